@@ -3,8 +3,16 @@ import logging
 import yaml
 from concurrent.futures import ThreadPoolExecutor
 from collections import namedtuple
-from typing import Any, Coroutine, Iterator, List, Set, Tuple, Dict
-
+from functools import partial
+from typing import Any, List, Optional, Set, Tuple, Dict
+
+from brad.admin.bulk_load_chunks import S3TableChunker, chunk_files_prefix
+from brad.admin.bulk_load_scheduler import (
+    BulkLoadScheduler,
+    LoadChunk,
+    TableLoad,
+    load_workers_for,
+)
 from brad.asset_manager import AssetManager
 from brad.blueprint import Blueprint
 from brad.blueprint.manager import BlueprintManager
@@ -14,9 +22,12 @@ from brad.blueprint.sql_gen.table import (
 )
 from brad.blueprint.user import UserProvidedBlueprint
 from brad.connection.connection import Connection
+from brad.connection.executor import EngineExecutors
+from brad.connection.factory import ConnectionFactory
 from brad.config.file import ConfigFile
 from brad.config.engine import Engine
 from brad.config.strings import (
+    AURORA_BULK_LOAD_PROGRESS_TABLE_NAME,
     AURORA_EXTRACT_PROGRESS_TABLE_NAME,
     AURORA_SEQ_COLUMN,
     source_table_name,
@@ -86,6 +97,19 @@ def register_admin_action(subparser) -> None:
         action="store_true",
         help="If set, this tool will load the tables one-by-one.",
     )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        help="If set, table files larger than this size (in MB) are split into "
+        "chunks that are loaded concurrently. The chunks are stored in the "
+        "manifest's S3 bucket and are reused by later bulk loads.",
+    )
+    parser.add_argument(
+        "--max-workers-per-engine",
+        type=int,
+        help="Caps the number of concurrent loads on each engine. By default, "
+        "this number is based on each engine's provisioning.",
+    )
     parser.add_argument(
         "--only-engines",
         type=str,
@@ -155,18 +179,25 @@ async def _ensure_empty(
             await cursor.rollback()
 
 
-async def _load_aurora(
+def _aurora_load_table_name(
+    ctx: _LoadContext, table_name: str, bare_aurora_tables: bool
+) -> str:
+    table = ctx.blueprint.get_table(table_name)
+    return source_table_name(table) if not bare_aurora_tables else table.name
+
+
+async def _load_aurora_chunk(
     ctx: _LoadContext,
     table_name: str,
     table_options,
+    bare_aurora_tables: bool,
     aurora_connection: Connection,
-    bare_aurora_tables: bool = False,
-) -> Engine:
-    logger.info("Loading %s on Aurora...", table_name)
+    chunk: LoadChunk,
+) -> None:
+    logger.info("Loading %s on Aurora (%s)...", table_name, chunk.s3_path)
     table = ctx.blueprint.get_table(table_name)
-    load_table_name = source_table_name(table) if not bare_aurora_tables else table.name
     load_query = _AURORA_LOAD_TEMPLATE.format(
-        table_name=load_table_name,
+        table_name=_aurora_load_table_name(ctx, table_name, bare_aurora_tables),
         columns=comma_separated_column_names(table.columns),
         options=(
             "({})".format(table_options["aurora_options"])
@@ -175,12 +206,32 @@ async def _load_aurora(
         ),
         s3_bucket=ctx.s3_bucket,
         s3_region=ctx.s3_bucket_region,
-        s3_path=table_options["s3_path"],
+        s3_path=chunk.s3_path,
     )
     logger.debug("Running on Aurora: %s", load_query)
     cursor = await aurora_connection.cursor()
     await cursor.execute(load_query)
 
+    # Record the chunk in the same transaction as its rows so that an
+    # interrupted load can resume from the chunks that were not loaded.
+    q = "INSERT INTO {} (table_name, s3_path) VALUES ('{}', '{}')".format(
+        AURORA_BULK_LOAD_PROGRESS_TABLE_NAME, table_name, chunk.s3_path
+    )
+    logger.debug("Running on Aurora: %s", q)
+    await cursor.execute(q)
+    await cursor.commit()
+
+
+async def _finish_aurora(
+    ctx: _LoadContext,
+    table_name: str,
+    bare_aurora_tables: bool,
+    aurora_connection: Connection,
+) -> None:
+    table = ctx.blueprint.get_table(table_name)
+    load_table_name = _aurora_load_table_name(ctx, table_name, bare_aurora_tables)
+    cursor = await aurora_connection.cursor()
+
     # Reset the next sequence values for SERIAL/BIGSERIAL types after a bulk
     # load (Aurora does not automatically update it).
     for column in table.columns:
@@ -199,11 +250,57 @@ async def _load_aurora(
         logger.debug("Running on Aurora: %s", q)
         await cursor.execute(q)
 
-    # Commit each table load so that we can resume.
+    # The table is fully loaded, so its chunks no longer need to be tracked.
+    q = "DELETE FROM {} WHERE table_name = '{}'".format(
+        AURORA_BULK_LOAD_PROGRESS_TABLE_NAME, table_name
+    )
+    logger.debug("Running on Aurora: %s", q)
+    await cursor.execute(q)
     await cursor.commit()
-
     logger.info("Done loading %s on Aurora!", table_name)
-    return Engine.Aurora
+
+
+async def _read_aurora_load_progress(
+    aurora_connection: Connection,
+) -> Dict[str, Set[str]]:
+    """
+    Returns the chunks that were already loaded for each table whose Aurora
+    load was interrupted (tables that finished loading are not included).
+    """
+    cursor = await aurora_connection.cursor()
+    q = "CREATE TABLE IF NOT EXISTS {} (table_name TEXT, s3_path TEXT)".format(
+        AURORA_BULK_LOAD_PROGRESS_TABLE_NAME
+    )
+    logger.debug("Running on Aurora: %s", q)
+    await cursor.execute(q)
+    await cursor.execute(
+        "SELECT table_name, s3_path FROM " + AURORA_BULK_LOAD_PROGRESS_TABLE_NAME
+    )
+    progress: Dict[str, Set[str]] = {}
+    for table_name, s3_path in await cursor.fetchall():
+        if table_name not in progress:
+            progress[table_name] = set()
+        progress[table_name].add(s3_path)
+    await cursor.commit()
+    return progress
+
+
+def _remaining_chunks(
+    table_name: str, chunks: List[LoadChunk], loaded: Set[str]
+) -> List[LoadChunk]:
+    """
+    Returns the chunks of a partially loaded table that still need to be
+    loaded on Aurora.
+    """
+    if not loaded.issubset(chunk.s3_path for chunk in chunks):
+        raise RuntimeError(
+            "The Aurora load of {} was interrupted, but the loaded chunks do not "
+            "match the table's current chunks (was --chunk-mb changed?). Rerun "
+            "with the previous --chunk-mb value, or with --reload-aurora.".format(
+                table_name
+            )
+        )
+    return [chunk for chunk in chunks if chunk.s3_path not in loaded]
 
 
 async def _load_redshift(
@@ -211,12 +308,15 @@ async def _load_redshift(
     table_name: str,
     table_options,
     redshift_connection: Connection,
-) -> Engine:
+    chunk: LoadChunk,
+) -> None:
     logger.info("Loading %s on Redshift...", table_name)
+    # If the table was split, `chunk.s3_path` is a prefix that matches all of
+    # its chunks (Redshift loads them in parallel).
     load_query = _REDSHIFT_LOAD_TEMPLATE.format(
         table_name=table_name,
         s3_bucket=ctx.s3_bucket,
-        s3_path=table_options["s3_path"],
+        s3_path=chunk.s3_path,
         options=(
             table_options["redshift_options"]
             if "redshift_options" in table_options
@@ -232,7 +332,6 @@ async def _load_redshift(
     await cursor.commit()
 
     logger.info("Done loading %s on Redshift!", table_name)
-    return Engine.Redshift
 
 
 async def _load_athena(
@@ -240,7 +339,8 @@ async def _load_athena(
     table_name: str,
     table_options,
     athena_connection: Connection,
-) -> Engine:
+    _chunk: LoadChunk,
+) -> None:
     logger.info("Loading %s on Athena...", table_name)
     table = ctx.blueprint.get_table(table_name)
 
@@ -283,7 +383,6 @@ async def _load_athena(
     await cursor.execute(q)
 
     logger.info("Done loading %s on Athena!", table_name)
-    return Engine.Athena
 
 
 async def _update_sync_progress(
@@ -322,18 +421,6 @@ async def _update_sync_progress(
     await cursor.commit()
 
 
-def _try_add_task(
-    generator: Iterator[Coroutine[Any, Any, Engine]],
-    dest: List[asyncio.Task[Engine]],
-) -> None:
-    try:
-        coro = next(generator)
-        task = asyncio.create_task(coro)
-        dest.append(task)
-    except StopIteration:
-        pass
-
-
 async def _truncate_aurora_tables(
     blueprint: Blueprint, aurora_connection: Connection
 ) -> None:
@@ -344,6 +431,118 @@ async def _truncate_aurora_tables(
         logger.info("Truncating %s", table_name)
         await cursor.execute("TRUNCATE TABLE {}".format(source_table_name(table_name)))
         await cursor.execute("TRUNCATE TABLE {}".format(shadow_table_name(table_name)))
+    await cursor.execute(
+        "CREATE TABLE IF NOT EXISTS {} (table_name TEXT, s3_path TEXT)".format(
+            AURORA_BULK_LOAD_PROGRESS_TABLE_NAME
+        )
+    )
+    await cursor.execute("TRUNCATE TABLE " + AURORA_BULK_LOAD_PROGRESS_TABLE_NAME)
+
+
+def _workers_per_engine(
+    args, blueprint: Blueprint, engines_filter: Set[Engine]
+) -> Dict[Engine, int]:
+    workers = {}
+    for engine in engines_filter:
+        if args.sequential:
+            workers[engine] = 1
+            continue
+        workers[engine] = load_workers_for(engine, blueprint)
+        if args.max_workers_per_engine is not None:
+            workers[engine] = max(min(workers[engine], args.max_workers_per_engine), 1)
+    return workers
+
+
+async def _add_table_loads(
+    args,
+    manifest: Dict[str, Any],
+    ctx: _LoadContext,
+    engines_filter: Set[Engine],
+    nonempty_tables: List[Tuple[Engine, str]],
+    aurora_progress: Dict[str, Set[str]],
+    aurora_connection: Optional[Connection],
+    scheduler: BulkLoadScheduler,
+) -> None:
+    chunker = S3TableChunker(
+        ctx.config,
+        ctx.s3_bucket,
+        args.chunk_mb * 1_000_000 if args.chunk_mb is not None else None,
+    )
+
+    for table_options in manifest["tables"]:
+        table_name = table_options["table_name"]
+        table_locations = ctx.blueprint.get_table_locations(table_name)
+        load_engines = [
+            engine
+            for engine in table_locations
+            if engine in engines_filter and (engine, table_name) not in nonempty_tables
+        ]
+        if len(load_engines) == 0:
+            continue
+
+        chunks = await chunker.chunks_for(table_options)
+        # Redshift and Athena load the whole table with one statement.
+        whole_table = [
+            LoadChunk(
+                chunk_files_prefix(chunks), sum(chunk.size_bytes for chunk in chunks)
+            )
+        ]
+
+        for engine in load_engines:
+            if engine == Engine.Aurora:
+                aurora_chunks = chunks
+                if table_name in aurora_progress:
+                    aurora_chunks = _remaining_chunks(
+                        table_name, chunks, aurora_progress[table_name]
+                    )
+                    logger.info(
+                        "Resuming the Aurora load of %s (%d of %d chunks left).",
+                        table_name,
+                        len(aurora_chunks),
+                        len(chunks),
+                    )
+                if len(aurora_chunks) == 0:
+                    # All chunks were loaded, but the load did not finish.
+                    assert aurora_connection is not None
+                    await _finish_aurora(
+                        ctx, table_name, args.bare_aurora_tables, aurora_connection
+                    )
+                    continue
+                scheduler.add(
+                    TableLoad(
+                        engine,
+                        table_name,
+                        aurora_chunks,
+                        partial(
+                            _load_aurora_chunk,
+                            ctx,
+                            table_name,
+                            table_options,
+                            args.bare_aurora_tables,
+                        ),
+                        partial(
+                            _finish_aurora, ctx, table_name, args.bare_aurora_tables
+                        ),
+                    )
+                )
+            elif engine == Engine.Redshift:
+                scheduler.add(
+                    TableLoad(
+                        engine,
+                        table_name,
+                        whole_table,
+                        partial(_load_redshift, ctx, table_name, table_options),
+                    )
+                )
+            elif engine == Engine.Athena:
+                scheduler.add(
+                    TableLoad(
+                        engine,
+                        table_name,
+                        whole_table,
+                        partial(_load_athena, ctx, table_name, table_options),
+                    )
+                )
 
 
 async def bulk_load_impl(args, manifest: Dict[str, Any]) -> None:
@@ -374,14 +573,20 @@ async def bulk_load_impl(args, manifest: Dict[str, Any]) -> None:
     else:
         engines_filter = {Engine.Aurora, Engine.Athena, Engine.Redshift}
 
+    # Each load worker has its own connection (and driver thread). The extra
+    # thread is for the connections used below.
+    workers_per_engine = _workers_per_engine(args, blueprint, engines_filter)
+    EngineExecutors.instance().configure(
+        {engine: workers + 1 for engine, workers in workers_per_engine.items()}
+    )
+
+    engines = await EngineConnections.connect(
+        config,
+        directory,
+        manifest["schema_name"],
+        specific_engines=engines_filter,
+    )
     try:
-        running: List[asyncio.Task[Engine]] = []
-        engines = await EngineConnections.connect(
-            config,
-            directory,
-            manifest["schema_name"],
-            specific_engines=engines_filter,
-        )
         if not args.force and not args.reload_aurora:
             logger.info("Checking for non-empty tables...")
             nonempty_tables = await _ensure_empty(
@@ -391,6 +596,30 @@ async def bulk_load_impl(args, manifest: Dict[str, Any]) -> None:
             logger.info("Not checking for non-empty tables.")
             nonempty_tables = []
 
+        # If we are reloading Aurora, truncate the tables first.
+        if args.reload_aurora:
+            await _truncate_aurora_tables(
+                blueprint, engines.get_connection(Engine.Aurora)
+            )
+
+        # Aurora tables whose load was interrupted are non-empty, but they are
+        # resumed (instead of skipped).
+        if Engine.Aurora in engines_filter:
+            aurora_connection: Optional[Connection] = engines.get_connection(
+                Engine.Aurora
+            )
+            aurora_progress = await _read_aurora_load_progress(
+                engines.get_connection(Engine.Aurora)
+            )
+            nonempty_tables = [
+                (engine, table_name)
+                for engine, table_name in nonempty_tables
+                if engine != Engine.Aurora or table_name not in aurora_progress
+            ]
+        else:
+            aurora_connection = None
+            aurora_progress = {}
+
         if args.strict and len(nonempty_tables) > 0:
             raise RuntimeError("There are non-empty tables and --strict is set.")
 
@@ -398,93 +627,32 @@ async def bulk_load_impl(args, manifest: Dict[str, Any]) -> None:
             config, manifest["s3_bucket"], manifest["s3_bucket_region"], blueprint
         )
 
-        def load_tasks_for_engine(
-            engine: Engine,
-        ) -> Iterator[Coroutine[Any, Any, Engine]]:
-            if engine not in engines_filter:
-                return
-
-            for table_options in manifest["tables"]:
-                table_name = table_options["table_name"]
-                table_locations = blueprint.get_table_locations(table_name)
-                table_tup = (engine, table_name)
-                if (
-                    engine == Engine.Aurora
-                    and Engine.Aurora in table_locations
-                    and table_tup not in nonempty_tables
-                ):
-                    yield _load_aurora(
-                        ctx,
-                        table_name,
-                        table_options,
-                        engines.get_connection(Engine.Aurora),
-                        args.bare_aurora_tables,
-                    )
-                elif (
-                    engine == Engine.Redshift
-                    and Engine.Redshift in table_locations
-                    and table_tup not in nonempty_tables
-                ):
-                    yield _load_redshift(
-                        ctx,
-                        table_name,
-                        table_options,
-                        engines.get_connection(Engine.Redshift),
-                    )
-                elif (
-                    engine == Engine.Athena
-                    and Engine.Athena in table_locations
-                    and table_tup not in nonempty_tables
-                ):
-                    yield _load_athena(
-                        ctx,
-                        table_name,
-                        table_options,
-                        engines.get_connection(Engine.Athena),
-                    )
-
-        # If we are reloading Aurora, truncate the tables first.
-        if args.reload_aurora:
-            await _truncate_aurora_tables(
-                blueprint, engines.get_connection(Engine.Aurora)
+        async def connect(engine: Engine) -> Connection:
+            # Aurora chunk loads commit their rows and progress together.
+            return await ConnectionFactory.connect_to(
+                engine,
+                manifest["schema_name"],
+                config,
+                directory,
+                autocommit=engine != Engine.Aurora,
             )
 
-        # 2. Execute the load tasks.
-        # The intention is to have one in-flight load task for each engine
-        # running concurrently.
-        aurora_loads = load_tasks_for_engine(Engine.Aurora)
-        redshift_loads = load_tasks_for_engine(Engine.Redshift)
-        athena_loads = load_tasks_for_engine(Engine.Athena)
+        scheduler = BulkLoadScheduler(connect, workers_per_engine)
+        await _add_table_loads(
+            args,
+            manifest,
+            ctx,
+            engines_filter,
+            nonempty_tables,
+            aurora_progress,
+            aurora_connection,
+            scheduler,
+        )
 
+        # 2. Execute the loads. Each engine runs its loads on a bounded pool of
+        # workers (engines are loaded concurrently, unless --sequential is set).
         logger.info("Starting (or resuming) the bulk load.")
-        if args.sequential:
-            for t in aurora_loads:
-                await t
-            for t in redshift_loads:
-                await t
-            for t in athena_loads:
-                await t
-
-        else:
-            _try_add_task(aurora_loads, running)
-            _try_add_task(redshift_loads, running)
-            _try_add_task(athena_loads, running)
-
-            while len(running) > 0:
-                done, pending = await asyncio.wait(
-                    running, return_when=asyncio.FIRST_COMPLETED
-                )
-                running.clear()
-                running.extend(pending)
-
-                for task in done:
-                    engine = task.result()
-                    if engine == Engine.Aurora:
-                        _try_add_task(aurora_loads, running)
-                    elif engine == Engine.Redshift:
-                        _try_add_task(redshift_loads, running)
-                    elif engine == Engine.Athena:
-                        _try_add_task(athena_loads, running)
+        await scheduler.run(engines_in_parallel=not args.sequential)
 
         if Engine.Aurora in engines_filter:
             conn = engines.get_connection(Engine.Aurora)
@@ -502,13 +670,6 @@ async def bulk_load_impl(args, manifest: Dict[str, Any]) -> None:
                 manifest, blueprint, engines.get_connection(Engine.Aurora)
             )
 
-    except:
-        for to_cancel in running:
-            if isinstance(to_cancel, asyncio.Task):
-                to_cancel.cancel()
-        await asyncio.gather(*running, return_exceptions=True)
-        raise
-
     finally:
         await engines.close()
 
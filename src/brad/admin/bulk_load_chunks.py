@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import boto3
+
+from brad.admin.bulk_load_scheduler import LoadChunk
+from brad.config.file import ConfigFile
+
+logger = logging.getLogger(__name__)
+
+# Chunks are written under this prefix (outside of the table's own S3 folder,
+# since Athena loads every file in that folder).
+_CHUNK_PREFIX = "brad_load_chunks"
+_CHUNK_PART_PREFIX = "part-"
+# Written after all of a table's chunks are uploaded (so an interrupted split
+# is redone).
+_SPLIT_DONE_MARKER = "_split_done"
+_READ_BLOCK_BYTES = 8 * 1024 * 1024
+
+_REDSHIFT_IGNOREHEADER = re.compile(r"IGNOREHEADER\s+(\d+)", re.IGNORECASE)
+_AURORA_HEADER = re.compile(r"\bHEADER\b(\s+(true|false))?", re.IGNORECASE)
+
+
+def header_lines_for(table_options: Dict[str, Any]) -> int:
+    """
+    The number of header lines in a table's data file. Each chunk repeats the
+    header so that the engines' load options apply to every chunk. Set
+    `header_lines` in the manifest to override the value derived from the load
+    options.
+    """
+    if "header_lines" in table_options:
+        return int(table_options["header_lines"])
+
+    match = _REDSHIFT_IGNOREHEADER.search(table_options.get("redshift_options", ""))
+    if match is not None:
+        return int(match.group(1))
+
+    match = _AURORA_HEADER.search(table_options.get("aurora_options", ""))
+    if match is not None:
+        value = match.group(2)
+        return 0 if value is not None and value.lower() == "false" else 1
+
+    return 0
+
+
+def split_into_chunks(
+    blocks: Iterable[bytes], chunk_bytes: int, header_lines: int = 0
+) -> Iterator[bytes]:
+    """
+    Regroups a file's contents (provided as `blocks`) into chunks of about
+    `chunk_bytes` bytes. Chunks end on line boundaries and each one starts with
+    the file's first `header_lines` lines.
+
+    This assumes each record is on its own line (records with quoted newlines
+    may be split across chunks).
+    """
+    assert chunk_bytes > 0
+    header: Optional[bytes] = b"" if header_lines == 0 else None
+    pending = bytearray()
+
+    for block in blocks:
+        pending += block
+        if header is None:
+            header_end = _find_line_end(pending, header_lines)
+            if header_end < 0:
+                continue
+            header = bytes(pending[:header_end])
+            del pending[:header_end]
+
+        while len(pending) >= chunk_bytes:
+            cut = pending.rfind(b"\n", 0, chunk_bytes)
+            if cut < 0:
+                # The line is longer than a chunk.
+                cut = pending.find(b"\n", chunk_bytes)
+                if cut < 0:
+                    break
+            yield header + bytes(pending[: cut + 1])
+            del pending[: cut + 1]
+
+    if header is not None and len(pending) > 0:
+        yield header + bytes(pending)
+
+
+def _find_line_end(data: bytearray, num_lines: int) -> int:
+    """
+    Returns the index just past the `num_lines`-th newline in `data` (or -1 if
+    there are fewer lines).
+    """
+    end = 0
+    for _ in range(num_lines):
+        newline = data.find(b"\n", end)
+        if newline < 0:
+            return -1
+        end = newline + 1
+    return end
+
+
+class S3TableChunker:
+    """
+    Determines the chunks used to load each table. If `chunk_bytes` is set,
+    table files larger than it are split into chunks stored in S3 (once; later
+    bulk loads reuse them).
+    """
+
+    def __init__(
+        self, config: ConfigFile, s3_bucket: str, chunk_bytes: Optional[int]
+    ) -> None:
+        self._s3_bucket = s3_bucket
+        self._chunk_bytes = chunk_bytes
+        self._s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=config.aws_access_key,
+            aws_secret_access_key=config.aws_access_key_secret,
+        )
+
+    async def chunks_for(self, table_options: Dict[str, Any]) -> List[LoadChunk]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.chunks_for_sync, table_options)
+
+    def chunks_for_sync(self, table_options: Dict[str, Any]) -> List[LoadChunk]:
+        """
+        Returns the table's chunks. If chunking is disabled, this returns the
+        whole table file as one chunk of unknown size (0 bytes) without
+        accessing S3.
+        """
+        s3_path = table_options["s3_path"]
+        if self._chunk_bytes is None:
+            return [LoadChunk(s3_path, 0)]
+
+        response = self._s3_client.head_object(Bucket=self._s3_bucket, Key=s3_path)
+        size_bytes = int(response["ContentLength"])
+        if size_bytes <= self._chunk_bytes:
+            return [LoadChunk(s3_path, size_bytes)]
+
+        chunk_folder = chunk_folder_for(s3_path, self._chunk_bytes)
+        chunks = self._list_chunks(chunk_folder)
+        if chunks is None:
+            chunks = self._split(table_options, chunk_folder)
+        return chunks
+
+    def _list_chunks(self, chunk_folder: str) -> Optional[List[LoadChunk]]:
+        chunks = []
+        split_done = False
+        paginator = self._s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self._s3_bucket, Prefix=chunk_folder):
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(_SPLIT_DONE_MARKER):
+                    split_done = True
+                else:
+                    chunks.append(LoadChunk(obj["Key"], int(obj["Size"])))
+        if not split_done:
+            return None
+        chunks.sort(key=lambda chunk: chunk.s3_path)
+        return chunks
+
+    def _split(
+        self, table_options: Dict[str, Any], chunk_folder: str
+    ) -> List[LoadChunk]:
+        assert self._chunk_bytes is not None
+        s3_path = table_options["s3_path"]
+        logger.info("Splitting %s into chunks...", s3_path)
+        response = self._s3_client.get_object(Bucket=self._s3_bucket, Key=s3_path)
+        chunks = []
+        for index, data in enumerate(
+            split_into_chunks(
+                response["Body"].iter_chunks(_READ_BLOCK_BYTES),
+                self._chunk_bytes,
+                header_lines_for(table_options),
+            )
+        ):
+            key = "{}{}{:05d}".format(chunk_folder, _CHUNK_PART_PREFIX, index)
+            self._s3_client.put_object(Bucket=self._s3_bucket, Key=key, Body=data)
+            chunks.append(LoadChunk(key, len(data)))
+        self._s3_client.put_object(
+            Bucket=self._s3_bucket, Key=chunk_folder + _SPLIT_DONE_MARKER, Body=b""
+        )
+        logger.info("Split %s into %d chunks.", s3_path, len(chunks))
+        return chunks
+
+
+def chunk_folder_for(s3_path: str, chunk_bytes: int) -> str:
+    return "{}/{}b/{}/".format(_CHUNK_PREFIX, chunk_bytes, s3_path)
+
+
+def chunk_files_prefix(chunks: List[LoadChunk]) -> str:
+    """
+    An S3 key prefix that matches all of a table's chunks (and nothing else).
+    Redshift loads all the chunks with one `COPY` (which loads the files in
+    parallel across the cluster's slices).
+    """
+    if len(chunks) == 1:
+        return chunks[0].s3_path
+    folder = chunks[0].s3_path.rsplit("/", 1)[0]
+    return "{}/{}".format(folder, _CHUNK_PART_PREFIX)
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import time
+from collections import namedtuple
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional
+
+from brad.blueprint import Blueprint
+from brad.config.engine import Engine
+from brad.connection.connection import Connection
+from brad.planner.scoring.provisioning import aurora_num_cpus
+
+logger = logging.getLogger(__name__)
+
+# A piece of a table's data (e.g., one S3 object).
+LoadChunk = namedtuple("LoadChunk", ["s3_path", "size_bytes"])
+
+LoadChunkFn = Callable[[Connection, LoadChunk], Coroutine[Any, Any, None]]
+FinishTableFn = Callable[[Connection], Coroutine[Any, Any, None]]
+ConnectFn = Callable[[Engine], Awaitable[Connection]]
+
+# Athena is serverless, so its load concurrency does not depend on a blueprint.
+_ATHENA_LOAD_WORKERS = 4
+
+
+class TableLoad:
+    """
+    The work needed to load one table on one engine. Each chunk is loaded with
+    `load_chunk` (chunks may be loaded concurrently, on different connections).
+    Once all chunks are loaded, `finish` runs (if provided).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        table_name: str,
+        chunks: List[LoadChunk],
+        load_chunk: LoadChunkFn,
+        finish: Optional[FinishTableFn] = None,
+    ) -> None:
+        assert len(chunks) > 0
+        self.engine = engine
+        self.table_name = table_name
+        self.chunks = chunks
+        self.load_chunk = load_chunk
+        self.finish = finish
+        self.chunks_remaining = len(chunks)
+
+    def size_bytes(self) -> int:
+        return sum(chunk.size_bytes for chunk in self.chunks)
+
+
+class EngineLoadStats:
+    """
+    Progress (and, once done, the final result) of the loads on one engine.
+    """
+
+    def __init__(self, engine: Engine, num_chunks: int, total_bytes: int) -> None:
+        self.engine = engine
+        self.num_chunks = num_chunks
+        self.total_bytes = total_bytes
+        self.chunks_done = 0
+        self.bytes_done = 0
+        self.tables_done = 0
+        self.elapsed_s = 0.0
+
+    def throughput_mb_per_s(self) -> float:
+        if self.elapsed_s <= 0.0:
+            return 0.0
+        return self.bytes_done / 1_000_000 / self.elapsed_s
+
+    def __repr__(self) -> str:
+        return (
+            "{}: {}/{} chunks, {:.1f}/{:.1f} MB, {} tables, {:.1f} s, "
+            "{:.2f} MB/s".format(
+                self.engine.value,
+                self.chunks_done,
+                self.num_chunks,
+                self.bytes_done / 1_000_000,
+                self.total_bytes / 1_000_000,
+                self.tables_done,
+                self.elapsed_s,
+                self.throughput_mb_per_s(),
+            )
+        )
+
+
+def load_workers_for(engine: Engine, blueprint: Blueprint) -> int:
+    """
+    The number of concurrent loads to run on `engine`, based on its
+    provisioning.
+
+    - Aurora: one load per writer vCPU (a PostgreSQL import uses one core).
+    - Redshift: one load per node (each load is spread across all slices, so
+      this mainly overlaps per-statement overheads).
+    - Athena: a fixed number.
+    """
+    if engine == Engine.Aurora:
+        prov = blueprint.aurora_provisioning()
+        return max(aurora_num_cpus(prov), 1) if prov.num_nodes() > 0 else 1
+    elif engine == Engine.Redshift:
+        return max(blueprint.redshift_provisioning().num_nodes(), 1)
+    else:
+        return _ATHENA_LOAD_WORKERS
+
+
+class BulkLoadScheduler:
+    """
+    Runs table loads using a bounded pool of workers for each engine. Each
+    worker has its own connection. The engines are loaded concurrently.
+
+    Chunks are loaded largest-first across all tables on an engine. This greedy
+    ordering keeps one large table from running alone at the end of the load
+    (which lowers the total load time).
+    """
+
+    def __init__(
+        self,
+        connect: ConnectFn,
+        workers_per_engine: Dict[Engine, int],
+    ) -> None:
+        self._connect = connect
+        self._workers_per_engine = workers_per_engine
+        self._loads: Dict[Engine, List[TableLoad]] = {}
+
+    def add(self, load: TableLoad) -> None:
+        if load.engine not in self._loads:
+            self._loads[load.engine] = []
+        self._loads[load.engine].append(load)
+
+    async def run(
+        self, engines_in_parallel: bool = True
+    ) -> Dict[Engine, EngineLoadStats]:
+        """
+        Runs all added loads. If a load fails, the other in-flight loads are
+        cancelled and the exception is raised.
+        """
+        stats = {
+            engine: EngineLoadStats(
+                engine,
+                sum(len(load.chunks) for load in loads),
+                sum(load.size_bytes() for load in loads),
+            )
+            for engine, loads in self._loads.items()
+        }
+        try:
+            if engines_in_parallel:
+                await asyncio.gather(
+                    *[
+                        self._run_engine(engine, loads, stats[engine])
+                        for engine, loads in self._loads.items()
+                    ]
+                )
+            else:
+                for engine, loads in self._loads.items():
+                    await self._run_engine(engine, loads, stats[engine])
+        except:
+            partial = [
+                "{} on {}".format(load.table_name, load.engine.value)
+                for loads in self._loads.values()
+                for load in loads
+                if 0 < load.chunks_remaining < len(load.chunks)
+            ]
+            if len(partial) > 0:
+                logger.warning(
+                    "The bulk load failed. These tables are partially loaded: %s",
+                    ", ".join(partial),
+                )
+            raise
+
+        for engine_stats in stats.values():
+            logger.info("Bulk load done. %s", engine_stats)
+        return stats
+
+    async def _run_engine(
+        self, engine: Engine, loads: List[TableLoad], stats: EngineLoadStats
+    ) -> None:
+        work = [(load, chunk) for load in loads for chunk in load.chunks]
+        # Stable sort, so equal-sized chunks keep their manifest order.
+        work.sort(key=lambda item: item[1].size_bytes, reverse=True)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in work:
+            queue.put_nowait(item)
+
+        num_workers = min(max(self._workers_per_engine.get(engine, 1), 1), len(work))
+        logger.info(
+            "Loading %d chunk(s) of %d table(s) on %s using %d worker(s).",
+            len(work),
+            len(loads),
+            engine.value,
+            num_workers,
+        )
+        start = time.monotonic()
+        workers = [
+            asyncio.create_task(self._worker(engine, queue, stats, start))
+            for _ in range(num_workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+    async def _worker(
+        self,
+        engine: Engine,
+        queue: asyncio.Queue,
+        stats: EngineLoadStats,
+        start: float,
+    ) -> None:
+        connection = await self._connect(engine)
+        try:
+            while not queue.empty():
+                load, chunk = queue.get_nowait()
+                await load.load_chunk(connection, chunk)
+                load.chunks_remaining -= 1
+                if load.chunks_remaining == 0:
+                    if load.finish is not None:
+                        await load.finish(connection)
+                    stats.tables_done += 1
+                    logger.info("Done loading %s on %s.", load.table_name, engine.value)
+
+                stats.chunks_done += 1
+                stats.bytes_done += chunk.size_bytes
+                stats.elapsed_s = time.monotonic() - start
+                _log_progress(stats)
+        finally:
+            await connection.close()
+
+
+def _log_progress(stats: EngineLoadStats) -> None:
+    throughput = stats.throughput_mb_per_s()
+    remaining_mb = (stats.total_bytes - stats.bytes_done) / 1_000_000
+    if throughput > 0.0:
+        eta = "{:.0f} s".format(remaining_mb / throughput)
+    else:
+        eta = "unknown"
+    logger.info("Bulk load progress. %s (ETA: %s)", stats, eta)
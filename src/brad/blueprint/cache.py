@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import os
+import pathlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from brad.blueprint import Blueprint
+from brad.blueprint.serde import deserialize_blueprint
+from brad.planner.scoring.score import Score
+
+logger = logging.getLogger(__name__)
+
+
+def blueprint_digest(serialized: bytes) -> str:
+    """
+    The content address of a serialized blueprint.
+    """
+    return hashlib.sha256(serialized).hexdigest()
+
+
+class BlueprintCache:
+    """
+    A content-addressed cache of blueprints, keyed by `blueprint_digest()`.
+    Entries are immutable, so they never need to be invalidated.
+
+    Deserialized blueprints are kept in memory. If a `path` is provided, the
+    serialized blueprints are also stored on disk so that other BRAD processes
+    on the same machine (e.g., the front ends) can avoid fetching them from S3.
+
+    Scores are only kept in memory. They are keyed by the blueprint version and
+    digest because a score is persisted along with its blueprint version.
+    """
+
+    def __init__(self, path: Optional[pathlib.Path], max_in_memory: int = 8) -> None:
+        self._path = path
+        self._max_in_memory = max_in_memory
+        self._blueprints: "OrderedDict[str, Blueprint]" = OrderedDict()
+        self._scores: "OrderedDict[Tuple[int, str], Score]" = OrderedDict()
+
+    def get(self, digest: str) -> Optional[Blueprint]:
+        blueprint = self._blueprints.get(digest)
+        if blueprint is not None:
+            self._blueprints.move_to_end(digest)
+            return blueprint
+
+        if self._path is None:
+            return None
+        try:
+            with open(self._path / digest, "rb") as file:
+                serialized = file.read()
+        except FileNotFoundError:
+            return None
+        if blueprint_digest(serialized) != digest:
+            logger.warning("Ignoring corrupted cached blueprint %s", digest)
+            return None
+
+        blueprint = deserialize_blueprint(serialized)
+        self._remember(digest, blueprint)
+        return blueprint
+
+    def put(self, serialized: bytes, blueprint: Optional[Blueprint] = None) -> str:
+        """
+        Adds a serialized blueprint to the cache and returns its digest.
+        """
+        digest = blueprint_digest(serialized)
+        self._remember(
+            digest,
+            deserialize_blueprint(serialized) if blueprint is None else blueprint,
+        )
+
+        if self._path is not None and not (self._path / digest).exists():
+            try:
+                self._path.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._path / f"{digest}.tmp{os.getpid()}"
+                with open(tmp_path, "wb") as file:
+                    file.write(serialized)
+                os.replace(tmp_path, self._path / digest)
+            except OSError:
+                logger.exception("Failed to cache blueprint %s", digest)
+        return digest
+
+    def get_score(self, version: int, digest: str) -> Optional[Score]:
+        return self._scores.get((version, digest))
+
+    def put_score(self, version: int, digest: str, score: Score) -> None:
+        self._scores[(version, digest)] = score
+        self._scores.move_to_end((version, digest))
+        while len(self._scores) > self._max_in_memory:
+            self._scores.popitem(last=False)
+
+    def _remember(self, digest: str, blueprint: Blueprint) -> None:
+        self._blueprints[digest] = blueprint
+        self._blueprints.move_to_end(digest)
+        while len(self._blueprints) > self._max_in_memory:
+            self._blueprints.popitem(last=False)
@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+
+from brad.blueprint import Blueprint
+from brad.blueprint.cache import blueprint_digest
+from brad.blueprint.diff.blueprint import BlueprintDiff
+from brad.blueprint.provisioning import Provisioning
+from brad.blueprint.serde import serialize_blueprint
+from brad.config.engine import Engine
+from brad.routing.abstract_policy import FullRoutingPolicy
+
+
+class BlueprintDelta:
+    """
+    A compact description of how to turn one blueprint (the base) into another
+    (the target). It only holds the parts of the target that differ from the
+    base: the locations of moved tables, changed provisionings, and the routing
+    policy (if it changed).
+
+    The daemon sends deltas to the front ends during blueprint transitions so
+    that they can update their in-memory blueprint without reloading it. The
+    digests identify the base and target (see `blueprint_digest()`).
+    """
+
+    @classmethod
+    def of(cls, base: Blueprint, target: Blueprint) -> "BlueprintDelta":
+        table_locations: Dict[str, List[Engine]] = {}
+        aurora: Optional[Provisioning] = None
+        redshift: Optional[Provisioning] = None
+        routing_policy: Optional[FullRoutingPolicy] = None
+
+        diff = BlueprintDiff.of(base, target)
+        if diff is not None:
+            for table_diff in diff.table_diffs():
+                name = table_diff.table_name()
+                table_locations[name] = list(target.get_table_locations(name))
+            if diff.aurora_diff() is not None:
+                aurora = target.aurora_provisioning()
+            if diff.redshift_diff() is not None:
+                redshift = target.redshift_provisioning()
+            if diff.has_routing_diff():
+                routing_policy = target.get_routing_policy()
+
+        return cls(
+            base_digest=blueprint_digest(serialize_blueprint(base)),
+            target_digest=blueprint_digest(serialize_blueprint(target)),
+            table_locations=table_locations,
+            aurora_provisioning=aurora,
+            redshift_provisioning=redshift,
+            routing_policy=routing_policy,
+        )
+
+    def __init__(
+        self,
+        base_digest: str,
+        target_digest: str,
+        table_locations: Dict[str, List[Engine]],
+        aurora_provisioning: Optional[Provisioning],
+        redshift_provisioning: Optional[Provisioning],
+        routing_policy: Optional[FullRoutingPolicy],
+    ) -> None:
+        self._base_digest = base_digest
+        self._target_digest = target_digest
+        self._table_locations = table_locations
+        self._aurora_provisioning = aurora_provisioning
+        self._redshift_provisioning = redshift_provisioning
+        self._routing_policy = routing_policy
+
+    def base_digest(self) -> str:
+        return self._base_digest
+
+    def target_digest(self) -> str:
+        return self._target_digest
+
+    def apply(self, base: Blueprint) -> Blueprint:
+        """
+        Returns the target blueprint. Callers should check that `base` is the
+        blueprint that this delta was computed against (using the digests).
+        """
+        table_locations = dict(base.table_locations())
+        table_locations.update(self._table_locations)
+        return Blueprint(
+            schema_name=base.schema_name(),
+            table_schemas=base.tables(),
+            table_locations=table_locations,
+            aurora_provisioning=(
+                self._aurora_provisioning
+                if self._aurora_provisioning is not None
+                else base.aurora_provisioning()
+            ),
+            redshift_provisioning=(
+                self._redshift_provisioning
+                if self._redshift_provisioning is not None
+                else base.redshift_provisioning()
+            ),
+            full_routing_policy=(
+                self._routing_policy
+                if self._routing_policy is not None
+                else base.get_routing_policy()
+            ),
+        )
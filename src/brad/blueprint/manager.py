@@ -2,10 +2,12 @@ import asyncio
 import json
 import logging
 import pathlib
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from brad.asset_manager import AssetManager
 from brad.blueprint import Blueprint
+from brad.blueprint.cache import BlueprintCache, blueprint_digest
+from brad.blueprint.diff.delta import BlueprintDelta
 from brad.blueprint.serde import (
     serialize_blueprint,
     deserialize_blueprint,
@@ -40,7 +42,12 @@ class BlueprintManager:
         self._directory = (
             Directory(config) if initial_directory is None else initial_directory
         )
+        self._directory_from_snapshot = False
         self._config = config
+        self._cache = BlueprintCache(config.blueprint_cache_path())
+        # Digests of the stable versions we have seen. These versions are
+        # never overwritten.
+        self._stable_digests: Dict[int, str] = {}
 
     @staticmethod
     def initialize_schema(
@@ -52,7 +59,9 @@ class BlueprintManager:
         """
 
         serialized = serialize_blueprint(blueprint)
-        versioning = BlueprintVersioning(0, TransitionState.Stable, None)
+        versioning = BlueprintVersioning(
+            0, TransitionState.Stable, None, blueprint_digest(serialized)
+        )
         assets.persist_sync(
             BlueprintManager._blueprint_key_for_version(
                 blueprint.schema_name(), version=0
@@ -64,9 +73,18 @@ class BlueprintManager:
             versioning.serialize(),
         )
 
-    async def load(self, skip_directory_refresh: bool = False) -> None:
+    async def load(
+        self,
+        skip_directory_refresh: bool = False,
+        allow_directory_snapshot: bool = False,
+    ) -> None:
         """
         Loads the persisted version of the blueprint from S3.
+
+        If `allow_directory_snapshot` is set, the directory is loaded from its
+        saved snapshot (when one is configured and usable) instead of being
+        refreshed. Use `directory_is_from_snapshot()` to check whether the
+        directory still needs a refresh.
         """
         stub_path = self._config.stub_mode_path()
         if stub_path is not None:
@@ -80,12 +98,14 @@ class BlueprintManager:
             versioning = await self._load_versioning()
             # If there is still a problem, we want the exception to stop BRAD.
 
-        current_blueprint = await self._load_blueprint_version(versioning.version)
-        current_score = await self._load_score(versioning.version)
+        current_blueprint, current_score = await self._load_version(
+            versioning.version, versioning.version_digest
+        )
 
         if versioning.next_version is not None:
-            next_blueprint = await self._load_blueprint_version(versioning.next_version)
-            next_score = await self._load_score(versioning.next_version)
+            next_blueprint, next_score = await self._load_version(
+                versioning.next_version, versioning.next_version_digest
+            )
         else:
             next_blueprint = None
             next_score = None
@@ -109,7 +129,18 @@ class BlueprintManager:
                 self._directory.set_override_redshift_cluster_id(
                     preset_redshift_cluster_id
                 )
-            await self._directory.refresh()
+            snapshot_path = (
+                self._config.directory_snapshot_path()
+                if allow_directory_snapshot
+                else None
+            )
+            if snapshot_path is not None and self._directory.load_snapshot(
+                snapshot_path
+            ):
+                logger.info("Loaded the saved directory from %s", snapshot_path)
+                self._directory_from_snapshot = True
+            else:
+                await self.refresh_directory()
         logger.debug("Loaded %s", self._versioning)
 
     def load_sync(self) -> None:
@@ -126,12 +157,12 @@ class BlueprintManager:
             # If there is still a problem, we want the exception to stop BRAD.
 
         self._current_blueprint = self._load_blueprint_version_sync(
-            self._versioning.version
+            self._versioning.version, self._versioning.version_digest
         )
         self._current_blueprint_score = self._load_score_sync(self._versioning.version)
         if self._versioning.next_version is not None:
             self._next_blueprint = self._load_blueprint_version_sync(
-                self._versioning.next_version
+                self._versioning.next_version, self._versioning.next_version_digest
             )
             self._next_blueprint_score = self._load_score_sync(
                 self._versioning.next_version
@@ -160,9 +191,52 @@ class BlueprintManager:
         """
         Used for administrative purposes only.
         """
-        blueprint = await self._load_blueprint_version(version)
-        score = await self._load_score(version)
-        return blueprint, score
+        return await self._load_version(version, self._stable_digests.get(version))
+
+    def apply_delta(self, version: int, delta: BlueprintDelta) -> bool:
+        """
+        Used by the front ends to switch to the blueprint `version` that the
+        daemon has transitioned to, without reloading it. `delta` must have
+        been computed against this manager's active blueprint; if it was not,
+        this method returns false and callers should `load()` instead.
+
+        The front ends do not use blueprint scores, so the new blueprint's score
+        is not loaded.
+        """
+        if self._versioning is None:
+            return False
+        active = self.get_blueprint()
+        active_version = self.get_active_blueprint_version()
+        active_digest = self._cache.put(serialize_blueprint(active), active)
+        if active_digest != delta.base_digest():
+            logger.info(
+                "Blueprint delta does not apply to version %d. Will reload.",
+                active_version,
+            )
+            return False
+
+        target = delta.apply(active)
+        target_digest = self._cache.put(serialize_blueprint(target), target)
+        if target_digest != delta.target_digest():
+            logger.warning(
+                "Applying the blueprint delta for version %d produced a different "
+                "blueprint. Will reload.",
+                version,
+            )
+            return False
+
+        self._versioning = BlueprintVersioning(
+            active_version,
+            TransitionState.TransitionedPreCleanUp,
+            version,
+            active_digest,
+            target_digest,
+        )
+        self._current_blueprint = active
+        self._current_blueprint_score = self.get_active_score()
+        self._next_blueprint = target
+        self._next_blueprint_score = None
+        return True
 
     async def start_transition(
         self, new_blueprint: Blueprint, new_score: Optional[Score]
@@ -174,6 +248,7 @@ class BlueprintManager:
 
         next_version = self._versioning.version + 1
         serialized = serialize_blueprint(new_blueprint)
+        next_digest = self._cache.put(serialized, new_blueprint)
         await self._assets.persist(
             self._blueprint_key_for_version(self._schema_name, next_version),
             serialized,
@@ -183,9 +258,11 @@ class BlueprintManager:
             await self._assets.persist(
                 self._score_key_for_version(next_version), serialized_score
             )
+            self._cache.put_score(next_version, next_digest, new_score)
 
         next_versioning = self._versioning.copy()
         next_versioning.next_version = next_version
+        next_versioning.next_version_digest = next_digest
         next_versioning.transition_state = TransitionState.Transitioning
         await self._assets.persist(
             _VERSION_KEY.format(schema_name=self._schema_name),
@@ -207,7 +284,9 @@ class BlueprintManager:
         if next_state == TransitionState.Stable:
             assert next_versioning.next_version is not None
             next_versioning.version = next_versioning.next_version
+            next_versioning.version_digest = next_versioning.next_version_digest
             next_versioning.next_version = None
+            next_versioning.next_version_digest = None
         await self._assets.persist(
             _VERSION_KEY.format(schema_name=self._schema_name),
             next_versioning.serialize(),
@@ -234,6 +313,7 @@ class BlueprintManager:
         next_versioning.transition_state = TransitionState.Stable
         next_versioning.version = self._versioning.version
         next_versioning.next_version = None
+        next_versioning.next_version_digest = None
         await self._assets.persist(
             _VERSION_KEY.format(schema_name=self._schema_name),
             next_versioning.serialize(),
@@ -253,8 +333,10 @@ class BlueprintManager:
         serialized = serialize_blueprint(blueprint)
         versioning = self._versioning.copy()
         versioning.version += 1
+        versioning.version_digest = self._cache.put(serialized, blueprint)
         versioning.transition_state = TransitionState.Stable
         versioning.next_version = None
+        versioning.next_version_digest = None
         self._assets.persist_sync(
             self._blueprint_key_for_version(self._schema_name, versioning.version),
             serialized,
@@ -348,6 +430,14 @@ class BlueprintManager:
 
     async def refresh_directory(self) -> None:
         await self._directory.refresh()
+        self._directory_from_snapshot = False
+
+    def directory_is_from_snapshot(self) -> bool:
+        """
+        Returns true if the directory was loaded from a saved snapshot and has
+        not been refreshed since.
+        """
+        return self._directory_from_snapshot
 
     async def _load_versioning(self) -> "BlueprintVersioning":
         version_data = await self._assets.load(
@@ -355,11 +445,32 @@ class BlueprintManager:
         )
         return BlueprintVersioning.deserialize(version_data)
 
-    async def _load_blueprint_version(self, version: int) -> Blueprint:
+    async def _load_version(
+        self, version: int, digest: Optional[str]
+    ) -> Tuple[Blueprint, Optional[Score]]:
+        if digest is not None:
+            blueprint = self._cache.get(digest)
+            score = self._cache.get_score(version, digest)
+            if blueprint is not None and score is not None:
+                self._stable_digests.setdefault(version, digest)
+                return blueprint, score
+        blueprint = await self._load_blueprint_version(version, digest)
+        score = await self._load_score(version)
+        if digest is not None and score is not None:
+            self._cache.put_score(version, digest, score)
+        return blueprint, score
+
+    async def _load_blueprint_version(
+        self, version: int, digest: Optional[str]
+    ) -> Blueprint:
+        if digest is not None:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                return cached
         serialized = await self._assets.load(
             self._blueprint_key_for_version(self._schema_name, version)
         )
-        return deserialize_blueprint(serialized)
+        return self._remember_loaded(version, digest, serialized)
 
     def _load_versioning_sync(self) -> "BlueprintVersioning":
         version_data = self._assets.load_sync(
@@ -367,11 +478,31 @@ class BlueprintManager:
         )
         return BlueprintVersioning.deserialize(version_data)
 
-    def _load_blueprint_version_sync(self, version: int) -> Blueprint:
+    def _load_blueprint_version_sync(
+        self, version: int, digest: Optional[str]
+    ) -> Blueprint:
+        if digest is not None:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                return cached
         serialized = self._assets.load_sync(
             self._blueprint_key_for_version(self._schema_name, version)
         )
-        return deserialize_blueprint(serialized)
+        return self._remember_loaded(version, digest, serialized)
+
+    def _remember_loaded(
+        self, version: int, expected_digest: Optional[str], serialized: bytes
+    ) -> Blueprint:
+        digest = self._cache.put(serialized)
+        if expected_digest is not None and digest != expected_digest:
+            logger.warning(
+                "Blueprint version %d does not match its recorded digest.", version
+            )
+        if self._versioning is not None and version <= self._versioning.version:
+            self._stable_digests[version] = digest
+        blueprint = self._cache.get(digest)
+        assert blueprint is not None
+        return blueprint
 
     async def _load_score(self, version: int) -> Optional[Score]:
         try:
@@ -402,7 +533,9 @@ class BlueprintManager:
                 "Failed to load the blueprint. Check if you have bootstrapped this schema."
             ) from ex
 
-        versioning = BlueprintVersioning(0, TransitionState.Stable, None)
+        versioning = BlueprintVersioning(
+            0, TransitionState.Stable, None, blueprint_digest(serialized)
+        )
         self._assets.persist_sync(
             self._blueprint_key_for_version(self._schema_name, version=0),
             serialized,
@@ -432,13 +565,25 @@ class BlueprintVersioning:
         version: int,
         transition_state: TransitionState,
         next_version: Optional[int],
+        version_digest: Optional[str] = None,
+        next_version_digest: Optional[str] = None,
     ) -> None:
         self.version = version
         self.transition_state = transition_state
         self.next_version = next_version
+        # The content addresses of the blueprints (see `BlueprintCache`). These
+        # are missing in versioning metadata written by older BRAD versions.
+        self.version_digest = version_digest
+        self.next_version_digest = next_version_digest
 
     def serialize(self) -> bytes:
-        parts = [self.version, self.transition_state.value, self.next_version]
+        parts = [
+            self.version,
+            self.transition_state.value,
+            self.next_version,
+            self.version_digest,
+            self.next_version_digest,
+        ]
         return json.dumps(parts).encode()
 
     @classmethod
@@ -448,6 +593,8 @@ class BlueprintVersioning:
             int(parts[0]),
             TransitionState.from_str(parts[1]),
             int(parts[2]) if parts[2] is not None else None,
+            parts[3] if len(parts) > 3 else None,
+            parts[4] if len(parts) > 4 else None,
         )
 
     def __repr__(self) -> str:
@@ -465,7 +612,11 @@ class BlueprintVersioning:
 
     def copy(self) -> "BlueprintVersioning":
         return BlueprintVersioning(
-            self.version, self.transition_state, self.next_version
+            self.version,
+            self.transition_state,
+            self.next_version,
+            self.version_digest,
+            self.next_version_digest,
         )
 
 
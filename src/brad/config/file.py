@@ -80,6 +80,16 @@ class ConfigFile:
     def num_front_ends(self) -> int:
         return int(self._raw["num_front_ends"])
 
+    def front_end_shared_port(self) -> bool:
+        """
+        If true, all front end processes listen on `front_end_port` (using
+        SO_REUSEPORT) and the kernel spreads client connections across them.
+        """
+        try:
+            return bool(self._raw["front_end_shared_port"])
+        except KeyError:
+            return False
+
     @property
     def planner_log_path(self) -> Optional[pathlib.Path]:
         return self._extract_log_path("planner_log_path")
@@ -306,6 +316,143 @@ class ConfigFile:
         except KeyError:
             return False
 
+    def engine_executor_threads(self) -> Dict[Engine, int]:
+        """
+        The number of threads in each engine's dedicated executor (used to run
+        blocking driver calls). Engines that are not listed use the event
+        loop's shared default executor.
+        """
+        try:
+            raw = self._raw["engine_executor_threads"]
+            return {Engine.from_str(engine): int(size) for engine, size in raw.items()}
+        except KeyError:
+            return {}
+
+    def connection_pooling(self) -> bool:
+        """
+        If set, front end sessions borrow connections from shared per-engine
+        pools instead of opening their own connections to every engine.
+        """
+        try:
+            return self._raw["connection_pooling"]
+        except KeyError:
+            return False
+
+    def connection_pool_sizes(self) -> Dict[Engine, int]:
+        """
+        The maximum number of pooled connections per engine. For Aurora, the
+        size applies to each instance (the writer and each read replica).
+        """
+        sizes = {Engine.Aurora: 32, Engine.Redshift: 16, Engine.Athena: 16}
+        try:
+            for engine, size in self._raw["connection_pool_sizes"].items():
+                if engine == "sidecar":
+                    continue
+                sizes[Engine.from_str(engine)] = int(size)
+        except KeyError:
+            pass
+        return sizes
+
+    def sidecar_pool_size(self) -> int:
+        """
+        The maximum number of sidecar DB connections shared by pooled sessions
+        (used for cardinality estimation).
+        """
+        try:
+            return int(self._raw["connection_pool_sizes"]["sidecar"])
+        except KeyError:
+            return 8
+
+    def engine_connect_timeout_s(self) -> float:
+        """
+        The maximum time to wait when establishing one connection to an engine
+        (or to one Aurora read replica).
+        """
+        try:
+            return float(self._raw["engine_connect_timeout_s"])
+        except KeyError:
+            return 15.0
+
+    def parse_cache_snapshot_path(self) -> Optional[pathlib.Path]:
+        """
+        Where the daemon and front ends persist their parse caches (see
+        `ParseCache`). If unset, the caches are not persisted.
+        """
+        try:
+            return pathlib.Path(self._raw["parse_cache_snapshot_path"])
+        except KeyError:
+            return None
+
+    def blueprint_cache_path(self) -> Optional[pathlib.Path]:
+        """
+        A directory where BRAD caches serialized blueprints, keyed by their
+        content. Processes on the same machine share these blueprints instead
+        of each loading them from S3. If unset, blueprints are only cached in
+        memory.
+        """
+        try:
+            return pathlib.Path(self._raw["blueprint_cache_path"])
+        except KeyError:
+            return None
+
+    def directory_snapshot_path(self) -> Optional[pathlib.Path]:
+        """
+        Where BRAD saves the most recently retrieved `Directory`. If set, the
+        daemon starts with the saved directory and refreshes it in the
+        background.
+        """
+        try:
+            return pathlib.Path(self._raw["directory_snapshot_path"])
+        except KeyError:
+            return None
+
+    def parse_cache_max_entries(self) -> int:
+        try:
+            return int(self._raw["parse_cache_max_entries"])
+        except KeyError:
+            return 50_000
+
+    def standby_session_connections(self) -> int:
+        """
+        The number of pre-established session connection sets that each front
+        end keeps on standby (not used with connection pooling).
+        """
+        try:
+            return int(self._raw["standby_session_connections"])
+        except KeyError:
+            return 0
+
+    def vdbe_result_cache_max_entries(self) -> int:
+        """
+        The maximum number of query results that the VDBE front end caches
+        (0 disables the cache).
+        """
+        try:
+            return int(self._raw["vdbe_result_cache_max_entries"])
+        except KeyError:
+            return 1000
+
+    def vdbe_max_engine_concurrency(self) -> Optional[int]:
+        """
+        The maximum number of concurrent VDBE queries per underlying engine.
+        If set, the VDBE front end enables SLO-aware admission control and
+        adjusts the limit (up to this value) based on the VDBEs' latency SLOs.
+        """
+        try:
+            return int(self._raw["vdbe_admission_control"]["max_engine_concurrency"])
+        except KeyError:
+            return None
+
+    def vdbe_max_queued_queries(self) -> int:
+        """
+        The maximum number of queries per VDBE that can wait for admission.
+        Further queries are rejected with a transient error.
+        """
+        try:
+            return int(self._raw["vdbe_admission_control"]["max_queued_queries"])
+        except KeyError:
+            return 1000
+
     def vdbe_start_port(self) -> int:
         """
         Returns the port on which the first VDBE will be started. The rest of the
@@ -12,3 +12,18 @@ class FrontEndMetric(enum.Enum):
 
     TxnLatencySecondP50 = "txn_latency_s_p50"
     TxnLatencySecondP90 = "txn_latency_s_p90"
+
+    # Time spent in each stage of the front end's query path (see
+    # `brad.front_end.query_stages.QueryStage`).
+    StageParseSecondP50 = "stage_parse_s_p50"
+    StageParseSecondP90 = "stage_parse_s_p90"
+    StageRouteSecondP50 = "stage_route_s_p50"
+    StageRouteSecondP90 = "stage_route_s_p90"
+    StageExecuteSecondP50 = "stage_execute_s_p50"
+    StageExecuteSecondP90 = "stage_execute_s_p90"
+    StageFetchSecondP50 = "stage_fetch_s_p50"
+    StageFetchSecondP90 = "stage_fetch_s_p90"
+    StageLogSecondP50 = "stage_log_s_p50"
+    StageLogSecondP90 = "stage_log_s_p90"
+    StageSerializeSecondP50 = "stage_serialize_s_p50"
+    StageSerializeSecondP90 = "stage_serialize_s_p90"
@@ -170,6 +170,16 @@ class PlannerConfig:
     def sample_set_size(self) -> int:
         return int(self._raw["sample_set_size"])
 
+    def neighborhood_scoring_workers(self) -> int:
+        """
+        The number of processes used to score neighborhood candidates. Set to
+        1 to score candidates in the planner's process.
+        """
+        try:
+            return int(self._raw["neighborhood_scoring_workers"])
+        except KeyError:
+            return 1
+
     ###
     ### Provisioning scaling
     ###
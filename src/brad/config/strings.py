@@ -86,6 +86,7 @@ def delete_delta_table_name(table: str | Table) -> str:
 
 
 AURORA_EXTRACT_PROGRESS_TABLE_NAME = "brad_extract_progress"
+AURORA_BULK_LOAD_PROGRESS_TABLE_NAME = "brad_bulk_load_progress"
 AURORA_SEQ_COLUMN = "brad_seq"
 
 SHELL_HISTORY_FILE = ".brad_history"
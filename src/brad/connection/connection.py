@@ -23,6 +23,14 @@ class Connection:
     def close_sync(self) -> None:
         raise NotImplementedError
 
+    def is_async_native(self) -> bool:
+        """
+        Returns `True` if this connection uses a driver that natively supports
+        asyncio. Such connections only support the async cursor methods; they
+        do not need to hand off blocking calls to a thread.
+        """
+        return False
+
     def is_connection_lost_error(self, ex: Exception) -> bool:
         """
         Return `True` if the exception represents a connection lost exception.
@@ -0,0 +1,234 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+from ddsketch import DDSketch
+
+from brad.config.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EngineExecutor:
+    """
+    A bounded thread pool used to run an engine's blocking driver calls (e.g.,
+    `cursor.execute()`). Giving each engine its own pool prevents slow engines
+    (e.g., long-polling Athena queries) from occupying all of the threads that
+    faster engines (e.g., Aurora) also need.
+
+    If `max_workers` is `None`, calls run on the event loop's default executor
+    (this is the behavior when no dedicated pools are configured).
+    """
+
+    def __init__(self, name: str, max_workers: Optional[int]) -> None:
+        self._name = name
+        self._max_workers = max_workers
+        if max_workers is not None:
+            self._pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"brad-{name}"
+            )
+        else:
+            self._pool = None
+
+        # Metrics. `_queued` counts calls that were submitted but have not
+        # started running yet. The counters are modified from the pool's
+        # threads, so we protect them with a lock.
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._wait_time_sketch = DDSketch(relative_accuracy=0.01)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_workers(self) -> Optional[int]:
+        return self._max_workers
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Runs `fn(*args)` on this executor's threads and waits for the result.
+        """
+        loop = asyncio.get_running_loop()
+        call = _QueuedCall(time.monotonic())
+        with self._lock:
+            self._queued += 1
+        try:
+            return await loop.run_in_executor(
+                self._pool, functools.partial(self._run_and_track, call, fn, *args)
+            )
+        finally:
+            # The call may never start (e.g., if the caller is cancelled while
+            # the call is queued, or if the pool shuts down).
+            self._mark_dequeued(call)
+
+    def queue_depth(self) -> int:
+        """
+        The number of calls waiting for a thread.
+        """
+        return self._queued
+
+    def in_flight(self) -> int:
+        """
+        The number of calls currently running.
+        """
+        return self._running
+
+    def take_metrics(self) -> "EngineExecutorMetrics":
+        """
+        Returns a snapshot of this executor's metrics. The wait time
+        distribution is reset after each call.
+        """
+        with self._lock:
+            sketch = self._wait_time_sketch
+            self._wait_time_sketch = DDSketch(relative_accuracy=0.01)
+            completed = self._completed
+            self._completed = 0
+            return EngineExecutorMetrics(
+                self._name,
+                self._max_workers,
+                queue_depth=self._queued,
+                in_flight=self._running,
+                completed=completed,
+                wait_time_sketch=sketch,
+            )
+
+    def shutdown(self, cancel_queued: bool = True) -> None:
+        """
+        Stops accepting new calls. Calls that are waiting for a thread are
+        cancelled unless `cancel_queued` is `False` (then they still run).
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=cancel_queued)
+
+    def _mark_dequeued(self, call: "_QueuedCall") -> None:
+        # Called both when the call starts and when `run()` returns, so the
+        # queue depth must only be decremented once per call.
+        with self._lock:
+            if call.dequeued:
+                return
+            call.dequeued = True
+            self._queued -= 1
+
+    def _run_and_track(self, call: "_QueuedCall", fn: Callable[..., T], *args) -> T:
+        started_at = time.monotonic()
+        self._mark_dequeued(call)
+        with self._lock:
+            self._running += 1
+            self._wait_time_sketch.add(started_at - call.submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+
+class _QueuedCall:
+    __slots__ = ("submitted_at", "dequeued")
+
+    def __init__(self, submitted_at: float) -> None:
+        self.submitted_at = submitted_at
+        # Set once the call is no longer counted in the queue depth.
+        self.dequeued = False
+
+
+class EngineExecutorMetrics:
+    def __init__(
+        self,
+        name: str,
+        max_workers: Optional[int],
+        queue_depth: int,
+        in_flight: int,
+        completed: int,
+        wait_time_sketch: DDSketch,
+    ) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.in_flight = in_flight
+        self.completed = completed
+        self.wait_time_sketch = wait_time_sketch
+
+    def wait_time_s(self, quantile: float) -> float:
+        value = self.wait_time_sketch.get_quantile_value(quantile)
+        return value if value is not None else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"EngineExecutorMetrics({self.name}, max_workers={self.max_workers}, "
+            f"queue_depth={self.queue_depth}, in_flight={self.in_flight}, "
+            f"completed={self.completed}, "
+            f"wait_p50_s={self.wait_time_s(0.5):.4f}, "
+            f"wait_p99_s={self.wait_time_s(0.99):.4f})"
+        )
+
+
+class EngineExecutors:
+    """
+    Holds one `EngineExecutor` per engine. A process-wide instance is available
+    through `EngineExecutors.instance()`; call `configure()` at startup to
+    create dedicated pools with the configured sizes. Until then (e.g., in
+    admin tools), all engines share the event loop's default executor.
+    """
+
+    @classmethod
+    def instance(cls) -> "EngineExecutors":
+        global _INSTANCE  # pylint: disable=global-statement
+        if _INSTANCE is None:
+            _INSTANCE = cls()
+        return _INSTANCE
+
+    def __init__(self) -> None:
+        self._executors: Dict[Engine, EngineExecutor] = {
+            engine: EngineExecutor(engine.value, max_workers=None) for engine in Engine
+        }
+
+    def configure(self, pool_sizes: Dict[Engine, int]) -> None:
+        """
+        Creates dedicated pools for the engines in `pool_sizes`. Calls that
+        were already submitted to the previous executors (running or queued)
+        still complete on them.
+        """
+        for engine, size in pool_sizes.items():
+            old = self._executors[engine]
+            self._executors[engine] = EngineExecutor(engine.value, max_workers=size)
+            old.shutdown(cancel_queued=False)
+            logger.info("Using a dedicated %d-thread pool for %s", size, engine)
+
+    def for_engine(self, engine: Engine) -> EngineExecutor:
+        return self._executors[engine]
+
+    def take_metrics(self) -> Dict[Engine, EngineExecutorMetrics]:
+        return {
+            engine: executor.take_metrics()
+            for engine, executor in self._executors.items()
+        }
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown()
+
+
+_INSTANCE: Optional[EngineExecutors] = None
+
+
+def default_executor() -> EngineExecutor:
+    """
+    Returns an executor that runs calls on the event loop's default executor.
+    Used by connections that were not given a dedicated executor.
+    """
+    global _DEFAULT_EXECUTOR  # pylint: disable=global-statement
+    if _DEFAULT_EXECUTOR is None:
+        _DEFAULT_EXECUTOR = EngineExecutor("default", max_workers=None)
+    return _DEFAULT_EXECUTOR
+
+
+_DEFAULT_EXECUTOR: Optional[EngineExecutor] = None
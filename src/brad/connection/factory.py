@@ -1,8 +1,10 @@
 from typing import Dict, Optional
 
 from .connection import Connection, ConnectionFailed
+from .executor import EngineExecutor, EngineExecutors
 from .odbc_connection import OdbcConnection
 from .psycopg_connection import PsycopgConnection
+from .psycopg_async_connection import PsycopgAsyncConnection
 from .pyathena_connection import PyAthenaConnection
 from .redshift_connection import RedshiftConnection
 from .sqlite_connection import SqliteConnection
@@ -11,6 +13,7 @@ from brad.config.engine import Engine
 from brad.provisioning.directory import Directory
 
 _USE_PSYCOPG_KEY = "use_psycopg"
+_USE_ASYNC_DRIVER_KEY = "use_async_driver"
 
 
 class ConnectionFactory:
@@ -24,10 +27,19 @@ class ConnectionFactory:
         autocommit: bool = True,
         aurora_read_replica: Optional[int] = None,
         timeout_s: int = 10,
+        executor: Optional[EngineExecutor] = None,
     ) -> Connection:
+        """
+        Connects to `engine`. Blocking driver calls made through the returned
+        connection run on `executor`; by default, this is the engine's
+        process-wide executor (see `EngineExecutors`).
+        """
         if config.stub_mode_path() is not None:
             return cls.connect_to_stub(config)
 
+        if executor is None:
+            executor = EngineExecutors.instance().for_engine(engine)
+
         # HACK: Schema aliasing for convenience.
         if schema_name is not None and (
             schema_name == "imdb_editable_100g" or schema_name == "imdb_etl_100g"
@@ -35,9 +47,22 @@ class ConnectionFactory:
             schema_name = "imdb_extended_100g"
 
         connection_details = config.get_connection_details(engine)
+        use_async_driver = connection_details.get(_USE_ASYNC_DRIVER_KEY, False)
         if engine == Engine.Redshift:
             cluster = directory.redshift_cluster()
             address, port = cluster.endpoint()
+            if use_async_driver:
+                # Redshift speaks the PostgreSQL wire protocol.
+                cstr = cls._pg_aurora_psycopg_connection_string(
+                    address,
+                    port,
+                    connection_details,
+                    schema_name if schema_name is not None else "dev",
+                    timeout_s,
+                    statement_timeout_s=None,
+                )
+                cstr += " sslmode=require"
+                return await PsycopgAsyncConnection.connect(cstr, autocommit)
             return await RedshiftConnection.connect(
                 host=address,
                 port=port,
@@ -46,6 +71,7 @@ class ConnectionFactory:
                 schema_name=schema_name,
                 autocommit=autocommit,
                 timeout_s=timeout_s,
+                executor=executor,
             )
         elif engine == Engine.Aurora:
             if aurora_read_replica is None:
@@ -60,7 +86,17 @@ class ConnectionFactory:
                     )
                 instance = aurora_readers[aurora_read_replica]
                 address, port = instance.endpoint()
-            if (
+            if use_async_driver:
+                cstr = cls._pg_aurora_psycopg_connection_string(
+                    address,
+                    port,
+                    connection_details,
+                    schema_name,
+                    timeout_s,
+                    statement_timeout_s=None,
+                )
+                return await PsycopgAsyncConnection.connect(cstr, autocommit)
+            elif (
                 _USE_PSYCOPG_KEY in connection_details
                 and connection_details[_USE_PSYCOPG_KEY]
             ):
@@ -72,12 +108,14 @@ class ConnectionFactory:
                     timeout_s,
                     statement_timeout_s=None,
                 )
-                return await PsycopgConnection.connect(cstr, autocommit)
+                return await PsycopgConnection.connect(cstr, autocommit, executor)
             else:
                 cstr = cls._pg_aurora_odbc_connection_string(
                     address, port, connection_details, schema_name
                 )
-                return await OdbcConnection.connect(cstr, autocommit, timeout_s)
+                return await OdbcConnection.connect(
+                    cstr, autocommit, timeout_s, executor
+                )
         elif engine == Engine.Athena:
             return await PyAthenaConnection.connect(
                 aws_region=connection_details["aws_region"],
@@ -85,6 +123,7 @@ class ConnectionFactory:
                 access_key=connection_details["access_key"],
                 access_key_secret=connection_details["access_key_secret"],
                 schema_name=schema_name,
+                executor=executor,
             )
         else:
             raise RuntimeError("Unsupported engine: {}".format(engine))
@@ -1,18 +1,23 @@
-import asyncio
 import pyodbc
 from typing import Any, Optional
 
 from .connection import Connection, ConnectionFailed
 from .cursor import Cursor
+from .executor import EngineExecutor, default_executor
 from .odbc_cursor import OdbcCursor
 
 
 class OdbcConnection(Connection):
     @classmethod
     async def connect(
-        cls, connection_str: str, autocommit: bool, timeout_s: int
+        cls,
+        connection_str: str,
+        autocommit: bool,
+        timeout_s: int,
+        executor: Optional[EngineExecutor] = None,
     ) -> Connection:
-        loop = asyncio.get_running_loop()
+        if executor is None:
+            executor = default_executor()
 
         def make_connection():
             return pyodbc.connect(
@@ -20,8 +25,8 @@ class OdbcConnection(Connection):
             )
 
         try:
-            connection = await loop.run_in_executor(None, make_connection)
-            return cls(connection)
+            connection = await executor.run(make_connection)
+            return cls(connection, executor)
         except pyodbc.OperationalError as ex:
             raise ConnectionFailed() from ex
 
@@ -37,29 +42,30 @@ class OdbcConnection(Connection):
         except pyodbc.OperationalError as ex:
             raise ConnectionFailed() from ex
 
-    def __init__(self, connection_impl: Any) -> None:
+    def __init__(
+        self, connection_impl: Any, executor: Optional[EngineExecutor] = None
+    ) -> None:
         super().__init__()
         self._connection = connection_impl
+        self._executor = executor if executor is not None else default_executor()
         self._cursor: Optional[Cursor] = None
         self._is_closed = False
 
     async def cursor(self) -> Cursor:
         if self._cursor is None:
-            loop = asyncio.get_running_loop()
-            cursor_impl = await loop.run_in_executor(None, self._connection.cursor)
-            self._cursor = OdbcCursor(cursor_impl)
+            cursor_impl = await self._executor.run(self._connection.cursor)
+            self._cursor = OdbcCursor(cursor_impl, self._executor)
         return self._cursor
 
     async def close(self) -> None:
         if self._is_closed:
             return
-        loop = asyncio.get_running_loop()
         self._is_closed = True
-        await loop.run_in_executor(None, self._connection.close)
+        await self._executor.run(self._connection.close)
 
     def cursor_sync(self) -> Cursor:
         if self._cursor is None:
-            self._cursor = OdbcCursor(self._connection.cursor())
+            self._cursor = OdbcCursor(self._connection.cursor(), self._executor)
         return self._cursor
 
     def close_sync(self) -> None:
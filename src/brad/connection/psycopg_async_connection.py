@@ -0,0 +1,56 @@
+import psycopg
+from typing import Optional
+
+from .connection import Connection, ConnectionFailed
+from .cursor import Cursor
+from .psycopg_async_cursor import PsycopgAsyncCursor
+from .psycopg_connection import is_psycopg_connection_lost_error
+
+
+class PsycopgAsyncConnection(Connection):
+    """
+    Uses psycopg's `AsyncConnection`, which runs queries directly on the event
+    loop. This works for Aurora and for Redshift (which speaks the PostgreSQL
+    wire protocol).
+    """
+
+    @classmethod
+    async def connect(cls, connection_str: str, autocommit: bool) -> Connection:
+        try:
+            connection = await psycopg.AsyncConnection.connect(
+                connection_str, autocommit=autocommit
+            )
+            return cls(connection)
+        except psycopg.OperationalError as ex:
+            raise ConnectionFailed() from ex
+
+    def __init__(self, connection_impl: psycopg.AsyncConnection) -> None:
+        super().__init__()
+        self._connection = connection_impl
+        self._cursor: Optional[Cursor] = None
+
+    async def cursor(self) -> Cursor:
+        return self.cursor_sync()
+
+    async def close(self) -> None:
+        await self._connection.close()
+
+    def cursor_sync(self) -> Cursor:
+        # N.B. Creating an async cursor does not perform any I/O.
+        if self._cursor is None:
+            self._cursor = PsycopgAsyncCursor(
+                self._connection, self._connection.cursor()
+            )
+        return self._cursor
+
+    def close_sync(self) -> None:
+        # Closing the underlying libpq connection does not require the event
+        # loop.
+        if not self._connection.closed:
+            self._connection.pgconn.finish()
+
+    def is_async_native(self) -> bool:
+        return True
+
+    def is_connection_lost_error(self, ex: Exception) -> bool:
+        return is_psycopg_connection_lost_error(ex)
@@ -0,0 +1,73 @@
+import psycopg
+from typing import Any, Optional, List, Iterable
+
+from .cursor import Cursor, Row
+from .schema import Schema, Field, DataType
+from .psycopg_cursor import _POSTGRESQL_OID_TO_BRAD_TYPE
+
+
+class PsycopgAsyncCursor(Cursor):
+    """
+    A cursor backed by psycopg's native asyncio interface. Queries run on the
+    event loop (no thread handoffs), so only the async methods are supported.
+    """
+
+    def __init__(
+        self, conn: psycopg.AsyncConnection, impl: psycopg.AsyncCursor
+    ) -> None:
+        super().__init__()
+        self._conn = conn
+        self._impl = impl
+
+    async def execute(self, query: str) -> None:
+        await self._impl.execute(query)  # type: ignore
+
+    async def fetchone(self) -> Optional[Row]:
+        return await self._impl.fetchone()
+
+    async def fetchall(self) -> List[Row]:
+        return await self._impl.fetchall()
+
+    async def commit(self) -> None:
+        await self._conn.commit()
+
+    async def rollback(self) -> None:
+        await self._conn.rollback()
+
+    def execute_sync(self, query: str) -> None:
+        raise _sync_unsupported()
+
+    def executemany_sync(self, query: str, batch: Iterable[Any]) -> None:
+        raise _sync_unsupported()
+
+    def fetchone_sync(self) -> Optional[Row]:
+        raise _sync_unsupported()
+
+    def fetchall_sync(self) -> List[Row]:
+        raise _sync_unsupported()
+
+    def result_schema(self, results: Optional[List[Row]] = None) -> Schema:
+        if self._impl.description is None:
+            return Schema.empty()
+
+        fields = []
+        for column_metadata in self._impl.description:
+            try:
+                brad_type = _POSTGRESQL_OID_TO_BRAD_TYPE[column_metadata.type_code]
+            except KeyError:
+                brad_type = DataType.Unknown
+            fields.append(Field(name=column_metadata.name, data_type=brad_type))
+        return Schema(fields)
+
+    def commit_sync(self) -> None:
+        raise _sync_unsupported()
+
+    def rollback_sync(self) -> None:
+        raise _sync_unsupported()
+
+
+def _sync_unsupported() -> RuntimeError:
+    return RuntimeError(
+        "PsycopgAsyncCursor only supports the async interface. "
+        "Use ConnectionFactory.connect_to_sync() for synchronous access."
+    )
@@ -1,23 +1,29 @@
-import asyncio
 import psycopg
 from typing import Optional
 
 from .connection import Connection, ConnectionFailed
 from .cursor import Cursor
+from .executor import EngineExecutor, default_executor
 from .psycopg_cursor import PsycopgCursor
 
 
 class PsycopgConnection(Connection):
     @classmethod
-    async def connect(cls, connection_str: str, autocommit: bool) -> Connection:
-        loop = asyncio.get_running_loop()
+    async def connect(
+        cls,
+        connection_str: str,
+        autocommit: bool,
+        executor: Optional[EngineExecutor] = None,
+    ) -> Connection:
+        if executor is None:
+            executor = default_executor()
 
         def make_connection():
             return psycopg.connect(connection_str, autocommit=autocommit)
 
         try:
-            connection = await loop.run_in_executor(None, make_connection)
-            return cls(connection)
+            connection = await executor.run(make_connection)
+            return cls(connection, executor)
         except psycopg.OperationalError as ex:
             raise ConnectionFailed() from ex
 
@@ -29,9 +35,14 @@ class PsycopgConnection(Connection):
         except psycopg.OperationalError as ex:
             raise ConnectionFailed() from ex
 
-    def __init__(self, connection_impl: psycopg.Connection) -> None:
+    def __init__(
+        self,
+        connection_impl: psycopg.Connection,
+        executor: Optional[EngineExecutor] = None,
+    ) -> None:
         super().__init__()
         self._connection = connection_impl
+        self._executor = executor if executor is not None else default_executor()
         self._cursor: Optional[Cursor] = None
 
     async def cursor(self) -> Cursor:
@@ -42,26 +53,32 @@ class PsycopgConnection(Connection):
 
     def cursor_sync(self) -> Cursor:
         if self._cursor is None:
-            self._cursor = PsycopgCursor(self._connection, self._connection.cursor())
+            self._cursor = PsycopgCursor(
+                self._connection, self._connection.cursor(), self._executor
+            )
         return self._cursor
 
     def close_sync(self) -> None:
         self._connection.close()
 
     def is_connection_lost_error(self, ex: Exception) -> bool:
-        if isinstance(ex, psycopg.Error) or isinstance(ex, psycopg.OperationalError):
-            err_code = ex.sqlstate
-            if err_code in _CONNECTION_LOST_ERR_CODES:
-                return True
-
-        # Unfortunately, there is no nice exception type. So we fall back to
-        # substring search.
-        message = repr(ex)
-        for phrase in _CONNECTION_LOST_PHRASES:
-            if phrase in message:
-                return True
-
-        return False
+        return is_psycopg_connection_lost_error(ex)
+
+
+def is_psycopg_connection_lost_error(ex: Exception) -> bool:
+    if isinstance(ex, psycopg.Error) or isinstance(ex, psycopg.OperationalError):
+        err_code = ex.sqlstate
+        if err_code in _CONNECTION_LOST_ERR_CODES:
+            return True
+
+    # Unfortunately, there is no nice exception type. So we fall back to
+    # substring search.
+    message = repr(ex)
+    for phrase in _CONNECTION_LOST_PHRASES:
+        if phrase in message:
+            return True
+
+    return False
 
 
 # Error code 25006 is used when running DML statements on a read replica. This
@@ -1,36 +1,37 @@
-import asyncio
 import psycopg
 from typing import Any, Optional, List, Iterable
 
 from .cursor import Cursor, Row
+from .executor import EngineExecutor, default_executor
 from .schema import Schema, Field, DataType
 
 
 class PsycopgCursor(Cursor):
-    def __init__(self, conn: psycopg.Connection, impl: psycopg.Cursor) -> None:
+    def __init__(
+        self,
+        conn: psycopg.Connection,
+        impl: psycopg.Cursor,
+        executor: Optional[EngineExecutor] = None,
+    ) -> None:
         super().__init__()
         self._conn = conn
         self._impl = impl
+        self._executor = executor if executor is not None else default_executor()
 
     async def execute(self, query: str) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._impl.execute, query)
+        await self._executor.run(self._impl.execute, query)
 
     async def fetchone(self) -> Optional[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchone)
+        return await self._executor.run(self._impl.fetchone)
 
     async def fetchall(self) -> List[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchall)
+        return await self._executor.run(self._impl.fetchall)
 
     async def commit(self) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._conn.commit)
+        await self._executor.run(self._conn.commit)
 
     async def rollback(self) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._conn.rollback)
+        await self._executor.run(self._conn.rollback)
 
     def execute_sync(self, query: str) -> None:
         self._impl.execute(query)
@@ -1,11 +1,11 @@
-import asyncio
 import pyathena
 import pyathena.connection
 import boto3
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .connection import Connection
 from .cursor import Cursor
+from .executor import EngineExecutor, default_executor
 from .pyathena_cursor import PyAthenaCursor
 
 
@@ -18,9 +18,19 @@ class PyAthenaConnection(Connection):
         access_key: str,
         access_key_secret: str,
         schema_name: Optional[str],
+        executor: Optional[EngineExecutor] = None,
     ) -> Connection:
-        return cls.connect_sync(
-            aws_region, s3_output_path, access_key, access_key_secret, schema_name
+        return cls(
+            pyathena.connect(
+                **cls._connect_kwargs(
+                    aws_region,
+                    s3_output_path,
+                    access_key,
+                    access_key_secret,
+                    schema_name,
+                )
+            ),
+            executor,
         )
 
     @classmethod
@@ -32,7 +42,27 @@ class PyAthenaConnection(Connection):
         access_key_secret: str,
         schema_name: Optional[str],
     ) -> Connection:
-        kwargs = {
+        return cls(
+            pyathena.connect(
+                **cls._connect_kwargs(
+                    aws_region,
+                    s3_output_path,
+                    access_key,
+                    access_key_secret,
+                    schema_name,
+                )
+            )
+        )
+
+    @staticmethod
+    def _connect_kwargs(
+        aws_region: str,
+        s3_output_path: str,
+        access_key: str,
+        access_key_secret: str,
+        schema_name: Optional[str],
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
             "region_name": aws_region,
             "s3_staging_dir": s3_output_path,
             "session": boto3.Session(
@@ -42,31 +72,36 @@ class PyAthenaConnection(Connection):
         }
         if schema_name is not None:
             kwargs["schema_name"] = schema_name
-        return cls(pyathena.connect(**kwargs))
+        return kwargs
 
-    def __init__(self, connection_impl: pyathena.connection.Connection) -> None:
+    def __init__(
+        self,
+        connection_impl: pyathena.connection.Connection,
+        executor: Optional[EngineExecutor] = None,
+    ) -> None:
         super().__init__()
         self._connection = connection_impl
+        self._executor = executor if executor is not None else default_executor()
         self._cursor: Optional[Cursor] = None
         self._is_closed = False
 
     async def cursor(self) -> Cursor:
         if self._cursor is None:
-            loop = asyncio.get_running_loop()
-            cursor_impl = await loop.run_in_executor(None, self._connection.cursor)
-            self._cursor = PyAthenaCursor(cursor_impl)  # type: ignore
+            cursor_impl = await self._executor.run(self._connection.cursor)
+            self._cursor = PyAthenaCursor(cursor_impl, self._executor)  # type: ignore
         return self._cursor
 
     async def close(self) -> None:
         if self._is_closed:
             return
-        loop = asyncio.get_running_loop()
         self._is_closed = True
-        await loop.run_in_executor(None, self._connection.close)
+        await self._executor.run(self._connection.close)
 
     def cursor_sync(self) -> Cursor:
         if self._cursor is None:
-            self._cursor = PyAthenaCursor(self._connection.cursor())  # type: ignore
+            self._cursor = PyAthenaCursor(
+                self._connection.cursor(), self._executor  # type: ignore
+            )
         return self._cursor
 
     def close_sync(self) -> None:
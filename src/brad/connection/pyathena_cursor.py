@@ -1,29 +1,29 @@
-import asyncio
 import pyathena
 import pyathena.connection
 import pyathena.cursor
 from typing import Any, Iterable, Optional, List
 
 from .cursor import Cursor, Row
+from .executor import EngineExecutor, default_executor
 from .schema import Schema, Field, DataType
 
 
 class PyAthenaCursor(Cursor):
-    def __init__(self, impl: pyathena.cursor.Cursor) -> None:
+    def __init__(
+        self, impl: pyathena.cursor.Cursor, executor: Optional[EngineExecutor] = None
+    ) -> None:
         super().__init__()
         self._impl = impl
+        self._executor = executor if executor is not None else default_executor()
 
     async def execute(self, query: str) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._impl.execute, query)
+        await self._executor.run(self._impl.execute, query)
 
     async def fetchone(self) -> Optional[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchone)  # type: ignore
+        return await self._executor.run(self._impl.fetchone)  # type: ignore
 
     async def fetchall(self) -> List[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchall)  # type: ignore
+        return await self._executor.run(self._impl.fetchall)  # type: ignore
 
     async def commit(self) -> None:
         pass
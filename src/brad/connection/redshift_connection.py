@@ -1,4 +1,3 @@
-import asyncio
 import redshift_connector
 import redshift_connector.error as redshift_errors
 import struct
@@ -6,6 +5,7 @@ from typing import Optional
 
 from .connection import Connection, ConnectionFailed
 from .cursor import Cursor
+from .executor import EngineExecutor, default_executor
 from .redshift_cursor import RedshiftCursor
 
 
@@ -21,8 +21,10 @@ class RedshiftConnection(Connection):
         autocommit: bool,
         # TODO: Enforce connection timeouts, but not query timeouts.
         timeout_s: int,  # pylint: disable=unused-argument
+        executor: Optional[EngineExecutor] = None,
     ) -> Connection:
-        loop = asyncio.get_running_loop()
+        if executor is None:
+            executor = default_executor()
 
         def make_connection():
             kwargs = {
@@ -35,9 +37,9 @@ class RedshiftConnection(Connection):
             return redshift_connector.connect(**kwargs)
 
         try:
-            connection = await loop.run_in_executor(None, make_connection)
+            connection = await executor.run(make_connection)
             connection.autocommit = autocommit
-            return cls(connection)
+            return cls(connection, executor)
         except redshift_errors.InterfaceError as ex:
             raise ConnectionFailed() from ex
 
@@ -68,29 +70,34 @@ class RedshiftConnection(Connection):
         except redshift_errors.InterfaceError as ex:
             raise ConnectionFailed() from ex
 
-    def __init__(self, connection_impl: redshift_connector.Connection) -> None:
+    def __init__(
+        self,
+        connection_impl: redshift_connector.Connection,
+        executor: Optional[EngineExecutor] = None,
+    ) -> None:
         super().__init__()
         self._connection = connection_impl
+        self._executor = executor if executor is not None else default_executor()
         self._cursor: Optional[Cursor] = None
         self._is_closed = False
 
     async def cursor(self) -> Cursor:
         if self._cursor is None:
-            loop = asyncio.get_running_loop()
-            cursor_impl = await loop.run_in_executor(None, self._connection.cursor)
-            self._cursor = RedshiftCursor(cursor_impl, self._connection)
+            cursor_impl = await self._executor.run(self._connection.cursor)
+            self._cursor = RedshiftCursor(cursor_impl, self._connection, self._executor)
         return self._cursor
 
     async def close(self) -> None:
         if self._is_closed:
             return
-        loop = asyncio.get_running_loop()
         self._is_closed = True
-        await loop.run_in_executor(None, self._connection.close)
+        await self._executor.run(self._connection.close)
 
     def cursor_sync(self) -> Cursor:
         if self._cursor is None:
-            self._cursor = RedshiftCursor(self._connection.cursor(), self._connection)
+            self._cursor = RedshiftCursor(
+                self._connection.cursor(), self._connection, self._executor
+            )
         return self._cursor
 
     def close_sync(self) -> None:
@@ -1,39 +1,38 @@
-import asyncio
 import redshift_connector
 from redshift_connector.utils.oids import RedshiftOID
 from typing import Any, Iterable, Optional, List
 
 from .cursor import Cursor, Row
+from .executor import EngineExecutor, default_executor
 from .schema import Schema, Field, DataType
 
 
 class RedshiftCursor(Cursor):
     def __init__(
-        self, impl: redshift_connector.Cursor, conn: redshift_connector.Connection
+        self,
+        impl: redshift_connector.Cursor,
+        conn: redshift_connector.Connection,
+        executor: Optional[EngineExecutor] = None,
     ) -> None:
         super().__init__()
         self._impl = impl
         self._conn = conn
+        self._executor = executor if executor is not None else default_executor()
 
     async def execute(self, query: str) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._impl.execute, query)
+        await self._executor.run(self._impl.execute, query)
 
     async def fetchone(self) -> Optional[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchone)
+        return await self._executor.run(self._impl.fetchone)
 
     async def fetchall(self) -> List[Row]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._impl.fetchall)
+        return await self._executor.run(self._impl.fetchall)
 
     async def commit(self) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._conn.commit)
+        await self._executor.run(self._conn.commit)
 
     async def rollback(self) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._conn.rollback)
+        await self._executor.run(self._conn.rollback)
 
     def execute_sync(self, query: str) -> None:
         self._impl.execute(query)
@@ -0,0 +1,53 @@
+import logging
+import numpy as np
+from typing import Optional
+
+from brad.blueprint import Blueprint
+from brad.blueprint.diff.blueprint import BlueprintDiff
+from brad.config.planner import PlannerConfig
+from brad.planner.scoring.score import Score
+
+logger = logging.getLogger(__name__)
+
+
+def is_minor_blueprint_change(
+    current_blueprint: Blueprint,
+    current_score: Optional[Score],
+    next_blueprint: Blueprint,
+    next_score: Score,
+    planner_config: PlannerConfig,
+) -> bool:
+    """
+    Returns true if transitioning to `next_blueprint` is not worthwhile because
+    it makes few changes.
+
+    The change is not minor if:
+    - There is a provisioning change
+    - The change in query routing is above a threshold
+    """
+    diff = BlueprintDiff.of(current_blueprint, next_blueprint)
+    if diff is None:
+        logger.info("Planner selected an identical blueprint - skipping.")
+        return True
+
+    if current_score is None:
+        # Do not skip - we are currently missing the score of the active
+        # blueprint, so there is nothing to compare to.
+        return False
+
+    if diff.aurora_diff() is not None or diff.redshift_diff() is not None:
+        return False
+
+    current_dist = current_score.normalized_query_count_distribution()
+    next_dist = next_score.normalized_query_count_distribution()
+    abs_delta = np.abs(next_dist - current_dist).sum()
+
+    if abs_delta >= planner_config.query_dist_change_frac():
+        return False
+    else:
+        logger.info(
+            "Skipping blueprint because the query distribution change (%.4f) falls under the threshold (%.4f).",
+            abs_delta,
+            planner_config.query_dist_change_frac(),
+        )
+        return True
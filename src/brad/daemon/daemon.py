@@ -1,15 +1,13 @@
 import asyncio
 import logging
-import queue
 import os
 import pathlib
 import multiprocessing as mp
-import numpy as np
 from typing import Optional, List, Set, Tuple
 
 from brad.asset_manager import AssetManager
 from brad.blueprint import Blueprint
-from brad.blueprint.diff.blueprint import BlueprintDiff
+from brad.blueprint.diff.delta import BlueprintDelta
 from brad.blueprint.manager import BlueprintManager
 from brad.blueprint.provisioning import Provisioning
 from brad.blueprint.state import TransitionState
@@ -19,9 +17,10 @@ from brad.config.system_event import SystemEvent
 from brad.config.temp_config import TempConfig
 from brad.connection.factory import ConnectionFactory
 from brad.daemon.hot_config import HotConfig
+from brad.daemon.ipc_channel import IpcChannel, IpcChannelClosed
 from brad.daemon.messages import (
+    DirectoryUpdated,
     ShutdownFrontEnd,
-    Sentinel,
     MetricsReport,
     VdbeMetricsReport,
     InternalCommandRequest,
@@ -30,10 +29,12 @@ from brad.daemon.messages import (
     NewBlueprintAck,
     ReconcileVirtualInfrastructure,
     ReconcileVirtualInfrastructureAck,
+    TablesSynced,
 )
 from brad.daemon.monitor import Monitor
 from brad.daemon.system_event_logger import SystemEventLogger
 from brad.daemon.transition_orchestrator import TransitionOrchestrator
+from brad.daemon.blueprint_filter import is_minor_blueprint_change
 from brad.daemon.blueprint_watchdog import BlueprintWatchdog
 from brad.daemon.populate_stub import create_tables_in_stub, load_tables_in_stub
 from brad.data_stats.estimator import Estimator
@@ -66,9 +67,11 @@ from brad.planner.triggers.provider import ConfigDefinedTriggers
 from brad.planner.triggers.trigger import Trigger
 from brad.planner.triggers.query_latency_ceiling import QueryLatencyCeiling
 from brad.planner.triggers.txn_latency_ceiling import TransactionLatencyCeiling
+from brad.parse_cache import ParseCache
 from brad.planner.workload import Workload
 from brad.planner.workload.builder import WorkloadBuilder
 from brad.planner.workload.provider import LoggedWorkloadProvider
+from brad.query_rep import load_parse_cache, save_parse_cache
 from brad.routing.policy import RoutingPolicy
 from brad.routing.tree_based.forest_policy import ForestPolicy
 from brad.row_list import RowList
@@ -122,7 +125,6 @@ class BradDaemon:
         self._providers: Optional[BlueprintProviders] = None
         self._planner: Optional[BlueprintPlanner] = None
 
-        self._process_manager: Optional[mp.managers.SyncManager] = None
         self._front_ends: List[_FrontEndProcess] = []
 
         self._data_sync_executor = DataSyncExecutor(self._config, self._blueprint_mgr)
@@ -130,6 +132,7 @@ class BradDaemon:
 
         self._transition_orchestrator: Optional[TransitionOrchestrator] = None
         self._transition_task: Optional[asyncio.Task[None]] = None
+        self._directory_refresh_task: Optional[asyncio.Task[None]] = None
 
         self._system_event_logger = SystemEventLogger.create_if_requested(self._config)
         self._watchdog = BlueprintWatchdog(self._system_event_logger)
@@ -219,7 +222,11 @@ class BradDaemon:
 
     async def _run_setup(self) -> None:
         is_stub_mode = self._config.stub_mode_path() is not None
-        await self._blueprint_mgr.load()
+        ParseCache.instance().set_max_entries(self._config.parse_cache_max_entries())
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            load_parse_cache(parse_cache_path)
+        await self._blueprint_mgr.load(allow_directory_snapshot=True)
         logger.info("Current blueprint: %s", self._blueprint_mgr.get_blueprint())
         if not is_stub_mode:
             logger.info("Current directory: %s", self._blueprint_mgr.get_directory())
@@ -315,7 +322,6 @@ class BradDaemon:
                 self._planner_config,
                 self._monitor,
                 data_access_provider,
-                self._estimator_provider,
                 self._startup_timestamp,
             ),
         )
@@ -334,10 +340,13 @@ class BradDaemon:
         logger.info(
             "Setting up and starting %d front ends...", self._config.num_front_ends
         )
-        self._process_manager = mp.Manager()
+        if self._config.front_end_shared_port():
+            logger.info(
+                "The front ends will share port %d.", self._config.front_end_port
+            )
         for fe_index in range(self._config.num_front_ends):
-            input_queue = self._process_manager.Queue()
-            output_queue = self._process_manager.Queue()
+            channel, fe_channel = IpcChannel.create_pair()
+            await channel.open()
             process = mp.Process(
                 target=start_front_end,
                 args=(
@@ -347,21 +356,22 @@ class BradDaemon:
                     self._path_to_system_config,
                     self._debug_mode,
                     self._blueprint_mgr.get_directory(),
-                    input_queue,
-                    output_queue,
+                    fe_channel,
                 ),
             )
-            wrapper = _FrontEndProcess(fe_index, process, input_queue, output_queue)
+            wrapper = _FrontEndProcess(fe_index, process, channel, fe_channel)
             reader_task = asyncio.create_task(self._read_front_end_messages(wrapper))
             wrapper.message_reader_task = reader_task
             self._front_ends.append(wrapper)
 
         for fe in self._front_ends:
             fe.process.start()
+            # The front end process has its own copy of its end of the channel.
+            fe.fe_channel.close_unopened()
 
         if self._vdbe_manager is not None:
-            v_input_queue = self._process_manager.Queue()
-            v_output_queue = self._process_manager.Queue()
+            v_channel, v_fe_channel = IpcChannel.create_pair()
+            await v_channel.open()
             process = mp.Process(
                 target=start_vdbe_front_end,
                 args=(
@@ -371,18 +381,23 @@ class BradDaemon:
                     self._debug_mode,
                     self._blueprint_mgr.get_directory(),
                     self._vdbe_manager.infra(),
-                    v_input_queue,
-                    v_output_queue,
+                    v_fe_channel,
                 ),
             )
-            self._vdbe_process = _VdbeFrontEndProcess(
-                process, v_input_queue, v_output_queue
-            )
+            self._vdbe_process = _VdbeFrontEndProcess(process, v_channel)
             reader_task = asyncio.create_task(
                 self._read_vdbe_messages(self._vdbe_process)
             )
             self._vdbe_process.message_reader_task = reader_task
             self._vdbe_process.process.start()
+            v_fe_channel.close_unopened()
+
+        if self._blueprint_mgr.directory_is_from_snapshot():
+            # The front ends started with the saved directory. We push any
+            # changes to them once the refresh completes.
+            self._directory_refresh_task = asyncio.create_task(
+                self._refresh_saved_directory()
+            )
 
         if (
             self._config.routing_policy == RoutingPolicy.ForestTableSelectivity
@@ -408,27 +423,32 @@ class BradDaemon:
     async def _run_teardown(self) -> None:
         # Shut down the front end processes.
         # 1. Send a message to tell them to shut down.
-        # 2. Input sentinel messages to unblock our reader tasks.
+        # 2. Stop our reader tasks and close the IPC channels.
         # 3. Wait for the processes to shut down.
         logger.info("Telling %d front end(s) to shut down...", len(self._front_ends))
         for fe_index, fe in enumerate(self._front_ends):
-            fe.input_queue.put(ShutdownFrontEnd(fe_index))
+            await fe.channel.send(ShutdownFrontEnd(fe_index))
             if fe.message_reader_task is not None:
-                fe.output_queue.put(Sentinel(fe_index))
+                fe.message_reader_task.cancel()
+            await fe.channel.close()
 
         if self._vdbe_process is not None:
             logger.info("Telling the VDBE front end to shut down...")
-            self._vdbe_process.input_queue.put(
+            await self._vdbe_process.channel.send(
                 ShutdownFrontEnd(BradVdbeFrontEnd.NUMERIC_IDENTIFIER)
             )
-            self._vdbe_process.output_queue.put(
-                Sentinel(BradVdbeFrontEnd.NUMERIC_IDENTIFIER)
-            )
+            if self._vdbe_process.message_reader_task is not None:
+                self._vdbe_process.message_reader_task.cancel()
+            await self._vdbe_process.channel.close()
 
         if self._timed_sync_task is not None:
             self._timed_sync_task.cancel()
             self._timed_sync_task = None
 
+        if self._directory_refresh_task is not None:
+            self._directory_refresh_task.cancel()
+            self._directory_refresh_task = None
+
         await self._data_sync_executor.shutdown()
 
         # Shut down the estimator.
@@ -449,14 +469,45 @@ class BradDaemon:
             self._vdbe_process.process.join()
             self._vdbe_process = None
 
+        # The front ends have saved their parse caches; merge ours in.
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            save_parse_cache(parse_cache_path)
+
+    async def _refresh_saved_directory(self) -> None:
+        try:
+            directory = self._blueprint_mgr.get_directory()
+            saved = directory.connection_metadata()
+            await self._blueprint_mgr.refresh_directory()
+            if directory.connection_metadata() == saved:
+                logger.info("The saved directory is up to date.")
+                return
+
+            logger.info("Refreshed the saved directory: %s", directory)
+            if self._transition_task is not None:
+                # The transition sends the front ends its own directory.
+                return
+            self._monitor.update_metrics_sources()
+            await self._data_sync_executor.update_connections()
+            for fe in self._front_ends:
+                await fe.channel.send(DirectoryUpdated(fe.fe_index, directory))
+            if self._vdbe_process is not None:
+                await self._vdbe_process.channel.send(
+                    DirectoryUpdated(BradVdbeFrontEnd.NUMERIC_IDENTIFIER, directory)
+                )
+        except Exception as ex:
+            if not isinstance(ex, asyncio.CancelledError):
+                logger.exception("Failed to refresh the saved directory.")
+        finally:
+            self._directory_refresh_task = None
+
     async def _read_front_end_messages(self, front_end: "_FrontEndProcess") -> None:
         """
         Waits for messages from the specified front end process and processes them.
         """
-        loop = asyncio.get_running_loop()
         while True:
             try:
-                message = await loop.run_in_executor(None, front_end.output_queue.get)
+                message = await front_end.channel.recv()
                 if message.fe_index != front_end.fe_index:
                     logger.warning(
                         "Received message with invalid front end index. Expected %d. Received %d.",
@@ -513,6 +564,9 @@ class BradDaemon:
                         front_end.fe_index,
                         str(message),
                     )
+            except IpcChannelClosed:
+                logger.info("Front end %d closed its IPC channel.", front_end.fe_index)
+                break
             except Exception as ex:
                 if not isinstance(ex, asyncio.CancelledError):
                     logger.exception(
@@ -521,12 +575,9 @@ class BradDaemon:
                     )
 
     async def _read_vdbe_messages(self, vdbe_process: "_VdbeFrontEndProcess") -> None:
-        loop = asyncio.get_running_loop()
         while True:
             try:
-                message = await loop.run_in_executor(
-                    None, vdbe_process.output_queue.get
-                )
+                message = await vdbe_process.channel.recv()
                 if message.fe_index != BradVdbeFrontEnd.NUMERIC_IDENTIFIER:
                     logger.warning(
                         "Received message with invalid front end index. Expected %d. Received %d.",
@@ -585,6 +636,9 @@ class BradDaemon:
                         str(message),
                     )
 
+            except IpcChannelClosed:
+                logger.info("The VDBE front end closed its IPC channel.")
+                break
             except Exception as ex:
                 if not isinstance(ex, asyncio.CancelledError):
                     logger.exception(
@@ -663,10 +717,7 @@ class BradDaemon:
         is to avoid transitioning to blueprints with few changes.
 
         We always skip the blueprint if a transition is currently in progress.
-
-        We do not skip the blueprint if:
-        - If there is a provisioning change
-        - The change in query routing is above a threshold
+        Otherwise we skip it if `is_minor_blueprint_change()` returns true.
         """
         if self._transition_orchestrator is not None:
             logger.warning(
@@ -675,40 +726,31 @@ class BradDaemon:
             )
             return True
 
-        current_blueprint = self._blueprint_mgr.get_blueprint()
-        diff = BlueprintDiff.of(current_blueprint, blueprint)
-        if diff is None:
-            logger.info("Planner selected an identical blueprint - skipping.")
-            return True
-
-        current_score = self._blueprint_mgr.get_active_score()
-        if current_score is None:
-            # Do not skip - we are currently missing the score of the active
-            # blueprint, so there is nothing to compare to.
-            return False
-
-        if diff.aurora_diff() is not None or diff.redshift_diff() is not None:
-            return False
-
-        current_dist = current_score.normalized_query_count_distribution()
-        next_dist = score.normalized_query_count_distribution()
-        abs_delta = np.abs(next_dist - current_dist).sum()
-
-        if abs_delta >= self._planner_config.query_dist_change_frac():
-            return False
-        else:
-            logger.info(
-                "Skipping blueprint because the query distribution change (%.4f) falls under the threshold (%.4f).",
-                abs_delta,
-                self._planner_config.query_dist_change_frac(),
-            )
-            return True
+        return is_minor_blueprint_change(
+            self._blueprint_mgr.get_blueprint(),
+            self._blueprint_mgr.get_active_score(),
+            blueprint,
+            score,
+            self._planner_config,
+        )
 
     async def _run_sync_periodically(self) -> None:
         while True:
             await asyncio.sleep(self._config.data_sync_period_seconds)
             logger.debug("Starting an auto data sync.")
-            await self._data_sync_executor.run_sync(self._blueprint_mgr.get_blueprint())
+            await self._run_data_sync()
+
+    async def _run_data_sync(self) -> bool:
+        ran_sync = await self._data_sync_executor.run_sync(
+            self._blueprint_mgr.get_blueprint()
+        )
+        synced_tables = self._data_sync_executor.last_synced_tables()
+        if ran_sync and self._vdbe_process is not None and len(synced_tables) > 0:
+            # The VDBE front end caches query results; they may now be stale.
+            await self._vdbe_process.channel.send(
+                TablesSynced(BradVdbeFrontEnd.NUMERIC_IDENTIFIER, synced_tables)
+            )
+        return ran_sync
 
     async def _run_internal_command_request_response(
         self, msg: InternalCommandRequest
@@ -716,25 +758,18 @@ class BradDaemon:
         try:
             results = await self._handle_internal_command(msg.request)
             response = InternalCommandResponse(msg.fe_index, results)
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(
-                None, self._front_ends[msg.fe_index].input_queue.put, response
-            )
+            await self._front_ends[msg.fe_index].channel.send(response)
         except Exception as ex:
             logger.exception(
                 "Unexpected exception when handling internal command: %s", msg.request
             )
-            await loop.run_in_executor(
-                None,
-                self._front_ends[msg.fe_index].input_queue.put,
-                InternalCommandResponse(msg.fe_index, [(str(ex),)]),
+            await self._front_ends[msg.fe_index].channel.send(
+                InternalCommandResponse(msg.fe_index, [(str(ex),)])
             )
 
     async def _handle_internal_command(self, command: str) -> RowList:
         if command == "BRAD_SYNC":
-            ran_sync = await self._data_sync_executor.run_sync(
-                self._blueprint_mgr.get_blueprint()
-            )
+            ran_sync = await self._run_data_sync()
             if ran_sync:
                 return [("Sync succeeded.",)]
             else:
@@ -992,22 +1027,26 @@ class BradDaemon:
                 "Notifying %d front ends about the new blueprint.",
                 len(self._front_ends),
             )
+            assert tm.next_blueprint is not None
+            delta = BlueprintDelta.of(tm.curr_blueprint, tm.next_blueprint)
             for fe in self._front_ends:
-                fe.input_queue.put(
+                await fe.channel.send(
                     NewBlueprint(
                         fe.fe_index,
                         tm.next_version,
                         self._blueprint_mgr.get_directory(),
+                        delta,
                     )
                 )
 
             total_wait = len(self._front_ends)
             if self._vdbe_process is not None:
-                self._vdbe_process.input_queue.put(
+                await self._vdbe_process.channel.send(
                     NewBlueprint(
                         BradVdbeFrontEnd.NUMERIC_IDENTIFIER,
                         tm.next_version,
                         self._blueprint_mgr.get_directory(),
+                        delta,
                     )
                 )
                 total_wait += 1
@@ -1135,13 +1174,15 @@ class _FrontEndProcess:
         self,
         fe_index: int,
         process: mp.Process,
-        input_queue: queue.Queue,
-        output_queue: queue.Queue,
+        channel: IpcChannel,
+        fe_channel: IpcChannel,
     ) -> None:
         self.fe_index = fe_index
         self.process = process
-        self.input_queue = input_queue
-        self.output_queue = output_queue
+        # The daemon's end of the IPC channel.
+        self.channel = channel
+        # The front end's end of the IPC channel (passed to the process).
+        self.fe_channel = fe_channel
         self.message_reader_task: Optional[asyncio.Task] = None
 
 
@@ -1153,12 +1194,10 @@ class _VdbeFrontEndProcess:
     def __init__(
         self,
         process: mp.Process,
-        input_queue: queue.Queue,
-        output_queue: queue.Queue,
+        channel: IpcChannel,
     ) -> None:
         self.process = process
-        self.input_queue = input_queue
-        self.output_queue = output_queue
+        self.channel = channel
         self.message_reader_task: Optional[asyncio.Task] = None
         self.mailbox: Mailbox[VirtualInfrastructure, Tuple] = Mailbox(
             do_send_msg=self._send_message
@@ -1167,5 +1206,4 @@ class _VdbeFrontEndProcess:
     async def _send_message(self, infra: VirtualInfrastructure) -> None:
         logger.debug("Sending reconcile VDBE IPC message")
         msg = ReconcileVirtualInfrastructure(BradVdbeFrontEnd.NUMERIC_IDENTIFIER, infra)
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.input_queue.put, msg)
+        await self.channel.send(msg)
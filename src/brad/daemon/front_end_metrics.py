@@ -4,7 +4,7 @@ import logging
 import pandas as pd
 import pytz
 import copy
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from ddsketch import DDSketch
 
@@ -13,6 +13,8 @@ from brad.config.file import ConfigFile
 from brad.config.metrics import FrontEndMetric
 from brad.daemon.messages import MetricsReport
 from brad.daemon.metrics_logger import MetricsLogger
+from brad.front_end.query_stages import QueryStage
+from brad.front_end.replica_balancer import ReplicaMetrics
 from brad.utils.streaming_metric import StreamingMetric, StreamingNumericMetric
 from brad.utils import log_verbose
 from brad.utils.time_periods import universal_now
@@ -54,6 +56,14 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
                 for _ in range(self._config.num_front_ends)
             ],
         }
+        # Time spent in each stage of the front end's query path.
+        self._stage_sketches: Dict[QueryStage, List[StreamingMetric[DDSketch]]] = {
+            stage: [
+                StreamingMetric[DDSketch](window_size=sm_window_size)
+                for _ in range(self._config.num_front_ends)
+            ]
+            for stage in QueryStage
+        }
         self._ordered_metrics: List[str] = [
             FrontEndMetric.TxnEndPerSecond.value,
             FrontEndMetric.QueryLatencySecondP50.value,
@@ -61,7 +71,16 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
             FrontEndMetric.QueryLatencySecondP90.value,
             FrontEndMetric.TxnLatencySecondP90.value,
         ]
+        for stage in QueryStage:
+            self._ordered_metrics.extend(
+                metric.value for metric in STAGE_METRICS[stage]
+            )
         self._values_df = pd.DataFrame(columns=self._ordered_metrics.copy())
+        # The most recent Aurora read replica load statistics reported by each
+        # front end.
+        self._replica_metrics: List[List[ReplicaMetrics]] = [
+            [] for _ in range(self._config.num_front_ends)
+        ]
         self._logger = MetricsLogger.create_from_config(
             self._config, "brad_metrics_front_end.log"
         )
@@ -109,55 +128,14 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
                     metric_key == _MetricKey.QueryLatencySecond
                     or metric_key == _MetricKey.TxnLatencySecond
                 ):
-                    merged = None
-                    for fidx, sketches in enumerate(fe_sketches):
-                        num_matching = 0
-                        min_ts = None
-                        max_ts = None
-
-                        for sketch, ts in sketches.window_iterator(
-                            window_start, window_end
-                        ):
-                            # These stats are for debug logging.
-                            num_matching += 1
-                            if min_ts is not None:
-                                min_ts = min(min_ts, ts)
-                            else:
-                                min_ts = ts
-                            if max_ts is not None:
-                                max_ts = max(max_ts, ts)
-                            else:
-                                max_ts = ts
-
-                            if merged is not None:
-                                merged.merge(sketch)
-                            else:
-                                # DDSketch.merge() is an inplace method. We want
-                                # to avoid modifying the stored sketches so we
-                                # make a copy.
-                                merged = copy.deepcopy(sketch)
-
-                        log_verbose(
-                            logger,
-                            "[%s] [%d] Matched %d sketches with range %s -- %s",
-                            metric_key,
-                            fidx,
-                            num_matching,
-                            min_ts,
-                            max_ts,
-                        )
-
+                    merged = self._merge_sketches_in_window(
+                        metric_key, fe_sketches, window_start, window_end
+                    )
                     if merged is None:
                         logger.warning(
                             "Missing latency sketch values for %s", metric_key
                         )
-                        p50_val = 0.0
-                        p90_val = 0.0
-                    else:
-                        p50_val_cand = merged.get_quantile_value(0.5)
-                        p90_val_cand = merged.get_quantile_value(0.9)
-                        p50_val = p50_val_cand if p50_val_cand is not None else 0.0
-                        p90_val = p90_val_cand if p90_val_cand is not None else 0.0
+                    p50_val, p90_val = _p50_p90(merged)
 
                     if metric_key == _MetricKey.QueryLatencySecond:
                         data_cols[FrontEndMetric.QueryLatencySecondP50.value].append(
@@ -176,6 +154,17 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
                 else:
                     logger.warning("Unhandled front end metric: %s", metric_key)
 
+            for stage, fe_sketches in self._stage_sketches.items():
+                # Stages can legitimately be empty (e.g., no queries ran), so we
+                # do not warn about missing values here.
+                merged = self._merge_sketches_in_window(
+                    stage, fe_sketches, window_start, window_end
+                )
+                p50_val, p90_val = _p50_p90(merged)
+                p50_metric, p90_metric = STAGE_METRICS[stage]
+                data_cols[p50_metric.value].append(p50_val)
+                data_cols[p90_metric.value].append(p90_val)
+
             timestamps.append(window_end)
 
         # Sanity checks.
@@ -185,6 +174,53 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
         self._values_df = self._get_updated_metrics(new_metrics)
         await super().fetch_latest()
 
+    def _merge_sketches_in_window(
+        self,
+        metric_key: Any,
+        fe_sketches: List[StreamingMetric[DDSketch]],
+        window_start: datetime,
+        window_end: datetime,
+    ) -> Optional[DDSketch]:
+        """
+        Merges the sketches reported by all front ends within the window.
+        Returns `None` if there are no such sketches.
+        """
+        merged = None
+        for fidx, sketches in enumerate(fe_sketches):
+            num_matching = 0
+            min_ts = None
+            max_ts = None
+
+            for sketch, ts in sketches.window_iterator(window_start, window_end):
+                # These stats are for debug logging.
+                num_matching += 1
+                if min_ts is not None:
+                    min_ts = min(min_ts, ts)
+                else:
+                    min_ts = ts
+                if max_ts is not None:
+                    max_ts = max(max_ts, ts)
+                else:
+                    max_ts = ts
+
+                if merged is not None:
+                    merged.merge(sketch)
+                else:
+                    # DDSketch.merge() is an inplace method. We want to avoid
+                    # modifying the stored sketches so we make a copy.
+                    merged = copy.deepcopy(sketch)
+
+            log_verbose(
+                logger,
+                "[%s] [%d] Matched %d sketches with range %s -- %s",
+                metric_key,
+                fidx,
+                num_matching,
+                min_ts,
+                max_ts,
+            )
+        return merged
+
     def _metrics_values(self) -> pd.DataFrame:
         return self._values_df
 
@@ -205,6 +241,10 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
         self._sketch_front_end_metrics[_MetricKey.TxnLatencySecond][
             fe_index
         ].add_sample(report.txn_latency_sketch(), now)
+        for stage, sketch in report.stage_latency_sketches():
+            self._stage_sketches[stage][fe_index].add_sample(sketch, now)
+
+        self._replica_metrics[fe_index] = report.replica_metrics
 
         log_verbose(
             logger,
@@ -213,9 +253,70 @@ class FrontEndMetrics(MetricsSourceWithForecasting):
             report.txn_completions_per_s,
             now,
         )
+        if len(report.replica_metrics) > 0:
+            log_verbose(
+                logger,
+                "Replica load reported by front end %d: %s",
+                report.fe_index,
+                report.replica_metrics,
+            )
+
+    def aurora_replica_load(self) -> Dict[int, int]:
+        """
+        Returns the number of outstanding read-only queries on each Aurora read
+        replica (keyed by replica index), summed across the front ends, as of
+        their latest metrics reports.
+        """
+        load: Dict[int, int] = {}
+        for fe_metrics in self._replica_metrics:
+            for replica in fe_metrics:
+                load[replica.replica_index] = (
+                    load.get(replica.replica_index, 0) + replica.outstanding
+                )
+        return load
 
 
 class _MetricKey(enum.Enum):
     TxnEndPerSecond = "txn_end_per_s"
     QueryLatencySecond = "query_latency_s"
     TxnLatencySecond = "txn_latency_s"
+
+
+# The (p50, p90) metrics reported for each query stage.
+STAGE_METRICS: Dict[QueryStage, Tuple[FrontEndMetric, FrontEndMetric]] = {
+    QueryStage.Parse: (
+        FrontEndMetric.StageParseSecondP50,
+        FrontEndMetric.StageParseSecondP90,
+    ),
+    QueryStage.Route: (
+        FrontEndMetric.StageRouteSecondP50,
+        FrontEndMetric.StageRouteSecondP90,
+    ),
+    QueryStage.Execute: (
+        FrontEndMetric.StageExecuteSecondP50,
+        FrontEndMetric.StageExecuteSecondP90,
+    ),
+    QueryStage.Fetch: (
+        FrontEndMetric.StageFetchSecondP50,
+        FrontEndMetric.StageFetchSecondP90,
+    ),
+    QueryStage.Log: (
+        FrontEndMetric.StageLogSecondP50,
+        FrontEndMetric.StageLogSecondP90,
+    ),
+    QueryStage.Serialize: (
+        FrontEndMetric.StageSerializeSecondP50,
+        FrontEndMetric.StageSerializeSecondP90,
+    ),
+}
+
+
+def _p50_p90(sketch: Optional[DDSketch]) -> Tuple[float, float]:
+    if sketch is None:
+        return 0.0, 0.0
+    p50_val = sketch.get_quantile_value(0.5)
+    p90_val = sketch.get_quantile_value(0.9)
+    return (
+        p50_val if p50_val is not None else 0.0,
+        p90_val if p90_val is not None else 0.0,
+    )
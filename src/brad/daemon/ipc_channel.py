@@ -0,0 +1,203 @@
+import asyncio
+import collections
+import logging
+import pickle
+import socket
+import struct
+from typing import Deque, List, Optional, Tuple
+
+from brad.daemon.messages import IpcMessage
+
+logger = logging.getLogger(__name__)
+
+# Each frame is prefixed with its payload length (unsigned 32-bit, network
+# byte order).
+_FRAME_HEADER = struct.Struct("!I")
+_MAX_FRAME_BYTES = (1 << 32) - 1
+
+
+class IpcChannelClosed(Exception):
+    """
+    Raised when the peer closes its end of an `IpcChannel`.
+    """
+
+
+class IpcChannel:
+    """
+    One end of a bidirectional, asyncio-native message channel between the
+    daemon and a front end process.
+
+    The channel runs over a Unix domain socket pair that is registered with the
+    event loop, so reading and writing messages does not tie up executor
+    threads. Outgoing messages are buffered and batched: a single writer task
+    drains all pending messages into one length-prefixed frame, which amortizes
+    the framing and syscall overhead when many messages are sent at once.
+
+    Backpressure: `send()` waits when more than `max_pending_messages` are
+    buffered, whereas `send_nowait()` drops the message instead (use it for
+    messages that are periodically re-sent, like metrics reports). The writer
+    task also waits for the socket's write buffer to drain before writing the
+    next frame.
+
+    Create both ends with `IpcChannel.create_pair()` before forking the front
+    end process. Each end must be opened (`open()`) inside the event loop of
+    the process that uses it.
+    """
+
+    @classmethod
+    def create_pair(
+        cls, max_pending_messages: int = 1024, max_batch_size: int = 128
+    ) -> Tuple["IpcChannel", "IpcChannel"]:
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        return (
+            cls(left, max_pending_messages, max_batch_size),
+            cls(right, max_pending_messages, max_batch_size),
+        )
+
+    def __init__(
+        self, sock: socket.socket, max_pending_messages: int, max_batch_size: int
+    ) -> None:
+        self._sock = sock
+        self._max_pending_messages = max_pending_messages
+        self._max_batch_size = max_batch_size
+
+        # These are set up in `open()`.
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._outgoing: Optional[asyncio.Queue[IpcMessage]] = None
+        self._writer_task: Optional[asyncio.Task[None]] = None
+
+        # Messages received in a batch that have not been returned by `recv()`
+        # yet.
+        self._inbox: Deque[IpcMessage] = collections.deque()
+
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def open(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(sock=self._sock)
+        self._outgoing = asyncio.Queue(maxsize=self._max_pending_messages)
+        self._writer_task = asyncio.create_task(self._write_batches())
+        self._writer_task.add_done_callback(_log_writer_exit)
+
+    def close_unopened(self) -> None:
+        """
+        Used by the daemon to release its copy of the front end's end of the
+        channel after the front end process has started.
+        """
+        assert self._writer is None
+        self._sock.close()
+
+    async def close(self, flush_timeout_s: float = 5.0) -> None:
+        """
+        Flushes any pending outgoing messages (waiting up to `flush_timeout_s`)
+        and then closes the channel.
+        """
+        if self._writer is None:
+            self._sock.close()
+            return
+
+        assert self._outgoing is not None
+        try:
+            if self._writer_task is not None and not self._writer_task.done():
+                await asyncio.wait_for(self._outgoing.join(), timeout=flush_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Timed out flushing %d IPC message(s) before closing.",
+                self._outgoing.qsize(),
+            )
+
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, BrokenPipeError):
+            pass
+        self._writer = None
+        self._reader = None
+
+    async def send(self, message: IpcMessage) -> None:
+        """
+        Queues `message` to be sent. If the outgoing buffer is full, this waits
+        until there is space.
+        """
+        assert self._outgoing is not None, "Must call open() first."
+        await self._outgoing.put(message)
+
+    def send_nowait(self, message: IpcMessage) -> bool:
+        """
+        Queues `message` to be sent without waiting. Returns `False` (and drops
+        the message) if the outgoing buffer is full.
+        """
+        assert self._outgoing is not None, "Must call open() first."
+        try:
+            self._outgoing.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def recv(self) -> IpcMessage:
+        """
+        Waits for and returns the next message. Raises `IpcChannelClosed` if
+        the peer closed the channel.
+        """
+        if len(self._inbox) == 0:
+            self._inbox.extend(await self._read_frame())
+        return self._inbox.popleft()
+
+    async def _read_frame(self) -> List[IpcMessage]:
+        assert self._reader is not None, "Must call open() first."
+        try:
+            header = await self._reader.readexactly(_FRAME_HEADER.size)
+            (length,) = _FRAME_HEADER.unpack(header)
+            payload = await self._reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError) as ex:
+            raise IpcChannelClosed() from ex
+        return pickle.loads(payload)
+
+    async def _write_batches(self) -> None:
+        assert self._outgoing is not None
+        assert self._writer is not None
+        while True:
+            batch = [await self._outgoing.get()]
+            while len(batch) < self._max_batch_size and not self._outgoing.empty():
+                batch.append(self._outgoing.get_nowait())
+
+            try:
+                payload = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+                if len(payload) > _MAX_FRAME_BYTES:
+                    logger.error(
+                        "Dropping an IPC batch of %d message(s) because it is too large (%d bytes).",
+                        len(batch),
+                        len(payload),
+                    )
+                    continue
+                self._writer.writelines([_FRAME_HEADER.pack(len(payload)), payload])
+                await self._writer.drain()
+            except (ConnectionError, BrokenPipeError):
+                logger.warning(
+                    "IPC peer disconnected. Dropped %d message(s).", len(batch)
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                # E.g., a message that cannot be pickled. The writer must keep
+                # running, otherwise nothing drains the outgoing buffer.
+                logger.exception(
+                    "Failed to send an IPC batch. Dropped %d message(s).", len(batch)
+                )
+            finally:
+                for _ in batch:
+                    self._outgoing.task_done()
+
+
+def _log_writer_exit(task: "asyncio.Task[None]") -> None:
+    # The writer task only stops when the channel is closed (it is cancelled).
+    if task.cancelled():
+        return
+    logger.error(
+        "The IPC writer task exited unexpectedly. Outgoing messages will not be sent.",
+        exc_info=task.exception(),
+    )
@@ -1,7 +1,10 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from ddsketch import DDSketch
 from ddsketch.pb.proto import DDSketchProto, pb as ddspb
 
+from brad.blueprint.diff.delta import BlueprintDelta
+from brad.front_end.query_stages import QueryStage
+from brad.front_end.replica_balancer import ReplicaMetrics
 from brad.provisioning.directory import Directory
 from brad.row_list import RowList
 from brad.vdbe.models import VirtualInfrastructure
@@ -21,15 +24,33 @@ class IpcMessage:
 class NewBlueprint(IpcMessage):
     """
     Sent from the daemon to the front end indicating that there is a new
-    blueprint.
+    blueprint. If `delta` is set, the front end can use it to derive the new
+    blueprint from its current one instead of reloading it.
     """
 
     def __init__(
-        self, fe_index: int, version: int, updated_directory: Directory
+        self,
+        fe_index: int,
+        version: int,
+        updated_directory: Directory,
+        delta: Optional[BlueprintDelta] = None,
     ) -> None:
         super().__init__(fe_index)
         self.version = version
         self.updated_directory = updated_directory
+        self.delta = delta
+
+
+class DirectoryUpdated(IpcMessage):
+    """
+    Sent from the daemon to the front end when the daemon's directory changes
+    outside of a blueprint transition (e.g., after the daemon refreshes a
+    directory that it loaded from a saved snapshot).
+    """
+
+    def __init__(self, fe_index: int, updated_directory: Directory) -> None:
+        super().__init__(fe_index)
+        self.updated_directory = updated_directory
 
 
 class NewBlueprintAck(IpcMessage):
@@ -55,7 +76,15 @@ class MetricsReport(IpcMessage):
         txn_completions_per_s: float,
         txn_latency_sketch: DDSketch,
         query_latency_sketch: DDSketch,
+        replica_metrics: Optional[List[ReplicaMetrics]] = None,
+        stage_latency_sketches: Optional[List[Tuple[QueryStage, DDSketch]]] = None,
     ) -> "MetricsReport":
+        serialized_stage_sketches = [
+            (stage.value, DDSketchProto.to_proto(sketch).SerializeToString())
+            for stage, sketch in (
+                stage_latency_sketches if stage_latency_sketches is not None else []
+            )
+        ]
         return cls(
             fe_index,
             txn_completions_per_s,
@@ -65,6 +94,8 @@ class MetricsReport(IpcMessage):
             serialized_query_latency_sketch=DDSketchProto.to_proto(
                 query_latency_sketch
             ).SerializeToString(),
+            replica_metrics=replica_metrics,
+            serialized_stage_latency_sketches=serialized_stage_sketches,
         )
 
     def __init__(
@@ -73,11 +104,23 @@ class MetricsReport(IpcMessage):
         txn_completions_per_s: float,
         serialized_txn_latency_sketch: bytes,
         serialized_query_latency_sketch: bytes,
+        replica_metrics: Optional[List[ReplicaMetrics]] = None,
+        serialized_stage_latency_sketches: Optional[List[Tuple[str, bytes]]] = None,
     ) -> None:
         super().__init__(fe_index)
         self.txn_completions_per_s = txn_completions_per_s
         self.serialized_txn_latency_sketch = serialized_txn_latency_sketch
         self.serialized_query_latency_sketch = serialized_query_latency_sketch
+        # Per-replica load statistics from the front end's replica load
+        # balancer (empty if there are no Aurora read replicas).
+        self.replica_metrics = replica_metrics if replica_metrics is not None else []
+        # Time spent in each stage of the front end's query path, keyed by
+        # `QueryStage` value.
+        self.serialized_stage_latency_sketches = (
+            serialized_stage_latency_sketches
+            if serialized_stage_latency_sketches is not None
+            else []
+        )
 
     def txn_latency_sketch(self) -> DDSketch:
         pb_sketch = ddspb.DDSketch()
@@ -89,6 +132,16 @@ class MetricsReport(IpcMessage):
         pb_sketch.ParseFromString(self.serialized_query_latency_sketch)
         return DDSketchProto.from_proto(pb_sketch)
 
+    def stage_latency_sketches(self) -> List[Tuple[QueryStage, DDSketch]]:
+        results = []
+        for stage_value, serialized_sketch in self.serialized_stage_latency_sketches:
+            pb_sketch = ddspb.DDSketch()
+            pb_sketch.ParseFromString(serialized_sketch)
+            results.append(
+                (QueryStage(stage_value), DDSketchProto.from_proto(pb_sketch))
+            )
+        return results
+
 
 class VdbeMetricsReport(IpcMessage):
     """
@@ -100,24 +153,50 @@ class VdbeMetricsReport(IpcMessage):
         cls,
         fe_index: int,
         latency_sketches: List[Tuple[int, DDSketch]],
+        queue_time_sketches: Optional[List[Tuple[int, DDSketch]]] = None,
     ) -> "VdbeMetricsReport":
         serialized_sketches = [
             (vdbe_id, DDSketchProto.to_proto(sketch).SerializeToString())
             for vdbe_id, sketch in latency_sketches
         ]
-        return cls(fe_index, latency_sketches=serialized_sketches)
+        serialized_queue_sketches = [
+            (vdbe_id, DDSketchProto.to_proto(sketch).SerializeToString())
+            for vdbe_id, sketch in (
+                queue_time_sketches if queue_time_sketches is not None else []
+            )
+        ]
+        return cls(
+            fe_index,
+            latency_sketches=serialized_sketches,
+            queue_time_sketches=serialized_queue_sketches,
+        )
 
     def __init__(
         self,
         fe_index: int,
         latency_sketches: List[Tuple[int, bytes]],
+        queue_time_sketches: Optional[List[Tuple[int, bytes]]] = None,
     ) -> None:
         super().__init__(fe_index)
         self.serialized_latency_sketches = latency_sketches
+        # Time spent waiting for admission, per VDBE (empty if admission
+        # control is disabled).
+        self.serialized_queue_time_sketches = (
+            queue_time_sketches if queue_time_sketches is not None else []
+        )
 
     def query_latency_sketches(self) -> List[Tuple[int, DDSketch]]:
+        return self._deserialize(self.serialized_latency_sketches)
+
+    def queue_time_sketches(self) -> List[Tuple[int, DDSketch]]:
+        return self._deserialize(self.serialized_queue_time_sketches)
+
+    @staticmethod
+    def _deserialize(
+        serialized_sketches: List[Tuple[int, bytes]],
+    ) -> List[Tuple[int, DDSketch]]:
         results = []
-        for vdbe_id, serialized_sketch in self.serialized_latency_sketches:
+        for vdbe_id, serialized_sketch in serialized_sketches:
             pb_sketch = ddspb.DDSketch()
             pb_sketch.ParseFromString(serialized_sketch)
             results.append((vdbe_id, DDSketchProto.from_proto(pb_sketch)))
@@ -165,14 +244,18 @@ class ReconcileVirtualInfrastructureAck(IpcMessage):
         self.num_removed = num_removed
 
 
-class ShutdownFrontEnd(IpcMessage):
+class TablesSynced(IpcMessage):
     """
-    Sent from the daemon to the front end indicating that it should shut down.
+    Sent from the daemon to the VDBE front end after data sync applies changes
+    to `table_names`. Used to invalidate cached query results.
     """
 
+    def __init__(self, fe_index: int, table_names: List[str]) -> None:
+        super().__init__(fe_index)
+        self.table_names = table_names
 
-class Sentinel(IpcMessage):
+
+class ShutdownFrontEnd(IpcMessage):
     """
-    Used when shutting down the server to unblock threads waiting for a message
-    from the daemon.
+    Sent from the daemon to the front end indicating that it should shut down.
     """
@@ -7,6 +7,11 @@ from brad.forecasting import Forecaster
 from brad.forecasting.constant_forecaster import ConstantForecaster
 from brad.forecasting.moving_average_forecaster import MovingAverageForecaster
 from brad.forecasting.linear_forecaster import LinearForecaster
+from brad.forecasting.online_moving_average_forecaster import (
+    OnlineMovingAverageForecaster,
+)
+from brad.forecasting.online_linear_forecaster import OnlineLinearForecaster
+from brad.forecasting.seasonal_forecaster import SeasonalForecaster
 
 
 class MetricsSourceWithForecasting:
@@ -20,11 +25,18 @@ class MetricsSourceWithForecasting:
         epoch_length: timedelta,
         forecasting_method: str,
         forecasting_window_size: int,
+        forecaster: Optional[Forecaster] = None,
     ) -> None:
         self._epoch_length = epoch_length
+        self._forecasting_method = forecasting_method
+        self._forecasting_window_size = forecasting_window_size
         values = self._metrics_values()
         self._forecaster: Forecaster
-        if forecasting_method == "constant":
+        if forecaster is not None:
+            # Used by snapshots, which share the state of an existing
+            # forecaster.
+            self._forecaster = forecaster
+        elif forecasting_method == "constant":
             self._forecaster = ConstantForecaster(values, self._epoch_length)
         elif forecasting_method == "moving_average":
             self._forecaster = MovingAverageForecaster(
@@ -34,6 +46,16 @@ class MetricsSourceWithForecasting:
             self._forecaster = LinearForecaster(
                 values, self._epoch_length, forecasting_window_size
             )
+        elif forecasting_method == "online_moving_average":
+            self._forecaster = OnlineMovingAverageForecaster(
+                values, self._epoch_length, forecasting_window_size
+            )
+        elif forecasting_method == "online_linear":
+            self._forecaster = OnlineLinearForecaster(
+                values, self._epoch_length, forecasting_window_size
+            )
+        elif forecasting_method == "seasonal":
+            self._forecaster = SeasonalForecaster(values, self._epoch_length)
 
     async def fetch_latest(self) -> None:
         """
@@ -56,6 +78,24 @@ class MetricsSourceWithForecasting:
         """
         return 0
 
+    def snapshot(self, num_epochs: int) -> "MetricsSourceWithForecasting":
+        """
+        Returns a read-only copy of this source's `num_epochs` most recent
+        metric values (or more, if the forecaster needs a longer window). The
+        copy is not affected by later fetches and can be read (and forecasted)
+        without coordinating with this source.
+        """
+        values = self._metrics_values()
+        values = values.tail(max(num_epochs, self._forecasting_window_size, 1)).copy()
+        return _MetricsSnapshot(
+            values,
+            self._epoch_length,
+            self._forecasting_method,
+            self._forecasting_window_size,
+            self._forecaster.snapshot(values),
+            self.real_time_delay(),
+        )
+
     def _metrics_values(self) -> pd.DataFrame:
         raise NotImplementedError
 
@@ -113,14 +153,11 @@ class MetricsSourceWithForecasting:
         timestamps = [
             values.index[-1] + i * self._epoch_length for i in range(1, k + 1)
         ]
-        columns = metric_ids if metric_ids else values.columns
-        df = pd.DataFrame(index=timestamps, columns=columns)
-
-        # Fill in the values
-        for col in columns:
-            vals = self._forecaster.num_points(col, k)
-            df[col] = vals
+        columns = metric_ids if metric_ids else list(values.columns)
 
+        # Forecast all metrics in one (vectorized) call.
+        df = self._forecaster.num_points_all(k)[columns]
+        df.index = pd.Index(timestamps)
         return df
 
     # `end_ts` is inclusive
@@ -178,3 +215,32 @@ class MetricsSourceWithForecasting:
         return pd.concat(
             [values, new_metrics.loc[new_metrics.index > values.index[-1]]]
         )
+
+
+class _MetricsSnapshot(MetricsSourceWithForecasting):
+    def __init__(
+        self,
+        values: pd.DataFrame,
+        epoch_length: timedelta,
+        forecasting_method: str,
+        forecasting_window_size: int,
+        forecaster: Forecaster,
+        real_time_delay: int,
+    ) -> None:
+        self._values = values
+        self._real_time_delay = real_time_delay
+        super().__init__(
+            epoch_length, forecasting_method, forecasting_window_size, forecaster
+        )
+
+    async def fetch_latest(self) -> None:
+        raise RuntimeError("Metrics snapshots cannot be refreshed.")
+
+    def real_time_delay(self) -> int:
+        return self._real_time_delay
+
+    def _metrics_values(self) -> pd.DataFrame:
+        return self._values
+
+    def _metrics_logger(self) -> Optional[MetricsLogger]:
+        return None
@@ -20,7 +20,9 @@ class Monitor:
         self,
         config: ConfigFile,
         blueprint_mgr: BlueprintManager,
-        forecasting_method: str = "constant",  # {constant, moving_average, linear}
+        # {constant, moving_average, linear, online_moving_average, online_linear,
+        #  seasonal}
+        forecasting_method: str = "constant",
         forecasting_window_size: int = 5,  # (Up to) how many past samples to base the forecast on
         create_vdbe_metrics: bool = False,
     ) -> None:
@@ -44,12 +46,21 @@ class Monitor:
         else:
             self._vdbe_metrics = None
 
+        # A copy of the metrics as of the most recent fetch (taken on demand)
+        # and the number of epochs it covers.
+        self._snapshot: Optional[MonitorSnapshot] = None
+        self._snapshot_epochs = 0
+        # Held while the metrics sources are being updated so that snapshots
+        # are not taken in the middle of a fetch.
+        self._fetch_lock = asyncio.Lock()
+
     def set_up_metrics_sources(self) -> None:
         """
         Must be called to initialize the `Monitor`. Run after loading the
         blueprint into the blueprint manager.
         """
         # TODO: No need to create metrics sources if the engine is paused.
+        self._snapshot = None
         blueprint = self._blueprint_mgr.get_blueprint()
 
         aurora_prov = blueprint.aurora_provisioning()
@@ -84,6 +95,7 @@ class Monitor:
         """
         Updates the metrics sources when the blueprint changes.
         """
+        self._snapshot = None
         blueprint = self._blueprint_mgr.get_blueprint()
         num_replicas = blueprint.aurora_provisioning().num_nodes() - 1
 
@@ -140,7 +152,9 @@ class Monitor:
             if source is None:
                 continue
             futures.append(source.fetch_latest())
-        await asyncio.gather(*futures)
+        async with self._fetch_lock:
+            await asyncio.gather(*futures)
+            self._snapshot = None
 
     async def run_forever(self) -> None:
         """
@@ -194,6 +208,20 @@ class Monitor:
 
     # The methods below are used to retrieve metrics.
 
+    async def snapshot(self, num_epochs: int) -> "MonitorSnapshot":
+        """
+        Returns a read-only copy of (at least) the `num_epochs` most recent
+        epochs of metrics as of the most recent fetch. If a fetch is in
+        progress, this method waits for it to complete so that readers see a
+        consistent view of the metrics. The same snapshot is returned until
+        the next fetch (unless more epochs are requested).
+        """
+        async with self._fetch_lock:
+            if self._snapshot is None or self._snapshot_epochs < num_epochs:
+                self._snapshot = self._take_snapshot(num_epochs)
+                self._snapshot_epochs = num_epochs
+            return self._snapshot
+
     def aurora_writer_metrics(self) -> MetricsSourceWithForecasting:
         assert self._aurora_writer_metrics is not None
         return self._aurora_writer_metrics
@@ -211,3 +239,59 @@ class Monitor:
 
     def vdbe_metrics(self) -> Optional[MetricsSourceWithForecasting]:
         return self._vdbe_metrics
+
+    def _take_snapshot(self, num_epochs: int) -> "MonitorSnapshot":
+        return MonitorSnapshot(
+            (
+                self._aurora_writer_metrics.snapshot(num_epochs)
+                if self._aurora_writer_metrics is not None
+                else None
+            ),
+            tuple(
+                source.snapshot(num_epochs) for source in self._aurora_reader_metrics
+            ),
+            (
+                self._redshift_metrics.snapshot(num_epochs)
+                if self._redshift_metrics is not None
+                else None
+            ),
+            self._front_end_metrics.snapshot(num_epochs),
+        )
+
+
+class MonitorSnapshot:
+    """
+    A point-in-time, read-only copy of the `Monitor`'s metrics. It provides the
+    same accessors as the `Monitor`.
+    """
+
+    @classmethod
+    def empty(cls) -> "MonitorSnapshot":
+        return cls(None, tuple(), None, None)
+
+    def __init__(
+        self,
+        aurora_writer_metrics: Optional[MetricsSourceWithForecasting],
+        aurora_reader_metrics: Tuple[MetricsSourceWithForecasting, ...],
+        redshift_metrics: Optional[MetricsSourceWithForecasting],
+        front_end_metrics: Optional[MetricsSourceWithForecasting],
+    ) -> None:
+        self._aurora_writer_metrics = aurora_writer_metrics
+        self._aurora_reader_metrics = aurora_reader_metrics
+        self._redshift_metrics = redshift_metrics
+        self._front_end_metrics = front_end_metrics
+
+    def aurora_writer_metrics(self) -> MetricsSourceWithForecasting:
+        assert self._aurora_writer_metrics is not None
+        return self._aurora_writer_metrics
+
+    def aurora_reader_metrics(self) -> Tuple[MetricsSourceWithForecasting, ...]:
+        return self._aurora_reader_metrics
+
+    def redshift_metrics(self) -> MetricsSourceWithForecasting:
+        assert self._redshift_metrics is not None
+        return self._redshift_metrics
+
+    def front_end_metrics(self) -> MetricsSourceWithForecasting:
+        assert self._front_end_metrics is not None
+        return self._front_end_metrics
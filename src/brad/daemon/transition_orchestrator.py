@@ -30,6 +30,7 @@ from brad.data_sync.operators.unload_to_s3 import UnloadToS3
 from brad.front_end.engine_connections import EngineConnections
 from brad.provisioning.rds import RdsProvisioningManager
 from brad.provisioning.redshift import RedshiftProvisioningManager
+from brad.provisioning.waiter import ProvisioningWaiter
 from brad.utils.assertions import nonsilent_assert
 
 logger = logging.getLogger(__name__)
@@ -44,8 +45,11 @@ class TransitionOrchestrator:
     ) -> None:
         self._config = config
         self._blueprint_mgr = blueprint_mgr
-        self._rds = RdsProvisioningManager(config)
-        self._redshift = RedshiftProvisioningManager(config)
+        # The waiter keeps the observed durations of provisioning actions
+        # across transitions.
+        waiter = ProvisioningWaiter()
+        self._rds = RdsProvisioningManager(config, waiter)
+        self._redshift = RedshiftProvisioningManager(config, waiter)
         self._waiting_for_front_ends = 0
         self._data_sync_executor = DataSyncExecutor(self._config, self._blueprint_mgr)
         self._cxns: Optional[EngineConnections] = None
@@ -338,26 +342,29 @@ class TransitionOrchestrator:
         new_replica_count = max(new.num_nodes() - 1, 0)
         old_replica_count = max(old.num_nodes() - 1, 0)
         if new_replica_count > 0 and new_replica_count > old_replica_count:
-            next_index = old_replica_count
-            while next_index < new_replica_count:
+            new_replica_ids = []
+            for next_index in range(old_replica_count, new_replica_count):
                 new_replica_id = _AURORA_REPLICA_FORMAT.format(
                     cluster_id=self._config.aurora_cluster_id,
                     version=str(next_version).zfill(5),
                     index=str(next_index).zfill(2),
                 )
                 logger.debug("Creating replica %s", new_replica_id)
-                # Ideally we wait for the replicas to finish creation in
-                # parallel. Because of how we make the boto3 client async,
-                # there's a possibility of having multiple API calls in flight
-                # at the same time, which boto3 does not support. To be safe, we
-                # just run these replica creations sequentially.
                 await self._rds.create_replica(
                     self._config.aurora_cluster_id,
                     new_replica_id,
                     new,
-                    wait_until_available=True,
+                    wait_until_available=False,
                 )
-                next_index += 1
+                new_replica_ids.append(new_replica_id)
+            # The replicas are created in parallel. The provisioning manager
+            # runs the underlying API calls one at a time.
+            await asyncio.gather(
+                *[
+                    self._rds.wait_until_instance_is_available(replica_id)
+                    for replica_id in new_replica_ids
+                ]
+            )
             await self._blueprint_mgr.refresh_directory()
 
         if old.instance_type() != new.instance_type():
@@ -120,6 +120,14 @@ class VdbeMetrics(MetricsSourceWithForecasting):
         for vdbe_id, sketch in report.query_latency_sketches():
             p90 = sketch.get_quantile_value(0.9)
             logger.debug("Has sketch for VDBE %d. p90: %f", vdbe_id, p90)
+        for vdbe_id, sketch in report.queue_time_sketches():
+            p90 = sketch.get_quantile_value(0.9)
+            logger.debug(
+                "Has queue time sketch for VDBE %d. p90: %f (count: %d)",
+                vdbe_id,
+                p90,
+                sketch.count,
+            )
 
         for vdbe_id, sketch in report.query_latency_sketches():
             if vdbe_id not in self._sketch_front_end_metrics:
@@ -1,12 +1,15 @@
-from collections import namedtuple
 from typing import Any, Dict, List, Tuple, Optional
 
+from .operator_table import (
+    BaseCardinality,
+    OperatorTable,
+    explain_json_from_rows,
+    parse_explain_json,
+    parse_explain_text,
+)
 from .parse_plan import parse_plans
 
 ParsedPlan = Dict[str, Any]
-BaseCardinality = namedtuple(
-    "BaseCardinality", ["table_name", "cardinality", "width", "access_op_name"]
-)
 
 
 def parse_explain_verbose(lines: List[str] | List[Tuple[Any, ...]]) -> ParsedPlan:
@@ -0,0 +1,329 @@
+import array
+import json
+import math
+import re
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from brad.data_stats.plan_parsing.plan_operator import (
+    actual_regex,
+    estimated_regex,
+    workers_planned_regex,
+)
+
+BaseCardinality = namedtuple(
+    "BaseCardinality", ["table_name", "cardinality", "width", "access_op_name"]
+)
+
+# Plan properties that hold selection predicates. Join conditions are not
+# included (this matches `parse_explain_verbose()`'s defaults).
+_FILTER_KEYS = ["Filter", "Index Cond", "Recheck Cond"]
+_FILTER_PREFIXES = [key + ": " for key in _FILTER_KEYS]
+
+_op_name_regex = re.compile(r'[^"(]+')
+_literal_regex = re.compile(r"'(?:[^']|'')*'")
+_type_cast_regex = re.compile(
+    r"::(?:timestamp(?: with(?:out)? time zone)?|double precision|"
+    r"character varying|\"?\w+\"?)(?:\[\])?"
+)
+_identifier_regex = re.compile(r"[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*(?!\w|\s*\()")
+_predicate_keywords = {
+    "and",
+    "or",
+    "not",
+    "any",
+    "all",
+    "null",
+    "is",
+    "true",
+    "false",
+    "in",
+    "like",
+    "between",
+    "case",
+    "when",
+    "then",
+    "else",
+    "end",
+    "distinct",
+    "from",
+}
+
+
+class OperatorTable:
+    """
+    A flat, array-backed representation of a query plan. Operator `i` is
+    described by the `i`-th entry of each column. Operators are stored in
+    pre-order, so the root is operator 0 and `parents[i] < i` (the root's parent
+    is -1).
+
+    Use `parse_explain_json()` to build a table from `EXPLAIN (FORMAT JSON)`
+    and `parse_explain_text()` for engines that only produce text plans (e.g.,
+    Redshift). Unlike `parse_explain_verbose()`, this representation does not
+    resolve output columns or build predicate trees; it holds what the
+    estimators and cost models need per operator.
+    """
+
+    def __init__(self) -> None:
+        self.op_names: List[str] = []
+        # The accessed table (or index, for bitmap index scans), if any.
+        self.tables: List[Optional[str]] = []
+        self.parents = array.array("i")
+        self.est_startup_costs = array.array("d")
+        self.est_costs = array.array("d")
+        self.est_cards = array.array("q")
+        self.est_widths = array.array("q")
+        # NaN when the plan was not produced by EXPLAIN ANALYZE.
+        self.act_cards = array.array("d")
+        self.workers_planned = array.array("q")
+        # Columns referenced by each operator's predicates, stored contiguously:
+        # operator `i` references
+        # `filter_columns[filter_offsets[i]:filter_offsets[i + 1]]`.
+        self.filter_offsets = array.array("i", [0])
+        self.filter_columns: List[str] = []
+
+    def num_operators(self) -> int:
+        return len(self.op_names)
+
+    def children(self, op_index: int) -> List[int]:
+        return [
+            child
+            for child in range(op_index + 1, len(self.parents))
+            if self.parents[child] == op_index
+        ]
+
+    def filter_columns_of(self, op_index: int) -> List[str]:
+        return self.filter_columns[
+            self.filter_offsets[op_index] : self.filter_offsets[op_index + 1]
+        ]
+
+    def base_cardinalities(self) -> List[BaseCardinality]:
+        """
+        Extracts the number of rows accessed from each base table. This follows
+        `extract_base_cardinalities()`: a bitmap scan executed using an index is
+        reported at the operator above the index scan.
+        """
+        num_ops = len(self.op_names)
+        num_children = [0] * num_ops
+        for parent in self.parents:
+            if parent >= 0:
+                num_children[parent] += 1
+
+        base_cardinalities = []
+        child_is_index_scan = [False] * num_ops
+        for op_index in range(num_ops):
+            table = self.tables[op_index]
+            if num_children[op_index] != 0 or table is None:
+                continue
+            parent = self.parents[op_index]
+            if table.endswith("_index") and parent >= 0:
+                # A straight scan of the index. We do not get table cardinality
+                # information from this operator.
+                child_is_index_scan[parent] = True
+                continue
+            base_cardinalities.append(self._base_cardinality(op_index))
+
+        for op_index in range(num_ops):
+            if (
+                child_is_index_scan[op_index]
+                and self.tables[op_index] is not None
+                and "Scan" in self.op_names[op_index]
+            ):
+                base_cardinalities.append(self._base_cardinality(op_index))
+        return base_cardinalities
+
+    def _base_cardinality(self, op_index: int) -> BaseCardinality:
+        return BaseCardinality(
+            self.tables[op_index],
+            self.est_cards[op_index],
+            self.est_widths[op_index],
+            self.op_names[op_index],
+        )
+
+    def append_operator(
+        self,
+        op_name: str,
+        table: Optional[str],
+        parent: int,
+        est_startup_cost: float,
+        est_cost: float,
+        est_card: int,
+        est_width: int,
+        act_card: float = math.nan,
+        workers_planned: int = 0,
+    ) -> int:
+        self.op_names.append(op_name)
+        self.tables.append(table)
+        self.parents.append(parent)
+        self.est_startup_costs.append(est_startup_cost)
+        self.est_costs.append(est_cost)
+        self.est_cards.append(est_card)
+        self.est_widths.append(est_width)
+        self.act_cards.append(act_card)
+        self.workers_planned.append(workers_planned)
+        self.filter_offsets.append(len(self.filter_columns))
+        return len(self.op_names) - 1
+
+    def add_filter_columns(self, predicate: str) -> None:
+        # Only the most recently appended operator can receive filter columns.
+        start = self.filter_offsets[-2]
+        for column in _predicate_columns(predicate):
+            if column not in self.filter_columns[start:]:
+                self.filter_columns.append(column)
+        self.filter_offsets[-1] = len(self.filter_columns)
+
+
+def explain_json_from_rows(values: List[Any]) -> str | List[Any] | Dict[str, Any]:
+    """
+    Returns the plan in the `QUERY PLAN` column values returned by
+    `EXPLAIN (FORMAT JSON)`, for use with `parse_explain_json()`. ODBC drivers
+    return the JSON text (possibly split across rows) while psycopg returns the
+    decoded JSON value.
+    """
+    if len(values) > 0 and not isinstance(values[0], (str, bytes)):
+        return values[0]
+    return "".join(
+        value.decode("UTF-8") if isinstance(value, bytes) else value for value in values
+    )
+
+
+def parse_explain_json(plan: str | bytes | List[Any] | Dict[str, Any]) -> OperatorTable:
+    """
+    Parses the output of PostgreSQL's `EXPLAIN (FORMAT JSON)` (optionally with
+    `VERBOSE` and/or `ANALYZE`). `plan` can be the JSON text returned by the
+    query or the decoded JSON value.
+
+    Operator names are PostgreSQL's node types, prefixed with "Parallel" for
+    parallel-aware operators (e.g., "Parallel Seq Scan").
+    """
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    if isinstance(plan, list):
+        # PostgreSQL returns a list with one entry per statement.
+        plan = plan[0]
+    assert isinstance(plan, dict)
+    root = plan.get("Plan", plan)
+
+    table = OperatorTable()
+    stack: List[Tuple[Dict[str, Any], int]] = [(root, -1)]
+    while len(stack) > 0:
+        node, parent = stack.pop()
+        op_name = node["Node Type"]
+        if node.get("Parallel Aware", False):
+            op_name = "Parallel " + op_name
+        relation = node.get("Relation Name", node.get("Index Name"))
+        op_index = table.append_operator(
+            op_name,
+            _normalize_table_name(relation) if relation is not None else None,
+            parent,
+            float(node["Startup Cost"]),
+            float(node["Total Cost"]),
+            int(node["Plan Rows"]),
+            int(node["Plan Width"]),
+            act_card=float(node.get("Actual Rows", math.nan)),
+            workers_planned=int(node.get("Workers Planned", 0)),
+        )
+        for key in _FILTER_KEYS:
+            predicate = node.get(key)
+            if predicate is not None:
+                table.add_filter_columns(predicate)
+
+        children = node.get("Plans")
+        if children is not None:
+            # Reversed so that children are visited (and stored) in order.
+            stack.extend((child, op_index) for child in reversed(children))
+    return table
+
+
+def parse_explain_text(lines: List[str] | List[Tuple[Any, ...]]) -> OperatorTable:
+    """
+    Parses text `EXPLAIN` output, one plan line per entry. This is meant for
+    engines that cannot produce JSON plans (e.g., Redshift). It accepts the same
+    input as `parse_explain_verbose()`.
+    """
+    table = OperatorTable()
+    # (indentation, operator index) of the operators on the path to the
+    # current operator.
+    stack: List[Tuple[int, int]] = []
+    for line in lines:
+        if isinstance(line, (tuple, list)):
+            line = line[0]
+        content = line.strip()
+        if len(content) == 0:
+            continue
+
+        if len(stack) == 0 or content.startswith("->"):
+            # A new operator.
+            depth = len(line) - len(line.lstrip(" ")) if len(stack) > 0 else -1
+            while len(stack) > 0 and stack[-1][0] >= depth:
+                stack.pop()
+            parent = stack[-1][1] if len(stack) > 0 else -1
+            op_index = _append_text_operator(table, content, parent)
+            stack.append((depth, op_index))
+            continue
+
+        for prefix in _FILTER_PREFIXES:
+            if content.startswith(prefix):
+                table.add_filter_columns(content[len(prefix) :])
+                break
+        else:
+            workers_match = workers_planned_regex.match(content)
+            if workers_match is not None:
+                table.workers_planned[-1] = int(workers_match.group(1))
+    return table
+
+
+def _append_text_operator(table: OperatorTable, content: str, parent: int) -> int:
+    while content.startswith("->"):
+        content = content[2:].lstrip()
+
+    op_name_match = _op_name_regex.match(content)
+    assert op_name_match is not None
+    op_name = op_name_match.group()
+    for split_word in [" on ", " using "]:
+        op_name = op_name.split(split_word)[0]
+    op_name = op_name.strip()
+
+    table_name = None
+    if " on " in content and "Subquery Scan" not in content:
+        table_name = _normalize_table_name(
+            content.split(" on ")[1].strip().split(" ")[0]
+        )
+
+    est_match = estimated_regex.search(content)
+    assert est_match is not None, content
+    act_match = actual_regex.search(content)
+    return table.append_operator(
+        op_name,
+        table_name,
+        parent,
+        float(est_match.group("est_startup_cost")),
+        float(est_match.group("est_cost")),
+        int(est_match.group("est_card")),
+        int(est_match.group("est_width")),
+        act_card=(
+            float(act_match.group("act_card")) if act_match is not None else math.nan
+        ),
+    )
+
+
+def _normalize_table_name(name: str) -> str:
+    # Matches the normalization in `PlanOperator.parse_lines()`.
+    name = name.strip('"')
+    if name.endswith("_pkey"):
+        name = name.replace("_pkey", "")
+    if "." in name:
+        name = name.split(".")[1].strip('"')
+    return name
+
+
+def _predicate_columns(predicate: str) -> List[str]:
+    predicate = _literal_regex.sub("", predicate)
+    predicate = _type_cast_regex.sub("", predicate)
+    columns = []
+    for match in _identifier_regex.finditer(predicate):
+        identifier = match.group()
+        if identifier.lower() in _predicate_keywords:
+            continue
+        columns.append(identifier)
+    return columns
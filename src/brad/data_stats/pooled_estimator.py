@@ -0,0 +1,58 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, TYPE_CHECKING
+
+from brad.data_stats.estimator import Estimator, AccessInfo
+from brad.query_rep import QueryRep
+
+if TYPE_CHECKING:
+    from brad.blueprint.blueprint import Blueprint
+
+
+class PooledEstimator(Estimator):
+    """
+    Shares a bounded number of estimators (each with its own DB connection)
+    across many sessions. Each call borrows an estimator for its duration.
+    Estimators are created lazily.
+    """
+
+    def __init__(
+        self, max_size: int, create_fn: Callable[[], Awaitable[Estimator]]
+    ) -> None:
+        self._create_fn = create_fn
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: List[Estimator] = []
+        self._all: List[Estimator] = []
+        self._blueprint: Optional["Blueprint"] = None
+
+    async def analyze(
+        self, blueprint: "Blueprint", populate_cache_if_missing: bool = False
+    ) -> None:
+        self._blueprint = blueprint
+        await asyncio.gather(
+            *[
+                estimator.analyze(blueprint, populate_cache_if_missing)
+                for estimator in self._all
+            ]
+        )
+
+    async def get_access_info(self, query: QueryRep) -> List[AccessInfo]:
+        async with self._slots:
+            if len(self._idle) > 0:
+                estimator = self._idle.pop()
+            else:
+                estimator = await self._create_fn()
+                if self._blueprint is not None:
+                    await estimator.analyze(self._blueprint)
+                self._all.append(estimator)
+            try:
+                return await estimator.get_access_info(query)
+            finally:
+                self._idle.append(estimator)
+
+    def get_access_info_sync(self, query: QueryRep) -> List[AccessInfo]:
+        raise RuntimeError("PooledEstimator only supports the async interface.")
+
+    async def close(self) -> None:
+        await asyncio.gather(*[estimator.close() for estimator in self._all])
+        self._all.clear()
+        self._idle.clear()
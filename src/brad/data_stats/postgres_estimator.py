@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from .estimator import Estimator
 
@@ -16,10 +16,7 @@ from brad.connection.connection import Connection, ConnectionFailed
 from brad.connection.cursor import Cursor
 from brad.connection.factory import ConnectionFactory
 from brad.data_stats.estimator import AccessInfo
-from brad.data_stats.plan_parsing import (
-    parse_explain_verbose,
-    extract_base_cardinalities,
-)
+from brad.data_stats.plan_parsing import explain_json_from_rows, parse_explain_json
 from brad.query_rep import QueryRep
 from brad.utils.rand_exponential_backoff import RandomizedExponentialBackoff
 
@@ -79,16 +76,16 @@ class PostgresEstimator(Estimator):
         )
 
     async def _get_access_info_impl(self, query: QueryRep) -> List[AccessInfo]:
-        explain_query = f"EXPLAIN VERBOSE {query.raw_query}"
+        explain_query = f"EXPLAIN (VERBOSE, FORMAT JSON) {query.raw_query}"
         await self._cursor.execute(explain_query)
-        plan_lines = [row[0] async for row in self._cursor]
-        return self._extract_access_infos(plan_lines)
+        plan_rows = [row[0] async for row in self._cursor]
+        return self._extract_access_infos(plan_rows)
 
     def get_access_info_sync(self, query: QueryRep) -> List[AccessInfo]:
-        explain_query = f"EXPLAIN VERBOSE {query.raw_query}"
+        explain_query = f"EXPLAIN (VERBOSE, FORMAT JSON) {query.raw_query}"
         self._cursor.execute_sync(explain_query)
-        plan_lines = [row[0] for row in self._cursor]
-        return self._extract_access_infos(plan_lines)
+        plan_rows = [row[0] for row in self._cursor]
+        return self._extract_access_infos(plan_rows)
 
     async def close(self) -> None:
         await self._connection.close()
@@ -138,9 +135,10 @@ class PostgresEstimator(Estimator):
 
         return table_counts
 
-    def _extract_access_infos(self, plan_lines: List[str]) -> List[AccessInfo]:
-        parsed_plan = parse_explain_verbose(plan_lines)
-        base_cards = extract_base_cardinalities(parsed_plan)
+    def _extract_access_infos(self, plan_rows: List[Any]) -> List[AccessInfo]:
+        base_cards = parse_explain_json(
+            explain_json_from_rows(plan_rows)
+        ).base_cardinalities()
 
         access_infos = []
         for bc in base_cards:
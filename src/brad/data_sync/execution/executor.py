@@ -1,6 +1,6 @@
 import logging
 from collections import deque
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from brad.blueprint import Blueprint
 from brad.config.engine import Engine
@@ -22,6 +22,7 @@ class DataSyncExecutor:
         self._blueprint_mgr = blueprint_mgr
         self._config = config
         self._engines: Optional[EngineConnections] = None
+        self._last_synced_tables: List[str] = []
 
     async def establish_connections(self) -> None:
         if self._config.stub_mode_path() is not None:
@@ -85,7 +86,8 @@ class DataSyncExecutor:
 
     async def run_sync(self, blueprint: Blueprint) -> bool:
         ctx = self._new_execution_context()
-        _, phys_plan = await self._get_processed_plans_impl(blueprint, ctx)
+        self._last_synced_tables = []
+        logical_plan, phys_plan = await self._get_processed_plans_impl(blueprint, ctx)
         if len(phys_plan.all_operators()) == 0:
             # There is nothing to execute. But we must commit the transaction
             # that looked up the extraction ranges.
@@ -93,8 +95,18 @@ class DataSyncExecutor:
             await aurora.commit()
             return False
         await self._run_plan(phys_plan, ctx)
+        self._last_synced_tables = sorted(
+            {op.table_name() for op in logical_plan.operators()}
+        )
         return True
 
+    def last_synced_tables(self) -> List[str]:
+        """
+        The tables that the most recent call to `run_sync()` applied changes
+        to (empty if the sync was skipped).
+        """
+        return self._last_synced_tables
+
     def get_static_logical_plan(self, blueprint: Blueprint) -> LogicalDataSyncPlan:
         return make_logical_data_sync_plan(blueprint)
 
@@ -1,3 +1,4 @@
+import copy
 from typing import List
 from datetime import datetime
 import pandas as pd
@@ -12,3 +13,22 @@ class Forecaster:
 
     def until(self, metric_id: str, end_ts: datetime) -> List[float]:
         raise NotImplementedError
+
+    def num_points_all(self, num_points: int) -> pd.DataFrame:
+        """
+        Forecasts `num_points` values for every metric column at once. The
+        returned dataframe has one column per metric and a `RangeIndex` (the
+        caller is responsible for attaching timestamps).
+        """
+        raise NotImplementedError
+
+    def snapshot(self, df: pd.DataFrame) -> "Forecaster":
+        """
+        Returns a copy of this forecaster that is not affected by later
+        updates. `df` must contain (at least) the most recent rows of the
+        dataframe this forecaster has seen; forecasters that read their
+        dataframe directly will use it instead.
+        """
+        copied = copy.copy(self)
+        copied.update_df_pointer(df)
+        return copied
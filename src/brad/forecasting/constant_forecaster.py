@@ -1,5 +1,6 @@
 from brad.forecasting import Forecaster
 import pandas as pd
+import numpy as np
 from typing import List
 from datetime import datetime, timedelta
 
@@ -16,6 +17,13 @@ class ConstantForecaster(Forecaster):
     def num_points(self, metric_id: str, num_points: int) -> List[float]:
         return max(num_points, 0) * list(self._df.tail(1)[metric_id])
 
+    def num_points_all(self, num_points: int) -> pd.DataFrame:
+        last = self._df.tail(1)
+        return pd.DataFrame(
+            np.repeat(last.to_numpy(dtype=np.float64), max(num_points, 0), axis=0),
+            columns=self._df.columns,
+        )
+
     # `end_ts` is inclusive
     # Returns empty list if `end_ts` is sooner than one `_epoch_length` after the last entry in `_df`.
     def until(self, metric_id: str, end_ts: datetime) -> List[float]:
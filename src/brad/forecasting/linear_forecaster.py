@@ -28,6 +28,28 @@ class LinearForecaster(Forecaster):
         next_X = np.arange(len(window), len(window) + num_points).reshape(-1, 1)
         return list(model.predict(next_X))
 
+    def num_points_all(self, num_points: int) -> pd.DataFrame:
+        if num_points <= 0:
+            return pd.DataFrame(columns=self._df.columns, dtype=np.float64)
+
+        # Ordinary least squares on all columns at once (one fit per column,
+        # solved in closed form).
+        window = self._df.tail(self._window_size).to_numpy(dtype=np.float64)
+        n = window.shape[0]
+        xs = np.arange(n, dtype=np.float64)
+        x_mean = xs.mean()
+        y_mean = window.mean(axis=0)
+        denom = ((xs - x_mean) ** 2).sum()
+        if denom == 0.0:
+            slope = np.zeros_like(y_mean)
+        else:
+            slope = ((xs - x_mean) @ (window - y_mean)) / denom
+        intercept = y_mean - slope * x_mean
+        next_xs = np.arange(n, n + num_points, dtype=np.float64)
+        return pd.DataFrame(
+            np.outer(next_xs, slope) + intercept, columns=self._df.columns
+        )
+
     # `end_ts` is inclusive
     # Returns empty list if `end_ts` is sooner than one `_epoch_length` after the last entry in `_df`.
     def until(self, metric_id: str, end_ts: datetime) -> List[float]:
@@ -1,5 +1,6 @@
 from brad.forecasting import Forecaster
 import pandas as pd
+import numpy as np
 from typing import List
 from datetime import datetime, timedelta
 
@@ -19,6 +20,12 @@ class MovingAverageForecaster(Forecaster):
     def num_points(self, metric_id: str, num_points: int) -> List[float]:
         return max(num_points, 0) * [self._df.tail(self._window_size).mean()[metric_id]]
 
+    def num_points_all(self, num_points: int) -> pd.DataFrame:
+        means = self._df.tail(self._window_size).mean().to_numpy(dtype=np.float64)
+        return pd.DataFrame(
+            np.tile(means, (max(num_points, 0), 1)), columns=self._df.columns
+        )
+
     # `end_ts` is inclusive
     # Returns empty list if `end_ts` is sooner than one `_epoch_length` after the last entry in `_df`.
     def until(self, metric_id: str, end_ts: datetime) -> List[float]:
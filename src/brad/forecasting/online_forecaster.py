@@ -0,0 +1,163 @@
+from brad.forecasting import Forecaster
+import copy
+import pandas as pd
+import numpy as np
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime, timedelta
+
+
+class OnlineForecaster(Forecaster):
+    """
+    Base class for forecasters that maintain incremental state.
+
+    Each call to `update_df_pointer()` only ingests the rows that are newer
+    than the last ingested timestamp, so the cost of an update is proportional
+    to the number of new epochs (not to the size of the dataframe). Forecasts
+    are computed for all metric columns at once and are cached until the next
+    update, so repeated per-metric calls (e.g., from `read_k_upcoming()`) are
+    effectively free.
+    """
+
+    def __init__(self, df: pd.DataFrame, epoch_length: timedelta) -> None:
+        self._epoch_length = epoch_length
+        self._columns: List[str] = []
+        self._column_index: Dict[str, int] = {}
+        self._last_ts: Optional[datetime] = None
+        self._cached_forecast: Optional[np.ndarray] = None
+        self.update_df_pointer(df)
+
+    def update_df_pointer(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        columns = list(df.columns)
+        if columns != self._columns or (
+            self._last_ts is not None and df.index[-1] < self._last_ts
+        ):
+            # The schema changed or the metrics were reset. We need to rebuild
+            # our state from scratch.
+            self._columns = columns
+            self._column_index = {col: idx for idx, col in enumerate(columns)}
+            self._last_ts = None
+            self._reset_state(len(columns))
+
+        if self._last_ts is None:
+            new_rows = df
+        else:
+            new_rows = df.loc[df.index > self._last_ts]
+        if new_rows.empty:
+            return
+
+        values = new_rows.to_numpy(dtype=np.float64)
+        for idx, ts in enumerate(new_rows.index):
+            self._ingest(values[idx], ts)
+        self._last_ts = new_rows.index[-1]
+        self._cached_forecast = None
+
+    def snapshot(self, df: pd.DataFrame) -> "OnlineForecaster":
+        # Our state already summarizes `df`, so we copy it instead of
+        # re-ingesting the rows. The state's size does not depend on the
+        # number of ingested epochs.
+        return copy.deepcopy(self)
+
+    # Returns empty list if `num_points` is <= 0
+    def num_points(self, metric_id: str, num_points: int) -> List[float]:
+        if num_points <= 0 or self._last_ts is None:
+            return []
+        col_idx = self._column_index[metric_id]
+        return self._forecast(num_points)[:num_points, col_idx].tolist()
+
+    # `end_ts` is inclusive
+    # Returns empty list if `end_ts` is sooner than one `_epoch_length` after the last ingested entry.
+    def until(self, metric_id: str, end_ts: datetime) -> List[float]:
+        if self._last_ts is None:
+            return []
+        num_points = (end_ts - self._last_ts) // self._epoch_length
+        return self.num_points(metric_id, num_points)
+
+    def num_points_all(self, num_points: int) -> pd.DataFrame:
+        if num_points <= 0 or self._last_ts is None:
+            return pd.DataFrame(columns=self._columns, dtype=np.float64)
+        return pd.DataFrame(
+            self._forecast(num_points)[:num_points], columns=self._columns
+        )
+
+    def _forecast(self, num_points: int) -> np.ndarray:
+        # Forecasts are cached (and only extended when a longer horizon is
+        # requested) until new data is ingested.
+        if self._cached_forecast is None or self._cached_forecast.shape[0] < num_points:
+            self._cached_forecast = self._compute_forecast(num_points)
+        return self._cached_forecast
+
+    # The methods below are implemented by subclasses.
+
+    def _reset_state(self, num_columns: int) -> None:
+        raise NotImplementedError
+
+    def _ingest(self, row: np.ndarray, ts: datetime) -> None:
+        """
+        Ingests one epoch's worth of values (one value per column). This is
+        called once per new epoch and should run in O(1) time per column.
+
+        Non-finite values (e.g., a missing metric) should be dropped (see
+        `split_finite()`) so that they do not corrupt the incremental state.
+        """
+        raise NotImplementedError
+
+    def _compute_forecast(self, num_points: int) -> np.ndarray:
+        """
+        Returns a `num_points` x `num_columns` array of forecasted values.
+        """
+        raise NotImplementedError
+
+
+def split_finite(row: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns `row` with its non-finite values (NaN or infinity) replaced by 0,
+    and a mask that is 1.0 where the value is finite and 0.0 otherwise.
+    """
+    finite = np.isfinite(row)
+    return np.where(finite, row, 0.0), finite.astype(np.float64)
+
+
+class RingBuffer:
+    """
+    A fixed-capacity buffer of rows (one value per column) that overwrites its
+    oldest row once full.
+    """
+
+    def __init__(self, capacity: int, num_columns: int) -> None:
+        self._data = np.zeros((capacity, num_columns), dtype=np.float64)
+        self._capacity = capacity
+        self._next = 0
+        self._size = 0
+
+    def push(self, row: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Appends `row` and returns the evicted row (if the buffer was full).
+        """
+        evicted = None
+        if self._size == self._capacity:
+            evicted = self._data[self._next].copy()
+        else:
+            self._size += 1
+        self._data[self._next] = row
+        self._next = (self._next + 1) % self._capacity
+        return evicted
+
+    def size(self) -> int:
+        return self._size
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def last(self) -> np.ndarray:
+        return self._data[(self._next - 1) % self._capacity]
+
+    def ordered(self) -> np.ndarray:
+        """
+        Returns the buffered rows from oldest to newest.
+        """
+        if self._size < self._capacity:
+            return self._data[: self._size]
+        return np.roll(self._data, -self._next, axis=0)
@@ -0,0 +1,111 @@
+from brad.forecasting.online_forecaster import (
+    OnlineForecaster,
+    RingBuffer,
+    split_finite,
+)
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+
+class OnlineLinearForecaster(OnlineForecaster):
+    """
+    Equivalent to `LinearForecaster`, but fits the least squares line in
+    closed form using running sums over a ring buffer of the most recent
+    `window_size` epochs.
+
+    The points in the window are assigned x-coordinates 0, 1, ..., n - 1
+    (oldest to newest). Non-finite values are left out of the fit, so we
+    maintain `count`, `sum(x)`, `sum(x^2)`, `sum(y)`, and `sum(x * y)` over
+    each column's finite points. When the window slides, every remaining
+    point's x-coordinate decreases by one, which lets us update the sums in
+    O(1).
+    """
+
+    # The running sums are recomputed from the buffer after this many updates
+    # to bound floating point drift.
+    RESYNC_INTERVAL = 1000
+
+    def __init__(
+        self, df: pd.DataFrame, epoch_length: timedelta, window_size: int = 5
+    ) -> None:
+        self._window_size = window_size
+        self._buffer = RingBuffer(window_size, 0)
+        self._finite = RingBuffer(window_size, 0)
+        self._count = np.zeros(0, dtype=np.float64)
+        self._sum_x = np.zeros(0, dtype=np.float64)
+        self._sum_xx = np.zeros(0, dtype=np.float64)
+        self._sum_y = np.zeros(0, dtype=np.float64)
+        self._sum_xy = np.zeros(0, dtype=np.float64)
+        self._updates_since_resync = 0
+        super().__init__(df, epoch_length)
+
+    def _reset_state(self, num_columns: int) -> None:
+        self._buffer = RingBuffer(self._window_size, num_columns)
+        self._finite = RingBuffer(self._window_size, num_columns)
+        self._count = np.zeros(num_columns, dtype=np.float64)
+        self._sum_x = np.zeros(num_columns, dtype=np.float64)
+        self._sum_xx = np.zeros(num_columns, dtype=np.float64)
+        self._sum_y = np.zeros(num_columns, dtype=np.float64)
+        self._sum_xy = np.zeros(num_columns, dtype=np.float64)
+        self._updates_since_resync = 0
+
+    def _ingest(self, row: np.ndarray, ts: datetime) -> None:
+        values, finite = split_finite(row)
+        n = self._buffer.size()
+        evicted = self._buffer.push(values)
+        evicted_finite = self._finite.push(finite)
+        if evicted is None:
+            # The window grows; the new point has x = n.
+            x = n
+        else:
+            # The window slides. The evicted point had x = 0 (so it only
+            # contributes to `count` and `sum(y)`) and all remaining points
+            # shift down by one.
+            assert evicted_finite is not None
+            self._count -= evicted_finite
+            self._sum_y -= evicted
+            self._sum_xy -= self._sum_y
+            self._sum_xx += self._count - 2.0 * self._sum_x
+            self._sum_x -= self._count
+            x = n - 1
+
+        self._count += finite
+        self._sum_x += x * finite
+        self._sum_xx += x * x * finite
+        self._sum_y += values
+        self._sum_xy += x * values
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.RESYNC_INTERVAL:
+            self._resync()
+
+    def _resync(self) -> None:
+        window = self._buffer.ordered()
+        finite = self._finite.ordered()
+        xs = np.arange(window.shape[0], dtype=np.float64)
+        self._count = finite.sum(axis=0)
+        self._sum_x = xs @ finite
+        self._sum_xx = (xs * xs) @ finite
+        self._sum_y = window.sum(axis=0)
+        self._sum_xy = xs @ window
+        self._updates_since_resync = 0
+
+    def _compute_forecast(self, num_points: int) -> np.ndarray:
+        n = self._buffer.size()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = self._count * self._sum_xx - self._sum_x * self._sum_x
+            slope = np.where(
+                denom == 0.0,
+                0.0,
+                (self._count * self._sum_xy - self._sum_x * self._sum_y) / denom,
+            )
+            # Columns without any finite values in the window are forecasted
+            # as NaN.
+            intercept = np.where(
+                self._count > 0,
+                (self._sum_y - slope * self._sum_x) / self._count,
+                np.nan,
+            )
+        next_xs = np.arange(n, n + num_points, dtype=np.float64)
+        return np.outer(next_xs, slope) + intercept
@@ -0,0 +1,64 @@
+from brad.forecasting.online_forecaster import (
+    OnlineForecaster,
+    RingBuffer,
+    split_finite,
+)
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+
+class OnlineMovingAverageForecaster(OnlineForecaster):
+    """
+    Equivalent to `MovingAverageForecaster`, but maintains a running sum over
+    a ring buffer of the most recent `window_size` epochs.
+
+    Non-finite values are left out of the running sum (and of the number of
+    values it averages over).
+    """
+
+    # The running sum is recomputed from the buffer after this many updates to
+    # bound floating point drift.
+    RESYNC_INTERVAL = 1000
+
+    def __init__(
+        self, df: pd.DataFrame, epoch_length: timedelta, window_size: int = 5
+    ) -> None:
+        self._window_size = window_size
+        self._buffer = RingBuffer(window_size, 0)
+        self._finite = RingBuffer(window_size, 0)
+        self._sum = np.zeros(0, dtype=np.float64)
+        self._count = np.zeros(0, dtype=np.float64)
+        self._updates_since_resync = 0
+        super().__init__(df, epoch_length)
+
+    def _reset_state(self, num_columns: int) -> None:
+        self._buffer = RingBuffer(self._window_size, num_columns)
+        self._finite = RingBuffer(self._window_size, num_columns)
+        self._sum = np.zeros(num_columns, dtype=np.float64)
+        self._count = np.zeros(num_columns, dtype=np.float64)
+        self._updates_since_resync = 0
+
+    def _ingest(self, row: np.ndarray, ts: datetime) -> None:
+        values, finite = split_finite(row)
+        evicted = self._buffer.push(values)
+        evicted_finite = self._finite.push(finite)
+        self._sum += values
+        self._count += finite
+        if evicted is not None:
+            assert evicted_finite is not None
+            self._sum -= evicted
+            self._count -= evicted_finite
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.RESYNC_INTERVAL:
+            self._sum = self._buffer.ordered().sum(axis=0)
+            self._count = self._finite.ordered().sum(axis=0)
+            self._updates_since_resync = 0
+
+    def _compute_forecast(self, num_points: int) -> np.ndarray:
+        # Columns without any finite values in the window are forecasted as
+        # NaN (matching `MovingAverageForecaster`).
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(self._count > 0, self._sum / self._count, np.nan)
+        return np.tile(mean, (num_points, 1))
@@ -0,0 +1,64 @@
+from brad.forecasting.online_forecaster import OnlineForecaster
+import math
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+
+class SeasonalForecaster(OnlineForecaster):
+    """
+    Forecasts using a daily profile. Each day is divided into slots of length
+    `epoch_length` and we keep an exponentially weighted average of the values
+    observed in each slot. A forecast for an upcoming epoch is the profile
+    value of the slot it falls into. Slots that have not been observed yet fall
+    back to the most recently observed value.
+
+    `smoothing` is the weight given to the newest observation of a slot (1.0
+    means "same time yesterday"). Non-finite values are not treated as
+    observations.
+    """
+
+    DAY = timedelta(days=1)
+
+    def __init__(
+        self, df: pd.DataFrame, epoch_length: timedelta, smoothing: float = 0.5
+    ) -> None:
+        assert 0.0 < smoothing <= 1.0
+        self._smoothing = smoothing
+        self._num_slots = math.ceil(self.DAY / epoch_length)
+        self._profile = np.zeros((self._num_slots, 0), dtype=np.float64)
+        # Whether each slot has been observed, per column.
+        self._observed = np.zeros((self._num_slots, 0), dtype=bool)
+        self._last_row = np.zeros(0, dtype=np.float64)
+        self._last_slot = 0
+        super().__init__(df, epoch_length)
+
+    def _reset_state(self, num_columns: int) -> None:
+        self._profile = np.zeros((self._num_slots, num_columns), dtype=np.float64)
+        self._observed = np.zeros((self._num_slots, num_columns), dtype=bool)
+        self._last_row = np.zeros(num_columns, dtype=np.float64)
+        self._last_slot = 0
+
+    def _slot_of(self, ts: datetime) -> int:
+        since_midnight = ts - ts.replace(hour=0, minute=0, second=0, microsecond=0)
+        return int(since_midnight // self._epoch_length) % self._num_slots
+
+    def _ingest(self, row: np.ndarray, ts: datetime) -> None:
+        slot = self._slot_of(ts)
+        finite = np.isfinite(row)
+        profile = self._profile[slot]
+        updated = np.where(
+            self._observed[slot], profile + self._smoothing * (row - profile), row
+        )
+        self._profile[slot] = np.where(finite, updated, profile)
+        self._observed[slot] |= finite
+        self._last_row = np.where(finite, row, self._last_row)
+        self._last_slot = slot
+
+    def _compute_forecast(self, num_points: int) -> np.ndarray:
+        slots = (self._last_slot + np.arange(1, num_points + 1)) % self._num_slots
+        return np.where(
+            self._observed[slots],
+            self._profile[slots],
+            self._last_row,
+        )
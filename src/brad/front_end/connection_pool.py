@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import deque
+
+from brad.blueprint.manager import BlueprintManager
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.connection.connection import Connection
+from brad.connection.executor import EngineExecutors
+from brad.connection.factory import ConnectionFactory
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    A bounded pool of connections to one engine endpoint (e.g., the Aurora
+    writer or one Aurora read replica). Connections are established lazily,
+    up to `max_size`; once the pool is exhausted, `acquire()` waits for a
+    connection to be released.
+
+    Lost connections (see `Connection.mark_connection_lost()`) are discarded
+    when they are released, so the pool heals itself by reconnecting on the
+    next `acquire()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        connect_fn: Callable[[], Awaitable[Connection]],
+    ) -> None:
+        self._name = name
+        self._max_size = max_size
+        self._connect_fn = connect_fn
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: Deque[Connection] = deque()
+        self._num_open = 0
+        self._num_waiting = 0
+        self._closed = False
+        # Incremented by `reset()`. Connections created in an earlier
+        # generation are closed instead of being returned to the pool.
+        self._generation = 0
+        self._conn_generation: Dict[int, int] = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def acquire(self) -> Connection:
+        """
+        Returns a connection from the pool, establishing a new one if needed.
+        Callers must return the connection using `release()`.
+        """
+        if self._closed:
+            raise RuntimeError(f"Connection pool {self._name} is closed.")
+
+        self._num_waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._num_waiting -= 1
+
+        try:
+            while len(self._idle) > 0:
+                conn = self._idle.pop()
+                if conn.is_connected():
+                    return conn
+                self._discard(conn)
+
+            conn = await self._connect_fn()
+            self._num_open += 1
+            self._conn_generation[id(conn)] = self._generation
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: Connection, discard: bool = False) -> None:
+        """
+        Returns `conn` to the pool. Set `discard` to close the connection
+        instead (e.g., if it may hold an open transaction).
+        """
+        if (
+            discard
+            or self._closed
+            or not conn.is_connected()
+            or self._conn_generation.get(id(conn)) != self._generation
+        ):
+            self._discard(conn)
+        else:
+            self._idle.append(conn)
+        self._slots.release()
+
+    def reset(self) -> None:
+        """
+        Closes all idle connections. Connections that are currently in use are
+        closed when they are released. Used when the engine's endpoint may have
+        changed (e.g., after a blueprint transition).
+        """
+        self._generation += 1
+        while len(self._idle) > 0:
+            self._discard(self._idle.pop())
+
+    async def close(self) -> None:
+        self._closed = True
+        to_close = list(self._idle)
+        self._idle.clear()
+        self._num_open -= len(to_close)
+        for conn in to_close:
+            self._conn_generation.pop(id(conn), None)
+        await asyncio.gather(*[conn.close() for conn in to_close])
+
+    def stats(self) -> Tuple[int, int, int]:
+        """
+        Returns the number of open connections, idle connections, and waiters.
+        """
+        return (self._num_open, len(self._idle), self._num_waiting)
+
+    def _discard(self, conn: Connection) -> None:
+        self._num_open -= 1
+        self._conn_generation.pop(id(conn), None)
+        task = asyncio.create_task(conn.close())
+        task.add_done_callback(_log_close_errors)
+
+
+class EngineConnectionPools:
+    """
+    Front-end-wide connection pools used when connection pooling is enabled.
+    There is one pool per engine endpoint (the Aurora writer, each Aurora read
+    replica, Redshift, and Athena). Sessions borrow connections from these
+    pools for the duration of a statement (or a transaction).
+    """
+
+    def __init__(
+        self,
+        config: ConfigFile,
+        blueprint_mgr: BlueprintManager,
+        schema_name: str,
+    ) -> None:
+        self._config = config
+        self._blueprint_mgr = blueprint_mgr
+        self._schema_name = schema_name
+        self._pool_sizes = config.connection_pool_sizes()
+        self._pools: Dict[Engine, ConnectionPool] = {}
+        self._aurora_read_replicas: List[ConnectionPool] = []
+        self._prng = random.Random()
+
+    def refresh(self) -> None:
+        """
+        Creates pools for the engines (and Aurora read replicas) in the current
+        blueprint, and removes pools for engines that are no longer running.
+        Connections are established lazily.
+
+        The remaining Aurora and Redshift pools are reset, since a transition
+        may replace the instances behind them (e.g., a replica at the same
+        index after an instance type change).
+        """
+        blueprint = self._blueprint_mgr.get_blueprint()
+        expected_engines = {Engine.Athena}
+        num_read_replicas = 0
+        if blueprint.aurora_provisioning().num_nodes() > 0:
+            expected_engines.add(Engine.Aurora)
+            num_read_replicas = blueprint.aurora_provisioning().num_nodes() - 1
+        if blueprint.redshift_provisioning().num_nodes() > 0:
+            expected_engines.add(Engine.Redshift)
+
+        for engine in list(self._pools.keys()):
+            if engine not in expected_engines:
+                self._close_in_background(self._pools.pop(engine))
+            elif engine != Engine.Athena:
+                self._pools[engine].reset()
+
+        for engine in expected_engines:
+            if engine not in self._pools:
+                self._pools[engine] = ConnectionPool(
+                    engine.value,
+                    self._pool_sizes[engine],
+                    self._make_connect_fn(engine, aurora_read_replica=None),
+                )
+
+        while len(self._aurora_read_replicas) > num_read_replicas:
+            self._close_in_background(self._aurora_read_replicas.pop())
+        for pool in self._aurora_read_replicas:
+            pool.reset()
+        while len(self._aurora_read_replicas) < num_read_replicas:
+            replica_idx = len(self._aurora_read_replicas)
+            self._aurora_read_replicas.append(
+                ConnectionPool(
+                    f"{Engine.Aurora.value}_replica_{replica_idx}",
+                    self._pool_sizes[Engine.Aurora],
+                    self._make_connect_fn(Engine.Aurora, replica_idx),
+                )
+            )
+
+    def reset_all(self) -> None:
+        """
+        Drains all pools. Used after a connection is lost, since events that
+        break one connection (e.g., an Aurora failover) usually break the other
+        connections to the same endpoint too. Pools reconnect lazily.
+        """
+        for pool in self._all_pools():
+            pool.reset()
+
+    def pool_for(
+        self, engine: Engine, for_writes: bool, replica_index: Optional[int] = None
+    ) -> ConnectionPool:
+        if engine == Engine.Aurora and not for_writes:
+            if replica_index is not None and replica_index < len(
+                self._aurora_read_replicas
+            ):
+                return self._aurora_read_replicas[replica_index]
+            elif len(self._aurora_read_replicas) > 0:
+                return self._prng.choice(self._aurora_read_replicas)
+        try:
+            return self._pools[engine]
+        except KeyError as ex:
+            raise RuntimeError("Not connected to {}".format(engine)) from ex
+
+    def num_aurora_read_replicas(self) -> int:
+        return len(self._aurora_read_replicas)
+
+    def engines(self) -> Set[Engine]:
+        return set(self._pools.keys())
+
+    async def close(self) -> None:
+        await asyncio.gather(*[pool.close() for pool in self._all_pools()])
+        self._pools.clear()
+        self._aurora_read_replicas.clear()
+
+    def log_stats(self, logging_fn: Callable[..., None]) -> None:
+        for pool in self._all_pools():
+            num_open, num_idle, num_waiting = pool.stats()
+            logging_fn(
+                "Connection pool %s: %d open, %d idle, %d waiting",
+                pool.name,
+                num_open,
+                num_idle,
+                num_waiting,
+            )
+
+    def _all_pools(self) -> List[ConnectionPool]:
+        return [*self._pools.values(), *self._aurora_read_replicas]
+
+    def _make_connect_fn(
+        self, engine: Engine, aurora_read_replica: Optional[int]
+    ) -> Callable[[], Awaitable[Connection]]:
+        async def connect() -> Connection:
+            conn = await ConnectionFactory.connect_to(
+                engine,
+                self._schema_name,
+                self._config,
+                self._blueprint_mgr.get_directory(),
+                autocommit=True,
+                aurora_read_replica=aurora_read_replica,
+                executor=EngineExecutors.instance().for_engine(engine),
+            )
+            # TODO: We may want this to be configurable.
+            if engine == Engine.Redshift:
+                cursor = await conn.cursor()
+                await cursor.execute("SET enable_result_cache_for_session = off")
+            return conn
+
+        return connect
+
+    def _close_in_background(self, pool: ConnectionPool) -> None:
+        task = asyncio.create_task(pool.close())
+        task.add_done_callback(_log_close_errors)
+
+
+def _log_close_errors(task: "asyncio.Task[None]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Error when closing a pooled connection: %s", task.exception())
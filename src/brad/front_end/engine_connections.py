@@ -1,11 +1,12 @@
 import asyncio
 import logging
 import random
-from typing import Optional, Dict, Set, List
+from typing import Awaitable, Optional, Dict, Sequence, Set, List
 
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
 from brad.connection.connection import Connection, ConnectionFailed
+from brad.connection.executor import EngineExecutor, EngineExecutors
 from brad.connection.factory import ConnectionFactory
 from brad.front_end.debug import ReestablishConnectionsReport
 from brad.provisioning.directory import Directory
@@ -27,9 +28,18 @@ class EngineConnections:
         autocommit: bool = True,
         specific_engines: Optional[Set[Engine]] = None,
         connect_to_aurora_read_replicas: bool = False,
+        executors: Optional[EngineExecutors] = None,
+        timeout_s: Optional[float] = None,
     ) -> "EngineConnections":
         """
-        Establishes connections to the underlying engines.
+        Establishes connections to the underlying engines. Blocking driver
+        calls on each engine's connections run on that engine's executor in
+        `executors` (the process-wide executors are used by default).
+
+        The connections are established concurrently; each one must be
+        established within `timeout_s` (`engine_connect_timeout_s` in the
+        config by default). If any connection fails, the others are closed and
+        this method raises `ConnectionFailed`.
         """
 
         # As the system gets more sophisticated, we'll add connection pooling, etc.
@@ -40,27 +50,51 @@ class EngineConnections:
         if specific_engines is None:
             specific_engines = {Engine.Aurora, Engine.Redshift, Engine.Athena}
 
-        connection_map: Dict[Engine, Connection] = {}
-        aurora_read_replicas: List[Connection] = []
-
-        for engine in specific_engines:
-            logger.debug("Connecting to %s...", engine)
-            connection_map[engine] = await ConnectionFactory.connect_to(
-                engine, schema_name, config, directory, autocommit
-            )
-
-            # TODO: We may want this to be configurable.
-            if engine == Engine.Redshift:
-                conn = connection_map[engine]
-                cursor = await conn.cursor()
-                await cursor.execute("SET enable_result_cache_for_session = off")
-
-            if engine == Engine.Aurora and connect_to_aurora_read_replicas:
-                # NOTE: We want to avoid using the reader endpoint so that we
-                # have more control over load balancing.
-                aurora_read_replicas = await cls._connect_to_aurora_replicas(
-                    directory, schema_name, config, autocommit
+        if executors is None:
+            executors = EngineExecutors.instance()
+        if timeout_s is None:
+            timeout_s = config.engine_connect_timeout_s()
+
+        # Connect to all engines (and Aurora read replicas) concurrently.
+        engines = list(specific_engines)
+        num_read_replicas = (
+            len(directory.aurora_readers())
+            if connect_to_aurora_read_replicas and Engine.Aurora in specific_engines
+            else 0
+        )
+        connections = await cls._connect_all(
+            [
+                cls._connect_one(
+                    engine,
+                    schema_name,
+                    config,
+                    directory,
+                    autocommit,
+                    executors.for_engine(engine),
+                    timeout_s,
+                )
+                for engine in engines
+            ]
+            # NOTE: We want to avoid using the reader endpoint so that we
+            # have more control over load balancing.
+            + [
+                cls._connect_one(
+                    Engine.Aurora,
+                    schema_name,
+                    config,
+                    directory,
+                    autocommit,
+                    executors.for_engine(Engine.Aurora),
+                    timeout_s,
+                    aurora_read_replica=replica_index,
                 )
+                for replica_index in range(num_read_replicas)
+            ]
+        )
+        connection_map: Dict[Engine, Connection] = dict(
+            zip(engines, connections[: len(engines)])
+        )
+        aurora_read_replicas = connections[len(engines) :]
 
         return cls(
             connection_map,
@@ -68,6 +102,7 @@ class EngineConnections:
             autocommit,
             connect_to_aurora_read_replicas,
             aurora_read_replicas,
+            executors,
         )
 
     @classmethod
@@ -127,8 +162,12 @@ class EngineConnections:
         autocommit: bool,
         connect_to_aurora_read_replicas: bool,
         aurora_read_replicas: List[Connection],
+        executors: Optional[EngineExecutors] = None,
     ):
         self._connection_map = connection_map
+        self._executors = (
+            executors if executors is not None else EngineExecutors.instance()
+        )
         self._schema_name = schema_name
         self._autocommit = autocommit
         self._closed = False
@@ -151,30 +190,58 @@ class EngineConnections:
         currently connected to. This will also reconnect to Redshift because we
         may change the underlying physical endpoint.
         """
-        for engine in expected_engines:
-            if engine in self._connection_map and engine != Engine.Redshift:
-                continue
-            # We force reconnect to Redshift because we may be changing to a
-            # different physical endpoint.
-            self._connection_map[engine] = await ConnectionFactory.connect_to(
-                engine, self._schema_name, config, directory, self._autocommit
-            )
+        timeout_s = config.engine_connect_timeout_s()
+        # We force reconnect to Redshift because we may be changing to a
+        # different physical endpoint.
+        to_connect = [
+            engine
+            for engine in expected_engines
+            if engine not in self._connection_map or engine == Engine.Redshift
+        ]
+        refresh_replicas = (
+            self._connect_to_aurora_read_replicas and Engine.Aurora in expected_engines
+        )
+        num_read_replicas = len(directory.aurora_readers()) if refresh_replicas else 0
 
-            # TODO: We may want this to be configurable.
-            if engine == Engine.Redshift:
-                cursor = self._connection_map[engine].cursor_sync()
-                cursor.execute_sync("SET enable_result_cache_for_session = off")
+        connections = await self._connect_all(
+            [
+                self._connect_one(
+                    engine,
+                    self._schema_name,
+                    config,
+                    directory,
+                    self._autocommit,
+                    self._executors.for_engine(engine),
+                    timeout_s,
+                )
+                for engine in to_connect
+            ]
+            + [
+                self._connect_one(
+                    Engine.Aurora,
+                    self._schema_name,
+                    config,
+                    directory,
+                    self._autocommit,
+                    self._executors.for_engine(Engine.Aurora),
+                    timeout_s,
+                    aurora_read_replica=replica_index,
+                )
+                for replica_index in range(num_read_replicas)
+            ]
+        )
+
+        for engine, conn in zip(to_connect, connections):
+            self._connection_map[engine] = conn
 
-        if self._connect_to_aurora_read_replicas and Engine.Aurora in expected_engines:
+        if refresh_replicas:
             # For simplicity, refresh all connections. This is because of how we
             # update the replica set (sometimes we create an entirely new
             # replica to replace an existing one).
             #
             # N.B. There may be existing clients using the current connections.
             # For simplicity, just replace the connections list.
-            self._aurora_read_replicas = await self._connect_to_aurora_replicas(
-                directory, self._schema_name, config, self._autocommit
-            )
+            self._aurora_read_replicas = connections[len(to_connect) :]
 
     async def remove_connections(
         self, expected_engines: Set[Engine], expected_aurora_read_replicas: int
@@ -215,56 +282,66 @@ class EngineConnections:
         instead.
         """
         report = ReestablishConnectionsReport()
-        curr_connections = [item for item in self._connection_map.items()]
-        new_connections = []
+        timeout_s = config.engine_connect_timeout_s()
 
-        for engine, conn in curr_connections:
-            if conn.is_connected():
-                report.bump_still_connected(engine)
-                continue
+        async def try_connect(
+            engine: Engine, replica_index: Optional[int]
+        ) -> Optional[Connection]:
             try:
-                new_conn = await ConnectionFactory.connect_to(
-                    engine, self._schema_name, config, directory, self._autocommit
+                return await self._connect_one(
+                    engine,
+                    self._schema_name,
+                    config,
+                    directory,
+                    self._autocommit,
+                    self._executors.for_engine(engine),
+                    timeout_s,
+                    aurora_read_replica=replica_index,
                 )
-                # TODO: We may want this to be configurable.
-                if engine == Engine.Redshift:
-                    cursor = new_conn.cursor_sync()
-                    cursor.execute_sync("SET enable_result_cache_for_session = off")
-                new_connections.append((engine, new_conn))
-                report.bump(engine, succeeded=True)
             except ConnectionFailed:
-                report.bump(engine, succeeded=False)
+                return None
 
-        for engine, conn in new_connections:
-            self._connection_map[engine] = conn
+        lost_engines = []
+        for engine, conn in self._connection_map.items():
+            if conn.is_connected():
+                report.bump_still_connected(engine)
+            else:
+                lost_engines.append(engine)
 
         # Reconnect to read replicas if needed.
+        lost_replicas = []
         if (
             self._connect_to_aurora_read_replicas
             and Engine.Aurora in self._connection_map
         ):
-            curr_replica_conns = self._aurora_read_replicas.copy()
-            new_replica_conns = []
-            for replica_idx, conn in enumerate(curr_replica_conns):
+            for replica_idx, conn in enumerate(self._aurora_read_replicas):
                 if conn.is_connected():
                     report.bump_still_connected(Engine.Aurora)
-                    continue
-                try:
-                    new_conn = await ConnectionFactory.connect_to(
-                        Engine.Aurora,
-                        self._schema_name,
-                        config,
-                        directory,
-                        self._autocommit,
-                        replica_idx,
-                    )
-                    new_replica_conns.append((replica_idx, new_conn))
-                    report.bump(Engine.Aurora, succeeded=True)
-                except ConnectionFailed:
-                    report.bump(Engine.Aurora, succeeded=False)
-
-            for replica_idx, conn in new_replica_conns:
-                self._aurora_read_replicas[replica_idx] = conn
+                else:
+                    lost_replicas.append(replica_idx)
+
+        # All lost connections are re-established concurrently.
+        new_connections = await asyncio.gather(
+            *[try_connect(engine, None) for engine in lost_engines],
+            *[try_connect(Engine.Aurora, idx) for idx in lost_replicas],
+        )
+
+        for engine, new_conn in zip(lost_engines, new_connections):
+            report.bump(engine, succeeded=new_conn is not None)
+            if new_conn is not None:
+                self._connection_map[engine] = new_conn
+
+        for replica_idx, new_conn in zip(
+            lost_replicas, new_connections[len(lost_engines) :]
+        ):
+            report.bump(Engine.Aurora, succeeded=new_conn is not None)
+            if new_conn is None:
+                continue
+            if replica_idx < len(self._aurora_read_replicas):
+                self._aurora_read_replicas[replica_idx] = new_conn
+            else:
+                # The replica was removed while we were reconnecting.
+                await new_conn.close()
 
         return report
 
@@ -280,6 +357,9 @@ class EngineConnections:
         except KeyError:
             return None
 
+    def num_aurora_read_replicas(self) -> int:
+        return len(self._aurora_read_replicas)
+
     def get_reader_connection(
         self, engine: Engine, specific_index: Optional[int] = None
     ) -> Connection:
@@ -318,25 +398,75 @@ class EngineConnections:
         self._closed = True
 
     @staticmethod
-    async def _connect_to_aurora_replicas(
-        directory: Directory,
+    async def _connect_one(
+        engine: Engine,
         schema_name: Optional[str],
         config: ConfigFile,
+        directory: Directory,
         autocommit: bool,
+        executor: EngineExecutor,
+        timeout_s: float,
+        aurora_read_replica: Optional[int] = None,
+    ) -> Connection:
+        async def connect() -> Connection:
+            conn = await ConnectionFactory.connect_to(
+                engine,
+                schema_name,
+                config,
+                directory,
+                autocommit,
+                aurora_read_replica,
+                executor=executor,
+            )
+            # TODO: We may want this to be configurable.
+            if engine == Engine.Redshift:
+                cursor = await conn.cursor()
+                await cursor.execute("SET enable_result_cache_for_session = off")
+            return conn
+
+        logger.debug(
+            "Connecting to %s%s...",
+            engine,
+            (
+                f" (replica {aurora_read_replica})"
+                if aurora_read_replica is not None
+                else ""
+            ),
+        )
+        try:
+            return await asyncio.wait_for(connect(), timeout=timeout_s)
+        except asyncio.TimeoutError as ex:
+            # N.B. A blocking driver call that is already running on the
+            # executor cannot be interrupted; its connection is dropped once the
+            # call returns.
+            raise ConnectionFailed(
+                f"Timed out after {timeout_s} s when connecting to {engine}."
+            ) from ex
+
+    @staticmethod
+    async def _connect_all(
+        connect_coros: Sequence[Awaitable[Connection]],
     ) -> List[Connection]:
-        aurora_read_replicas = []
-        for replica_index in range(len(directory.aurora_readers())):
-            aurora_read_replicas.append(
-                await ConnectionFactory.connect_to(
-                    Engine.Aurora,
-                    schema_name,
-                    config,
-                    directory,
-                    autocommit,
-                    replica_index,
-                )
+        """
+        Runs `connect_coros` concurrently and returns the connections in order.
+        If any of them fail, the connections that were established are closed
+        and the first error is raised.
+        """
+        results = await asyncio.gather(*connect_coros, return_exceptions=True)
+        connections: List[Connection] = []
+        error: Optional[BaseException] = None
+        for result in results:
+            if isinstance(result, BaseException):
+                if error is None:
+                    error = result
+            else:
+                connections.append(result)
+        if error is not None:
+            await asyncio.gather(
+                *[conn.close() for conn in connections], return_exceptions=True
             )
-        return aurora_read_replicas
+            raise error
+        return connections
 
     @staticmethod
     def _connect_to_aurora_replicas_sync(
@@ -4,7 +4,6 @@ import logging
 import random
 import time
 import ssl
-import multiprocessing as mp
 import redshift_connector.error as redshift_errors
 import psycopg
 import struct
@@ -18,15 +17,18 @@ import pyodbc
 import brad.proto_gen.brad_pb2_grpc as brad_grpc
 
 from brad.asset_manager import AssetManager
+from brad.blueprint.diff.delta import BlueprintDelta
 from brad.blueprint.manager import BlueprintManager
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
-from brad.connection.connection import ConnectionFailed
+from brad.connection.connection import Connection, ConnectionFailed
+from brad.connection.executor import EngineExecutors
 from brad.connection.schema import Schema, Field, DataType
+from brad.daemon.ipc_channel import IpcChannel, IpcChannelClosed
 from brad.daemon.monitor import Monitor
 from brad.daemon.messages import (
+    DirectoryUpdated,
     ShutdownFrontEnd,
-    Sentinel,
     MetricsReport,
     InternalCommandRequest,
     InternalCommandResponse,
@@ -36,10 +38,12 @@ from brad.daemon.messages import (
 from brad.front_end.brad_interface import BradInterface
 from brad.front_end.errors import QueryError
 from brad.front_end.grpc import BradGrpc
+from brad.front_end.query_stages import QueryStage, StageLatencies
 from brad.front_end.session import SessionManager, SessionId, Session
 from brad.front_end.watchdog import Watchdog
 from brad.provisioning.directory import Directory
-from brad.query_rep import QueryRep
+from brad.parse_cache import ParseCache
+from brad.query_rep import QueryRep, load_parse_cache, save_parse_cache
 from brad.routing.abstract_policy import AbstractRoutingPolicy
 from brad.routing.always_one import AlwaysOneRouter
 from brad.routing.rule_based import RuleBased
@@ -84,8 +88,7 @@ class BradFrontEnd(BradInterface):
         path_to_system_config: str,
         debug_mode: bool,
         initial_directory: Directory,
-        input_queue: mp.Queue,
-        output_queue: mp.Queue,
+        channel: IpcChannel,
     ):
         if (
             BradFrontEnd.native_server_is_supported()
@@ -115,13 +118,9 @@ class BradFrontEnd(BradInterface):
         self._schema_name = schema_name
         self._debug_mode = debug_mode
 
-        # Used for IPC with the daemon. Eventually we will use RPC to
-        # communicate with the daemon. But there's currently no need for
-        # something fancy here.
-        # Used for messages sent from the daemon to this front end server.
-        self._input_queue = input_queue
-        # Used for messages sent from this front end server to the daemon.
-        self._output_queue = output_queue
+        # Used for IPC with the daemon (messages flow in both directions). It
+        # is opened when the front end starts up.
+        self._daemon_channel = channel
 
         self._assets = AssetManager(self._config)
         self._blueprint_mgr = BlueprintManager(
@@ -160,14 +159,25 @@ class BradFrontEnd(BradInterface):
         self._routing_policy_override = self._config.routing_policy
         # This is set up as the front end starts up.
         self._router: Optional[Router] = None
-        self._sessions = SessionManager(
-            self._config, self._blueprint_mgr, self._schema_name
-        )
+        if self._config.front_end_shared_port():
+            self._sessions = SessionManager(
+                self._config,
+                self._blueprint_mgr,
+                self._schema_name,
+                first_id_value=self._fe_index,
+                id_stride=self._config.num_front_ends,
+            )
+        else:
+            self._sessions = SessionManager(
+                self._config, self._blueprint_mgr, self._schema_name
+            )
         self._daemon_messages_task: Optional[asyncio.Task[None]] = None
 
         # Number of transactions that completed.
         self._transaction_end_counter = Counter()  # pylint: disable=global-statement
         self._reset_latency_sketches()
+        # Tracks where time is spent on the query path.
+        self._stage_latencies = StageLatencies()
         self._brad_metrics_reporting_task: Optional[asyncio.Task[None]] = None
 
         # Used to manage `BRAD_` requests that need to be sent to the daemon for
@@ -230,9 +240,17 @@ class BradFrontEnd(BradInterface):
             self._flight_sql_server.start()
 
         try:
-            grpc_server = grpc.aio.server()
-            brad_grpc.add_BradServicer_to_server(BradGrpc(self), grpc_server)
-            port_to_use = self._config.front_end_port + self._fe_index
+            if self._config.front_end_shared_port():
+                # All front ends listen on the same port and the kernel
+                # distributes incoming connections among them.
+                grpc_server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+                port_to_use = self._config.front_end_port
+            else:
+                grpc_server = grpc.aio.server()
+                port_to_use = self._config.front_end_port + self._fe_index
+            brad_grpc.add_BradServicer_to_server(
+                BradGrpc(self, self._stage_latencies), grpc_server
+            )
             grpc_server.add_insecure_port(
                 "{}:{}".format(self._config.front_end_interface, port_to_use)
             )
@@ -252,6 +270,12 @@ class BradFrontEnd(BradInterface):
 
     async def _run_setup(self) -> None:
         self._main_thread_loop = asyncio.get_running_loop()
+        await self._daemon_channel.open()
+        EngineExecutors.instance().configure(self._config.engine_executor_threads())
+        ParseCache.instance().set_max_entries(self._config.parse_cache_max_entries())
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            load_parse_cache(parse_cache_path)
 
         # The directory will have been populated by the daemon.
         await self._blueprint_mgr.load(skip_directory_refresh=True)
@@ -276,6 +300,10 @@ class BradFrontEnd(BradInterface):
         self._watchdog.start(self._main_thread_loop)
         self._ping_watchdog_task = asyncio.create_task(self._ping_watchdog())
 
+        # Warm up the standby session connections so that the first sessions
+        # do not need to wait for connections to be established.
+        self._sessions.start_standby_connections()
+
     async def _set_up_router(self) -> None:
         # We have different routing policies for performance evaluation and
         # testing purposes.
@@ -328,9 +356,6 @@ class BradFrontEnd(BradInterface):
 
         await self._sessions.end_all_sessions()
 
-        # Important for unblocking our message reader thread.
-        self._input_queue.put(Sentinel(self._fe_index))
-
         if self._daemon_messages_task is not None:
             self._daemon_messages_task.cancel()
             self._daemon_messages_task = None
@@ -348,6 +373,12 @@ class BradFrontEnd(BradInterface):
             self._ping_watchdog_task.cancel()
             self._ping_watchdog_task = None
 
+        await self._daemon_channel.close()
+        EngineExecutors.instance().shutdown()
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            save_parse_cache(parse_cache_path)
+
     async def start_session(self) -> SessionId:
         rand_backoff = None
         while True:
@@ -395,6 +426,9 @@ class BradFrontEnd(BradInterface):
         results, _ = await self._run_query_impl(session_id, query, debug_info)
         return json.dumps(results, cls=DecimalEncoder, default=str)
 
+    def stage_latencies(self) -> StageLatencies:
+        return self._stage_latencies
+
     async def _run_query_impl(
         self,
         session_id: SessionId,
@@ -408,6 +442,12 @@ class BradFrontEnd(BradInterface):
                 "Invalid session id {}".format(str(session_id)), is_transient=False
             )
 
+        # The connection used to run the query (returned to the session once
+        # the results have been retrieved).
+        leased_connection: Optional[Connection] = None
+        query_failed = False
+        stage_start = time.perf_counter()
+
         try:
             # Remove any trailing or leading whitespace. Remove the trailing
             # semicolon if it exists.
@@ -430,9 +470,16 @@ class BradFrontEnd(BradInterface):
             if query.startswith("SET SESSION"):
                 # Support for setting transaction isolation level (temporary).
                 engine_to_use = Engine.Aurora
+                session.pin_for_session(engine_to_use)
+                stage_start = self._end_stage(QueryStage.Parse, stage_start)
             else:
                 assert self._router is not None
+                # The router needs these facts; computing them here lets us
+                # time parsing separately from routing.
+                query_rep.get_required_functionality()
+                stage_start = self._end_stage(QueryStage.Parse, stage_start)
                 engine_to_use = await self._router.engine_for(query_rep, session)
+                stage_start = self._end_stage(QueryStage.Route, stage_start)
 
             log_verbose(
                 logger,
@@ -444,22 +491,32 @@ class BradFrontEnd(BradInterface):
             debug_info["executor"] = engine_to_use
 
             # 3. Actually execute the query.
+            transactional_query: bool = (
+                session.in_transaction or query_rep.is_data_modification_query()
+            )
             try:
-                transactional_query: bool = (
-                    session.in_transaction or query_rep.is_data_modification_query()
+                connection = await session.acquire_connection(
+                    engine_to_use, for_writes=transactional_query
                 )
+            except ConnectionFailed as ex:
+                raise QueryError.from_exception(ex, is_transient=True)
+            leased_connection = connection
+
+            try:
                 if transactional_query:
-                    connection = session.engines.get_connection(engine_to_use)
                     cursor = connection.cursor_sync()
                     start = universal_now()
                     if query_rep.is_transaction_start():
                         session.set_txn_start_timestamp(start)
-                    # Using execute_sync() is lower overhead than the async
-                    # interface. For transactions, we won't necessarily need the
-                    # async interface.
-                    cursor.execute_sync(query_rep.raw_query)
+                    if connection.is_async_native():
+                        await cursor.execute(query_rep.raw_query)
+                    else:
+                        # Using execute_sync() is lower overhead than the async
+                        # interface when the driver hands off to a thread. For
+                        # transactions, we won't necessarily need the async
+                        # interface.
+                        cursor.execute_sync(query_rep.raw_query)
                 else:
-                    connection = session.engines.get_reader_connection(engine_to_use)
                     cursor = connection.cursor_sync()
                     # HACK: To work around dialect differences between
                     # Athena/Aurora/Redshift for now. This should be replaced by
@@ -500,6 +557,8 @@ class BradFrontEnd(BradInterface):
                 # Error when executing the query.
                 raise QueryError.from_exception(ex, is_transient_error)
 
+            stage_start = self._end_stage(QueryStage.Execute, stage_start)
+
             # We keep track of transactional state after executing the query in
             # case the query failed.
             if query_rep.is_transaction_start():
@@ -530,6 +589,7 @@ class BradFrontEnd(BradInterface):
                     self._txn_latency_sketch.add(
                         (end - session.txn_start_timestamp()).total_seconds()
                     )
+            stage_start = self._end_stage(QueryStage.Log, stage_start)
 
             # Extract and return the results, if any.
             try:
@@ -537,7 +597,10 @@ class BradFrontEnd(BradInterface):
                 if result_row_limit is not None:
                     results = []
                     for _ in range(result_row_limit):
-                        row = cursor.fetchone_sync()
+                        if connection.is_async_native():
+                            row = await cursor.fetchone()
+                        else:
+                            row = cursor.fetchone_sync()
                         if row is None:
                             break
                         results.append(tuple(row))
@@ -546,16 +609,26 @@ class BradFrontEnd(BradInterface):
                         "Responded with %d rows (limited to %d rows).",
                         len(results),
                     )
+                elif connection.is_async_native():
+                    results = [tuple(row) for row in await cursor.fetchall()]
+                    log_verbose(logger, "Responded with %d rows.", len(results))
                 else:
                     # Using `fetchall_sync()` is lower overhead than the async interface.
                     results = [tuple(row) for row in cursor.fetchall_sync()]
                     log_verbose(logger, "Responded with %d rows.", len(results))
-                return (
-                    results,
-                    (cursor.result_schema(results) if retrieve_schema else None),
+                result_schema = (
+                    cursor.result_schema(results) if retrieve_schema else None
                 )
+                # Used to time result serialization (see `BradGrpc`).
+                debug_info["fetched_at"] = self._end_stage(
+                    QueryStage.Fetch, stage_start
+                )
+                return (results, result_schema)
             except (pyodbc.ProgrammingError, psycopg.ProgrammingError):
                 log_verbose(logger, "No rows produced.")
+                debug_info["fetched_at"] = self._end_stage(
+                    QueryStage.Fetch, stage_start
+                )
                 return ([], Schema.empty() if retrieve_schema else None)
             except (
                 pyodbc.Error,
@@ -574,6 +647,7 @@ class BradFrontEnd(BradInterface):
         except QueryError as ex:
             # This is an expected exception. We catch and re-raise it here to
             # avoid triggering the handler below.
+            query_failed = True
             logger.debug("Query error: %s", repr(ex))
             if self._verbose_logger is not None:
                 if ex.is_transient():
@@ -582,8 +656,14 @@ class BradFrontEnd(BradInterface):
                     self._verbose_logger.exception("Non-transient error")
             raise
         except Exception as ex:
+            query_failed = True
             logger.exception("Encountered unexpected exception when handling request.")
             raise QueryError.from_exception(ex)
+        finally:
+            if leased_connection is not None:
+                session.release_connection(
+                    leased_connection, succeeded=not query_failed
+                )
 
     async def _handle_internal_command(
         self, session: Session, command_raw: str, debug_info: Dict[str, Any]
@@ -639,28 +719,31 @@ class BradFrontEnd(BradInterface):
                 return [("Empty query/command.",)]
 
             try:
-                connection = session.engines.get_connection(engine)
-                cursor = await connection.cursor()
-                logger.debug("Requested to run on %s: %s", str(engine), query)
-                await cursor.execute(query)
+                connection = await session.acquire_connection(engine, for_writes=True)
             except RuntimeError as ex:
                 return [(str(ex),)]
 
-            # Extract and return the results, if any.
             try:
-                return [tuple(row) for row in cursor.fetchall_sync()]
-            except pyodbc.ProgrammingError:
-                return []
+                cursor = await connection.cursor()
+                logger.debug("Requested to run on %s: %s", str(engine), query)
+                await cursor.execute(query)
+
+                # Extract and return the results, if any.
+                try:
+                    return [tuple(row) for row in await cursor.fetchall()]
+                except (pyodbc.ProgrammingError, psycopg.ProgrammingError):
+                    return []
+            finally:
+                session.release_connection(connection)
 
         else:
             return [("Unknown internal command: {}".format(command),)]
 
     async def _read_daemon_messages(self) -> None:
-        assert self._input_queue is not None
         loop = asyncio.get_running_loop()
         while True:
             try:
-                message = await loop.run_in_executor(None, self._input_queue.get)
+                message = await self._daemon_channel.recv()
                 if message.fe_index != self._fe_index:
                     logger.warning(
                         "Received message with invalid front end index. Expected %d. Received %d.",
@@ -683,6 +766,9 @@ class BradFrontEnd(BradInterface):
                         continue
                     self._daemon_request_mailbox.on_new_message(message.response)
 
+                elif isinstance(message, DirectoryUpdated):
+                    await self._run_directory_update(message.updated_directory)
+
                 elif isinstance(message, NewBlueprint):
                     logger.info(
                         "Received notification to update to blueprint version %d",
@@ -690,11 +776,11 @@ class BradFrontEnd(BradInterface):
                     )
                     # This refreshes any cached state that depends on the old blueprint.
                     await self._run_blueprint_update(
-                        message.version, message.updated_directory
+                        message.version, message.updated_directory, message.delta
                     )
                     # Tell the daemon that we have updated.
-                    self._output_queue.put(
-                        NewBlueprintAck(self._fe_index, message.version), block=False
+                    await self._daemon_channel.send(
+                        NewBlueprintAck(self._fe_index, message.version)
                     )
                     logger.info(
                         "Acknowledged update to blueprint version %d", message.version
@@ -702,6 +788,9 @@ class BradFrontEnd(BradInterface):
 
                 else:
                     logger.info("Received message from the daemon: %s", message)
+            except IpcChannelClosed:
+                logger.warning("The daemon closed the IPC channel.")
+                break
             except Exception as ex:
                 if not isinstance(ex, asyncio.CancelledError):
                     logger.exception(
@@ -727,13 +816,15 @@ class BradFrontEnd(BradInterface):
                 self._transaction_end_counter.reset()
                 elapsed_time_s = period_end - period_start
 
-                # If the input queue is full, we just drop this message.
+                # If the outgoing buffer is full, we just drop this message.
                 sampled_thpt = txn_value / elapsed_time_s
                 metrics_report = MetricsReport.from_data(
                     self._fe_index,
                     sampled_thpt,
                     self._txn_latency_sketch,
                     self._query_latency_sketch,
+                    self._sessions.replica_balancer.take_metrics(),
+                    self._stage_latencies.take(),
                 )
                 if self._verbose_logger is not None:
                     logging_fn = self._verbose_logger.info
@@ -742,7 +833,8 @@ class BradFrontEnd(BradInterface):
                 logging_fn(
                     "Sending metrics report: txn_completions_per_s: %.2f", sampled_thpt
                 )
-                self._output_queue.put_nowait(metrics_report)
+                if not self._daemon_channel.send_nowait(metrics_report):
+                    logger.warning("Dropped a metrics report (IPC buffer is full).")
 
                 txn_p90 = self._txn_latency_sketch.get_quantile_value(0.9)
                 if txn_p90 is not None:
@@ -752,6 +844,16 @@ class BradFrontEnd(BradInterface):
                 if query_p90 is not None:
                     logger.debug("Query latency p90 (s): %.4f", query_p90)
 
+                for executor_metrics in (
+                    EngineExecutors.instance().take_metrics().values()
+                ):
+                    if (
+                        executor_metrics.completed == 0
+                        and executor_metrics.queue_depth == 0
+                    ):
+                        continue
+                    logging_fn("Executor: %s", executor_metrics)
+
                 period_start = time.time()
                 self._reset_latency_sketches()
 
@@ -760,6 +862,15 @@ class BradFrontEnd(BradInterface):
                 # This should be a fatal error.
                 logger.exception("Unexpected error in the metrics reporting task.")
 
+    def _end_stage(self, stage: QueryStage, stage_start: float) -> float:
+        """
+        Records the time spent in `stage` and returns the current time (the
+        start of the next stage).
+        """
+        now = time.perf_counter()
+        self._stage_latencies.record(stage, now - stage_start)
+        return now
+
     def _clean_query_str(self, raw_sql: str) -> str:
         sql = raw_sql.strip()
         if sql.endswith(";"):
@@ -769,8 +880,7 @@ class BradFrontEnd(BradInterface):
     async def _send_daemon_request(self, request: str) -> None:
         message = InternalCommandRequest(self._fe_index, request)
         logger.debug("Sending internal command request: %s", message)
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._output_queue.put, message)
+        await self._daemon_channel.send(message)
 
     async def _refresh_qlogger(self) -> None:
         try:
@@ -792,9 +902,13 @@ class BradFrontEnd(BradInterface):
                 logger.exception("Watchdog ping task encountered exception.")
 
     async def _run_blueprint_update(
-        self, version: int, updated_directory: Directory
+        self,
+        version: int,
+        updated_directory: Directory,
+        delta: Optional[BlueprintDelta],
     ) -> None:
-        await self._blueprint_mgr.load(skip_directory_refresh=True)
+        if delta is None or not self._blueprint_mgr.apply_delta(version, delta):
+            await self._blueprint_mgr.load(skip_directory_refresh=True)
         self._blueprint_mgr.get_directory().update_to_directory(updated_directory)
         active_version = self._blueprint_mgr.get_active_blueprint_version()
         if version != active_version:
@@ -819,6 +933,15 @@ class BradFrontEnd(BradInterface):
         await self._sessions.remove_connections()
         logger.info("Completed transition to blueprint version %d", version)
 
+    async def _run_directory_update(self, updated_directory: Directory) -> None:
+        self._blueprint_mgr.get_directory().update_to_directory(updated_directory)
+        directory = self._blueprint_mgr.get_directory()
+        logger.info("Loaded updated directory: %s", directory)
+        if self._monitor is not None:
+            self._monitor.update_metrics_sources()
+        await self._sessions.add_and_refresh_connections()
+        await self._sessions.remove_connections()
+
     def _schedule_reestablish_connections(self) -> None:
         if self._reestablish_connections_task is not None:
             return
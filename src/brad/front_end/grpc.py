@@ -1,4 +1,5 @@
-from typing import AsyncIterable, Dict, Any
+import time
+from typing import AsyncIterable, Dict, Any, Optional
 
 import brad.proto_gen.brad_pb2 as b
 import brad.proto_gen.brad_pb2_grpc as rpc
@@ -7,6 +8,7 @@ from brad.config.session import SessionId
 from brad.connection.connection import ConnectionFailed
 from brad.front_end.brad_interface import BradInterface
 from brad.front_end.errors import QueryError
+from brad.front_end.query_stages import QueryStage, StageLatencies
 
 # pylint: disable=no-member
 # See https://github.com/protocolbuffers/protobuf/issues/10372
@@ -19,8 +21,14 @@ class BradGrpc(rpc.BradServicer):
     A shim layer used to implement BRAD's gRPC interface.
     """
 
-    def __init__(self, brad: BradInterface):
+    def __init__(
+        self, brad: BradInterface, stage_latencies: Optional[StageLatencies] = None
+    ):
         self._brad = brad
+        # If provided, used to record the time spent serializing results. The
+        # interface sets `debug_info["fetched_at"]` (a `time.perf_counter()`
+        # value) once it has retrieved the results.
+        self._stage_latencies = stage_latencies
 
     async def StartSession(
         self, _request: b.StartSessionRequest, _context
@@ -38,16 +46,31 @@ class BradGrpc(rpc.BradServicer):
     ) -> AsyncIterable[b.RunQueryResponse]:
         session_id = SessionId(request.id.id_value)
         debug_info: Dict[str, Any] = {}
+        # Excludes the time spent waiting for gRPC to send each row.
+        serialize_s = 0.0
+        serialize_start: Optional[float] = None
         try:
             async for row in self._brad.run_query(
                 session_id, request.query, debug_info
             ):
+                if serialize_start is None:
+                    serialize_start = debug_info.get("fetched_at")
                 response = b.RunQueryResponse(row=b.QueryResultRow(row_data=row))
                 if "executor" in debug_info:
                     response.executor = self._convert_engine(debug_info["executor"])
                 if "not_tabular" in debug_info:
                     response.not_tabular = debug_info["not_tabular"]
+                if serialize_start is not None:
+                    serialize_s += time.perf_counter() - serialize_start
                 yield response
+                serialize_start = time.perf_counter()
+
+            if self._stage_latencies is not None and "fetched_at" in debug_info:
+                if serialize_start is None:
+                    # The query did not produce any rows.
+                    serialize_start = debug_info["fetched_at"]
+                serialize_s += time.perf_counter() - serialize_start
+                self._stage_latencies.record(QueryStage.Serialize, serialize_s)
 
         except QueryError as ex:
             yield b.RunQueryResponse(
@@ -68,7 +91,13 @@ class BradGrpc(rpc.BradServicer):
                 response.executor = self._convert_engine(debug_info["executor"])
             if "not_tabular" in debug_info:
                 response.not_tabular = debug_info["not_tabular"]
-            return b.RunQueryJsonResponse(results=response)
+            json_response = b.RunQueryJsonResponse(results=response)
+            if self._stage_latencies is not None and "fetched_at" in debug_info:
+                self._stage_latencies.record(
+                    QueryStage.Serialize,
+                    time.perf_counter() - debug_info["fetched_at"],
+                )
+            return json_response
 
         except QueryError as ex:
             return b.RunQueryJsonResponse(
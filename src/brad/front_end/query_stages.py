@@ -0,0 +1,51 @@
+import enum
+from typing import Dict, List, Tuple
+from ddsketch import DDSketch
+
+
+class QueryStage(enum.Enum):
+    """
+    The stages of the front end's query path.
+    """
+
+    # Cleaning the query string and analyzing it (tables, functionality).
+    Parse = "parse"
+    # Selecting an engine (including any estimator calls).
+    Route = "route"
+    # Acquiring a connection and running the query on the engine.
+    Execute = "execute"
+    # Retrieving the results and converting the rows.
+    Fetch = "fetch"
+    # Workload logging and latency bookkeeping.
+    Log = "log"
+    # Encoding the results for the client.
+    Serialize = "serialize"
+
+
+class StageLatencies:
+    """
+    Per-stage latency sketches for the queries handled by a front end. Callers
+    time stages using a monotonic clock (`time.perf_counter()`) and record the
+    elapsed seconds.
+    """
+
+    def __init__(self) -> None:
+        self._sketches = self._empty_sketches()
+
+    def record(self, stage: QueryStage, elapsed_s: float) -> None:
+        self._sketches[stage].add(elapsed_s)
+
+    def sketches(self) -> List[Tuple[QueryStage, DDSketch]]:
+        return list(self._sketches.items())
+
+    def take(self) -> List[Tuple[QueryStage, DDSketch]]:
+        """
+        Returns the sketches recorded so far and starts new ones.
+        """
+        sketches = self.sketches()
+        self._sketches = self._empty_sketches()
+        return sketches
+
+    @staticmethod
+    def _empty_sketches() -> Dict[QueryStage, DDSketch]:
+        return {stage: DDSketch(relative_accuracy=0.01) for stage in QueryStage}
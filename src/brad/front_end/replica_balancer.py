@@ -0,0 +1,206 @@
+import logging
+import random
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaMetrics:
+    """
+    Per-replica load statistics for one reporting period. These are sent to
+    the daemon as part of the front end's `MetricsReport`.
+    """
+
+    def __init__(
+        self,
+        replica_index: int,
+        outstanding: int,
+        completed: int,
+        ewma_latency_s: Optional[float],
+        weight: float,
+    ) -> None:
+        self.replica_index = replica_index
+        self.outstanding = outstanding
+        self.completed = completed
+        self.ewma_latency_s = ewma_latency_s
+        self.weight = weight
+
+    def __repr__(self) -> str:
+        latency = (
+            f"{self.ewma_latency_s:.4f}" if self.ewma_latency_s is not None else "n/a"
+        )
+        return (
+            f"ReplicaMetrics(replica={self.replica_index}, "
+            f"outstanding={self.outstanding}, completed={self.completed}, "
+            f"ewma_latency_s={latency}, weight={self.weight:.2f})"
+        )
+
+
+class _ReplicaState:
+    def __init__(self, replica_id: Optional[str], added_at: Optional[float]) -> None:
+        # The replica's instance ID (if known).
+        self.replica_id = replica_id
+        # `added_at` is `None` for replicas that do not need a slow start.
+        self.added_at = added_at
+        self.outstanding = 0
+        self.completed = 0
+        self.ewma_latency_s: Optional[float] = None
+
+
+class ReplicaLoadBalancer:
+    """
+    Selects the Aurora read replica to use for a read-only query. It is shared
+    by all sessions in a front end.
+
+    Each replica is scored using
+
+        (outstanding + 1) * latency / weight
+
+    where `outstanding` is the number of in-flight queries that this front end
+    sent to the replica, `latency` is an exponentially weighted moving average
+    of its recent query latencies, and `weight` ramps up linearly from
+    `min_weight` to 1 over `slow_start_s` for newly added replicas (so that a
+    replica with a cold buffer pool is not immediately sent its full share of
+    traffic). The replica with the lowest score is selected; ties are broken
+    randomly.
+    """
+
+    def __init__(
+        self,
+        ewma_alpha: float = 0.2,
+        slow_start_s: float = 60.0,
+        min_weight: float = 0.1,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._ewma_alpha = ewma_alpha
+        self._slow_start_s = slow_start_s
+        self._min_weight = min_weight
+        self._replicas: List[_ReplicaState] = []
+        self._prng = random.Random(seed)
+
+    def num_replicas(self) -> int:
+        return len(self._replicas)
+
+    def set_replicas(
+        self, replica_ids: List[Optional[str]], slow_start: bool = True
+    ) -> None:
+        """
+        Sets the replicas to balance across, in replica index order. Replicas
+        are identified by their instance IDs, so a replica that is replaced by
+        a different instance at the same index is treated as a new replica
+        (`None` IDs only match by index). New replicas start with a slow start
+        ramp (unless `slow_start` is `False`, e.g., when the front end first
+        starts).
+        """
+        now = time.monotonic()
+        replicas = []
+        for idx, replica_id in enumerate(replica_ids):
+            if (
+                idx < len(self._replicas)
+                and self._replicas[idx].replica_id == replica_id
+            ):
+                replicas.append(self._replicas[idx])
+                continue
+            replicas.append(_ReplicaState(replica_id, now if slow_start else None))
+            if slow_start:
+                logger.info(
+                    "Slow starting Aurora read replica %d (%s)", idx, replica_id
+                )
+        self._replicas = replicas
+
+    def choose(self) -> int:
+        """
+        Returns the index of the replica to use. There must be at least one
+        replica.
+        """
+        assert len(self._replicas) > 0
+        if len(self._replicas) == 1:
+            return 0
+
+        now = time.monotonic()
+        default_latency = self._default_latency()
+        best_score = None
+        best: List[int] = []
+        for idx, replica in enumerate(self._replicas):
+            latency = (
+                replica.ewma_latency_s
+                if replica.ewma_latency_s is not None
+                else default_latency
+            )
+            score = (replica.outstanding + 1) * latency / self._weight(replica, now)
+            if best_score is None or score < best_score:
+                best_score = score
+                best = [idx]
+            elif score == best_score:
+                best.append(idx)
+        return best[0] if len(best) == 1 else self._prng.choice(best)
+
+    def on_start(self, replica_index: int) -> None:
+        if replica_index >= len(self._replicas):
+            return
+        self._replicas[replica_index].outstanding += 1
+
+    def on_complete(self, replica_index: int, latency_s: Optional[float]) -> None:
+        """
+        Records the end of a query that was started with `on_start()`. Pass
+        `None` for `latency_s` if the query failed (it is not recorded in the
+        latency average).
+        """
+        if replica_index >= len(self._replicas):
+            # The replica was removed while the query was running.
+            return
+        replica = self._replicas[replica_index]
+        replica.outstanding = max(0, replica.outstanding - 1)
+        if latency_s is None:
+            return
+        replica.completed += 1
+        if replica.ewma_latency_s is None:
+            replica.ewma_latency_s = latency_s
+        else:
+            replica.ewma_latency_s += self._ewma_alpha * (
+                latency_s - replica.ewma_latency_s
+            )
+
+    def take_metrics(self) -> List[ReplicaMetrics]:
+        """
+        Returns the current per-replica metrics. Completion counts are reset
+        after each call.
+        """
+        now = time.monotonic()
+        metrics = []
+        for idx, replica in enumerate(self._replicas):
+            metrics.append(
+                ReplicaMetrics(
+                    idx,
+                    replica.outstanding,
+                    replica.completed,
+                    replica.ewma_latency_s,
+                    self._weight(replica, now),
+                )
+            )
+            replica.completed = 0
+        return metrics
+
+    def _weight(self, replica: _ReplicaState, now: float) -> float:
+        if replica.added_at is None or self._slow_start_s <= 0.0:
+            return 1.0
+        elapsed = now - replica.added_at
+        if elapsed >= self._slow_start_s:
+            replica.added_at = None
+            return 1.0
+        frac = elapsed / self._slow_start_s
+        return self._min_weight + (1.0 - self._min_weight) * frac
+
+    def _default_latency(self) -> float:
+        # Replicas without any latency samples are assumed to be as fast as
+        # the average replica. If there are no samples at all, all replicas
+        # are treated equally.
+        known = [
+            replica.ewma_latency_s
+            for replica in self._replicas
+            if replica.ewma_latency_s is not None
+        ]
+        if len(known) == 0:
+            return 1.0
+        return sum(known) / len(known)
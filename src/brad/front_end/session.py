@@ -1,17 +1,23 @@
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
 from brad.config.session import SessionId
 from brad.blueprint.manager import BlueprintManager
+from brad.connection.connection import Connection
+from brad.front_end.connection_pool import ConnectionPool, EngineConnectionPools
 from brad.front_end.debug import ReestablishConnectionsReport
 from brad.front_end.engine_connections import EngineConnections
+from brad.front_end.replica_balancer import ReplicaLoadBalancer
+from brad.front_end.standby_connections import SessionConnections, StandbyConnections
 from brad.planner.estimator import Estimator
 from brad.routing.policy import RoutingPolicy
 from brad.routing.tree_based.forest_policy import ForestPolicy
+from brad.data_stats.pooled_estimator import PooledEstimator
 from brad.data_stats.postgres_estimator import PostgresEstimator
 from brad.data_stats.stub_estimator import StubEstimator
 from brad.utils.time_periods import universal_now
@@ -21,32 +27,169 @@ logger = logging.getLogger(__name__)
 
 class Session:
     """
-    Stores session-specific state (on the front end). Each session has its own
-    connections to the underlying engines. Create instances using
-    `SessionManager`.
+    Stores session-specific state (on the front end). By default, each session
+    has its own connections to the underlying engines. When connection pooling
+    is enabled, sessions instead borrow connections from front-end-wide pools
+    and only hold on to (pin) a connection while in a transaction, or after
+    running a session-scoped statement on it (see `pin_for_session()`). Create
+    instances using `SessionManager`.
+
+    Use `acquire_connection()` and `release_connection()` to run statements;
+    these work in both modes.
     """
 
     def __init__(
         self,
         session_id: SessionId,
-        engines: EngineConnections,
+        engines: Optional[EngineConnections],
         estimator: Optional[Estimator],
+        pools: Optional[EngineConnectionPools] = None,
+        replica_balancer: Optional[ReplicaLoadBalancer] = None,
     ):
+        assert (engines is None) != (pools is None)
         self._session_id = session_id
         self._engines = engines
+        self._pools = pools
+        self._replica_balancer = replica_balancer
         self._in_txn = False
         self._closed = False
         self._txn_start_timestamp = universal_now()
         self._estimator = estimator
 
+        # Engines with session state (e.g., from `SET SESSION`). See
+        # `pin_for_session()`.
+        self._session_state_engines: Set[Engine] = set()
+
+        # Used in pooled mode.
+        self._pinned: Dict[Engine, Tuple[ConnectionPool, Connection]] = {}
+        self._borrowed: Dict[int, ConnectionPool] = {}
+        # Connections to Aurora read replicas that are in use, along with the
+        # replica index and the time the statement started.
+        self._replica_leases: Dict[int, Tuple[int, float]] = {}
+
     @property
     def identifier(self) -> SessionId:
         return self._session_id
 
     @property
     def engines(self) -> EngineConnections:
+        if self._engines is None:
+            raise RuntimeError("Pooled sessions do not own engine connections.")
         return self._engines
 
+    @property
+    def is_pooled(self) -> bool:
+        return self._pools is not None
+
+    async def acquire_connection(self, engine: Engine, for_writes: bool) -> Connection:
+        """
+        Returns a connection to `engine` for running one statement. Reads that
+        are not part of a transaction may use an Aurora read replica (selected
+        by the front end's `ReplicaLoadBalancer`). Callers must pass the
+        connection to `release_connection()` once they have retrieved the
+        statement's results.
+        """
+        if engine in self._session_state_engines:
+            # Session state is set on the primary (writer) connection.
+            for_writes = True
+        replica_index = self._choose_replica(engine, for_writes)
+
+        if self._pools is None:
+            assert self._engines is not None
+            if for_writes:
+                conn = self._engines.get_connection(engine)
+            else:
+                conn = self._engines.get_reader_connection(engine, replica_index)
+            self._start_replica_lease(conn, replica_index)
+            return conn
+
+        if engine in self._pinned:
+            return self._pinned[engine][1]
+
+        pool = self._pools.pool_for(engine, for_writes, replica_index)
+        conn = await pool.acquire()
+        if self._in_txn or engine in self._session_state_engines:
+            self._pinned[engine] = (pool, conn)
+        else:
+            self._borrowed[id(conn)] = pool
+        self._start_replica_lease(conn, replica_index)
+        return conn
+
+    def release_connection(
+        self, connection: Connection, succeeded: bool = True
+    ) -> None:
+        """
+        Returns a connection obtained from `acquire_connection()`. Pinned
+        connections stay with the session until its transaction ends (or until
+        the session ends, for connections that hold session state). Set
+        `succeeded` to `False` if the statement failed (its latency is then
+        not used for replica load balancing).
+        """
+        lease = self._replica_leases.pop(id(connection), None)
+        if lease is not None and self._replica_balancer is not None:
+            replica_index, start = lease
+            self._replica_balancer.on_complete(
+                replica_index, time.monotonic() - start if succeeded else None
+            )
+
+        if self._pools is None:
+            return
+
+        pool = self._borrowed.pop(id(connection), None)
+        if pool is not None:
+            pool.release(connection)
+            return
+
+        if self._in_txn:
+            return
+        for engine, (pool, conn) in list(self._pinned.items()):
+            if conn is not connection:
+                continue
+            if engine in self._session_state_engines:
+                if conn.is_connected():
+                    return
+                # The session state was lost along with the connection.
+                self._session_state_engines.discard(engine)
+            del self._pinned[engine]
+            pool.release(conn)
+
+    def pin_for_session(self, engine: Engine) -> None:
+        """
+        Called before running a session-scoped statement (e.g., `SET SESSION`)
+        on `engine`. The statement and all later statements on `engine` then
+        run on the session's primary connection to the engine. In pooled mode,
+        the session keeps (pins) this connection until it ends, since the
+        setting would otherwise apply to other sessions that borrow the
+        connection. The connection is closed when the session ends.
+        """
+        self._session_state_engines.add(engine)
+
+    def _choose_replica(self, engine: Engine, for_writes: bool) -> Optional[int]:
+        if (
+            engine != Engine.Aurora
+            or for_writes
+            or self._replica_balancer is None
+            or engine in self._pinned
+        ):
+            return None
+        if self._engines is not None:
+            num_replicas = self._engines.num_aurora_read_replicas()
+        else:
+            assert self._pools is not None
+            num_replicas = self._pools.num_aurora_read_replicas()
+        if num_replicas == 0 or self._replica_balancer.num_replicas() != num_replicas:
+            # The replicas are being changed (e.g., during a transition).
+            return None
+        return self._replica_balancer.choose()
+
+    def _start_replica_lease(
+        self, connection: Connection, replica_index: Optional[int]
+    ) -> None:
+        if replica_index is None or self._replica_balancer is None:
+            return
+        self._replica_balancer.on_start(replica_index)
+        self._replica_leases[id(connection)] = (replica_index, time.monotonic())
+
     @property
     def in_transaction(self) -> bool:
         return self._in_txn
@@ -70,10 +213,23 @@ class Session:
 
     async def close(self):
         self._closed = True
-        await self._engines.close()
-        if self._estimator is not None:
+        if self._engines is not None:
+            await self._engines.close()
+        if self._estimator is not None and self._pools is None:
+            # Pooled sessions share their estimator.
             await self._estimator.close()
 
+        # The connections may still have an open transaction (or hold session
+        # state), so we do not return them to the pool.
+        for engine, (pool, conn) in self._pinned.items():
+            pool.release(
+                conn, discard=self._in_txn or engine in self._session_state_engines
+            )
+        self._pinned.clear()
+        self._session_state_engines.clear()
+        # N.B. Statements that are still running return their (borrowed)
+        # connections when they complete.
+
 
 class SessionManager:
     def __init__(
@@ -82,10 +238,16 @@ class SessionManager:
         blueprint_mgr: "BlueprintManager",
         schema_name: str,
         for_vdbes: bool = False,
+        first_id_value: int = 0,
+        id_stride: int = 1,
     ) -> None:
         self._config = config
         self._blueprint_mgr = blueprint_mgr
-        self._next_id_value = 0
+        # Front ends that share a port use disjoint session IDs so that a
+        # session ID sent to the wrong process is rejected rather than used
+        # to access another client's session.
+        self._next_id_value = first_id_value
+        self._id_stride = id_stride
         self._sessions: Dict[SessionId, Session] = {}
         # Eventually we will allow connections to multiple underlying "schemas"
         # (table namespaces).  There is no fundamental reason why we cannot
@@ -95,11 +257,98 @@ class SessionManager:
         self._schema_name = schema_name
         self._for_vdbes = for_vdbes
 
+        # Used when connection pooling is enabled. The pools and the estimator
+        # are shared by all sessions.
+        if config.connection_pooling():
+            self._pools: Optional[EngineConnectionPools] = EngineConnectionPools(
+                config, blueprint_mgr, schema_name
+            )
+        else:
+            self._pools = None
+        self._pools_initialized = False
+        self._shared_estimator: Optional[Estimator] = None
+
+        # Pre-established session connections (only used without pooling).
+        if self._pools is None and config.standby_session_connections() > 0:
+            self._standby: Optional[StandbyConnections] = StandbyConnections(
+                config.standby_session_connections(), self._connect_session
+            )
+        else:
+            self._standby = None
+
+        # Shared by all sessions to balance reads across Aurora replicas.
+        self._replica_balancer = ReplicaLoadBalancer()
+        self._replica_balancer_initialized = False
+
+    @property
+    def replica_balancer(self) -> ReplicaLoadBalancer:
+        return self._replica_balancer
+
+    def start_standby_connections(self) -> None:
+        """
+        Starts establishing the standby session connections (if enabled) in
+        the background. Call this once the front end has finished setting up
+        (the connections are established against the current blueprint).
+        """
+        if self._standby is not None:
+            self._standby.replenish()
+
     async def create_new_session(self) -> Tuple[SessionId, Session]:
         logger.debug("Creating a new session...")
         session_id = SessionId(self._next_id_value)
-        self._next_id_value += 1
+        self._next_id_value += self._id_stride
+
+        if not self._replica_balancer_initialized:
+            # Replicas that already exist when the front end starts up do not
+            # need a slow start.
+            self._replica_balancer.set_replicas(
+                self._aurora_read_replica_ids(), slow_start=False
+            )
+            self._replica_balancer_initialized = True
+
+        if self._pools is not None:
+            # Starting a pooled session does not establish any connections.
+            if not self._pools_initialized:
+                self._pools.refresh()
+                self._pools_initialized = True
+            if self._shared_estimator is None:
+                self._shared_estimator = await self._create_estimator(pooled=True)
+            session = Session(
+                session_id,
+                None,
+                self._shared_estimator,
+                pools=self._pools,
+                replica_balancer=self._replica_balancer,
+            )
+            self._sessions[session_id] = session
+            logger.debug("Established a new pooled session: %s", session_id)
+            return (session_id, session)
+
+        standby = self._standby.take() if self._standby is not None else None
+        if standby is not None:
+            connections, estimator = standby
+        else:
+            connections, estimator = await self._connect_session()
+
+        session = Session(
+            session_id,
+            connections,
+            estimator,
+            replica_balancer=self._replica_balancer,
+        )
+        self._sessions[session_id] = session
+        logger.debug(
+            "Established a new session: %s%s",
+            session_id,
+            " (standby)" if standby is not None else "",
+        )
+        return (session_id, session)
 
+    async def _connect_session(self) -> SessionConnections:
+        """
+        Establishes a dedicated set of connections for one session. The engine
+        connections and the estimator are set up concurrently.
+        """
         # Only connect to running engines.
         engines = {Engine.Athena}
         blueprint = self._blueprint_mgr.get_blueprint()
@@ -108,38 +357,77 @@ class SessionManager:
         if blueprint.redshift_provisioning().num_nodes() > 0:
             engines.add(Engine.Redshift)
 
-        connections = await EngineConnections.connect(
-            self._config,
-            self._blueprint_mgr.get_directory(),
-            self._schema_name,
-            specific_engines=engines,
-            connect_to_aurora_read_replicas=True,
+        # The estimator should be session-specific since it currently depends
+        # on a DB connection.
+        connections, estimator = await asyncio.gather(
+            EngineConnections.connect(
+                self._config,
+                self._blueprint_mgr.get_directory(),
+                self._schema_name,
+                specific_engines=engines,
+                connect_to_aurora_read_replicas=True,
+            ),
+            self._create_estimator(pooled=False),
+            return_exceptions=True,
         )
+        if isinstance(connections, BaseException):
+            if estimator is not None and not isinstance(estimator, BaseException):
+                await estimator.close()
+            raise connections
+        if isinstance(estimator, BaseException):
+            await connections.close()
+            raise estimator
+        return (connections, estimator)
+
+    def _expected_aurora_read_replicas(self) -> int:
+        blueprint = self._blueprint_mgr.get_blueprint()
+        return max(0, blueprint.aurora_provisioning().num_nodes() - 1)
 
-        # Create an estimator if needed. The estimator should be
-        # session-specific since it currently depends on a DB connection.
+    def _aurora_read_replica_ids(self) -> List[Optional[str]]:
+        """
+        The instance IDs of the read replicas that sessions connect to, by
+        replica index (`None` if the directory does not list the replica).
+        """
+        readers = self._blueprint_mgr.get_directory().aurora_readers()
+        return [
+            readers[idx].instance_id() if idx < len(readers) else None
+            for idx in range(self._expected_aurora_read_replicas())
+        ]
+
+    async def _create_estimator(self, pooled: bool) -> Optional[Estimator]:
+        """
+        Creates an estimator if the routing policy needs one. When `pooled` is
+        set, the returned estimator shares a bounded number of sidecar
+        connections and can be used by many sessions.
+        """
         routing_policy_override = self._config.routing_policy
-        if not self._for_vdbes and (
+        if self._for_vdbes or not (
             routing_policy_override == RoutingPolicy.ForestTableSelectivity
             or routing_policy_override == RoutingPolicy.Default
         ):
-            policy = blueprint.get_routing_policy()
-            requires_estimator = isinstance(policy.definite_policy, ForestPolicy)
-            if self._config.stub_mode_path() is None and requires_estimator:
-                estimator: Optional[Estimator] = await PostgresEstimator.connect(
+            return None
+
+        blueprint = self._blueprint_mgr.get_blueprint()
+        policy = blueprint.get_routing_policy()
+        requires_estimator = isinstance(policy.definite_policy, ForestPolicy)
+        estimator: Estimator
+        if self._config.stub_mode_path() is None and requires_estimator:
+            if pooled:
+
+                async def connect() -> Estimator:
+                    return await PostgresEstimator.connect(
+                        self._schema_name, self._config
+                    )
+
+                estimator = PooledEstimator(self._config.sidecar_pool_size(), connect)
+            else:
+                estimator = await PostgresEstimator.connect(
                     self._schema_name, self._config
                 )
-            else:
-                estimator = StubEstimator()
-            assert estimator is not None
-            await estimator.analyze(self._blueprint_mgr.get_blueprint())
         else:
-            estimator = None
-
-        session = Session(session_id, connections, estimator)
-        self._sessions[session_id] = session
-        logger.debug("Established a new session: %s", session_id)
-        return (session_id, session)
+            estimator = StubEstimator()
+        await estimator.analyze(blueprint)
+        return estimator
 
     def get_session(self, session_id: SessionId) -> Optional[Session]:
         if session_id not in self._sessions:
@@ -161,11 +449,29 @@ class SessionManager:
         await asyncio.gather(*end_tasks)
         self._sessions.clear()
 
+        if self._standby is not None:
+            await self._standby.close()
+
+        if self._shared_estimator is not None:
+            await self._shared_estimator.close()
+            self._shared_estimator = None
+        if self._pools is not None:
+            await self._pools.close()
+
     async def add_and_refresh_connections(self) -> None:
         """
         Used during blueprint transitions to add connections to newly started
         engines.
         """
+        self._replica_balancer.set_replicas(self._aurora_read_replica_ids())
+        if self._pools is not None:
+            self._pools.refresh()
+            if self._shared_estimator is not None:
+                await self._shared_estimator.analyze(
+                    self._blueprint_mgr.get_blueprint()
+                )
+            return
+
         blueprint = self._blueprint_mgr.get_blueprint()
         directory = self._blueprint_mgr.get_directory()
 
@@ -180,18 +486,28 @@ class SessionManager:
         # change is "atomic" - new sessions arriving after the blueprint are
         # refreshed will connect to the new instances. Another blueprint change
         # cannot happen until this is complete (because we notify the daemon).
+        if self._standby is not None:
+            self._standby.invalidate()
         existing_sessions = [session for session in self._sessions.values()]
-        for session in existing_sessions:
-            if session.closed:
-                continue
-            await session.engines.add_and_refresh_connections(
-                self._config, directory, expected_engines
-            )
+        await asyncio.gather(
+            *[
+                session.engines.add_and_refresh_connections(
+                    self._config, directory, expected_engines
+                )
+                for session in existing_sessions
+                if not session.closed
+            ]
+        )
 
     async def remove_connections(self) -> None:
         """
         Used during blueprint transitions to remove connections to stopped engines.
         """
+        self._replica_balancer.set_replicas(self._aurora_read_replica_ids())
+        if self._pools is not None:
+            self._pools.refresh()
+            return
+
         blueprint = self._blueprint_mgr.get_blueprint()
 
         expected_engines = {Engine.Athena}
@@ -204,14 +520,19 @@ class SessionManager:
         if blueprint.redshift_provisioning().num_nodes() > 0:
             expected_engines.add(Engine.Redshift)
 
+        if self._standby is not None:
+            self._standby.invalidate()
         # See the comment in `add_and_refresh_connections()`.
         existing_sessions = [session for session in self._sessions.values()]
-        for session in existing_sessions:
-            if session.closed:
-                continue
-            await session.engines.remove_connections(
-                expected_engines, expected_aurora_read_replicas
-            )
+        await asyncio.gather(
+            *[
+                session.engines.remove_connections(
+                    expected_engines, expected_aurora_read_replicas
+                )
+                for session in existing_sessions
+                if not session.closed
+            ]
+        )
 
     async def reestablish_connections(self) -> ReestablishConnectionsReport:
         """
@@ -225,21 +546,32 @@ class SessionManager:
         instead.
         """
         logger.debug("Attempting to reestablish connections...")
+        if self._pools is not None:
+            # Pools reconnect lazily.
+            self._pools.reset_all()
+            return ReestablishConnectionsReport()
+
+        if self._standby is not None:
+            # The standby connections were likely lost too.
+            self._standby.invalidate()
+
         directory = self._blueprint_mgr.get_directory()
-        sessions = [session for session in self._sessions.values()]
+        sessions = [
+            session for session in self._sessions.values() if not session.closed
+        ]
+        # All sessions reconnect concurrently. A failure in one session does
+        # not prevent the other sessions from reconnecting.
+        reports = await asyncio.gather(
+            *[
+                session.engines.reestablish_connections(self._config, directory)
+                for session in sessions
+            ]
+        )
         overall_report = ReestablishConnectionsReport()
-        for session in sessions:
-            if session.closed:
-                continue
-
-            report = await session.engines.reestablish_connections(
-                self._config, directory
-            )
+        for session, report in zip(sessions, reports):
             if session.closed:
                 continue
             overall_report.merge(report)
-            # Continue running since we still want to try connecting other
-            # sessions.
         logger.debug(
             "Reestablish connections succeeded? %s", str(overall_report.all_succeeded())
         )
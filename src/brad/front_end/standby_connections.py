@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple
+
+from brad.connection.connection import ConnectionFailed
+from brad.front_end.engine_connections import EngineConnections
+from brad.planner.estimator import Estimator
+from brad.utils.rand_exponential_backoff import RandomizedExponentialBackoff
+
+logger = logging.getLogger(__name__)
+
+SessionConnections = Tuple[EngineConnections, Optional[Estimator]]
+
+
+class StandbyConnections:
+    """
+    A warm standby pool of pre-established session connection sets (engine
+    connections and an estimator). New sessions take a set from this pool
+    instead of waiting for connections to be established; the pool is
+    replenished in the background.
+
+    Sets are established against the current blueprint. Call `invalidate()`
+    when the blueprint's engines change (or connections are lost) so that
+    stale sets are discarded.
+    """
+
+    def __init__(
+        self,
+        target_size: int,
+        connect_fn: Callable[[], Awaitable[SessionConnections]],
+    ) -> None:
+        self._target_size = target_size
+        self._connect_fn = connect_fn
+        self._ready: Deque[SessionConnections] = deque()
+        self._generation = 0
+        self._replenish_task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def take(self) -> Optional[SessionConnections]:
+        """
+        Returns a standby set of session connections, if one is available.
+        This also starts replenishing the pool.
+        """
+        result = self._ready.popleft() if len(self._ready) > 0 else None
+        self.replenish()
+        return result
+
+    def num_ready(self) -> int:
+        return len(self._ready)
+
+    def replenish(self) -> None:
+        """
+        Starts establishing connection sets in the background until the pool
+        reaches its target size.
+        """
+        if self._closed or self._target_size <= 0:
+            return
+        if self._replenish_task is not None and not self._replenish_task.done():
+            return
+        if len(self._ready) >= self._target_size:
+            return
+        self._replenish_task = asyncio.create_task(self._replenish())
+
+    def invalidate(self) -> None:
+        """
+        Discards all standby connection sets (including ones that are being
+        established) and starts replenishing the pool.
+        """
+        self._generation += 1
+        to_close = list(self._ready)
+        self._ready.clear()
+        for connections in to_close:
+            self._close_in_background(connections)
+        # An in-progress replenish task closes the (stale) connections it
+        # establishes once it finishes.
+        self._replenish_task = None
+        self.replenish()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._replenish_task is not None:
+            self._replenish_task.cancel()
+            try:
+                await self._replenish_task
+            except asyncio.CancelledError:
+                pass
+            self._replenish_task = None
+        to_close = list(self._ready)
+        self._ready.clear()
+        await asyncio.gather(*[self._close(connections) for connections in to_close])
+
+    async def _replenish(self) -> None:
+        generation = self._generation
+        backoff: Optional[RandomizedExponentialBackoff] = None
+        while not self._closed and generation == self._generation:
+            num_missing = self._target_size - len(self._ready)
+            if num_missing <= 0:
+                return
+
+            results = await asyncio.gather(
+                *[self._connect_fn() for _ in range(num_missing)],
+                return_exceptions=True,
+            )
+            failed = False
+            for result in results:
+                if isinstance(result, BaseException):
+                    if not isinstance(result, ConnectionFailed):
+                        logger.exception(
+                            "Unexpected error when establishing standby connections.",
+                            exc_info=result,
+                        )
+                    failed = True
+                elif self._closed or generation != self._generation:
+                    # The blueprint changed while we were connecting.
+                    self._close_in_background(result)
+                else:
+                    self._ready.append(result)
+
+            if not failed:
+                backoff = None
+                continue
+            if backoff is None:
+                backoff = RandomizedExponentialBackoff(
+                    max_retries=10, base_delay_s=0.5, max_delay_s=10.0
+                )
+            wait_time_s = backoff.wait_time_s()
+            if wait_time_s is None:
+                logger.warning(
+                    "Failed to establish standby session connections; will retry "
+                    "when the next session starts."
+                )
+                return
+            await asyncio.sleep(wait_time_s)
+
+    def _close_in_background(self, connections: SessionConnections) -> None:
+        task = asyncio.create_task(self._close(connections))
+        task.add_done_callback(_log_close_errors)
+
+    @staticmethod
+    async def _close(connections: SessionConnections) -> None:
+        engines, estimator = connections
+        await engines.close()
+        if estimator is not None:
+            await estimator.close()
+
+
+def _log_close_errors(task: "asyncio.Task[None]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Error when closing standby connections: %s", task.exception())
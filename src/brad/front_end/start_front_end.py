@@ -1,9 +1,9 @@
 import asyncio
 import logging
 import signal
-import multiprocessing as mp
 
 from brad.config.file import ConfigFile
+from brad.daemon.ipc_channel import IpcChannel
 from brad.front_end.front_end import BradFrontEnd
 from brad.front_end.vdbe.vdbe_front_end import BradVdbeFrontEnd
 from brad.provisioning.directory import Directory
@@ -20,8 +20,7 @@ def start_front_end(
     path_to_system_config: str,
     debug_mode: bool,
     directory: Directory,
-    input_queue: mp.Queue,
-    output_queue: mp.Queue,
+    channel: IpcChannel,
 ) -> None:
     """
     Schedule this method to run in a child process to launch a BRAD front
@@ -50,8 +49,7 @@ def start_front_end(
             path_to_system_config,
             debug_mode,
             directory,
-            input_queue,
-            output_queue,
+            channel,
         )
         event_loop.create_task(front_end.serve_forever())
         logger.info("BRAD front end %d is starting...", fe_index)
@@ -68,8 +66,7 @@ def start_vdbe_front_end(
     debug_mode: bool,
     directory: Directory,
     initial_infra: VirtualInfrastructure,
-    input_queue: mp.Queue,
-    output_queue: mp.Queue,
+    channel: IpcChannel,
 ) -> None:
     """
     Schedule this method to run in a child process to launch a BRAD front
@@ -101,8 +98,7 @@ def start_vdbe_front_end(
             debug_mode,
             directory,
             initial_infra,
-            input_queue,
-            output_queue,
+            channel,
         )
         event_loop.create_task(front_end.serve_forever())
         logger.info("BRAD VDBE front end is starting...")
@@ -0,0 +1,267 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from ddsketch import DDSketch
+
+from brad.config.engine import Engine
+from brad.front_end.errors import QueryError
+from brad.vdbe.models import VirtualEngine
+
+logger = logging.getLogger(__name__)
+
+# Bounds on the relative weights of VDBEs that share an engine.
+_MAX_WEIGHT = 8.0
+
+
+class AdmissionTicket:
+    """
+    Returned by `VdbeAdmissionController.admit()`. Must be passed to
+    `VdbeAdmissionController.release()` once the query completes.
+    """
+
+    __slots__ = ("vdbe_id", "queue_time_s", "_group")
+
+    def __init__(
+        self, vdbe_id: int, queue_time_s: float, group: "_EngineGroup"
+    ) -> None:
+        self.vdbe_id = vdbe_id
+        self.queue_time_s = queue_time_s
+        self._group = group
+
+
+class _VdbeState:
+    def __init__(self, slo_ms: int, engine: Engine) -> None:
+        self.slo_ms = slo_ms
+        self.engine = engine
+        self.weight = 1.0
+        self.last_finish_tag = 0.0
+        self.num_queued = 0
+        # Engine latencies observed since the last limit adjustment.
+        self.window_latencies: Optional[DDSketch] = None
+
+
+class _EngineGroup:
+    """
+    The VDBEs mapped to one engine. They share a concurrency limit.
+    """
+
+    def __init__(self, engine: Engine, limit: float, now: float) -> None:
+        self.engine = engine
+        self.limit = limit
+        self.in_flight = 0
+        self.virtual_time = 0.0
+        # (start tag, sequence number, VDBE id, waiter)
+        self.waiters: List[Tuple[float, int, int, asyncio.Future]] = []
+        self.last_adjustment = now
+        # Set if queries had to wait since the last limit adjustment.
+        self.saturated = False
+
+
+class VdbeAdmissionController:
+    """
+    Controls how many queries each engine runs on behalf of the VDBEs that are
+    mapped to it, so that a burst on one VDBE does not cause the other VDBEs
+    on the same engine to miss their latency SLOs.
+
+    - Each engine has a concurrency limit that is adjusted using additive
+      increase, multiplicative decrease (AIMD). Every `adjust_period_s`, if any
+      VDBE on the engine had a p90 engine latency above its
+      `p90_latency_slo_ms`, the limit is multiplied by `decrease_factor`.
+      Otherwise, if queries had to wait, the limit increases by one.
+    - Queries that cannot run immediately wait in a start-time fair queue.
+      VDBEs with tighter SLOs receive a larger share of the engine (up to 8x
+      the share of the VDBE with the loosest SLO).
+    - Queries are rejected with a transient error once a VDBE has
+      `max_queued` waiting queries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        max_queued: int,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.7,
+        adjust_period_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._min_concurrency = min(min_concurrency, max_concurrency)
+        self._max_queued = max_queued
+        self._decrease_factor = decrease_factor
+        self._adjust_period_s = adjust_period_s
+        self._clock = clock
+
+        self._vdbes: Dict[int, _VdbeState] = {}
+        self._groups: Dict[Engine, _EngineGroup] = {}
+        self._next_seq = 0
+        # Queue times since the last call to `take_queue_time_sketches()`.
+        self._queue_time_sketches: Dict[int, DDSketch] = {}
+
+    def update_vdbes(self, vdbes: Iterable[VirtualEngine]) -> None:
+        """
+        Must be called whenever the virtual infrastructure changes.
+        """
+        new_vdbes: Dict[int, _VdbeState] = {}
+        for vdbe in vdbes:
+            state = self._vdbes.get(vdbe.internal_id)
+            if state is None or state.engine != vdbe.mapped_to:
+                state = _VdbeState(vdbe.p90_latency_slo_ms, vdbe.mapped_to)
+            else:
+                state.slo_ms = vdbe.p90_latency_slo_ms
+            new_vdbes[vdbe.internal_id] = state
+            if vdbe.mapped_to not in self._groups:
+                self._groups[vdbe.mapped_to] = _EngineGroup(
+                    vdbe.mapped_to, float(self._max_concurrency), self._clock()
+                )
+        self._vdbes = new_vdbes
+
+        # Tighter SLOs receive larger weights.
+        loosest_slo_ms: Dict[Engine, int] = {}
+        for state in self._vdbes.values():
+            loosest_slo_ms[state.engine] = max(
+                loosest_slo_ms.get(state.engine, 1), state.slo_ms
+            )
+        for state in self._vdbes.values():
+            state.weight = min(
+                _MAX_WEIGHT, loosest_slo_ms[state.engine] / max(state.slo_ms, 1)
+            )
+
+    async def admit(self, vdbe_id: int) -> AdmissionTicket:
+        state = self._vdbes.get(vdbe_id)
+        if state is None:
+            raise QueryError(
+                "Invalid VDBE id {}".format(str(vdbe_id)), is_transient=False
+            )
+        group = self._groups[state.engine]
+
+        # Rejected queries do not advance the VDBE's finish tag (so they do not
+        # reduce its share of the engine).
+        start_tag = max(group.virtual_time, state.last_finish_tag)
+
+        if len(group.waiters) == 0 and group.in_flight < int(group.limit):
+            state.last_finish_tag = start_tag + 1.0 / state.weight
+            group.in_flight += 1
+            self._record_queue_time(vdbe_id, 0.0)
+            return AdmissionTicket(vdbe_id, 0.0, group)
+
+        if state.num_queued >= self._max_queued:
+            raise QueryError(
+                "Too many queued queries on VDBE {}. Please retry later.".format(
+                    str(vdbe_id)
+                ),
+                is_transient=True,
+            )
+
+        state.last_finish_tag = start_tag + 1.0 / state.weight
+        group.saturated = True
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(group.waiters, (start_tag, self._next_seq, vdbe_id, waiter))
+        self._next_seq += 1
+        state.num_queued += 1
+        enqueued_at = self._clock()
+        # Skips over cancelled waiters (and admits this query if possible).
+        self._dispatch(group)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # We were admitted, but the query will not run.
+                group.in_flight -= 1
+                self._dispatch(group)
+            raise
+        finally:
+            state.num_queued -= 1
+
+        queue_time_s = self._clock() - enqueued_at
+        self._record_queue_time(vdbe_id, queue_time_s)
+        return AdmissionTicket(vdbe_id, queue_time_s, group)
+
+    def release(
+        self, ticket: AdmissionTicket, engine_latency_s: Optional[float]
+    ) -> None:
+        """
+        Must be called after an admitted query completes. `engine_latency_s`
+        should be `None` if the query failed.
+        """
+        # pylint: disable-next=protected-access
+        group = ticket._group
+        group.in_flight -= 1
+
+        state = self._vdbes.get(ticket.vdbe_id)
+        if engine_latency_s is not None and state is not None:
+            if state.window_latencies is None:
+                state.window_latencies = DDSketch(relative_accuracy=0.01)
+            state.window_latencies.add(engine_latency_s)
+
+        now = self._clock()
+        if now - group.last_adjustment >= self._adjust_period_s:
+            self._adjust_limit(group)
+            group.last_adjustment = now
+
+        self._dispatch(group)
+
+    def concurrency_limit(self, engine: Engine) -> Optional[int]:
+        group = self._groups.get(engine)
+        return int(group.limit) if group is not None else None
+
+    def take_queue_time_sketches(self) -> List[Tuple[int, DDSketch]]:
+        """
+        Returns the queue times recorded since the last call, per VDBE.
+        """
+        sketches = list(self._queue_time_sketches.items())
+        self._queue_time_sketches = {}
+        return sketches
+
+    def _adjust_limit(self, group: _EngineGroup) -> None:
+        violated_slo = False
+        for vdbe_id, state in self._vdbes.items():
+            if state.engine != group.engine or state.window_latencies is None:
+                continue
+            p90_s = state.window_latencies.get_quantile_value(0.9)
+            state.window_latencies = None
+            if p90_s is not None and p90_s * 1000.0 > state.slo_ms:
+                logger.debug(
+                    "VDBE %d p90 latency (%.1f ms) exceeds its SLO (%d ms).",
+                    vdbe_id,
+                    p90_s * 1000.0,
+                    state.slo_ms,
+                )
+                violated_slo = True
+
+        prev_limit = int(group.limit)
+        if violated_slo:
+            group.limit = max(
+                float(self._min_concurrency), group.limit * self._decrease_factor
+            )
+        elif group.saturated:
+            group.limit = min(float(self._max_concurrency), group.limit + 1.0)
+        group.saturated = False
+
+        if int(group.limit) != prev_limit:
+            logger.debug(
+                "Adjusted the VDBE concurrency limit on %s: %d -> %d",
+                group.engine,
+                prev_limit,
+                int(group.limit),
+            )
+
+    def _dispatch(self, group: _EngineGroup) -> None:
+        while len(group.waiters) > 0 and group.in_flight < int(group.limit):
+            start_tag, _, _, waiter = heapq.heappop(group.waiters)
+            if waiter.done():
+                # The query was cancelled while waiting.
+                continue
+            group.virtual_time = start_tag
+            group.in_flight += 1
+            waiter.set_result(None)
+
+    def _record_queue_time(self, vdbe_id: int, queue_time_s: float) -> None:
+        try:
+            self._queue_time_sketches[vdbe_id].add(queue_time_s)
+        except KeyError:
+            sketch = DDSketch(relative_accuracy=0.01)
+            sketch.add(queue_time_s)
+            self._queue_time_sketches[vdbe_id] = sketch
@@ -0,0 +1,160 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from brad.connection.schema import Schema
+from brad.row_list import RowList
+
+CacheKey = Tuple[int, str]
+
+
+class _CachedResult:
+    __slots__ = ("rows", "schema", "tables", "computed_at")
+
+    def __init__(
+        self,
+        rows: RowList,
+        schema: Optional[Schema],
+        tables: Tuple[str, ...],
+        computed_at: float,
+    ) -> None:
+        self.rows = rows
+        self.schema = schema
+        self.tables = tables
+        self.computed_at = computed_at
+
+
+class VdbeResultCache:
+    """
+    Caches read-only query results per VDBE, keyed by (VDBE id, query text). A cached result is served while it is younger than the VDBE's
+    `max_staleness_ms` bound. Entries that read a table are dropped when data
+    sync applies changes to that table (or when a write to the table runs
+    through the VDBE front end).
+
+    The cache is only accessed from the front end's event loop, so it does not
+    use a lock.
+    """
+
+    def __init__(
+        self, max_entries: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _CachedResult]" = OrderedDict()
+        self._keys_by_table: Dict[str, Set[CacheKey]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def now(self) -> float:
+        """
+        The timestamp to pass to `put()`. Callers should read it *before*
+        running the query so that the result's age is not underestimated.
+        """
+        return self._clock()
+
+    def get(
+        self,
+        vdbe_id: int,
+        sql_query: str,
+        max_staleness_ms: int,
+        need_schema: bool,
+    ) -> Optional[Tuple[RowList, Optional[Schema]]]:
+        if max_staleness_ms <= 0:
+            return None
+        key = (vdbe_id, _cache_key_sql(sql_query))
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        age_ms = (self._clock() - entry.computed_at) * 1000.0
+        if age_ms > max_staleness_ms:
+            self._remove(key)
+            self._misses += 1
+            return None
+        if need_schema and entry.schema is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.rows, entry.schema
+
+    def put(
+        self,
+        vdbe_id: int,
+        sql_query: str,
+        tables: Iterable[str],
+        rows: RowList,
+        schema: Optional[Schema],
+        computed_at: float,
+    ) -> None:
+        if not self.enabled():
+            return
+        key = (vdbe_id, _cache_key_sql(sql_query))
+        if key in self._entries:
+            self._remove(key)
+        entry = _CachedResult(rows, schema, tuple(tables), computed_at)
+        self._entries[key] = entry
+        for table in entry.tables:
+            try:
+                self._keys_by_table[table].add(key)
+            except KeyError:
+                self._keys_by_table[table] = {key}
+        while len(self._entries) > self._max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Removes the cached results that read any of `tables`. Returns the
+        number of removed entries.
+        """
+        num_removed = 0
+        for table in tables:
+            keys = self._keys_by_table.pop(table, None)
+            if keys is None:
+                continue
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    num_removed += 1
+        return num_removed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_table.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Tuple[int, int]:
+        """
+        Returns the number of cache hits and misses so far.
+        """
+        return (self._hits, self._misses)
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        for table in entry.tables:
+            keys = self._keys_by_table.get(table)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if len(keys) == 0:
+                del self._keys_by_table[table]
+
+
+def _cache_key_sql(sql_query: str) -> str:
+    """
+    Removes surrounding whitespace and a trailing semicolon. Whitespace inside
+    the query is kept as-is because it may be part of a string literal (so
+    collapsing it could return another query's results).
+    """
+    key = sql_query.strip()
+    if key.endswith(";"):
+        key = key[:-1].rstrip()
+    return key
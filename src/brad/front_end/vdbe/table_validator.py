@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from brad.query_rep import QueryRep
+from brad.vdbe.models import VirtualEngine
+
+
+class VdbeTableValidator:
+    """
+    Checks that queries only access tables that are part of the VDBE that they
+    are submitted to.
+
+    Each VDBE's table allowlist is compiled into a frozen set, and the outcome
+    of validating a query string is cached per VDBE. Repeated queries are then
+    validated using a single dictionary lookup, without analyzing the query.
+    The cache must be reset whenever the virtual infrastructure changes.
+    """
+
+    def __init__(
+        self, vdbes: Iterable[VirtualEngine], max_entries_per_vdbe: int = 10_000
+    ) -> None:
+        self._max_entries_per_vdbe = max_entries_per_vdbe
+        self._allowlists: Dict[int, FrozenSet[str]] = {}
+        # Maps a query string to the tables it accesses and the first of them
+        # that the VDBE does not allow (or `None` if the query is valid).
+        self._results: Dict[
+            int, "OrderedDict[str, Tuple[Tuple[str, ...], Optional[str]]]"
+        ] = {}
+        self.reset(vdbes)
+
+    def reset(self, vdbes: Iterable[VirtualEngine]) -> None:
+        self._allowlists = {
+            vdbe.internal_id: frozenset(vdbe.table_names_set) for vdbe in vdbes
+        }
+        self._results = {vdbe_id: OrderedDict() for vdbe_id in self._allowlists}
+
+    def check(
+        self, vdbe_id: int, query_rep: QueryRep
+    ) -> Tuple[Tuple[str, ...], Optional[str]]:
+        """
+        Returns the tables accessed by the query along with the first of those
+        tables that is not part of the VDBE (`None` if the query only accesses
+        the VDBE's tables).
+        """
+        results = self._results.get(vdbe_id)
+        if results is None:
+            # Unknown VDBEs have no tables.
+            tables = tuple(query_rep.tables())
+            return tables, (tables[0] if len(tables) > 0 else None)
+
+        sql = query_rep.raw_query
+        try:
+            return results[sql]
+        except KeyError:
+            pass
+
+        allowlist = self._allowlists[vdbe_id]
+        tables = tuple(query_rep.tables())
+        if allowlist.issuperset(tables):
+            result: Tuple[Tuple[str, ...], Optional[str]] = (tables, None)
+        else:
+            result = (tables, next(t for t in tables if t not in allowlist))
+
+        results[sql] = result
+        if len(results) > self._max_entries_per_vdbe:
+            # Evicts in insertion order. We do not reorder on hits to keep the
+            # hot path to a single lookup.
+            results.popitem(last=False)
+        return result
@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import ssl
-import multiprocessing as mp
 import redshift_connector.error as redshift_errors
 import psycopg
 import struct
@@ -11,24 +10,34 @@ from ddsketch import DDSketch
 import pyodbc
 
 from brad.asset_manager import AssetManager
+from brad.blueprint.diff.delta import BlueprintDelta
 from brad.blueprint.manager import BlueprintManager
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
-from brad.connection.connection import ConnectionFailed
+from brad.connection.connection import Connection, ConnectionFailed
+from brad.connection.executor import EngineExecutors
 from brad.connection.schema import Schema
+from brad.daemon.ipc_channel import IpcChannel, IpcChannelClosed
 from brad.daemon.monitor import Monitor
 from brad.daemon.messages import (
+    DirectoryUpdated,
     ShutdownFrontEnd,
-    Sentinel,
     VdbeMetricsReport,
     NewBlueprint,
     NewBlueprintAck,
     ReconcileVirtualInfrastructure,
     ReconcileVirtualInfrastructureAck,
+    TablesSynced,
 )
 from brad.front_end.errors import QueryError
 from brad.front_end.session import SessionManager, SessionId
 from brad.front_end.watchdog import Watchdog
+from brad.front_end.vdbe.admission_control import (
+    AdmissionTicket,
+    VdbeAdmissionController,
+)
+from brad.front_end.vdbe.result_cache import VdbeResultCache
+from brad.front_end.vdbe.table_validator import VdbeTableValidator
 from brad.front_end.vdbe.vdbe_endpoint_manager import VdbeEndpointManager
 from brad.provisioning.directory import Directory
 from brad.row_list import RowList
@@ -36,7 +45,8 @@ from brad.utils import log_verbose, create_custom_logger
 from brad.utils.rand_exponential_backoff import RandomizedExponentialBackoff
 from brad.utils.run_time_reservoir import RunTimeReservoir
 from brad.utils.time_periods import universal_now
-from brad.query_rep import QueryRep
+from brad.parse_cache import ParseCache
+from brad.query_rep import QueryRep, load_parse_cache, save_parse_cache
 from brad.vdbe.manager import VdbeFrontEndManager
 from brad.vdbe.models import VirtualInfrastructure
 
@@ -56,8 +66,7 @@ class BradVdbeFrontEnd:
         debug_mode: bool,
         initial_directory: Directory,
         initial_infra: VirtualInfrastructure,
-        input_queue: mp.Queue,
-        output_queue: mp.Queue,
+        channel: IpcChannel,
     ):
         self._main_thread_loop: Optional[asyncio.AbstractEventLoop] = None
 
@@ -65,13 +74,9 @@ class BradVdbeFrontEnd:
         self._schema_name = schema_name
         self._debug_mode = debug_mode
 
-        # Used for IPC with the daemon. Eventually we will use RPC to
-        # communicate with the daemon. But there's currently no need for
-        # something fancy here.
-        # Used for messages sent from the daemon to this front end server.
-        self._input_queue = input_queue
-        # Used for messages sent from this front end server to the daemon.
-        self._output_queue = output_queue
+        # Used for IPC with the daemon (messages flow in both directions). It
+        # is opened when the front end starts up.
+        self._daemon_channel = channel
 
         self._assets = AssetManager(self._config)
         self._blueprint_mgr = BlueprintManager(
@@ -126,6 +131,21 @@ class BradVdbeFrontEnd:
         self._is_stub_mode = self._config.stub_mode_path() is not None
 
         self._vdbe_mgr = VdbeFrontEndManager(initial_infra)
+        self._table_validator = VdbeTableValidator(self._vdbe_mgr.engines())
+        self._result_cache = VdbeResultCache(
+            self._config.vdbe_result_cache_max_entries()
+        )
+        max_engine_concurrency = self._config.vdbe_max_engine_concurrency()
+        if max_engine_concurrency is not None:
+            self._admission_control: Optional[VdbeAdmissionController] = (
+                VdbeAdmissionController(
+                    max_concurrency=max_engine_concurrency,
+                    max_queued=self._config.vdbe_max_queued_queries(),
+                )
+            )
+            self._admission_control.update_vdbes(self._vdbe_mgr.engines())
+        else:
+            self._admission_control = None
         self._endpoint_mgr = VdbeEndpointManager(
             vdbe_mgr=self._vdbe_mgr,
             session_mgr=self._sessions,
@@ -146,6 +166,12 @@ class BradVdbeFrontEnd:
 
     async def _run_setup(self) -> None:
         self._main_thread_loop = asyncio.get_running_loop()
+        await self._daemon_channel.open()
+        EngineExecutors.instance().configure(self._config.engine_executor_threads())
+        ParseCache.instance().set_max_entries(self._config.parse_cache_max_entries())
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            load_parse_cache(parse_cache_path)
 
         # The directory will have been populated by the daemon.
         await self._blueprint_mgr.load(skip_directory_refresh=True)
@@ -169,13 +195,14 @@ class BradVdbeFrontEnd:
         # Start all VDBE endpoints.
         await self._endpoint_mgr.initialize()
 
+        # Warm up the standby session connections so that the first sessions
+        # do not need to wait for connections to be established.
+        self._sessions.start_standby_connections()
+
     async def _run_teardown(self):
         # Stop all VDBE endpoints (this will also end the sessions).
         await self._endpoint_mgr.shutdown()
 
-        # Important for unblocking our message reader thread.
-        self._input_queue.put(Sentinel(self.NUMERIC_IDENTIFIER))
-
         if self._daemon_messages_task is not None:
             self._daemon_messages_task.cancel()
             self._daemon_messages_task = None
@@ -189,6 +216,12 @@ class BradVdbeFrontEnd:
             self._ping_watchdog_task.cancel()
             self._ping_watchdog_task = None
 
+        await self._daemon_channel.close()
+        EngineExecutors.instance().shutdown()
+        parse_cache_path = self._config.parse_cache_snapshot_path()
+        if parse_cache_path is not None:
+            save_parse_cache(parse_cache_path)
+
     async def start_session(self) -> SessionId:
         rand_backoff = None
         while True:
@@ -245,6 +278,14 @@ class BradVdbeFrontEnd:
                 "Invalid VDBE id {}".format(str(vdbe_id)), is_transient=False
             )
 
+        # The connection used to run the query (returned to the session once
+        # the results have been retrieved).
+        leased_connection: Optional[Connection] = None
+        query_failed = False
+        # Set if the query was admitted by the admission controller.
+        admission_ticket: Optional[AdmissionTicket] = None
+        engine_latency_s: Optional[float] = None
+
         try:
             # Remove any trailing or leading whitespace. Remove the trailing
             # semicolon if it exists.
@@ -254,14 +295,43 @@ class BradVdbeFrontEnd:
 
             # Verify that the query is not accessing tables that are not part of
             # the VDBE.
-            for table_name in query_rep.tables():
-                if table_name not in vdbe.table_names_set:
-                    raise QueryError(
-                        f"Table '{table_name}' not found in VDBE '{vdbe.name}'",
-                        is_transient=False,
-                    )
+            tables, table_name = self._table_validator.check(vdbe_id, query_rep)
+            if table_name is not None:
+                raise QueryError(
+                    f"Table '{table_name}' not found in VDBE '{vdbe.name}'",
+                    is_transient=False,
+                )
 
             engine_to_use = vdbe.mapped_to
+            debug_info["executor"] = engine_to_use
+
+            # Serve repeated reads from the result cache if the cached result
+            # is within the VDBE's staleness bound.
+            is_data_modification = query_rep.is_data_modification_query()
+            cacheable = (
+                self._result_cache.enabled()
+                and not is_data_modification
+                and vdbe.max_staleness_ms > 0
+                and len(tables) > 0
+            )
+            if cacheable:
+                cached = self._result_cache.get(
+                    vdbe_id,
+                    query_rep.raw_query,
+                    vdbe.max_staleness_ms,
+                    need_schema=retrieve_schema,
+                )
+                if cached is not None:
+                    # Cache hits are not recorded in the latency sketches
+                    # because they do not reflect the engine's performance
+                    # (which is what the VDBE's latency is monitored for).
+                    log_verbose(
+                        logger,
+                        "[S%d] Served '%s' from the result cache",
+                        session_id.value(),
+                        query,
+                    )
+                    return cached
 
             log_verbose(
                 logger,
@@ -270,11 +340,21 @@ class BradVdbeFrontEnd:
                 query,
                 engine_to_use,
             )
-            debug_info["executor"] = engine_to_use
+
+            # Wait for our turn to run on the engine (if enabled).
+            if self._admission_control is not None:
+                admission_ticket = await self._admission_control.admit(vdbe_id)
 
             # 3. Actually execute the query.
             try:
-                connection = session.engines.get_reader_connection(engine_to_use)
+                connection = await session.acquire_connection(
+                    engine_to_use, for_writes=False
+                )
+            except ConnectionFailed as ex:
+                raise QueryError.from_exception(ex, is_transient=True)
+            leased_connection = connection
+
+            try:
                 cursor = connection.cursor_sync()
                 # HACK: To work around dialect differences between
                 # Athena/Aurora/Redshift for now. This should be replaced by
@@ -283,6 +363,7 @@ class BradVdbeFrontEnd:
                     translated_query = query_rep.raw_query.replace("ascii", "codepoint")
                 else:
                     translated_query = query_rep.raw_query
+                computed_at = self._result_cache.now()
                 start = universal_now()
                 await cursor.execute(translated_query)
                 end = universal_now()
@@ -312,16 +393,14 @@ class BradVdbeFrontEnd:
 
             # Record the run time for later reporting.
             run_time_s = end - start
-            run_time_s_float = run_time_s.total_seconds()
-            try:
-                self._query_latency_sketches[vdbe_id].add(run_time_s_float)
-            except KeyError:
-                self._query_latency_sketches[vdbe_id] = self._get_empty_sketch()
-                self._query_latency_sketches[vdbe_id].add(run_time_s_float)
+            engine_latency_s = run_time_s.total_seconds()
+            self._record_query_latency(vdbe_id, engine_latency_s)
 
             # fetchall() may raise an error if the query does not produce output
             # (e.g., INSERT).
-            if query_rep.is_data_modification_query():
+            if is_data_modification:
+                # Cached results that read the modified tables are now stale.
+                self._result_cache.invalidate_tables(tables)
                 return ([], Schema.empty() if retrieve_schema else None)
 
             # Extract and return the results, if any.
@@ -330,7 +409,10 @@ class BradVdbeFrontEnd:
                 if result_row_limit is not None:
                     results = []
                     for _ in range(result_row_limit):
-                        row = cursor.fetchone_sync()
+                        if connection.is_async_native():
+                            row = await cursor.fetchone()
+                        else:
+                            row = cursor.fetchone_sync()
                         if row is None:
                             break
                         results.append(tuple(row))
@@ -339,14 +421,26 @@ class BradVdbeFrontEnd:
                         "Responded with %d rows (limited to %d rows).",
                         len(results),
                     )
+                elif connection.is_async_native():
+                    results = [tuple(row) for row in await cursor.fetchall()]
+                    log_verbose(logger, "Responded with %d rows.", len(results))
                 else:
                     # Using `fetchall_sync()` is lower overhead than the async interface.
                     results = [tuple(row) for row in cursor.fetchall_sync()]
                     log_verbose(logger, "Responded with %d rows.", len(results))
-                return (
-                    results,
-                    (cursor.result_schema(results) if retrieve_schema else None),
+                result_schema = (
+                    cursor.result_schema(results) if retrieve_schema else None
                 )
+                if cacheable:
+                    self._result_cache.put(
+                        vdbe_id,
+                        query_rep.raw_query,
+                        tables,
+                        results,
+                        result_schema,
+                        computed_at,
+                    )
+                return (results, result_schema)
             except (pyodbc.ProgrammingError, psycopg.ProgrammingError):
                 log_verbose(logger, "No rows produced.")
                 return ([], Schema.empty() if retrieve_schema else None)
@@ -367,6 +461,7 @@ class BradVdbeFrontEnd:
         except QueryError as ex:
             # This is an expected exception. We catch and re-raise it here to
             # avoid triggering the handler below.
+            query_failed = True
             logger.debug("Query error: %s", repr(ex))
             if self._verbose_logger is not None:
                 if ex.is_transient():
@@ -375,15 +470,23 @@ class BradVdbeFrontEnd:
                     self._verbose_logger.exception("Non-transient error")
             raise
         except Exception as ex:
+            query_failed = True
             logger.exception("Encountered unexpected exception when handling request.")
             raise QueryError.from_exception(ex)
+        finally:
+            if leased_connection is not None:
+                session.release_connection(
+                    leased_connection, succeeded=not query_failed
+                )
+            if admission_ticket is not None:
+                assert self._admission_control is not None
+                self._admission_control.release(admission_ticket, engine_latency_s)
 
     async def _read_daemon_messages(self) -> None:
-        assert self._input_queue is not None
         loop = asyncio.get_running_loop()
         while True:
             try:
-                message = await loop.run_in_executor(None, self._input_queue.get)
+                message = await self._daemon_channel.recv()
                 if message.fe_index != self.NUMERIC_IDENTIFIER:
                     logger.warning(
                         "Received message with invalid front end index. Expected %d. Received %d.",
@@ -397,6 +500,9 @@ class BradVdbeFrontEnd:
                     loop.create_task(_orchestrate_shutdown(self))
                     break
 
+                elif isinstance(message, DirectoryUpdated):
+                    await self._run_directory_update(message.updated_directory)
+
                 elif isinstance(message, NewBlueprint):
                     logger.info(
                         "Received notification to update to blueprint version %d",
@@ -404,25 +510,38 @@ class BradVdbeFrontEnd:
                     )
                     # This refreshes any cached state that depends on the old blueprint.
                     await self._run_blueprint_update(
-                        message.version, message.updated_directory
+                        message.version, message.updated_directory, message.delta
                     )
                     # Tell the daemon that we have updated.
-                    self._output_queue.put(
-                        NewBlueprintAck(self.NUMERIC_IDENTIFIER, message.version),
-                        block=False,
+                    await self._daemon_channel.send(
+                        NewBlueprintAck(self.NUMERIC_IDENTIFIER, message.version)
                     )
                     logger.info(
                         "Acknowledged update to blueprint version %d", message.version
                     )
 
+                elif isinstance(message, TablesSynced):
+                    num_removed = self._result_cache.invalidate_tables(
+                        message.table_names
+                    )
+                    logger.debug(
+                        "Data sync updated %d tables. Removed %d cached results.",
+                        len(message.table_names),
+                        num_removed,
+                    )
+
                 elif isinstance(message, ReconcileVirtualInfrastructure):
                     self._vdbe_mgr.update_infra(message.virtual_infra)
+                    self._table_validator.reset(self._vdbe_mgr.engines())
+                    if self._admission_control is not None:
+                        self._admission_control.update_vdbes(self._vdbe_mgr.engines())
+                    # VDBE definitions (e.g., mappings) may have changed.
+                    self._result_cache.clear()
                     num_added, num_removed = await self._endpoint_mgr.reconcile()
-                    self._output_queue.put(
+                    await self._daemon_channel.send(
                         ReconcileVirtualInfrastructureAck(
                             self.NUMERIC_IDENTIFIER, num_added, num_removed
-                        ),
-                        block=False,
+                        )
                     )
                     logger.info(
                         "Acknowledged virtual infrastructure update. Added %d and removed %d.",
@@ -432,6 +551,9 @@ class BradVdbeFrontEnd:
 
                 else:
                     logger.info("Received message from the daemon: %s", message)
+            except IpcChannelClosed:
+                logger.warning("The daemon closed the IPC channel.")
+                break
             except Exception as ex:
                 if not isinstance(ex, asyncio.CancelledError):
                     logger.exception(
@@ -461,12 +583,23 @@ class BradVdbeFrontEnd:
                 logger.info(
                     "Sending VDBE metrics report for %d VDBEs", len(report_data)
                 )
+                if self._admission_control is not None:
+                    queue_time_data = self._admission_control.take_queue_time_sketches()
+                    for vdbe_id, sketch in queue_time_data:
+                        queue_p90 = sketch.get_quantile_value(0.9)
+                        if queue_p90 is not None:
+                            logger.debug(
+                                "VDBE %d Queue time p90 (s): %.4f", vdbe_id, queue_p90
+                            )
+                else:
+                    queue_time_data = []
 
-                # If the input queue is full, we just drop this message.
+                # If the outgoing buffer is full, we just drop this message.
                 metrics_report = VdbeMetricsReport.from_data(
-                    self.NUMERIC_IDENTIFIER, report_data
+                    self.NUMERIC_IDENTIFIER, report_data, queue_time_data
                 )
-                self._output_queue.put_nowait(metrics_report)
+                if not self._daemon_channel.send_nowait(metrics_report):
+                    logger.warning("Dropped a metrics report (IPC buffer is full).")
                 self._reset_latency_sketches()
 
         except Exception as ex:
@@ -490,9 +623,13 @@ class BradVdbeFrontEnd:
                 logger.exception("Watchdog ping task encountered exception.")
 
     async def _run_blueprint_update(
-        self, version: int, updated_directory: Directory
+        self,
+        version: int,
+        updated_directory: Directory,
+        delta: Optional[BlueprintDelta],
     ) -> None:
-        await self._blueprint_mgr.load(skip_directory_refresh=True)
+        if delta is None or not self._blueprint_mgr.apply_delta(version, delta):
+            await self._blueprint_mgr.load(skip_directory_refresh=True)
         self._blueprint_mgr.get_directory().update_to_directory(updated_directory)
         active_version = self._blueprint_mgr.get_active_blueprint_version()
         if version != active_version:
@@ -514,6 +651,15 @@ class BradVdbeFrontEnd:
         await self._sessions.remove_connections()
         logger.info("Completed transition to blueprint version %d", version)
 
+    async def _run_directory_update(self, updated_directory: Directory) -> None:
+        self._blueprint_mgr.get_directory().update_to_directory(updated_directory)
+        directory = self._blueprint_mgr.get_directory()
+        logger.info("Loaded updated directory: %s", directory)
+        if self._monitor is not None:
+            self._monitor.update_metrics_sources()
+        await self._sessions.add_and_refresh_connections()
+        await self._sessions.remove_connections()
+
     def _schedule_reestablish_connections(self) -> None:
         if self._reestablish_connections_task is not None:
             return
@@ -575,6 +721,13 @@ class BradVdbeFrontEnd:
             logger.exception("Unexpected failure when reestablishing connections.")
             self._reestablish_connections_task = None
 
+    def _record_query_latency(self, vdbe_id: int, run_time_s: float) -> None:
+        try:
+            self._query_latency_sketches[vdbe_id].add(run_time_s)
+        except KeyError:
+            self._query_latency_sketches[vdbe_id] = self._get_empty_sketch()
+            self._query_latency_sketches[vdbe_id].add(run_time_s)
+
     def _reset_latency_sketches(self) -> None:
         self._query_latency_sketches.clear()
 
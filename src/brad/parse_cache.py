@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedQuery:
+    """
+    The facts about a query that BRAD derives by parsing it (see `QueryRep`).
+    """
+
+    __slots__ = ("normalized_sql", "tables", "functionality")
+
+    def __init__(
+        self, normalized_sql: str, tables: Tuple[str, ...], functionality: int
+    ) -> None:
+        self.normalized_sql = normalized_sql
+        self.tables = tables
+        self.functionality = functionality
+
+    def __repr__(self) -> str:
+        return f"ParsedQuery(tables={self.tables}, functionality={self.functionality})"
+
+
+class ParseCache:
+    """
+    A process-wide, size-bounded (LRU) cache of parsed query facts, keyed by
+    the query's fingerprint. This lets BRAD avoid re-parsing SQL strings that it
+    has already seen (e.g., the same workload queries in every replan).
+
+    The cache can be saved to and loaded from an on-disk snapshot so that the
+    daemon and front ends start with a warm cache.
+    """
+
+    @classmethod
+    def instance(cls) -> "ParseCache":
+        global _INSTANCE  # pylint: disable=global-statement
+        if _INSTANCE is None:
+            _INSTANCE = cls(max_entries=50_000)
+        return _INSTANCE
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedQuery]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        # Queries may be analyzed off the event loop thread.
+        self._lock = threading.Lock()
+
+    def set_max_entries(self, max_entries: int) -> None:
+        with self._lock:
+            self._max_entries = max_entries
+            self._evict()
+
+    def get_or_compute(
+        self,
+        sql_query: str,
+        compute_fn: Callable[[str], Tuple[List[str], int]],
+    ) -> ParsedQuery:
+        """
+        Returns the cached facts for `sql_query`, computing them with
+        `compute_fn` (which returns the query's tables and functionality bitmap)
+        on a cache miss.
+        """
+        normalized = normalize_sql(sql_query)
+        key = fingerprint(normalized)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return parsed
+            self._misses += 1
+
+        # Parse outside the lock.
+        tables, functionality = compute_fn(sql_query)
+        parsed = ParsedQuery(normalized, tuple(tables), functionality)
+        with self._lock:
+            self._entries[key] = parsed
+            self._evict()
+        return parsed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Tuple[int, int]:
+        """
+        Returns the number of cache hits and misses so far.
+        """
+        return (self._hits, self._misses)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path: pathlib.Path, version: str) -> None:
+        """
+        Writes a snapshot of the cache to `path`. Entries in an existing
+        snapshot (e.g., one written by another BRAD process) are kept if there
+        is room. The snapshot is replaced atomically.
+        """
+        existing = self._read_snapshot(path, version)
+        with self._lock:
+            entries = [
+                (key, parsed)
+                for key, parsed in existing.items()
+                if key not in self._entries
+            ]
+            entries.extend(self._entries.items())
+        # Keep the most recently used entries (they are at the end).
+        entries = entries[-self._max_entries :]
+
+        serialized = {
+            "version": version,
+            "entries": [
+                [key, parsed.normalized_sql, list(parsed.tables), parsed.functionality]
+                for key, parsed in entries
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".tmp{os.getpid()}")
+        with open(tmp_path, "w", encoding="UTF-8") as file:
+            json.dump(serialized, file)
+        os.replace(tmp_path, path)
+        logger.info("Saved %d parsed queries to %s", len(entries), path)
+
+    def load(self, path: pathlib.Path, version: str) -> int:
+        """
+        Adds the entries in the snapshot at `path` to the cache (entries that
+        are already cached take precedence). Snapshots written with a different
+        `version` of the query analysis are ignored. Returns the number of
+        entries loaded.
+        """
+        existing = self._read_snapshot(path, version)
+        with self._lock:
+            num_loaded = 0
+            older: "OrderedDict[str, ParsedQuery]" = OrderedDict()
+            for key, parsed in existing.items():
+                if key in self._entries:
+                    continue
+                older[key] = parsed
+                num_loaded += 1
+            # Loaded entries are treated as less recently used.
+            older.update(self._entries)
+            self._entries = older
+            self._evict()
+        logger.info("Loaded %d parsed queries from %s", num_loaded, path)
+        return num_loaded
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _read_snapshot(path: pathlib.Path, version: str) -> Dict[str, ParsedQuery]:
+        try:
+            with open(path, "r", encoding="UTF-8") as file:
+                raw = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable parse cache snapshot: %s", path)
+            return {}
+
+        if raw.get("version") != version:
+            logger.info(
+                "Ignoring parse cache snapshot %s written with a different "
+                "query analysis version.",
+                path,
+            )
+            return {}
+        return {
+            key: ParsedQuery(normalized_sql, tuple(tables), functionality)
+            for key, normalized_sql, tables, functionality in raw["entries"]
+        }
+
+
+def normalize_sql(sql_query: str) -> str:
+    """
+    Collapses whitespace and removes a trailing semicolon. These differences do
+    not change a query's parsed facts.
+    """
+    normalized = " ".join(sql_query.split())
+    if normalized.endswith(";"):
+        normalized = normalized[:-1].rstrip()
+    return normalized
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.blake2b(normalized_sql.encode("UTF-8"), digest_size=16).hexdigest()
+
+
+_INSTANCE: Optional[ParseCache] = None
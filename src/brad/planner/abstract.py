@@ -9,6 +9,7 @@ from brad.config.system_event import SystemEvent
 from brad.daemon.system_event_logger import SystemEventLogger
 from brad.planner.providers import BlueprintProviders
 from brad.planner.scoring.score import Score
+from brad.planner.triggers.evaluator import TriggerEvaluator
 from brad.planner.triggers.trigger import Trigger
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,7 @@ class BlueprintPlanner:
         self._triggers = self._providers.trigger_provider.get_triggers()
         for t in self._triggers:
             t.update_blueprint(self._current_blueprint, self._current_blueprint_score)
+        self._trigger_evaluator = TriggerEvaluator(self._triggers)
 
     async def run_forever(self) -> None:
         """
@@ -78,16 +80,20 @@ class BlueprintPlanner:
         while True:
             logger.debug("Planner is checking if a replan is needed...")
             if not self._replan_in_progress and not self._disable_triggers:
-                for t in self.get_triggers():
-                    if await t.should_replan():
-                        logger.info("Starting a triggered replan...")
-                        if self._system_event_logger is not None:
-                            self._system_event_logger.log(
-                                SystemEvent.TriggeredReplan,
-                                "trigger={}".format(t.name()),
-                            )
-                        await self.run_replan(trigger=t)
-                        break
+                # All triggers read the same metrics (taken after the
+                # monitor's most recent fetch).
+                metrics = await self._providers.trigger_provider.metrics_snapshot(
+                    self._trigger_evaluator.metrics_lookback_epochs()
+                )
+                fired = await self._trigger_evaluator.evaluate(metrics)
+                if fired is not None:
+                    logger.info("Starting a triggered replan...")
+                    if self._system_event_logger is not None:
+                        self._system_event_logger.log(
+                            SystemEvent.TriggeredReplan,
+                            "trigger={}".format(fired.name()),
+                        )
+                    await self.run_replan(trigger=fired)
             else:
                 logger.debug(
                     "A replan is already in progress or triggers are temporarily disabled. Skipping the trigger check."
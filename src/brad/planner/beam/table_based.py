@@ -141,6 +141,8 @@ class TableBasedBeamPlanner(BlueprintPlanner):
         ctx.compute_engine_latency_norm_factor()
         ctx.compute_current_workload_predicted_hourly_scan_cost()
         ctx.compute_current_blueprint_provisioning_hourly_cost()
+        # Used to only re-route the queries affected by a placement change.
+        ctx.compute_next_queries_by_table()
 
         comparator = self._providers.comparator_provider.get_comparator(
             metrics,
@@ -2,7 +2,7 @@ import logging
 import numpy as np
 import numpy.typing as npt
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Iterable, Tuple
+from typing import Any, Dict, List, Optional, Iterable, Set, Tuple
 
 from brad.blueprint import Blueprint
 from brad.blueprint.provisioning import Provisioning, MutableProvisioning
@@ -18,9 +18,8 @@ from brad.planner.scoring.provisioning import (
     compute_aurora_hourly_operational_cost,
     compute_redshift_hourly_operational_cost,
     compute_aurora_scan_cost,
-    compute_aurora_accessed_pages,
     compute_athena_scan_cost,
-    compute_athena_scanned_bytes,
+    compute_athena_scanned_bytes_sum,
     compute_aurora_transition_time_s,
     compute_redshift_transition_time_s,
 )
@@ -78,6 +77,13 @@ class BlueprintCandidate(ComparableBlueprint):
         self.query_locations[Engine.Redshift] = []
         self.query_locations[Engine.Athena] = []
 
+        # The engine each query in `self.queries` is routed to.
+        self.query_engines: Dict[int, Engine] = {}
+
+        # Tables whose placement changed since the last query cluster was
+        # added. Only queries referencing these tables need to be re-routed.
+        self._changed_tables: Set[str] = set()
+
         self.scaled_query_latencies: Dict[Engine, npt.NDArray] = {}
 
         # Scoring components.
@@ -90,6 +96,13 @@ class BlueprintCandidate(ComparableBlueprint):
         self.aurora_accessed_pages = 0
         self.table_movement_trans_cost = 0.0
 
+        # Running totals over the queries routed to each engine, used to
+        # incrementally maintain `aurora_accessed_pages` and
+        # `athena_scanned_bytes` as queries are (re-)routed.
+        self._aurora_pages_total = 0.0
+        self._aurora_arrivals_total = 0.0
+        self._athena_bytes_total = 0.0
+
         # Transition times.
         self.table_movement_trans_time_s = 0.0
         self.provisioning_trans_time_s = 0.0
@@ -189,6 +202,7 @@ class BlueprintCandidate(ComparableBlueprint):
             self.table_placements[table_name] = nxt
             if nxt != cur:
                 changed_tables.append((table_name, nxt, cur))
+                self._changed_tables.add(table_name)
                 changed = True
 
             # If we added the table to Athena or Aurora, we need to take into
@@ -219,32 +233,105 @@ class BlueprintCandidate(ComparableBlueprint):
         reroute_prev: bool,
         ctx: ScoringContext,
     ) -> None:
+        """
+        Routes the queries in `query_cluster` and adds them to this candidate.
+        If `reroute_prev` is set, the queries added previously that reference a
+        table whose placement changed (since the last call) are re-routed
+        first. The router must already reflect this candidate's placement.
+        """
         if reroute_prev:
-            self.query_locations[Engine.Aurora].clear()
-            self.query_locations[Engine.Redshift].clear()
-            self.query_locations[Engine.Athena].clear()
-
-            (
-                dests,
-                aurora_accessed_pages,
-                athena_scanned_bytes,
-            ) = await self._route_queries_compute_scan_stats(self.queries, router, ctx)
-            for eng, query_indices in dests.items():
-                self.query_locations[eng].extend(query_indices)
-
-            self.aurora_accessed_pages = aurora_accessed_pages
-            self.athena_scanned_bytes = athena_scanned_bytes
-
-        (
-            cluster_dests,
-            incr_aurora_accessed_pages,
-            incr_athena_scanned_bytes,
-        ) = await self._route_queries_compute_scan_stats(query_cluster, router, ctx)
-        for eng, query_indices in cluster_dests.items():
-            self.query_locations[eng].extend(query_indices)
-
-        self.aurora_accessed_pages += incr_aurora_accessed_pages
-        self.athena_scanned_bytes += incr_athena_scanned_bytes
+            await self._reroute_affected_queries(router, ctx)
+        self._changed_tables.clear()
+
+        for qidx in query_cluster:
+            eng = await router.engine_for(ctx.next_workload.analytical_queries()[qidx])
+            self.query_engines[qidx] = eng
+            self.query_locations[eng].append(qidx)
+        self._update_scan_totals(query_cluster, 1.0, ctx)
+        self.queries.extend(query_cluster)
+        self._update_workload_scan_cost(ctx)
+
+        self.feasibility = BlueprintFeasibility.Unchecked
+        self.explored_provisionings = False
+        self._memoized.clear()
+
+    async def _reroute_affected_queries(
+        self, router: Router, ctx: ScoringContext
+    ) -> None:
+        if ctx.next_queries_by_table is None:
+            affected: Iterable[int] = self.queries
+        else:
+            affected_set = set()
+            for table_name in self._changed_tables:
+                for qidx in ctx.next_queries_by_table.get(table_name, []):
+                    if qidx in self.query_engines:
+                        affected_set.add(qidx)
+            # Sorted to keep the routing order deterministic.
+            affected = sorted(affected_set)
+
+        all_queries = ctx.next_workload.analytical_queries()
+        moved: List[Tuple[int, Engine]] = []
+        for qidx in affected:
+            eng = await router.engine_for(all_queries[qidx])
+            if eng != self.query_engines[qidx]:
+                moved.append((qidx, eng))
+
+        if len(moved) == 0:
+            return
+
+        moved_indices = [qidx for qidx, _ in moved]
+        self._update_scan_totals(moved_indices, -1.0, ctx)
+        moved_set = set(moved_indices)
+        for engine in {self.query_engines[qidx] for qidx in moved_indices}:
+            self.query_locations[engine] = [
+                qidx for qidx in self.query_locations[engine] if qidx not in moved_set
+            ]
+        for qidx, eng in moved:
+            self.query_engines[qidx] = eng
+            self.query_locations[eng].append(qidx)
+        self._update_scan_totals(moved_indices, 1.0, ctx)
+
+    def _update_scan_totals(
+        self, queries: List[int], sign: float, ctx: ScoringContext
+    ) -> None:
+        """
+        Adds (`sign = 1.0`) or removes (`sign = -1.0`) the data access
+        contributions of `queries`, based on their current routing.
+        """
+        aurora_queries = [
+            qidx for qidx in queries if self.query_engines[qidx] == Engine.Aurora
+        ]
+        athena_queries = [
+            qidx for qidx in queries if self.query_engines[qidx] == Engine.Athena
+        ]
+        workload = ctx.next_workload
+
+        if len(aurora_queries) > 0:
+            self._aurora_pages_total += (
+                sign
+                * workload.get_predicted_aurora_pages_accessed_batch(
+                    aurora_queries
+                ).sum()
+            )
+            self._aurora_arrivals_total += (
+                sign * workload.get_arrival_counts_batch(aurora_queries).sum()
+            )
+
+        if len(athena_queries) > 0:
+            self._athena_bytes_total += sign * compute_athena_scanned_bytes_sum(
+                workload.get_predicted_athena_bytes_accessed_batch(athena_queries),
+                workload.get_arrival_counts_batch(athena_queries),
+                ctx.planner_config,
+            )
+
+    def _update_workload_scan_cost(self, ctx: ScoringContext) -> None:
+        # These follow `compute_aurora_accessed_pages()` and
+        # `compute_athena_scanned_bytes()`, over all queries routed to the
+        # engine.
+        self.aurora_accessed_pages = max(
+            int(self._aurora_pages_total * self._aurora_arrivals_total), 1
+        )
+        self.athena_scanned_bytes = max(int(self._athena_bytes_total), 1)
 
         self.workload_scan_cost = compute_athena_scan_cost(
             self.athena_scanned_bytes, ctx.planner_config
@@ -265,47 +352,6 @@ class BlueprintCandidate(ComparableBlueprint):
                 planner_config=ctx.planner_config,
             )
 
-        self.queries.extend(query_cluster)
-
-        self.feasibility = BlueprintFeasibility.Unchecked
-        self.explored_provisionings = False
-        self._memoized.clear()
-
-    async def _route_queries_compute_scan_stats(
-        self,
-        queries: List[int],
-        router: Router,
-        ctx: ScoringContext,
-    ) -> Tuple[Dict[Engine, List[int]], int, int]:
-        all_queries = ctx.next_workload.analytical_queries()
-        dests: Dict[Engine, List[int]] = {
-            Engine.Aurora: [],
-            Engine.Redshift: [],
-            Engine.Athena: [],
-        }
-
-        for qidx in queries:
-            q = all_queries[qidx]
-            eng = await router.engine_for(q)
-            dests[eng].append(qidx)
-
-        aurora_queries = [all_queries[qidx] for qidx in dests[Engine.Aurora]]
-        aurora_accessed_pages = compute_aurora_accessed_pages(
-            aurora_queries,
-            ctx.next_workload.get_predicted_aurora_pages_accessed_batch(queries),
-        )
-
-        athena_queries = [all_queries[qidx] for qidx in dests[Engine.Athena]]
-        athena_scanned_bytes = compute_athena_scanned_bytes(
-            athena_queries,
-            ctx.next_workload.get_predicted_athena_bytes_accessed_batch(
-                dests[Engine.Athena]
-            ),
-            ctx.planner_config,
-        )
-
-        return dests, aurora_accessed_pages, athena_scanned_bytes
-
     def add_transactional_tables(self, ctx: ScoringContext) -> None:
         referenced_tables = set()
         newly_added = []
@@ -323,6 +369,7 @@ class BlueprintCandidate(ComparableBlueprint):
 
                 if ((~orig) & self.table_placements[tbl]) != 0:
                     newly_added.append((tbl, self.table_placements[tbl], orig))
+                    self._changed_tables.add(tbl)
 
         for tbl, _, _ in newly_added:
             # Aurora only charges for 1 copy of the data.
@@ -571,6 +618,9 @@ class BlueprintCandidate(ComparableBlueprint):
             cloned.query_locations[engine].extend(indices)
 
         cloned.queries = self.queries.copy()
+        cloned.query_engines = self.query_engines.copy()
+        # pylint: disable-next=protected-access
+        cloned._changed_tables = self._changed_tables.copy()
 
         cloned.provisioning_cost = self.provisioning_cost
         cloned.storage_cost = self.storage_cost
@@ -578,6 +628,11 @@ class BlueprintCandidate(ComparableBlueprint):
         cloned.aurora_accessed_pages = self.aurora_accessed_pages
         cloned.athena_scanned_bytes = self.athena_scanned_bytes
         cloned.table_movement_trans_cost = self.table_movement_trans_cost
+        # pylint: disable=protected-access
+        cloned._aurora_pages_total = self._aurora_pages_total
+        cloned._aurora_arrivals_total = self._aurora_arrivals_total
+        cloned._athena_bytes_total = self._athena_bytes_total
+        # pylint: enable=protected-access
 
         cloned.table_movement_trans_time_s = self.table_movement_trans_time_s
         cloned.provisioning_trans_time_s = self.provisioning_trans_time_s
@@ -0,0 +1,114 @@
+import logging
+import multiprocessing
+import multiprocessing.pool
+import pickle
+from typing import Dict, List, Optional, Tuple
+
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.config.engine import Engine
+from brad.planner.neighborhood.score import Score, Scorer, ScoringContext
+
+logger = logging.getLogger(__name__)
+
+# A candidate blueprint's enumerated parts: table locations (as bitmaps) and
+# the Aurora and Redshift provisionings. These are much cheaper to send to a
+# worker process than a `Blueprint`.
+_CandidatePayload = Tuple[Dict[str, int], Tuple[str, int], Tuple[str, int]]
+
+# Set in each worker process when it starts. The worker processes are spawned
+# (the daemon uses the "spawn" start method), so each one receives a pickled
+# copy of the scorer and the prepared scoring context.
+_worker_state: Optional[Tuple[Scorer, ScoringContext]] = None
+
+
+class CandidateScorer:
+    """
+    Scores batches of candidate blueprints, either in the planner's process or
+    in a pool of spawned worker processes.
+
+    Call `start()` once the scoring context is ready (before enumerating
+    candidates) and `stop()` when done.
+    """
+
+    def __init__(self, scorer: Scorer, num_workers: int) -> None:
+        self._scorer = scorer
+        self._num_workers = num_workers
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        self._ctx: Optional[ScoringContext] = None
+
+    def start(self, ctx: ScoringContext) -> None:
+        self._ctx = ctx
+        if self._num_workers <= 1:
+            return
+
+        # Prepare before starting the workers so that they do not need to use
+        # the engine connections (which are not sent to them). We pickle the
+        # worker state here so that serialization errors are raised in the
+        # planner instead of in the workers' initializer.
+        self._scorer.prepare(ctx)
+        worker_state = pickle.dumps((self._scorer, ctx))
+        mp_ctx = multiprocessing.get_context("spawn")
+        self._pool = mp_ctx.Pool(
+            self._num_workers,
+            initializer=_set_worker_state,
+            initargs=(worker_state,),
+        )
+        logger.debug("Scoring candidates using %d processes.", self._num_workers)
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._ctx = None
+
+    def score(self, candidates: List[Blueprint]) -> List[Score]:
+        assert self._ctx is not None
+        if self._pool is None:
+            scores = []
+            for candidate in candidates:
+                self._ctx.reset(candidate)
+                scores.append(self._scorer.score(self._ctx))
+            return scores
+
+        payloads = [_to_payload(candidate) for candidate in candidates]
+        chunksize = max(1, len(payloads) // (4 * self._num_workers))
+        return self._pool.map(_score_in_worker, payloads, chunksize=chunksize)
+
+
+def _set_worker_state(worker_state: bytes) -> None:
+    global _worker_state  # pylint: disable=global-statement
+    _worker_state = pickle.loads(worker_state)
+
+
+def _score_in_worker(payload: _CandidatePayload) -> Score:
+    assert _worker_state is not None
+    scorer, ctx = _worker_state
+    ctx.reset(_from_payload(payload, ctx.current_blueprint))
+    return scorer.score(ctx)
+
+
+def _to_payload(candidate: Blueprint) -> _CandidatePayload:
+    aurora = candidate.aurora_provisioning()
+    redshift = candidate.redshift_provisioning()
+    return (
+        dict(candidate.table_locations_bitmap()),
+        (aurora.instance_type(), aurora.num_nodes()),
+        (redshift.instance_type(), redshift.num_nodes()),
+    )
+
+
+def _from_payload(payload: _CandidatePayload, base: Blueprint) -> Blueprint:
+    locations_bitmap, aurora, redshift = payload
+    return Blueprint(
+        base.schema_name(),
+        base.tables(),
+        {
+            table_name: Engine.from_bitmap(bitmap)
+            for table_name, bitmap in locations_bitmap.items()
+        },
+        Provisioning(instance_type=aurora[0], num_nodes=aurora[1]),
+        Provisioning(instance_type=redshift[0], num_nodes=redshift[1]),
+        base.get_routing_policy(),
+    )
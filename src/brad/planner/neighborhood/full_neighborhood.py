@@ -8,6 +8,7 @@ from brad.config.planner import PlannerConfig
 from brad.planner.enumeration.blueprint import EnumeratedBlueprint
 from brad.planner.neighborhood.logger import BlueprintPlanningLogger
 from brad.planner.neighborhood.blueprint_candidate import BlueprintCandidate
+from brad.planner.neighborhood.candidate_scorer import CandidateScorer
 from brad.planner.neighborhood.impl import NeighborhoodImpl
 from brad.planner.neighborhood.scaling_scorer import ScalingScorer
 from brad.planner.neighborhood.score import ScoringContext
@@ -21,6 +22,14 @@ class FullNeighborhoodSearchPlanner(NeighborhoodImpl):
     def __init__(self, planner_config: PlannerConfig) -> None:
         super().__init__()
         self._scorer = ScalingScorer(planner_config)
+        num_workers = planner_config.neighborhood_scoring_workers()
+        self._candidate_scorer = CandidateScorer(self._scorer, num_workers)
+        # Candidates are scored in batches when using worker processes. When
+        # scoring in this process, we score each candidate immediately so that
+        # the pruning threshold is always up to date.
+        self._batch_size = 1 if num_workers <= 1 else 1000 * num_workers
+        self._pending: List[Blueprint] = []
+        self._num_pruned = 0
 
         # No need to keep around all candidates if we are selecting the best
         # blueprint. But for debugging purposes it is useful to see what
@@ -30,32 +39,58 @@ class FullNeighborhoodSearchPlanner(NeighborhoodImpl):
 
         self._bp_logger: Optional[BlueprintPlanningLogger] = None
 
-    def on_start_enumeration(self) -> None:
+    def on_start_enumeration(self, ctx: ScoringContext) -> None:
         self._candidate_set.clear()
+        self._pending.clear()
+        self._num_pruned = 0
         if LOG_REPLAN_VAR in os.environ:
             self._bp_logger = BlueprintPlanningLogger()
+        self._candidate_scorer.start(ctx)
+
+    def should_prune(self, bp: EnumeratedBlueprint, ctx: ScoringContext) -> bool:
+        if self._bp_logger is not None or len(self._candidate_set) < self._num_top:
+            # Log every candidate when debugging.
+            return False
+        # A candidate only replaces the "worst" candidate so far if its score is
+        # strictly lower (better). Its score is at least its lower bound.
+        if self._scorer.lower_bound(ctx, bp) >= self._candidate_set[0].score_value:
+            self._num_pruned += 1
+            return True
+        return False
 
     def on_enumerated_blueprint(
-        self, bp: EnumeratedBlueprint, ctx: ScoringContext
+        self, bp: EnumeratedBlueprint, _ctx: ScoringContext
     ) -> None:
-        # Score the blueprint.
-        ctx.reset(bp)
-        score = self._scorer.score(ctx)
-        if self._bp_logger is not None:
-            self._bp_logger.log_blueprint_and_score(bp, score)
-
-        # Store the blueprint (for debugging purposes).
-        if len(self._candidate_set) < self._num_top:
-            self._candidate_set.append(BlueprintCandidate(bp.to_blueprint(), score))
-            if len(self._candidate_set) == self._num_top:
-                heapq.heapify(self._candidate_set)
-        elif self._candidate_set[0].score_value > score.single_value():
-            # Replace the "worst" blueprint so far with this one (lower
-            # score is better).
-            latest = BlueprintCandidate(bp.to_blueprint(), score)
-            heapq.heappushpop(self._candidate_set, latest)
+        # Very important to call `.to_blueprint()` to make a copy of the
+        # blueprint. The enumerator modifies the blueprint in place.
+        self._pending.append(bp.to_blueprint())
+        if len(self._pending) >= self._batch_size:
+            self._score_pending()
+
+    def _score_pending(self) -> None:
+        scores = self._candidate_scorer.score(self._pending)
+        for bp, score in zip(self._pending, scores):
+            if self._bp_logger is not None:
+                self._bp_logger.log_blueprint_and_score(bp, score)
+
+            # Store the blueprint (for debugging purposes).
+            if len(self._candidate_set) < self._num_top:
+                self._candidate_set.append(BlueprintCandidate(bp, score))
+                if len(self._candidate_set) == self._num_top:
+                    heapq.heapify(self._candidate_set)
+            elif self._candidate_set[0].score_value > score.single_value():
+                # Replace the "worst" blueprint so far with this one (lower
+                # score is better).
+                heapq.heappushpop(self._candidate_set, BlueprintCandidate(bp, score))
+        self._pending.clear()
 
     def on_enumeration_complete(self, _ctx: ScoringContext) -> Blueprint:
+        try:
+            self._score_pending()
+        finally:
+            self._candidate_scorer.stop()
+        logger.debug("Pruned %d candidates using score bounds.", self._num_pruned)
+
         # Close the logger.
         self._bp_logger = None
 
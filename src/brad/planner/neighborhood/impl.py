@@ -4,9 +4,16 @@ from brad.planner.neighborhood.score import ScoringContext
 
 
 class NeighborhoodImpl:
-    def on_start_enumeration(self) -> None:
+    def on_start_enumeration(self, ctx: ScoringContext) -> None:
         raise NotImplementedError
 
+    def should_prune(self, _bp: EnumeratedBlueprint, _ctx: ScoringContext) -> bool:
+        """
+        Called before the (more expensive) candidate filters. Returning true
+        drops the candidate.
+        """
+        return False
+
     def on_enumerated_blueprint(
         self, bp: EnumeratedBlueprint, ctx: ScoringContext
     ) -> None:
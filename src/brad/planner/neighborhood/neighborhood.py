@@ -149,7 +149,7 @@ class NeighborhoodSearchPlanner(BlueprintPlanner):
                 data_accessed_mb,
             )
 
-            self._impl.on_start_enumeration()
+            self._impl.on_start_enumeration(scoring_ctx)
 
             for idx, bp in enumerate(
                 NeighborhoodBlueprintEnumerator.enumerate(
@@ -161,6 +161,11 @@ class NeighborhoodSearchPlanner(BlueprintPlanner):
                 if idx % 10000 == 0:
                     logger.info("Processing %d", idx)
 
+                # Drop candidates that cannot be better than the ones found so
+                # far (this only uses cheap bounds, so it runs first).
+                if self._impl.should_prune(bp, scoring_ctx):
+                    continue
+
                 # Workload-independent filters.
                 # Drop this candidate if any are invalid.
                 if any(
@@ -6,6 +6,7 @@ from brad.blueprint import Blueprint
 from brad.config.planner import PlannerConfig
 from brad.planner.enumeration.blueprint import EnumeratedBlueprint
 from brad.planner.neighborhood.blueprint_candidate import BlueprintCandidate
+from brad.planner.neighborhood.candidate_scorer import CandidateScorer
 from brad.planner.neighborhood.logger import BlueprintPlanningLogger
 from brad.planner.neighborhood.impl import NeighborhoodImpl
 from brad.planner.neighborhood.scaling_scorer import ScalingScorer
@@ -20,10 +21,13 @@ LOG_REPLAN_VAR = "BRAD_LOG_PLANNING"
 class SampledNeighborhoodSearchPlanner(NeighborhoodImpl):
     def __init__(self, planner_config: PlannerConfig) -> None:
         super().__init__()
-        self._scorer = ScalingScorer(planner_config)
+        self._candidate_scorer = CandidateScorer(
+            ScalingScorer(planner_config),
+            planner_config.neighborhood_scoring_workers(),
+        )
         self._sampler = ReservoirSampler[Blueprint](planner_config.sample_set_size())
 
-    def on_start_enumeration(self) -> None:
+    def on_start_enumeration(self, _ctx: ScoringContext) -> None:
         self._sampler.reset()
 
     def on_enumerated_blueprint(
@@ -36,11 +40,15 @@ class SampledNeighborhoodSearchPlanner(NeighborhoodImpl):
         self._sampler.offer(lambda: bp.to_blueprint())
 
     def on_enumeration_complete(self, ctx: ScoringContext) -> Blueprint:
-        candidates: List[BlueprintCandidate] = []
-        for bp in self._sampler.get():
-            ctx.reset(bp)
-            score = self._scorer.score(ctx)
-            candidates.append(BlueprintCandidate(bp, score))
+        samples = self._sampler.get()
+        self._candidate_scorer.start(ctx)
+        try:
+            scores = self._candidate_scorer.score(samples)
+        finally:
+            self._candidate_scorer.stop()
+        candidates: List[BlueprintCandidate] = [
+            BlueprintCandidate(bp, score) for bp, score in zip(samples, scores)
+        ]
 
         if LOG_REPLAN_VAR in os.environ:
             bp_logger = BlueprintPlanningLogger()
@@ -3,13 +3,12 @@ import json
 import logging
 import math
 from collections import namedtuple
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Tuple, List
 
 from .score import Scorer, Score, ScoringContext
 import brad.planner.scoring.data as score_data
 
 from brad.blueprint import Blueprint
-from brad.blueprint.diff.blueprint import BlueprintDiff
 from brad.blueprint.provisioning import Provisioning
 from brad.config.engine import Engine
 from brad.config.planner import PlannerConfig
@@ -35,11 +34,17 @@ _ATHENA_METRICS = [
 
 ALL_METRICS = _REDSHIFT_METRICS + _AURORA_METRICS + _ATHENA_METRICS
 
+# Matches the threshold in `Score.combine()`.
+_ZERO = 1e-9
+
 
 class ScalingScorer(Scorer):
     def __init__(self, planner_config: PlannerConfig) -> None:
         self._planner_config = planner_config
 
+    def prepare(self, ctx: ScoringContext) -> None:
+        self._simulate_next_workload(ctx)
+
     def score(self, ctx: ScoringContext) -> Score:
         self._simulate_next_workload(ctx)
         debug_components: Dict[str, int | float] = {}
@@ -55,7 +60,29 @@ class ScalingScorer(Scorer):
             debug_components,
         )
 
+    def lower_bound(self, ctx: ScoringContext, candidate: Blueprint) -> float:
+        # The predicted performance only depends on the provisioning (the
+        # routing simulation is independent of the candidate), and the
+        # provisioning cost is a lower bound on the operational cost.
+        self._simulate_next_workload(ctx)
+        aurora_prov = candidate.aurora_provisioning()
+        redshift_prov = candidate.redshift_provisioning()
+        prov_cost = self._provisioning_cost(aurora_prov, redshift_prov)
+        if prov_cost <= _ZERO:
+            # `Score.combine()` drops zero-valued components, so it is only
+            # monotone in strictly positive costs.
+            return 0.0
+        perf_metrics, _ = self._performance_for_provisioning(
+            ctx, aurora_prov, redshift_prov
+        )
+        return Score.combine(Score.summarize_perf_metrics(perf_metrics), prov_cost)
+
     def _simulate_next_workload(self, ctx: ScoringContext) -> None:
+        # The simulated routing does not depend on the candidate blueprint, so
+        # we only need to run it once per scoring context.
+        if ctx.next_workload_simulated:
+            return
+
         # NOTE: The routing policy should be included in the blueprint. We
         # currently hardcode it here for engineering convenience.
         router = RuleBased()
@@ -67,8 +94,26 @@ class ScalingScorer(Scorer):
             assert len(next_engines) > 0
             next_engine = next_engines[0]
             ctx.next_dest[next_engine].append(q)
+            # Data accessed must always be populated using the current blueprint
+            # (since the tables would not have been moved yet).
             q.populate_data_accessed_mb(next_engine, ctx.engines, ctx.current_blueprint)
 
+        for engine, queries in ctx.next_dest.items():
+            ctx.next_accessed_mb[engine] = sum(
+                q.data_accessed_mb(engine) for q in queries
+            )
+        ctx.next_workload_simulated = True
+
+    def _provisioning_cost(
+        self, aurora_prov: Provisioning, redshift_prov: Provisioning
+    ) -> float:
+        return (
+            _AURORA_SPECS[aurora_prov.instance_type()].usd_per_hour
+            * aurora_prov.num_nodes()
+            + _REDSHIFT_SPECS[redshift_prov.instance_type()].usd_per_hour
+            * redshift_prov.num_nodes()
+        )
+
     def _operational_cost_score(
         self, ctx: ScoringContext, debug_components: Dict[str, int | float]
     ) -> float:
@@ -90,27 +135,8 @@ class ScalingScorer(Scorer):
         )
 
         # Data access (scan) costs.
-        aurora_access_mb = 0
-        for q in ctx.next_dest[Engine.Aurora]:
-            # Data accessed must always be populated using the current blueprint
-            # (since the tables would not have been moved yet).
-            q.populate_data_accessed_mb(
-                for_engine=Engine.Aurora,
-                connections=ctx.engines,
-                blueprint=ctx.current_blueprint,
-            )
-            aurora_access_mb += q.data_accessed_mb(Engine.Aurora)
-
-        athena_access_mb = 0
-        for q in ctx.next_dest[Engine.Athena]:
-            # Data accessed must always be populated using the current blueprint
-            # (since the tables would not have been moved yet).
-            q.populate_data_accessed_mb(
-                for_engine=Engine.Athena,
-                connections=ctx.engines,
-                blueprint=ctx.current_blueprint,
-            )
-            athena_access_mb += q.data_accessed_mb(Engine.Athena)
+        aurora_access_mb = ctx.next_accessed_mb[Engine.Aurora]
+        athena_access_mb = ctx.next_accessed_mb[Engine.Athena]
 
         aurora_scan_cost = (
             aurora_access_mb * self._planner_config.aurora_usd_per_mb_scanned()
@@ -203,61 +229,13 @@ class ScalingScorer(Scorer):
                     # engines. "Dropping" a table is "free".
                     continue
 
-                move_from = self._best_extract_engine(ctx.current_blueprint, table_name)
-                source_table_size_mb = ctx.current_workload.table_size_on_engine(
-                    table_name, move_from
-                )
-                assert source_table_size_mb is not None
-
-                # Extraction scoring.
-                if move_from == Engine.Athena:
-                    movement_time_s += (
-                        source_table_size_mb
-                        / self._planner_config.athena_extract_rate_mb_per_s()
-                    )
-                    movement_cost += (
-                        self._planner_config.athena_usd_per_mb_scanned()
-                        * source_table_size_mb
-                    )
-
-                elif move_from == Engine.Aurora:
-                    movement_time_s += (
-                        source_table_size_mb
-                        / self._planner_config.aurora_extract_rate_mb_per_s()
-                    )
-
-                elif move_from == Engine.Redshift:
-                    movement_time_s += (
-                        source_table_size_mb
-                        / self._planner_config.redshift_extract_rate_mb_per_s()
-                    )
-
-                # Import scoring.
-                for into_loc in move_to:
-                    # Need to assume the table will have the same size as on the
-                    # source engine. This is not necessarily true when Redshift
-                    # is the source, because it uses compression.
-                    if into_loc == Engine.Athena:
-                        movement_time_s += (
-                            source_table_size_mb
-                            / self._planner_config.athena_load_rate_mb_per_s()
-                        )
-                        movement_cost += (
-                            self._planner_config.athena_usd_per_mb_scanned()
-                            * source_table_size_mb
-                        )
-
-                    elif into_loc == Engine.Aurora:
-                        movement_time_s += (
-                            source_table_size_mb
-                            / self._planner_config.aurora_load_rate_mb_per_s()
-                        )
-
-                    elif into_loc == Engine.Redshift:
-                        movement_time_s += (
-                            source_table_size_mb
-                            / self._planner_config.redshift_load_rate_mb_per_s()
-                        )
+                key = (table_name, Engine.to_bitmap(move_to))
+                movement = ctx.table_movement.get(key)
+                if movement is None:
+                    movement = self._table_movement_score(ctx, table_name, move_to)
+                    ctx.table_movement[key] = movement
+                movement_time_s += movement[0]
+                movement_cost += movement[1]
 
             transition_time_s = (
                 redshift_prov_time_s + aurora_prov_time_s + movement_time_s
@@ -273,6 +251,72 @@ class ScalingScorer(Scorer):
         debug_components["transition_cost"] = transition_cost
         return transition_time_s, transition_cost
 
+    def _table_movement_score(
+        self, ctx: ScoringContext, table_name: str, move_to: List[Engine]
+    ) -> Tuple[float, float]:
+        """
+        Returns the time and monetary cost of copying a table onto `move_to`.
+        """
+        movement_cost = 0.0
+        movement_time_s = 0.0
+
+        move_from = self._best_extract_engine(ctx.current_blueprint, table_name)
+        source_table_size_mb = ctx.current_workload.table_size_on_engine(
+            table_name, move_from
+        )
+        assert source_table_size_mb is not None
+
+        # Extraction scoring.
+        if move_from == Engine.Athena:
+            movement_time_s += (
+                source_table_size_mb
+                / self._planner_config.athena_extract_rate_mb_per_s()
+            )
+            movement_cost += (
+                self._planner_config.athena_usd_per_mb_scanned() * source_table_size_mb
+            )
+
+        elif move_from == Engine.Aurora:
+            movement_time_s += (
+                source_table_size_mb
+                / self._planner_config.aurora_extract_rate_mb_per_s()
+            )
+
+        elif move_from == Engine.Redshift:
+            movement_time_s += (
+                source_table_size_mb
+                / self._planner_config.redshift_extract_rate_mb_per_s()
+            )
+
+        # Import scoring.
+        for into_loc in move_to:
+            # Need to assume the table will have the same size as on the
+            # source engine. This is not necessarily true when Redshift
+            # is the source, because it uses compression.
+            if into_loc == Engine.Athena:
+                movement_time_s += (
+                    source_table_size_mb
+                    / self._planner_config.athena_load_rate_mb_per_s()
+                )
+                movement_cost += (
+                    self._planner_config.athena_usd_per_mb_scanned()
+                    * source_table_size_mb
+                )
+
+            elif into_loc == Engine.Aurora:
+                movement_time_s += (
+                    source_table_size_mb
+                    / self._planner_config.aurora_load_rate_mb_per_s()
+                )
+
+            elif into_loc == Engine.Redshift:
+                movement_time_s += (
+                    source_table_size_mb
+                    / self._planner_config.redshift_load_rate_mb_per_s()
+                )
+
+        return movement_time_s, movement_cost
+
     def _best_extract_engine(self, blueprint: Blueprint, table_name: str) -> Engine:
         """
         Returns the best source engine to extract a table from.
@@ -301,17 +345,47 @@ class ScalingScorer(Scorer):
     def _performance_score(
         self, ctx: ScoringContext, debug_components: Dict[str, int | float]
     ) -> Dict[str, float]:
+        predicted_metrics, perf_debug = self._performance_for_provisioning(
+            ctx,
+            ctx.next_blueprint.aurora_provisioning(),
+            ctx.next_blueprint.redshift_provisioning(),
+        )
+        debug_components.update(perf_debug)
+        # Callers may modify the returned metrics.
+        return dict(predicted_metrics)
+
+    def _performance_for_provisioning(
+        self,
+        ctx: ScoringContext,
+        aurora_prov: Provisioning,
+        redshift_prov: Provisioning,
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Returns the predicted metrics (and debug components) for a candidate
+        with the given provisioning. The prediction does not depend on the
+        table placement, so it is cached in the scoring context.
+        """
+        key = (
+            (aurora_prov.instance_type(), aurora_prov.num_nodes()),
+            (redshift_prov.instance_type(), redshift_prov.num_nodes()),
+        )
+        cached = ctx.perf_by_provisioning.get(key)
+        if cached is not None:
+            return cached
+
         # > 1.0 means the dataset size has increased
         dataset_scaling = (
             ctx.next_workload.dataset_size_mb() / ctx.current_workload.dataset_size_mb()
         )
         # > 1.0 means there are more resources
         redshift_resource_scaling = self._compute_resource_scaling(
-            ctx.current_blueprint, ctx.next_blueprint, ctx.bp_diff, Engine.Redshift
+            ctx.current_blueprint.redshift_provisioning(),
+            redshift_prov,
+            Engine.Redshift,
         )
         # > 1.0 means there are more resources
         aurora_resource_scaling = self._compute_resource_scaling(
-            ctx.current_blueprint, ctx.next_blueprint, ctx.bp_diff, Engine.Aurora
+            ctx.current_blueprint.aurora_provisioning(), aurora_prov, Engine.Aurora
         )
 
         inv_redshift_resource_scaling = 1.0 / redshift_resource_scaling
@@ -330,9 +404,7 @@ class ScalingScorer(Scorer):
             if ctx.current_total_accessed_mb[engine] == 0:
                 modifier = 1.0
             else:
-                accessed_mb = 0
-                for q in ctx.next_dest[engine]:
-                    accessed_mb += q.data_accessed_mb(engine)
+                accessed_mb = ctx.next_accessed_mb[engine]
                 modifier = accessed_mb / ctx.current_total_accessed_mb[engine]
             return modifier
 
@@ -376,65 +448,37 @@ class ScalingScorer(Scorer):
             pred_value *= athena_tp_modifier
             predicted_metrics[metric_name] = pred_value
 
-        debug_components["aurora_tp_modifier"] = aurora_tp_modifier
-        debug_components["athena_tp_modifier"] = athena_tp_modifier
-        debug_components["redshift_tp_modifier"] = redshift_tp_modifier
-        debug_components["dataset_scaling"] = dataset_scaling
-        debug_components["redshift_resource_scaling"] = redshift_resource_scaling
-        debug_components["aurora_resource_scaling"] = aurora_resource_scaling
+        debug_components = {
+            "aurora_tp_modifier": aurora_tp_modifier,
+            "athena_tp_modifier": athena_tp_modifier,
+            "redshift_tp_modifier": redshift_tp_modifier,
+            "dataset_scaling": dataset_scaling,
+            "redshift_resource_scaling": redshift_resource_scaling,
+            "aurora_resource_scaling": aurora_resource_scaling,
+        }
 
-        return predicted_metrics
+        result = (predicted_metrics, debug_components)
+        ctx.perf_by_provisioning[key] = result
+        return result
 
     def _compute_resource_scaling(
         self,
-        current_blueprint: Blueprint,
-        next_blueprint: Blueprint,
-        bp_diff: Optional[BlueprintDiff],
+        current_prov: Provisioning,
+        next_prov: Provisioning,
         engine: Engine,
     ) -> float:
-        if bp_diff is None:
+        if engine not in (Engine.Aurora, Engine.Redshift):
+            raise RuntimeError("Unsupported resource scaling engine {}".format(engine))
+
+        if current_prov == next_prov:
             # No provisioning change.
             return 1.0
+        if current_prov.num_nodes() == 0 or next_prov.num_nodes() == 0:
+            # This engine is/will be disabled.
+            return 0.0
 
-        if engine == Engine.Redshift:
-            diff = bp_diff.redshift_diff()
-            if diff is None:
-                # No Redshift provisioning change.
-                return 1.0
-            if (
-                current_blueprint.redshift_provisioning().num_nodes() == 0
-                or next_blueprint.redshift_provisioning().num_nodes() == 0
-            ):
-                # This engine is/will be disabled.
-                return 0.0
-            curr_specs = self._retrieve_provisioning_specs(
-                engine, current_blueprint.redshift_provisioning()
-            )
-            next_specs = self._retrieve_provisioning_specs(
-                engine, next_blueprint.redshift_provisioning()
-            )
-
-        elif engine == Engine.Aurora:
-            diff = bp_diff.aurora_diff()
-            if diff is None:
-                # No Aurora provisioning change.
-                return 1.0
-            if (
-                current_blueprint.aurora_provisioning().num_nodes() == 0
-                or next_blueprint.aurora_provisioning().num_nodes() == 0
-            ):
-                # This engine is/will be disabled.
-                return 0.0
-            curr_specs = self._retrieve_provisioning_specs(
-                engine, current_blueprint.aurora_provisioning()
-            )
-            next_specs = self._retrieve_provisioning_specs(
-                engine, next_blueprint.aurora_provisioning()
-            )
-
-        else:
-            raise RuntimeError("Unsupported resource scaling engine {}".format(engine))
-
+        curr_specs = self._retrieve_provisioning_specs(engine, current_prov)
+        next_specs = self._retrieve_provisioning_specs(engine, next_prov)
         cpu_scale = next_specs[0] / curr_specs[0]
         mem_scale = next_specs[1] / curr_specs[1]
 
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from brad.blueprint import Blueprint
 from brad.blueprint.diff.blueprint import BlueprintDiff
@@ -34,17 +34,25 @@ class Score:
         return "Score:\n  " + score_components
 
     def single_value(self) -> float:
+        return self.combine(self.perf_summary_value(), self._monetary_cost)
+
+    @staticmethod
+    def combine(perf_summary_value: float, monetary_cost: float) -> float:
+        """
+        Combines the score components into a single value. For a fixed positive
+        performance value, this is nondecreasing in the (positive) monetary
+        cost.
+        """
         # To stay consistent with the other score components, lower is better.
         # N.B. This is a placeholder.
         num_components = 2
         zero = 1e-9
         values = []
 
-        perf_value = self.perf_summary_value()
-        if perf_value > zero:
-            values.append(perf_value)
-        if self._monetary_cost > zero:
-            values.append(self._monetary_cost)
+        if perf_summary_value > zero:
+            values.append(perf_summary_value)
+        if monetary_cost > zero:
+            values.append(monetary_cost)
 
         # We exclude the transition time for now. This is because we assume the
         # transition occurs during the maintenance window and that all
@@ -55,12 +63,16 @@ class Score:
         return gmean.item()
 
     def perf_summary_value(self) -> float:
+        return self.summarize_perf_metrics(self._perf_metrics)
+
+    @staticmethod
+    def summarize_perf_metrics(perf_metrics: Dict[str, float]) -> float:
         # To stay consistent with the cost and transition time component, lower is better.
         # We invert throughput values.
         num_components = 0
         zero = 1e-9
         values = []
-        for metric, mvalue in self._perf_metrics.items():
+        for metric, mvalue in perf_metrics.items():
             num_components += 1
             if mvalue <= zero:
                 continue
@@ -110,11 +122,33 @@ class ScoringContext:
         self.current_total_accessed_mb = current_total_accessed_mb
 
         # Queries from the next workload that will be routed to each engine
-        # under the next blueprint.
+        # under the next blueprint, and the total amount of data they access.
+        # The scorer's routing simulation does not depend on the candidate
+        # blueprint, so these are computed once (see `next_workload_simulated`).
         self.next_dest: Dict[Engine, List[Query]] = {}
         self.next_dest[Engine.Aurora] = []
         self.next_dest[Engine.Athena] = []
         self.next_dest[Engine.Redshift] = []
+        self.next_accessed_mb: Dict[Engine, float] = {}
+        self.next_workload_simulated = False
+
+        # Scoring components that only depend on part of a candidate, cached
+        # across candidates.
+        # (Aurora provisioning, Redshift provisioning) -> (predicted metrics,
+        # debug components)
+        self.perf_by_provisioning: Dict[
+            Tuple[Tuple[str, int], Tuple[str, int]],
+            Tuple[Dict[str, float], Dict[str, float]],
+        ] = {}
+        # (table name, added locations bitmap) -> (movement time, movement cost)
+        self.table_movement: Dict[Tuple[str, int], Tuple[float, float]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Engine connections cannot be sent to another process (e.g., a
+        # candidate scoring worker). Scorers use them in `prepare()`.
+        state = self.__dict__.copy()
+        state["engines"] = None
+        return state
 
     @property
     def next_blueprint(self) -> Blueprint:
@@ -124,11 +158,23 @@ class ScoringContext:
     def reset(self, next_blueprint: Blueprint) -> None:
         self._next_blueprint = next_blueprint
         self.bp_diff = BlueprintDiff.of(self.current_blueprint, self._next_blueprint)
-        self.next_dest[Engine.Aurora].clear()
-        self.next_dest[Engine.Athena].clear()
-        self.next_dest[Engine.Redshift].clear()
 
 
 class Scorer:
+    def prepare(self, ctx: ScoringContext) -> None:
+        """
+        Computes the parts of the scoring context that do not depend on the
+        candidate blueprint.
+        """
+
     def score(self, ctx: ScoringContext) -> Score:
         raise NotImplementedError
+
+    # pylint: disable-next=unused-argument
+    def lower_bound(self, ctx: ScoringContext, candidate: Blueprint) -> float:
+        """
+        A cheap lower bound on `score(ctx).single_value()` for `candidate`.
+        Candidates whose bound is no better than the scores already found can
+        be skipped without scoring them.
+        """
+        return 0.0
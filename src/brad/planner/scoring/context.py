@@ -74,6 +74,12 @@ class ScoringContext:
         self.table_storage_costs: Dict[Tuple[str, Engine], float] = {}
         self.table_movement: Dict[Tuple[str, Engine], TableMovementScore] = {}
 
+        # An inverted index from a table name to the (sorted) indices of the
+        # next workload's analytical queries that reference the table. This is
+        # used to only re-route the queries affected by a table placement
+        # change. It is `None` until it is computed.
+        self.next_queries_by_table: Optional[Dict[str, List[int]]] = None
+
     async def simulate_current_workload_routing(self, router: Router) -> None:
         self.current_query_locations[Engine.Aurora].clear()
         self.current_query_locations[Engine.Redshift].clear()
@@ -240,6 +246,15 @@ class ScoringContext:
                 adjusted_latencies, query_weights
             )
 
+    def compute_next_queries_by_table(self) -> None:
+        queries_by_table: Dict[str, List[int]] = {}
+        for qidx, query in enumerate(self.next_workload.analytical_queries()):
+            for table_name in set(query.tables()):
+                if table_name not in queries_by_table:
+                    queries_by_table[table_name] = []
+                queries_by_table[table_name].append(qidx)
+        self.next_queries_by_table = queries_by_table
+
     def compute_table_transitions(self) -> None:
         self.table_storage_costs.clear()
         self.table_movement.clear()
@@ -90,8 +90,8 @@ def compute_athena_scanned_bytes(
     planner_config: PlannerConfig,
 ) -> int:
     return compute_athena_scanned_bytes_batch(
-        np.array(accessed_bytes_per_query),
-        np.array(map(lambda query: query.arrival_count(), queries)),
+        np.array(list(accessed_bytes_per_query)),
+        np.array([query.arrival_count() for query in queries]),
         planner_config,
     )
 
@@ -101,13 +101,27 @@ def compute_athena_scanned_bytes_batch(
     arrival_counts: npt.NDArray,
     planner_config: PlannerConfig,
 ) -> int:
+    total_bytes = compute_athena_scanned_bytes_sum(
+        accessed_bytes_per_query, arrival_counts, planner_config
+    )
+    return max(int(total_bytes), 1)
+
+
+def compute_athena_scanned_bytes_sum(
+    accessed_bytes_per_query: npt.NDArray,
+    arrival_counts: npt.NDArray,
+    planner_config: PlannerConfig,
+) -> float:
+    """
+    The (arrival-weighted) bytes scanned by the queries, without rounding. Use
+    this to maintain a running total across batches of queries.
+    """
     # N.B. There is a minimum charge of 10 MB per query.
     min_bytes_per_query = planner_config.athena_min_mb_per_query() * 1000 * 1000
     accessed_bytes_pq = np.clip(
         accessed_bytes_per_query, a_min=min_bytes_per_query, a_max=None
     )
-    total_bytes = np.dot(accessed_bytes_pq, arrival_counts)
-    return max(int(total_bytes.item()), 1)
+    return np.dot(accessed_bytes_pq, arrival_counts).item()
 
 
 def compute_athena_scan_cost(
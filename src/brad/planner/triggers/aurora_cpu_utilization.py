@@ -4,7 +4,7 @@ from typing import Optional
 
 from .metrics_thresholds import MetricsThresholds
 from .trigger import Trigger
-from brad.daemon.monitor import Monitor
+from brad.daemon.monitor import MonitorSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,6 @@ logger = logging.getLogger(__name__)
 class AuroraCpuUtilization(Trigger):
     def __init__(
         self,
-        monitor: Monitor,
         lo: float,
         hi: float,
         epoch_length: timedelta,
@@ -21,13 +20,15 @@ class AuroraCpuUtilization(Trigger):
         lookahead_epochs: Optional[int] = None,
     ) -> None:
         super().__init__(epoch_length, observe_bp_delay)
-        self._monitor = monitor
         self._impl = MetricsThresholds(lo, hi, sustained_epochs)
         self._epoch_length = epoch_length
         self._sustained_epochs = sustained_epochs
         self._lookahead_epochs = lookahead_epochs
 
-    async def should_replan(self) -> bool:
+    def metrics_lookback_epochs(self) -> int:
+        return self._sustained_epochs
+
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         if self._current_blueprint is None:
             logger.info(
                 "Aurora CPU utilization trigger not running because of missing blueprint."
@@ -46,7 +47,7 @@ class AuroraCpuUtilization(Trigger):
             )
             return False
 
-        past = self._monitor.aurora_writer_metrics().read_k_most_recent(
+        past = metrics.aurora_writer_metrics().read_k_most_recent(
             k=self._sustained_epochs, metric_ids=[_UTILIZATION_METRIC]
         )
         relevant = past[past.index > self._cutoff]
@@ -55,7 +56,7 @@ class AuroraCpuUtilization(Trigger):
         ):
             return True
 
-        for idx, reader_metrics in enumerate(self._monitor.aurora_reader_metrics()):
+        for idx, reader_metrics in enumerate(metrics.aurora_reader_metrics()):
             past = reader_metrics.read_k_most_recent(
                 k=self._sustained_epochs, metric_ids=[_UTILIZATION_METRIC]
             )
@@ -73,7 +74,7 @@ class AuroraCpuUtilization(Trigger):
             # not passed since the last cutoff.
             return False
 
-        future = self._monitor.aurora_writer_metrics().read_k_upcoming(
+        future = metrics.aurora_writer_metrics().read_k_upcoming(
             k=self._lookahead_epochs, metric_ids=[_UTILIZATION_METRIC]
         )
         if self._impl.exceeds_thresholds(
@@ -81,7 +82,7 @@ class AuroraCpuUtilization(Trigger):
         ):
             return True
 
-        for idx, reader_metrics in enumerate(self._monitor.aurora_reader_metrics()):
+        for idx, reader_metrics in enumerate(metrics.aurora_reader_metrics()):
             future = reader_metrics.read_k_upcoming(
                 k=self._lookahead_epochs, metric_ids=[_UTILIZATION_METRIC]
             )
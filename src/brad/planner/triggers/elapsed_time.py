@@ -7,6 +7,7 @@ from brad.planner.scoring.score import Score
 from brad.utils.time_periods import universal_now
 
 from .trigger import Trigger
+from brad.daemon.monitor import MonitorSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,7 @@ class ElapsedTimeTrigger(Trigger):
         self._period = period
         self._reset_trigger_next()
 
-    async def should_replan(self) -> bool:
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         now = universal_now()
         if now >= self._trigger_next:
             self._reset_trigger_next()
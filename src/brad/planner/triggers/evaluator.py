@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from brad.daemon.monitor import MonitorSnapshot
+from brad.planner.triggers.trigger import Trigger
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerEvaluator:
+    """
+    Checks all of the planner's triggers concurrently against one metrics
+    snapshot. Triggers that wait on I/O (e.g., downloading workload logs) no
+    longer delay the triggers that come after them.
+
+    The result is deterministic: if several triggers fire, the one that appears
+    first in the configured order is returned.
+    """
+
+    def __init__(self, triggers: Iterable[Trigger]) -> None:
+        self._triggers = triggers
+        self._last_latencies: List[Tuple[str, float]] = []
+
+    async def evaluate(self, metrics: MonitorSnapshot) -> Optional[Trigger]:
+        """
+        Returns the trigger that should cause a replan (or `None` if no trigger
+        fired). Exceptions raised by a trigger are propagated.
+        """
+        triggers = list(self._triggers)
+        if len(triggers) == 0:
+            return None
+
+        results = await asyncio.gather(
+            *[self._timed_check(t, metrics) for t in triggers]
+        )
+
+        self._last_latencies = [
+            (t.name(), elapsed_s) for t, (_, elapsed_s) in zip(triggers, results)
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Trigger check latencies (s): %s",
+                ", ".join(
+                    "{}={:.4f}".format(name, elapsed_s)
+                    for name, elapsed_s in self._last_latencies
+                ),
+            )
+
+        for t, (fired, _) in zip(triggers, results):
+            if fired:
+                return t
+        return None
+
+    def metrics_lookback_epochs(self) -> int:
+        """
+        The number of most recent epochs of metrics that the metrics snapshot
+        passed to `evaluate()` needs to contain.
+        """
+        return max((t.metrics_lookback_epochs() for t in self._triggers), default=0)
+
+    def last_latencies(self) -> Dict[str, float]:
+        """
+        The time (in seconds) each trigger took during the most recent
+        evaluation.
+        """
+        return dict(self._last_latencies)
+
+    async def _timed_check(
+        self, trigger: Trigger, metrics: MonitorSnapshot
+    ) -> Tuple[bool, float]:
+        start = time.perf_counter()
+        fired = await trigger.should_replan(metrics)
+        return fired, time.perf_counter() - start
@@ -1,11 +1,10 @@
 import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
 from brad.config.file import ConfigFile
 from brad.config.planner import PlannerConfig
-from brad.daemon.monitor import Monitor
-from brad.planner.estimator import EstimatorProvider
+from brad.daemon.monitor import Monitor, MonitorSnapshot
 from brad.planner.scoring.data_access.provider import DataAccessProvider
 from brad.planner.triggers.aurora_cpu_utilization import AuroraCpuUtilization
 from brad.planner.triggers.redshift_cpu_utilization import RedshiftCpuUtilization
@@ -27,29 +26,42 @@ class TriggerProvider:
     def get_triggers(self) -> List[Trigger]:
         raise NotImplementedError
 
+    async def metrics_snapshot(self, num_epochs: int) -> MonitorSnapshot:
+        """
+        The metrics that the triggers should be evaluated against. The
+        snapshot contains (at least) the `num_epochs` most recent epochs.
+        """
+        raise NotImplementedError
+
 
 class EmptyTriggerProvider(TriggerProvider):
     def get_triggers(self) -> List[Trigger]:
         return []
 
+    async def metrics_snapshot(self, num_epochs: int) -> MonitorSnapshot:
+        return MonitorSnapshot.empty()
+
 
 class ConfigDefinedTriggers(TriggerProvider):
     def __init__(
         self,
         config: ConfigFile,
         planner_config: PlannerConfig,
-        monitor: Monitor,
+        monitor: Optional[Monitor],
         data_access_provider: DataAccessProvider,
-        estimator_provider: EstimatorProvider,
         startup_timestamp: datetime,
     ) -> None:
         self._config = config
         self._planner_config = planner_config
         self._monitor = monitor
         self._data_access_provider = data_access_provider
-        self._estimator_provider = estimator_provider
         self._startup_timestamp = startup_timestamp
 
+    async def metrics_snapshot(self, num_epochs: int) -> MonitorSnapshot:
+        # Subclasses that do not use a `Monitor` override this method.
+        assert self._monitor is not None
+        return await self._monitor.snapshot(num_epochs)
+
     def get_triggers(self) -> List[Trigger]:
         if self._config.stub_mode_path() is not None:
             logger.info("Stub mode enabled - not creating any planner triggers.")
@@ -79,7 +91,6 @@ class ConfigDefinedTriggers(TriggerProvider):
         if "disabled" not in aurora_cpu:
             trigger_list.append(
                 AuroraCpuUtilization(
-                    self._monitor,
                     epoch_length=self._config.epoch_length,
                     observe_bp_delay=observe_bp_delay,
                     **aurora_cpu
@@ -90,7 +101,6 @@ class ConfigDefinedTriggers(TriggerProvider):
         if "disabled" not in redshift_cpu:
             trigger_list.append(
                 RedshiftCpuUtilization(
-                    self._monitor,
                     epoch_length=self._config.epoch_length,
                     observe_bp_delay=observe_bp_delay,
                     **redshift_cpu
@@ -103,9 +113,7 @@ class ConfigDefinedTriggers(TriggerProvider):
                 VariableCosts(
                     self._config,
                     self._planner_config,
-                    self._monitor,
                     self._data_access_provider,
-                    self._estimator_provider,
                     var_costs["threshold"],
                     self._config.epoch_length,
                     self._startup_timestamp,
@@ -117,7 +125,6 @@ class ConfigDefinedTriggers(TriggerProvider):
         if "disabled" not in latency_ceiling:
             trigger_list.append(
                 QueryLatencyCeiling(
-                    self._monitor,
                     latency_ceiling["ceiling_s"],
                     latency_ceiling["sustained_epochs"],
                     self._config.epoch_length,
@@ -129,7 +136,6 @@ class ConfigDefinedTriggers(TriggerProvider):
         if "disabled" not in txn_latency_ceiling:
             trigger_list.append(
                 TransactionLatencyCeiling(
-                    self._monitor,
                     latency_ceiling["ceiling_s"],
                     latency_ceiling["sustained_epochs"],
                     self._config.epoch_length,
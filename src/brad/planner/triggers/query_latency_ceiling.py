@@ -3,7 +3,7 @@ from typing import Optional
 from datetime import timedelta
 
 from brad.config.metrics import FrontEndMetric
-from brad.daemon.monitor import Monitor
+from brad.daemon.monitor import MonitorSnapshot
 from brad.planner.triggers.trigger import Trigger
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,6 @@ logger = logging.getLogger(__name__)
 class QueryLatencyCeiling(Trigger):
     def __init__(
         self,
-        monitor: Monitor,
         latency_ceiling_s: float,
         sustained_epochs: int,
         epoch_length: timedelta,
@@ -20,7 +19,6 @@ class QueryLatencyCeiling(Trigger):
         lookahead_epochs: Optional[int] = None,
     ) -> None:
         super().__init__(epoch_length, observe_bp_delay)
-        self._monitor = monitor
         self._latency_ceiling_s = latency_ceiling_s
         self._sustained_epochs = sustained_epochs
         self._lookahead_epochs = lookahead_epochs
@@ -28,14 +26,17 @@ class QueryLatencyCeiling(Trigger):
     def set_latency_ceiling(self, ceiling_s: float) -> None:
         self._latency_ceiling_s = ceiling_s
 
-    async def should_replan(self) -> bool:
+    def metrics_lookback_epochs(self) -> int:
+        return self._sustained_epochs
+
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         if not self._passed_delays_since_cutoff():
             logger.debug(
                 "Skippping query latency ceiling trigger because we have not passed the delay cutoff."
             )
             return False
 
-        past = self._monitor.front_end_metrics().read_k_most_recent(
+        past = metrics.front_end_metrics().read_k_most_recent(
             k=self._sustained_epochs,
             metric_ids=[FrontEndMetric.QueryLatencySecondP90.value],
         )
@@ -56,7 +57,7 @@ class QueryLatencyCeiling(Trigger):
         if not self._passed_n_epochs_since_cutoff(self._sustained_epochs):
             return False
 
-        future = self._monitor.front_end_metrics().read_k_upcoming(
+        future = metrics.front_end_metrics().read_k_upcoming(
             k=self._lookahead_epochs,
             metric_ids=[FrontEndMetric.QueryLatencySecondP90.value],
         )
@@ -9,6 +9,7 @@ from brad.planner.scoring.score import Score
 from brad.utils.time_periods import universal_now
 
 from .trigger import Trigger
+from brad.daemon.monitor import MonitorSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class RecentChange(Trigger):
         self._last_provisioning_change: Optional[datetime] = None
         self._delay_epochs = delay_epochs
 
-    async def should_replan(self) -> bool:
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         if self._last_provisioning_change is None:
             return False
 
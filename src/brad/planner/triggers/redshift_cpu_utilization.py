@@ -4,7 +4,7 @@ from typing import Optional
 
 from .metrics_thresholds import MetricsThresholds
 from .trigger import Trigger
-from brad.daemon.monitor import Monitor
+from brad.daemon.monitor import MonitorSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,6 @@ logger = logging.getLogger(__name__)
 class RedshiftCpuUtilization(Trigger):
     def __init__(
         self,
-        monitor: Monitor,
         lo: float,
         hi: float,
         epoch_length: timedelta,
@@ -21,12 +20,14 @@ class RedshiftCpuUtilization(Trigger):
         lookahead_epochs: Optional[int] = None,
     ) -> None:
         super().__init__(epoch_length, observe_bp_delay)
-        self._monitor = monitor
         self._impl = MetricsThresholds(lo, hi, sustained_epochs)
         self._sustained_epochs = sustained_epochs
         self._lookahead_epochs = lookahead_epochs
 
-    async def should_replan(self) -> bool:
+    def metrics_lookback_epochs(self) -> int:
+        return self._sustained_epochs
+
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         if self._current_blueprint is None:
             logger.info(
                 "Redshift CPU utilization trigger not running because of missing blueprint."
@@ -45,7 +46,7 @@ class RedshiftCpuUtilization(Trigger):
             )
             return False
 
-        past = self._monitor.redshift_metrics().read_k_most_recent(
+        past = metrics.redshift_metrics().read_k_most_recent(
             k=self._sustained_epochs, metric_ids=[_UTILIZATION_METRIC]
         )
         relevant = past[past.index > self._cutoff]
@@ -62,7 +63,7 @@ class RedshiftCpuUtilization(Trigger):
             # not passed since the last cutoff.
             return False
 
-        future = self._monitor.redshift_metrics().read_k_upcoming(
+        future = metrics.redshift_metrics().read_k_upcoming(
             k=self._lookahead_epochs, metric_ids=[_UTILIZATION_METRIC]
         )
         return self._impl.exceeds_thresholds(
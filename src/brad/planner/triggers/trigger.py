@@ -2,6 +2,7 @@ from typing import Optional
 from datetime import timedelta, datetime
 from brad.blueprint import Blueprint
 from brad.daemon.aurora_metrics import AuroraMetrics
+from brad.daemon.monitor import MonitorSnapshot
 from brad.daemon.redshift_metrics import RedshiftMetrics
 from brad.planner.scoring.score import Score
 from brad.utils.time_periods import universal_now
@@ -20,13 +21,22 @@ class Trigger:
         self._observe_bp_delay = observe_bp_delay
         self._reset_cutoff()
 
-    async def should_replan(self) -> bool:
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         """
         Returns true if the blueprint planner should run again. This method is
-        meant to be called periodically.
+        meant to be called periodically. Triggers read metrics from the
+        provided snapshot, which is shared by all triggers and must not be
+        modified.
         """
         raise NotImplementedError
 
+    def metrics_lookback_epochs(self) -> int:
+        """
+        The number of most recent epochs of metrics that this trigger reads
+        from the snapshot passed to `should_replan()`.
+        """
+        return 0
+
     def update_blueprint(self, blueprint: Blueprint, score: Optional[Score]) -> None:
         self._current_blueprint = blueprint
         self._current_score = score
@@ -1,25 +1,25 @@
+import asyncio
 import logging
 import math
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Tuple, cast
 
 from .trigger import Trigger
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
 from brad.config.planner import PlannerConfig
-from brad.daemon.monitor import Monitor
-from brad.planner.estimator import EstimatorProvider
+from brad.daemon.monitor import MonitorSnapshot
 from brad.planner.scoring.data_access.provider import DataAccessProvider
-from brad.planner.workload.builder import WorkloadBuilder
 from brad.planner.workload.query import Query
+from brad.planner.workload.sliding_window import SlidingWorkloadWindow
 from brad.planner.scoring.provisioning import (
     compute_aurora_scan_cost,
     compute_athena_scan_cost,
     compute_aurora_accessed_pages,
-    compute_athena_scanned_bytes,
+    compute_athena_scanned_bytes_batch,
 )
-from brad.routing.router import Router
 from brad.utils.time_periods import elapsed_time, universal_now
 
 logger = logging.getLogger(__name__)
@@ -30,9 +30,7 @@ class VariableCosts(Trigger):
         self,
         config: ConfigFile,
         planner_config: PlannerConfig,
-        monitor: Monitor,
         data_access_provider: DataAccessProvider,
-        estimator_provider: EstimatorProvider,
         threshold_frac: float,
         epoch_length: timedelta,
         startup_timestamp: datetime,
@@ -49,13 +47,19 @@ class VariableCosts(Trigger):
         super().__init__(epoch_length, observe_bp_delay)
         self._config = config
         self._planner_config = planner_config
-        self._monitor = monitor
         self._data_access_provider = data_access_provider
-        self._estimator_provider = estimator_provider
+        # Incrementally maintains the queries logged in the planning window.
+        self._window = SlidingWorkloadWindow(config)
         self._change_ratio = 1.0 + threshold_frac
         self._startup_timestamp = startup_timestamp
 
-    async def should_replan(self) -> bool:
+    def metrics_lookback_epochs(self) -> int:
+        # We read the buffer hit rates over the planning window.
+        return math.ceil(
+            self._planner_config.planning_window() / self._config.epoch_length
+        )
+
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
         if self._current_blueprint is None or self._current_score is None:
             # We have no reference point for what the expected variable cost
             # should be.
@@ -70,7 +74,9 @@ class VariableCosts(Trigger):
             )
             return False
 
-        aurora_cost, athena_cost = await self._estimate_current_scan_hourly_cost()
+        aurora_cost, athena_cost = await self._estimate_current_scan_hourly_cost(
+            metrics
+        )
 
         if self._planner_config.use_io_optimized_aurora():
             current_hourly_cost = athena_cost
@@ -102,7 +108,9 @@ class VariableCosts(Trigger):
 
         return False
 
-    async def _estimate_current_scan_hourly_cost(self) -> Tuple[float, float]:
+    async def _estimate_current_scan_hourly_cost(
+        self, metrics: MonitorSnapshot
+    ) -> Tuple[float, float]:
         if self._current_blueprint is None:
             return 0.0, 0.0
 
@@ -115,58 +123,51 @@ class VariableCosts(Trigger):
         else:
             window_start = self._startup_timestamp
         logger.debug("Variable costs range: %s -- %s", window_start, window_end)
-        workload = (
-            WorkloadBuilder()
-            .add_queries_from_s3_logs(self._config, window_start, window_end)
-            .build(
-                rescale_to_period=timedelta(hours=1),
-                reinterpret_second_as=self._planner_config.reinterpret_second_as(),
-            )
-        )
-        if len(workload.analytical_queries()) == 0:
+        # Fetching the logs blocks on S3, so we do it off the event loop to let
+        # the other triggers run in the meantime.
+        await asyncio.to_thread(self._window.refresh, window_start, window_end)
+        window_queries = self._window.queries()
+        if len(window_queries) == 0:
             return 0.0, 0.0
-        self._data_access_provider.apply_access_statistics(workload)
+        self._window.apply_access_statistics(self._data_access_provider)
+        multiplier = self._window.arrival_count_multiplier(
+            rescale_to_period=timedelta(hours=1),
+            reinterpret_second_as=self._planner_config.reinterpret_second_as(),
+        )
 
-        # Compute the scan cost of this last window of queries.
-        aurora_query_indices: List[int] = []
+        # Compute the scan cost of this last window of queries. Each logged
+        # query is attributed to the engine it most recently ran on.
         aurora_queries: List[Query] = []
-        athena_query_indices: List[int] = []
+        aurora_pages: List[float] = []
         athena_queries: List[Query] = []
-        router = Router.create_from_blueprint(self._current_blueprint)
-        await router.run_setup_for_standalone(self._estimator_provider.get_estimator())
-
-        for idx, q in enumerate(workload.analytical_queries()):
-            maybe_engine = q.most_recent_execution_location()
-            if maybe_engine is None:
-                engine = await router.engine_for(q)
-            else:
-                engine = maybe_engine
-
-            if engine == Engine.Aurora:
-                aurora_query_indices.append(idx)
-                aurora_queries.append(q)
-            elif engine == Engine.Athena:
-                athena_query_indices.append(idx)
-                athena_queries.append(q)
+        athena_bytes: List[float] = []
+        for wq in window_queries:
+            if wq.engine == Engine.Aurora:
+                aurora_queries.append(
+                    Query(wq.query, arrival_count=wq.count * multiplier)
+                )
+                aurora_pages.append(cast(float, wq.aurora_pages))
+            elif wq.engine == Engine.Athena:
+                athena_queries.append(
+                    Query(wq.query, arrival_count=wq.count * multiplier)
+                )
+                athena_bytes.append(cast(float, wq.athena_bytes))
 
         # NOTE: Ideally we use the actual values.
         aurora_accessed_pages = compute_aurora_accessed_pages(
-            aurora_queries,
-            workload.get_predicted_aurora_pages_accessed_batch(aurora_query_indices),
+            aurora_queries, np.array(aurora_pages)
         )
-        athena_scanned_bytes = compute_athena_scanned_bytes(
-            athena_queries,
-            workload.get_predicted_athena_bytes_accessed_batch(athena_query_indices),
+        athena_scanned_bytes = compute_athena_scanned_bytes_batch(
+            np.array(athena_bytes),
+            np.array([q.arrival_count() for q in athena_queries]),
             self._planner_config,
         )
 
         # We use the hit rate to estimate Aurora scan costs.
         # Note that if we are using I/O optimized Aurora, there is no
         # incremental scan cost.
-        lookback_epochs = math.ceil(
-            self._planner_config.planning_window() / self._config.epoch_length
-        )
-        aurora_reader_metrics = self._monitor.aurora_reader_metrics()
+        lookback_epochs = self.metrics_lookback_epochs()
+        aurora_reader_metrics = metrics.aurora_reader_metrics()
         if len(aurora_reader_metrics) > 0:
             reader_hit_rates = []
             for reader_metrics in aurora_reader_metrics:
@@ -178,11 +179,11 @@ class VariableCosts(Trigger):
             all_metrics = pd.concat(reader_hit_rates)
             hit_rate_avg = all_metrics[_HIT_RATE_METRIC].mean() / 100.0
         else:
-            aurora_writer_metrics = self._monitor.aurora_writer_metrics()
-            metrics = aurora_writer_metrics.read_k_most_recent(
+            aurora_writer_metrics = metrics.aurora_writer_metrics()
+            writer_hit_rates = aurora_writer_metrics.read_k_most_recent(
                 k=lookback_epochs, metric_ids=[_HIT_RATE_METRIC]
             )
-            hit_rate_avg = metrics[_HIT_RATE_METRIC].mean() / 100.0
+            hit_rate_avg = writer_hit_rates[_HIT_RATE_METRIC].mean() / 100.0
 
         aurora_scan_cost = compute_aurora_scan_cost(
             aurora_accessed_pages, hit_rate_avg, self._planner_config
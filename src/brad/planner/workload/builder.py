@@ -3,7 +3,7 @@ import pathlib
 import logging
 import re
 from datetime import timedelta, datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 
 from brad.blueprint import Blueprint
 from brad.config.engine import Engine
@@ -15,6 +15,31 @@ from brad.workload_logging.log_fetcher import LogFetcher
 
 logger = logging.getLogger(__name__)
 
+_ANALYTICAL_LOG_REGEX = re.compile(
+    r"Query: (?P<query>.*) Engine: (?P<engine>[a-zA-Z]+) Duration \(s\): (?P<duration>[0-9\.]+)"
+)
+
+
+def parse_analytical_log(contents: str) -> Iterator[Tuple[str, Engine, float]]:
+    """
+    Extracts the (query, engine, run time in seconds) entries from the
+    contents of an analytical workload log file.
+    """
+    for line in contents.strip().split("\n"):
+        clean_line = line.strip()
+        if len(clean_line) == 0:
+            continue
+
+        matches = _ANALYTICAL_LOG_REGEX.search(line)
+        if matches is None:
+            logger.debug("Failed to parse log entry: %s", line)
+            continue
+        yield (
+            matches.group("query").strip(),
+            Engine.from_str(matches.group("engine")),
+            float(matches.group("duration")),
+        )
+
 
 class WorkloadBuilder:
     """
@@ -197,9 +222,6 @@ class WorkloadBuilder:
         range_start: Optional[datetime] = None
         epoch_length = config.epoch_length
 
-        log_regex_str = r"Query: (?P<query>.*) Engine: (?P<engine>[a-zA-Z]+) Duration \(s\): (?P<duration>[0-9\.]+)"
-        log_regex = re.compile(log_regex_str)
-
         # The logic below extracts data from log files that represent epochs
         # that intersect with the provided window.
         #
@@ -215,20 +237,9 @@ class WorkloadBuilder:
             is_valid = False
 
             if "analytical" in log_file.file_key:
-                for line in log_file.contents.strip().split("\n"):
-                    clean_line = line.strip()
-                    if len(clean_line) == 0:
-                        continue
-
-                    matches = log_regex.search(line)
-                    if matches is None:
-                        logger.debug("Failed to parse log entry: %s", line)
-                        continue
-                    q = matches.group("query")
-                    engine = Engine.from_str(matches.group("engine"))
-                    run_time_s = float(matches.group("duration"))
+                for q, engine, run_time_s in parse_analytical_log(log_file.contents):
                     analytical_queries.append(
-                        (q.strip(), engine, run_time_s, log_file.epoch_start)
+                        (q, engine, run_time_s, log_file.epoch_start)
                     )
                 is_valid = True
 
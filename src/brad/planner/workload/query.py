@@ -6,8 +6,9 @@ from brad.blueprint import Blueprint
 from brad.config.engine import Engine
 from brad.query_rep import QueryRep
 from brad.data_stats.plan_parsing import (
-    parse_explain_verbose,
-    extract_base_cardinalities,
+    explain_json_from_rows,
+    parse_explain_json,
+    parse_explain_text,
 )
 from brad.front_end.engine_connections import EngineConnections
 
@@ -95,7 +96,7 @@ class Query(QueryRep):
             )
 
         if source_engine == Engine.Aurora:
-            query = "EXPLAIN VERBOSE {}".format(self.raw_query)
+            query = "EXPLAIN (VERBOSE, FORMAT JSON) {}".format(self.raw_query)
             aurora = connections.get_connection(Engine.Aurora)
             cursor = aurora.cursor_sync()
         else:
@@ -106,8 +107,14 @@ class Query(QueryRep):
 
         cursor.execute_sync(query)
         plan_rows = [tuple(row) for row in cursor]
-        plan = parse_explain_verbose(plan_rows)
-        base_cardinalities = extract_base_cardinalities(plan)
+        if source_engine == Engine.Aurora:
+            plan = parse_explain_json(
+                explain_json_from_rows([row[0] for row in plan_rows])
+            )
+        else:
+            # Redshift does not support JSON plans.
+            plan = parse_explain_text(plan_rows)
+        base_cardinalities = plan.base_cardinalities()
 
         # 3. Sum up the results.
         # NOTE: This approach is not entirely correct. It is written this way
@@ -0,0 +1,213 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.planner.scoring.data_access.provider import DataAccessProvider
+from brad.planner.workload import Workload
+from brad.planner.workload.builder import parse_analytical_log
+from brad.planner.workload.query import Query
+from brad.workload_logging.log_fetcher import LogFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class WindowQuery:
+    """
+    An analytical query that was logged in the window, along with its cached
+    statistics.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        # The number of logged executions in the window.
+        self.count = 0
+        # Where the query ran in the most recent epoch that logged it. This is
+        # the engine that the query is currently routed to.
+        self.engine: Optional[Engine] = None
+        self.engine_epoch: Optional[datetime] = None
+        # Predicted data access statistics (`None` until they are computed).
+        self.aurora_pages: Optional[float] = None
+        self.athena_bytes: Optional[float] = None
+        # The number of epochs in the window that logged this query.
+        self.num_epochs = 0
+
+
+class _Epoch:
+    def __init__(self, epoch_start: datetime) -> None:
+        self.epoch_start = epoch_start
+        self.file_keys: Set[str] = set()
+        # Number of logged executions of each analytical query.
+        self.counts: Dict[str, int] = {}
+
+
+class SlidingWorkloadWindow:
+    """
+    Tracks the analytical queries logged over a sliding window of epochs.
+
+    `refresh()` only downloads the workload logs that it has not seen before
+    and drops the epochs that have left the window, so its cost is
+    proportional to the newly closed epochs rather than the whole window. The
+    data access statistics of each distinct query are predicted once and kept
+    for as long as the query remains in the window.
+    """
+
+    def __init__(
+        self, config: ConfigFile, log_fetcher: Optional[LogFetcher] = None
+    ) -> None:
+        self._config = config
+        self._log_fetcher = log_fetcher
+        self._epochs: Dict[datetime, _Epoch] = {}
+        self._queries: Dict[str, WindowQuery] = {}
+
+    def refresh(self, window_start: datetime, window_end: datetime) -> int:
+        """
+        Updates the window to cover the logs of the epochs that start in
+        `[window_start, window_end)`. Returns the number of new log files that
+        were ingested.
+        """
+        if self._log_fetcher is None:
+            self._log_fetcher = LogFetcher(self._config)
+
+        # Logs are written when their epoch ends, so we only need to look for
+        # epochs after the most recent one we have. We include that epoch
+        # because its logs are written by each front end independently.
+        fetch_start = window_start
+        if len(self._epochs) > 0:
+            fetch_start = max(fetch_start, *self._epochs.keys())
+
+        num_ingested = 0
+        for log_file in self._log_fetcher.fetch_logs(
+            fetch_start, window_end, include_contents=False
+        ):
+            is_analytical = "analytical" in log_file.file_key
+            if not is_analytical and "transactional" not in log_file.file_key:
+                continue
+
+            epoch = self._epochs.get(log_file.epoch_start)
+            if epoch is None:
+                epoch = _Epoch(log_file.epoch_start)
+                self._epochs[log_file.epoch_start] = epoch
+            elif log_file.file_key in epoch.file_keys:
+                continue
+            epoch.file_keys.add(log_file.file_key)
+            num_ingested += 1
+
+            # Transactional logs only count towards the window's period; their
+            # queries do not contribute to scan costs.
+            if is_analytical:
+                self._ingest_analytical(
+                    epoch, self._log_fetcher.fetch_contents(log_file.file_key)
+                )
+
+        # We evict after ingesting so that queries that are still running keep
+        # their cached statistics.
+        self._evict_before(window_start)
+
+        logger.debug(
+            "Workload window: ingested %d log file(s); %d epoch(s), %d queries.",
+            num_ingested,
+            len(self._epochs),
+            len(self._queries),
+        )
+        return num_ingested
+
+    def queries(self) -> List[WindowQuery]:
+        return list(self._queries.values())
+
+    def period(self) -> timedelta:
+        """
+        The amount of time covered by the logs in the window.
+        """
+        if len(self._epochs) == 0:
+            return timedelta(seconds=0)
+        return (
+            max(self._epochs.keys())
+            + self._config.epoch_length
+            - min(self._epochs.keys())
+        )
+
+    def arrival_count_multiplier(
+        self,
+        rescale_to_period: timedelta,
+        reinterpret_second_as: Optional[timedelta] = None,
+    ) -> float:
+        """
+        Scales the logged execution counts to arrivals per `rescale_to_period`
+        (using the same rules as `WorkloadBuilder.build()`).
+        """
+        period = self.period()
+        if reinterpret_second_as is not None:
+            period = timedelta(
+                seconds=period.total_seconds() * reinterpret_second_as.total_seconds()
+            )
+        if period.total_seconds() == 0.0:
+            return 1.0
+        return rescale_to_period / period
+
+    def apply_access_statistics(self, provider: DataAccessProvider) -> None:
+        """
+        Predicts the data access statistics of the queries that do not have
+        them yet.
+        """
+        missing = [wq for wq in self._queries.values() if wq.aurora_pages is None]
+        if len(missing) == 0:
+            return
+
+        workload = Workload(
+            period=timedelta(hours=1),
+            analytical_queries=[Query(wq.query) for wq in missing],
+            transactional_queries=[],
+            table_sizes={},
+        )
+        provider.apply_access_statistics(workload)
+        indices = list(range(len(missing)))
+        aurora_pages = workload.get_predicted_aurora_pages_accessed_batch(indices)
+        athena_bytes = workload.get_predicted_athena_bytes_accessed_batch(indices)
+        for wq, pages, num_bytes in zip(missing, aurora_pages, athena_bytes):
+            wq.aurora_pages = float(pages)
+            wq.athena_bytes = float(num_bytes)
+
+    def _ingest_analytical(self, epoch: _Epoch, contents: str) -> None:
+        first_engines: Dict[str, Engine] = {}
+        new_counts: Dict[str, int] = {}
+        for query, engine, _ in parse_analytical_log(contents):
+            if query not in new_counts:
+                new_counts[query] = 1
+                first_engines[query] = engine
+            else:
+                new_counts[query] += 1
+
+        for query, count in new_counts.items():
+            wq = self._queries.get(query)
+            if wq is None:
+                wq = WindowQuery(query)
+                self._queries[query] = wq
+            wq.count += count
+            if query in epoch.counts:
+                epoch.counts[query] += count
+            else:
+                epoch.counts[query] = count
+                wq.num_epochs += 1
+
+            # We use the engine of the first execution logged in the most
+            # recent epoch (see `Query.most_recent_execution_location()`).
+            if wq.engine_epoch is None or epoch.epoch_start > wq.engine_epoch:
+                wq.engine = first_engines[query]
+                wq.engine_epoch = epoch.epoch_start
+
+    def _evict_before(self, window_start: datetime) -> None:
+        expired: List[Tuple[datetime, _Epoch]] = [
+            (epoch_start, epoch)
+            for epoch_start, epoch in self._epochs.items()
+            if epoch_start < window_start
+        ]
+        for epoch_start, epoch in expired:
+            for query, count in epoch.counts.items():
+                wq = self._queries[query]
+                wq.count -= count
+                wq.num_epochs -= 1
+                if wq.num_epochs == 0:
+                    del self._queries[query]
+            del self._epochs[epoch_start]
@@ -1,6 +1,9 @@
 import asyncio
 import boto3
 import logging
+import os
+import pathlib
+import pickle
 import botocore.exceptions
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -74,12 +77,7 @@ class Directory:
 
     def __setstate__(self, d: Dict[Any, Any]) -> None:
         self._config = d["config"]
-        self._aurora_writer = d["aurora_writer"]
-        self._aurora_readers = d["aurora_readers"]
-        self._redshift_cluster = d["redshift_cluster"]
-        self._aurora_writer_endpoint = d["aurora_writer_endpoint"]
-        self._aurora_reader_endpoint = d["aurora_reader_endpoint"]
-        self._overridden_redshift_cluster_id = d["overridden_redshift_cluster_id"]
+        self._set_metadata(d)
 
         self._rds = boto3.client(
             "rds",
@@ -92,6 +90,39 @@ class Directory:
             aws_secret_access_key=self._config.aws_access_key_secret,
         )
 
+    def connection_metadata(self) -> Tuple[Any, ...]:
+        """
+        The parts of this directory that BRAD uses to connect to and monitor
+        the engines: the instances (and their endpoints), the Aurora cluster's
+        writer and reader endpoints, and the Redshift cluster. Instance
+        statuses are not included. Compare the results to check whether a
+        refresh changed the directory.
+        """
+
+        def aurora_instance(instance: Optional["AuroraInstanceMetadata"]) -> Any:
+            if instance is None:
+                return None
+            return (instance.instance_id(), instance.resource_id(), instance.endpoint())
+
+        redshift = self._redshift_cluster
+        return (
+            aurora_instance(self._aurora_writer),
+            tuple(aurora_instance(reader) for reader in self._aurora_readers),
+            self._aurora_writer_endpoint,
+            self._aurora_reader_endpoint,
+            (
+                None
+                if redshift is None
+                else (
+                    redshift.cluster_id(),
+                    redshift.endpoint(),
+                    redshift.instance_type(),
+                    redshift.num_nodes(),
+                )
+            ),
+            self._overridden_redshift_cluster_id,
+        )
+
     def update_to_directory(self, other: "Directory") -> None:
         # pylint: disable=protected-access
         """
@@ -106,6 +137,50 @@ class Directory:
         self._aurora_reader_endpoint = other._aurora_reader_endpoint
         self._overridden_redshift_cluster_id = other._overridden_redshift_cluster_id
 
+    def save_snapshot(self, path: pathlib.Path) -> None:
+        """
+        Persists this directory's metadata so that a later BRAD process can
+        start with it before its first refresh completes (see
+        `load_snapshot()`). The snapshot is replaced atomically.
+        """
+        state = self.__getstate__()
+        del state["config"]
+        state["aurora_cluster_id"] = self._config.aurora_cluster_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".tmp{os.getpid()}")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(state, file)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: pathlib.Path) -> bool:
+        """
+        Sets the metadata in this directory to the metadata saved by
+        `save_snapshot()`. Snapshots written for a different Aurora cluster or
+        Redshift cluster override are ignored. Returns true iff the snapshot
+        was used.
+
+        The snapshot may be out of date. Callers should still `refresh()` the
+        directory (e.g., in the background).
+        """
+        try:
+            with open(path, "rb") as file:
+                state = pickle.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            logger.warning("Ignoring unreadable directory snapshot %s", path)
+            return False
+
+        if (
+            state.get("aurora_cluster_id") != self._config.aurora_cluster_id
+            or state.get("overridden_redshift_cluster_id")
+            != self._overridden_redshift_cluster_id
+        ):
+            logger.info("Ignoring directory snapshot %s for other clusters.", path)
+            return False
+        self._set_metadata(state)
+        return True
+
     def set_override_redshift_cluster_id(self, cluster_id: Optional[str]) -> None:
         # This is used to switch to a preset Redshift cluster.
         self._overridden_redshift_cluster_id = cluster_id
@@ -139,7 +214,7 @@ class Directory:
         while True:
             try:
                 await self.refresh_impl()
-                return
+                break
             except botocore.exceptions.ClientError as ex:
                 if backoff is None:
                     backoff = RandomizedExponentialBackoff(
@@ -152,14 +227,24 @@ class Directory:
                     ) from ex
                 await asyncio.sleep(wait_time_s)
 
+        snapshot_path = self._config.directory_snapshot_path()
+        if snapshot_path is not None:
+            try:
+                self.save_snapshot(snapshot_path)
+            except OSError:
+                logger.exception("Failed to save the directory to %s", snapshot_path)
+
     async def refresh_impl(self) -> None:
+        # The describe calls are independent, so we issue them concurrently.
+        aurora, redshift = await asyncio.gather(
+            self._refresh_aurora(), self._refresh_redshift()
+        )
         (
             aurora_writer,
             aurora_readers,
             writer_endpoint,
             reader_endpoint,
-        ) = await self._refresh_aurora()
-        redshift = await self._refresh_redshift()
+        ) = aurora
 
         self._aurora_writer = aurora_writer
         self._aurora_readers.clear()
@@ -184,35 +269,44 @@ class Directory:
         new_readers: List[AuroraInstanceMetadata] = []
         cluster_info = response["DBClusters"][0]
 
+        writer_id: Optional[str] = None
+        reader_ids: List[str] = []
         for instance_info in cluster_info["DBClusterMembers"]:
             instance_id = instance_info["DBInstanceIdentifier"]
             is_writer = instance_info["IsClusterWriter"]
 
             if is_writer:
-                assert new_writer is None
-                new_writer = await self._refresh_aurora_instance(instance_id)
+                assert writer_id is None
+                writer_id = instance_id
+            elif "-replica-" not in instance_id:
+                logger.debug(
+                    "Ignoring Aurora instance %s because it is not named as a replica.",
+                    instance_id,
+                )
             else:
-                if "-replica-" not in instance_id:
-                    logger.debug(
-                        "Ignoring Aurora instance %s because it is not named as a replica.",
-                        instance_id,
-                    )
-                    continue
-
-                reader_info = await self._refresh_aurora_instance(instance_id)
-                reader_status = reader_info.status()
-                if (
-                    reader_status == RdsStatus.Deleting
-                    or reader_status == RdsStatus.DeletePrecheck
-                    or reader_status == RdsStatus.Failed
-                ):
-                    logger.debug(
-                        "Ignoring Aurora instance %s because it has an invalid status %s",
-                        instance_id,
-                        str(reader_status),
-                    )
-                    continue
-                new_readers.append(reader_info)
+                reader_ids.append(instance_id)
+
+        assert writer_id is not None
+        new_writer, *reader_infos = await asyncio.gather(
+            *[
+                self._refresh_aurora_instance(instance_id)
+                for instance_id in [writer_id, *reader_ids]
+            ]
+        )
+        for reader_info in reader_infos:
+            reader_status = reader_info.status()
+            if (
+                reader_status == RdsStatus.Deleting
+                or reader_status == RdsStatus.DeletePrecheck
+                or reader_status == RdsStatus.Failed
+            ):
+                logger.debug(
+                    "Ignoring Aurora instance %s because it has an invalid status %s",
+                    reader_info.instance_id(),
+                    str(reader_status),
+                )
+                continue
+            new_readers.append(reader_info)
 
         assert new_writer is not None
         new_readers.sort()
@@ -268,6 +362,14 @@ class Directory:
         }
         return RedshiftClusterMetadata(cluster_id=redshift_cluster_id, **kwargs)
 
+    def _set_metadata(self, d: Dict[Any, Any]) -> None:
+        self._aurora_writer = d["aurora_writer"]
+        self._aurora_readers = d["aurora_readers"]
+        self._redshift_cluster = d["redshift_cluster"]
+        self._aurora_writer_endpoint = d["aurora_writer_endpoint"]
+        self._aurora_reader_endpoint = d["aurora_reader_endpoint"]
+        self._overridden_redshift_cluster_id = d["overridden_redshift_cluster_id"]
+
     def _call_describe_aurora_cluster(self) -> Dict[Any, Any]:
         return self._rds.describe_db_clusters(
             DBClusterIdentifier=self._config.aurora_cluster_id
@@ -378,6 +480,9 @@ class RedshiftClusterMetadata:
             ]
         )
 
+    def cluster_id(self) -> str:
+        return self._cluster_id
+
     def endpoint(self) -> Tuple[str, int]:
         return (self._endpoint_address, self._endpoint_port)
 
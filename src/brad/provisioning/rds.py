@@ -3,31 +3,41 @@ import boto3
 import time
 import logging
 import botocore.exceptions
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from brad.config.engine import Engine
 from brad.config.file import ConfigFile
 from brad.blueprint.provisioning import Provisioning
+from brad.provisioning.waiter import ProvisioningAction, ProvisioningWaiter
 from brad.utils.rand_exponential_backoff import RandomizedExponentialBackoff
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class RdsProvisioningManager:
-    def __init__(self, config: ConfigFile) -> None:
+    def __init__(
+        self, config: ConfigFile, waiter: Optional[ProvisioningWaiter] = None
+    ) -> None:
         self._config = config
         self._rds = boto3.client(
             "rds",
             aws_access_key_id=config.aws_access_key,
             aws_secret_access_key=config.aws_access_key_secret,
         )
+        self._waiter = waiter if waiter is not None else ProvisioningWaiter()
+        # We make the boto3 client async by running its calls in a thread pool.
+        # To avoid having multiple API calls in flight on the same client, we
+        # run them one at a time. Waits on different instances can still
+        # proceed concurrently.
+        self._api_lock = asyncio.Lock()
 
     async def run_primary_failover(
         self,
         cluster_id: str,
         new_primary_identifier: str,
         wait_until_complete: bool = True,
-        polling_interval: float = 20.0,
     ) -> None:
         def do_failover():
             return self._rds.failover_db_cluster(
@@ -35,24 +45,25 @@ class RdsProvisioningManager:
                 TargetDBInstanceIdentifier=new_primary_identifier,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_failover)
+        await self._call(do_failover)
+
+        async def is_primary() -> bool:
+            response = await self._describe_db_cluster(cluster_id)
+            cluster = response["DBClusters"][0]
+            for instance_info in cluster["DBClusterMembers"]:
+                if (
+                    instance_info["DBInstanceIdentifier"] == new_primary_identifier
+                    and instance_info["IsClusterWriter"]
+                ):
+                    return True
+            return False
 
         if wait_until_complete:
-            while True:
-                response = await self._describe_db_cluster(cluster_id)
-                cluster = response["DBClusters"][0]
-                for instance_info in cluster["DBClusterMembers"]:
-                    if (
-                        instance_info["DBInstanceIdentifier"] == new_primary_identifier
-                        and instance_info["IsClusterWriter"]
-                    ):
-                        return
-                logger.debug(
-                    "Waiting for %s to be reflected as the primary...",
-                    new_primary_identifier,
-                )
-                await asyncio.sleep(polling_interval)
+            await self._waiter.wait_for(
+                ProvisioningAction.AuroraFailover,
+                is_primary,
+                "failover to {}".format(new_primary_identifier),
+            )
 
     async def create_replica(
         self,
@@ -76,14 +87,12 @@ class RdsProvisioningManager:
                 MonitoringRoleArn=monitoring_role_arn,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_create_replica)
+        await self._call(do_create_replica)
 
         if wait_until_available:
-            # Need a slight delay to ensure the instance's state change is
-            # updated.
-            await asyncio.sleep(20)
-            await self.wait_until_instance_is_available(instance_id)
+            await self.wait_until_instance_is_available(
+                instance_id, ProvisioningAction.AuroraCreateReplica
+            )
 
     async def delete_replica(
         self, instance_id: str, wait_until_status_updated: bool = True
@@ -95,56 +104,57 @@ class RdsProvisioningManager:
                 DeleteAutomatedBackups=True,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_delete)
+        await self._call(do_delete)
 
         # Will poll until the instance's status is no longer "available".
         if wait_until_status_updated:
-            await asyncio.sleep(10)
             await self.wait_until_instance_is_not_available(instance_id)
 
     async def wait_until_instance_is_available(
-        self, instance_id: str, polling_interval: float = 20
+        self,
+        instance_id: str,
+        action: ProvisioningAction = ProvisioningAction.AuroraCreateReplica,
+        initial_delay_s: float = 20.0,
     ) -> None:
-        while True:
-            response = await self._describe_db_instance(instance_id)
-            instance = response["DBInstances"][0]
-            status = instance["DBInstanceStatus"]
-            if status == "available":
-                break
-            logger.debug(
-                "Waiting for Aurora instance %s to become available...", instance_id
-            )
-            await asyncio.sleep(polling_interval)
+        """
+        Waits for the instance to become available after `action`. The
+        instance may still report its previous status right after the action
+        is requested, so the first check is delayed by `initial_delay_s`.
+        """
+
+        async def is_available() -> bool:
+            return await self._instance_status(instance_id) == "available"
+
+        await self._waiter.wait_for(
+            action,
+            is_available,
+            "Aurora instance {}".format(instance_id),
+            initial_delay_s=initial_delay_s,
+        )
 
-    async def wait_until_instance_is_not_available(
-        self, instance_id: str, polling_interval: float = 20
-    ) -> None:
-        while True:
-            response = await self._describe_db_instance(instance_id)
-            instance = response["DBInstances"][0]
-            status = instance["DBInstanceStatus"]
-            if status != "available":
-                break
-            logger.debug(
-                "Waiting for Aurora instance %s to be NOT available...", instance_id
-            )
-            await asyncio.sleep(polling_interval)
+    async def wait_until_instance_is_not_available(self, instance_id: str) -> None:
+        async def is_not_available() -> bool:
+            return await self._instance_status(instance_id) != "available"
 
-    async def wait_until_cluster_is_available(
-        self, cluster_id: str, polling_interval: float = 20
-    ) -> None:
-        while True:
+        await self._waiter.wait_for(
+            ProvisioningAction.AuroraDeleteReplica,
+            is_not_available,
+            "Aurora instance {} to be NOT available".format(instance_id),
+            initial_delay_s=10.0,
+        )
+
+    async def wait_until_cluster_is_available(self, cluster_id: str) -> None:
+        async def is_available() -> bool:
             response = await self._describe_db_cluster(cluster_id)
             cluster = response["DBClusters"][0]
-            status = cluster["Status"]
             # Check if status is stable.
-            if status == "available":
-                break
-            logger.debug(
-                "Waiting for Aurora cluster %s to become available...", cluster_id
-            )
-            await asyncio.sleep(polling_interval)
+            return cluster["Status"] == "available"
+
+        await self._waiter.wait_for(
+            ProvisioningAction.AuroraStartCluster,
+            is_available,
+            "Aurora cluster {}".format(cluster_id),
+        )
 
     async def start_cluster(
         self, cluster_id: str, wait_until_available: bool = True
@@ -154,8 +164,7 @@ class RdsProvisioningManager:
                 DBClusterIdentifier=cluster_id,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_start)
+        await self._call(do_start)
 
         if wait_until_available:
             await self.wait_until_cluster_is_available(cluster_id)
@@ -166,8 +175,7 @@ class RdsProvisioningManager:
                 DBClusterIdentifier=cluster_id,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_pause)
+        await self._call(do_pause)
 
     async def change_instance_type(
         self,
@@ -182,14 +190,20 @@ class RdsProvisioningManager:
                 ApplyImmediately=True,
             )
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, do_change)
+        await self._call(do_change)
 
         if wait_until_available:
             # Need a slight delay to ensure the instance's state change is
             # updated.
-            await asyncio.sleep(60)
-            await self.wait_until_instance_is_available(instance_id)
+            await self.wait_until_instance_is_available(
+                instance_id,
+                ProvisioningAction.AuroraChangeInstanceType,
+                initial_delay_s=60.0,
+            )
+
+    async def _instance_status(self, instance_id: str) -> str:
+        response = await self._describe_db_instance(instance_id)
+        return response["DBInstances"][0]["DBInstanceStatus"]
 
     async def _describe_db_instance(self, instance_id: str) -> Dict[str, Any]:
         def do_describe():
@@ -198,11 +212,10 @@ class RdsProvisioningManager:
             )
 
         backoff = None
-        loop = asyncio.get_running_loop()
 
         while True:
             try:
-                return await loop.run_in_executor(None, do_describe)
+                return await self._call(do_describe)
             except botocore.exceptions.ClientError as ex:
                 if backoff is None:
                     backoff = RandomizedExponentialBackoff(
@@ -222,13 +235,12 @@ class RdsProvisioningManager:
             )
 
         backoff = None
-        loop = asyncio.get_running_loop()
 
         # The AWS APIs may throttle us. We wrap the call with our own randomized
         # back off increase the likelihood that this call succeeds.
         while True:
             try:
-                return await loop.run_in_executor(None, do_describe)
+                return await self._call(do_describe)
             except botocore.exceptions.ClientError as ex:
                 if backoff is None:
                     backoff = RandomizedExponentialBackoff(
@@ -241,6 +253,11 @@ class RdsProvisioningManager:
                     ) from ex
                 await asyncio.sleep(wait_time_s)
 
+    async def _call(self, fn: Callable[[], T]) -> T:
+        async with self._api_lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, fn)
+
 
 class RdsProvisioning:
     # Initialize provisioning.
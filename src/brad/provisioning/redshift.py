@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional
 from brad.blueprint.provisioning import Provisioning
 from brad.config.file import ConfigFile
 from brad.provisioning.redshift_status import RedshiftAvailabilityStatus
+from brad.provisioning.waiter import ProvisioningAction, ProvisioningWaiter
 from brad.utils.rand_exponential_backoff import RandomizedExponentialBackoff
 
 logger = logging.getLogger(__name__)
@@ -19,12 +20,15 @@ class RedshiftProvisioningManager:
     Used to execute provisioning changes.
     """
 
-    def __init__(self, config: ConfigFile):
+    def __init__(
+        self, config: ConfigFile, waiter: Optional[ProvisioningWaiter] = None
+    ) -> None:
         self._redshift = boto3.client(
             "redshift",
             aws_access_key_id=config.aws_access_key,
             aws_secret_access_key=config.aws_access_key_secret,
         )
+        self._waiter = waiter if waiter is not None else ProvisioningWaiter()
 
     @staticmethod
     def must_use_classic_resize(old: Provisioning, new: Provisioning) -> bool:
@@ -96,8 +100,9 @@ class RedshiftProvisioningManager:
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, do_resume)
 
-        await asyncio.sleep(20)
-        await self.wait_until_available(cluster_id)
+        await self.wait_until_available(
+            cluster_id, ProvisioningAction.RedshiftResume, initial_delay_s=20.0
+        )
 
         response = await self._get_cluster_state(cluster_id)
         cluster = response["Clusters"][0]
@@ -148,15 +153,18 @@ class RedshiftProvisioningManager:
             if not wait_until_complete:
                 break
 
-            await asyncio.sleep(20)
-
+            initial_delay_s = 20.0
             while True:
                 # Wait for 20 minutes before considering aborting.
                 completed = await self.wait_until_available(
-                    cluster_id, polling_interval=30.0, max_checks=40
+                    cluster_id,
+                    ProvisioningAction.RedshiftClassicResize,
+                    initial_delay_s=initial_delay_s,
+                    max_wait_s=20 * 60.0,
                 )
                 if completed:
                     return
+                initial_delay_s = 0.0
 
                 # If the resize has not made any progress, we cancel and retry.
                 status = await self._get_resize_status(cluster_id)
@@ -180,8 +188,12 @@ class RedshiftProvisioningManager:
                             cluster_id,
                         )
 
-            await asyncio.sleep(20)
-            await self.wait_until_available(cluster_id)
+            # Wait for the cancellation to complete before retrying.
+            await self.wait_until_available(
+                cluster_id,
+                ProvisioningAction.RedshiftClassicResize,
+                initial_delay_s=20.0,
+            )
 
     async def elastic_resize(
         self,
@@ -215,46 +227,48 @@ class RedshiftProvisioningManager:
             return False
 
         if wait_until_available:
-            await asyncio.sleep(20)
-            await self.wait_until_available(cluster_id)
+            await self.wait_until_available(
+                cluster_id,
+                ProvisioningAction.RedshiftElasticResize,
+                initial_delay_s=20.0,
+            )
         return True
 
     async def wait_until_available(
         self,
         cluster_id: str,
-        polling_interval: float = 20.0,
-        max_checks: Optional[int] = None,
+        action: ProvisioningAction,
+        initial_delay_s: float = 0.0,
+        max_wait_s: Optional[float] = None,
     ) -> bool:
         """
-        Blocks until the Redshift cluster is available. If `max_checks` is set,
-        will abort after checking that many times. The return value indicates
-        whether the wait was successful (this can only be False if `max_checks`
-        is set).
+        Blocks until the Redshift cluster is available after `action`. If
+        `max_wait_s` is set, will abort after waiting that long. The return
+        value indicates whether the wait was successful (this can only be False
+        if `max_wait_s` is set).
         """
-        checks_so_far = 0
-        while True:
+
+        async def is_available() -> bool:
             response = await self._get_cluster_state(cluster_id)
             cluster = response["Clusters"][0]
             availability_status = RedshiftAvailabilityStatus.from_str(
                 cluster["ClusterAvailabilityStatus"]
             )
-            if (
+            return (
                 availability_status == RedshiftAvailabilityStatus.Available
                 # `Maintenance` sometimes occurs and probably refers to when AWS
                 # is performing upgrades to the DBMS. We can still serve queries
                 # during this time.
                 or availability_status == RedshiftAvailabilityStatus.Maintenance
-            ):
-                return True
-
-            checks_so_far += 1
-            if max_checks is not None and checks_so_far >= max_checks:
-                return False
-
-            logger.debug(
-                "Waiting for Redshift cluster %s to become available...", cluster_id
             )
-            await asyncio.sleep(polling_interval)
+
+        return await self._waiter.wait_for(
+            action,
+            is_available,
+            "Redshift cluster {}".format(cluster_id),
+            initial_delay_s=initial_delay_s,
+            max_wait_s=max_wait_s,
+        )
 
     async def cancel_resize(self, cluster_id: str) -> bool:
         def do_cancel():
@@ -0,0 +1,147 @@
+import asyncio
+import enum
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProvisioningAction(enum.Enum):
+    """
+    The kinds of provisioning changes whose completion we wait for. Each kind
+    has its own history of observed durations.
+    """
+
+    AuroraCreateReplica = "aurora_create_replica"
+    AuroraDeleteReplica = "aurora_delete_replica"
+    AuroraChangeInstanceType = "aurora_change_instance_type"
+    AuroraStartCluster = "aurora_start_cluster"
+    AuroraFailover = "aurora_failover"
+    RedshiftResume = "redshift_resume"
+    RedshiftElasticResize = "redshift_elastic_resize"
+    RedshiftClassicResize = "redshift_classic_resize"
+
+
+# Used until we have observed an action complete.
+_DEFAULT_EXPECTED_DURATION_S = {
+    ProvisioningAction.AuroraCreateReplica: 480.0,
+    ProvisioningAction.AuroraDeleteReplica: 20.0,
+    ProvisioningAction.AuroraChangeInstanceType: 600.0,
+    ProvisioningAction.AuroraStartCluster: 300.0,
+    ProvisioningAction.AuroraFailover: 30.0,
+    ProvisioningAction.RedshiftResume: 300.0,
+    ProvisioningAction.RedshiftElasticResize: 600.0,
+    ProvisioningAction.RedshiftClassicResize: 3600.0,
+}
+
+# Checks whether the action has completed (e.g., by calling a describe API).
+StateCheck = Callable[[], Awaitable[bool]]
+
+
+class ProvisioningWaiter:
+    """
+    Polls for the completion of provisioning actions.
+
+    Provisioning actions take minutes, but their durations are fairly
+    predictable. Instead of polling at a fixed interval, the waiter backs off
+    exponentially early on (the action cannot be done yet) and polls tightly
+    once the elapsed time approaches the expected duration. The expected
+    duration of each action is the median of its recently observed durations.
+
+    The state check, clock, and sleep function are pluggable so that the
+    waiter can be driven by a simulated provider.
+    """
+
+    def __init__(
+        self,
+        min_interval_s: float = 5.0,
+        max_interval_s: float = 30.0,
+        history_length: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._min_interval_s = min_interval_s
+        self._max_interval_s = max_interval_s
+        self._clock = clock
+        self._sleep = sleep
+        self._history: Dict[ProvisioningAction, Deque[float]] = {
+            action: deque(maxlen=history_length) for action in ProvisioningAction
+        }
+
+    async def wait_for(
+        self,
+        action: ProvisioningAction,
+        is_done: StateCheck,
+        description: str,
+        initial_delay_s: float = 0.0,
+        max_wait_s: Optional[float] = None,
+    ) -> bool:
+        """
+        Waits until `is_done()` returns true. Returns false if `max_wait_s` is
+        set and elapses first.
+
+        Some AWS APIs take a few seconds to reflect a requested change (e.g.,
+        an instance being modified still reports that it is available). Use
+        `initial_delay_s` to delay the first check in these cases.
+        """
+        start = self._clock()
+        expected_s = self.expected_duration_s(action)
+        num_checks = 0
+        if initial_delay_s > 0.0:
+            await self._sleep(initial_delay_s)
+        while True:
+            num_checks += 1
+            if await is_done():
+                elapsed_s = self._clock() - start
+                self._history[action].append(elapsed_s)
+                logger.debug(
+                    "%s completed after %.1f s (%d checks, expected %.1f s).",
+                    description,
+                    elapsed_s,
+                    num_checks,
+                    expected_s,
+                )
+                return True
+
+            elapsed_s = self._clock() - start
+            if max_wait_s is not None and elapsed_s >= max_wait_s:
+                return False
+
+            interval_s = self.next_interval_s(elapsed_s, expected_s)
+            if max_wait_s is not None:
+                interval_s = min(interval_s, max_wait_s - elapsed_s)
+            logger.debug(
+                "Waiting for %s (%.1f s elapsed, expected %.1f s)...",
+                description,
+                elapsed_s,
+                expected_s,
+            )
+            await self._sleep(interval_s)
+
+    def expected_duration_s(self, action: ProvisioningAction) -> float:
+        history = self._history[action]
+        if len(history) == 0:
+            return _DEFAULT_EXPECTED_DURATION_S[action]
+        return statistics.median(history)
+
+    def next_interval_s(self, elapsed_s: float, expected_s: float) -> float:
+        """
+        The time to wait before the next check.
+        """
+        # Poll tightly within this window around the expected completion time.
+        tight_start_s = 0.9 * expected_s
+        tight_end_s = 1.5 * expected_s
+
+        if elapsed_s < tight_start_s:
+            # Back off exponentially, but do not overshoot the tight window.
+            interval_s = max(self._min_interval_s, elapsed_s)
+            interval_s = min(interval_s, tight_start_s - elapsed_s)
+        elif elapsed_s < tight_end_s:
+            interval_s = self._min_interval_s
+        else:
+            # The action is taking longer than usual; back off again.
+            interval_s = elapsed_s - tight_end_s
+        return min(max(interval_s, self._min_interval_s), self._max_interval_s)
@@ -1,10 +1,17 @@
+import hashlib
+import logging
+import pathlib
+import re
 import sqlglot
 import sqlglot.expressions as exp
 import yaml
 from importlib.resources import files, as_file
 import brad.routing as routing
+from brad.parse_cache import ParseCache, ParsedQuery
 from brad.routing.functionality_catalog import Functionality
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 _DATA_MODIFICATION_PREFIXES = [
     "INSERT",
@@ -19,6 +26,7 @@ _DATA_MODIFICATION_PREFIXES = [
     "SET SESSION",
     "TRUNCATE",
 ]
+_DATA_MODIFICATION_PREFIXES_TUPLE = tuple(_DATA_MODIFICATION_PREFIXES)
 
 # Load geospatial keywords used to detect if geospatial query
 _GEOSPATIAL_KEYWORDS_PATH = files(routing).joinpath("geospatial_keywords.yml")
@@ -31,6 +39,248 @@ _GEOSPATIAL_KEYWORDS = [k.upper() for k in _GEOSPATIAL_KEYWORDS]
 _VECTOR_KEYWORDS = ["<=>"]
 
 
+def _keyword_pattern(keywords: List[str]) -> str:
+    """
+    Returns a regex that matches any of `keywords`. The alternatives are
+    arranged as a trie so that matching at each position is a single walk
+    (rather than trying every keyword in turn).
+    """
+    trie: Dict[str, Dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_pattern(node: Dict[str, Dict]) -> str:
+        alternatives = []
+        for char in sorted(node.keys()):
+            if char == "":
+                # A keyword ends here, so an empty suffix also matches.
+                alternatives.append("")
+            else:
+                alternatives.append(re.escape(char) + to_pattern(node[char]))
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    return to_pattern(trie)
+
+
+# Matches geospatial and vector keywords in one scan over the (uppercased)
+# query.
+_KEYWORD_MATCHER = re.compile(
+    "(?P<geospatial>{})|(?P<vector>{})".format(
+        _keyword_pattern(_GEOSPATIAL_KEYWORDS), _keyword_pattern(_VECTOR_KEYWORDS)
+    )
+)
+
+# Identifies the analysis used to derive a `ParsedQuery` (saved snapshots of
+# the parse cache are only used if this matches). Bump the suffix when the
+# table extraction changes.
+_ANALYSIS_VERSION = "{}-1".format(
+    hashlib.blake2b(
+        "\n".join(_GEOSPATIAL_KEYWORDS + _VECTOR_KEYWORDS).encode("UTF-8"),
+        digest_size=8,
+    ).hexdigest()
+)
+
+# Used by `_extract_tables_simple()`.
+_TOKENIZER = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<name>
+        (?:[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+")
+        (?:\.(?:[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+"))*
+    )
+    | (?P<number>\d+(?:\.\d*)?)
+    | (?P<lparen>\()
+    | (?P<rparen>\))
+    | (?P<comma>,)
+    | (?P<other>--|/\*|"|[^\s\w'"(),])
+    """,
+    re.VERBOSE,
+)
+_NAME_PARTS = re.compile(r'"((?:[^"]|"")+)"|([^."]+)')
+_JOIN_KEYWORDS = {"JOIN", "INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS"}
+_CLAUSE_END_KEYWORDS = {
+    "WHERE",
+    "GROUP",
+    "HAVING",
+    "WINDOW",
+    "ORDER",
+    "LIMIT",
+    "OFFSET",
+    "FETCH",
+    "FOR",
+    "RETURNING",
+}
+# Forms that the simple table extractor does not handle (we fall back to a
+# full parse).
+_UNSUPPORTED_KEYWORDS = {
+    "WITH",
+    "UNION",
+    "INTERSECT",
+    "EXCEPT",
+    "LATERAL",
+    "NATURAL",
+    "VALUES",
+    "USING",
+    "SET",
+    "INTO",
+    "SELECT",
+    "FROM",
+    "UPDATE",
+    "DELETE",
+    "INSERT",
+    "ONLY",
+    "TABLESAMPLE",
+}
+
+
+def _extract_tables_simple(sql: str) -> Optional[List[str]]:
+    """
+    Extracts the names of the tables referenced by simple single-block
+    SELECT, INSERT ... VALUES, UPDATE and DELETE statements without running a
+    full parse. The result matches the tables found by `sqlglot` (in the same
+    order). Returns `None` if the query is not in one of these simple forms.
+    """
+    tokens = []
+    expected_start = 0
+    for match in _TOKENIZER.finditer(sql):
+        if match.start() != expected_start:
+            # Text that we cannot tokenize (e.g., an unterminated string).
+            return None
+        expected_start = match.end()
+        kind = match.lastgroup
+        if kind == "ws":
+            continue
+        if kind == "other" and match.group() in ("--", "/*", '"', "\\", "$"):
+            # Comments, escaped strings, and dollar-quoted strings.
+            return None
+        tokens.append((kind, match.group()))
+    if expected_start != len(sql) or len(tokens) == 0 or tokens[0][0] != "name":
+        return None
+
+    # Find the tokens at parenthesis depth 0. Any nested statement (e.g., a
+    # subquery) makes the query "complex".
+    upper_values = [
+        value.upper() if kind == "name" else value for kind, value in tokens
+    ]
+    depth = 0
+    top_level = []
+    for idx, (kind, _) in enumerate(tokens):
+        if kind == "lparen":
+            depth += 1
+        elif kind == "rparen":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0:
+            top_level.append(idx)
+        elif kind == "name" and upper_values[idx] == "SELECT":
+            return None
+    if depth != 0:
+        return None
+    if tokens[-1] == ("other", ";"):
+        tokens.pop()
+        top_level.pop()
+
+    statement = upper_values[0]
+    if statement == "SELECT":
+        from_pos = None
+        for pos, idx in enumerate(top_level):
+            if idx == 0 or tokens[idx][0] != "name":
+                continue
+            if upper_values[idx] == "FROM" and from_pos is None:
+                from_pos = pos
+            elif upper_values[idx] in _UNSUPPORTED_KEYWORDS:
+                return None
+        if from_pos is None:
+            return []
+        return _extract_from_list(tokens, upper_values, top_level[from_pos + 1 :])
+
+    if statement == "INSERT":
+        # INSERT INTO <table> [(<columns>)] VALUES (...)[, (...)]
+        if len(tokens) < 4 or upper_values[1] != "INTO" or tokens[2][0] != "name":
+            return None
+        rest = [idx for idx in top_level if idx > 2]
+        if len(rest) == 0 or upper_values[rest[0]] != "VALUES":
+            return None
+        if any(tokens[idx][0] == "name" for idx in rest[1:]):
+            return None
+        return [_table_name(tokens[2][1])]
+
+    if statement in ("UPDATE", "DELETE"):
+        # UPDATE <table> [[AS] <alias>] SET ... [WHERE ...]
+        # DELETE FROM <table> [[AS] <alias>] [WHERE ...]
+        table_idx = 1 if statement == "UPDATE" else 2
+        if statement == "DELETE" and (len(tokens) < 3 or upper_values[1] != "FROM"):
+            return None
+        if (
+            len(tokens) <= table_idx
+            or tokens[table_idx][0] != "name"
+            or upper_values[table_idx] in _UNSUPPORTED_KEYWORDS
+            or (table_idx + 1 < len(tokens) and tokens[table_idx + 1][0] == "lparen")
+        ):
+            return None
+        for idx in top_level:
+            if idx <= table_idx or tokens[idx][0] != "name":
+                continue
+            value = upper_values[idx]
+            if value == "SET" and statement == "UPDATE":
+                continue
+            if value in _UNSUPPORTED_KEYWORDS or value == "RETURNING":
+                return None
+        return [_table_name(tokens[table_idx][1])]
+
+    return None
+
+
+def _extract_from_list(
+    tokens: List, upper_values: List[str], top_level: List[int]
+) -> Optional[List[str]]:
+    tables = []
+    expect_table = True
+    in_condition = False
+    for idx in top_level:
+        kind, value = tokens[idx]
+        upper = upper_values[idx]
+        if kind == "name" and upper in _CLAUSE_END_KEYWORDS:
+            break
+        if kind == "comma":
+            in_condition = False
+            expect_table = True
+            continue
+        if kind == "name" and upper in _JOIN_KEYWORDS:
+            in_condition = False
+            expect_table = upper == "JOIN"
+            continue
+        if kind == "name" and upper == "ON":
+            in_condition = True
+            continue
+        if in_condition:
+            continue
+        if kind != "name" or (
+            # Table functions (e.g., `generate_series(...)`) and column aliases.
+            idx + 1 < len(tokens)
+            and tokens[idx + 1][0] == "lparen"
+        ):
+            return None
+        if expect_table:
+            tables.append(_table_name(value))
+            expect_table = False
+        # Otherwise, this is an alias (optionally preceded by AS).
+    return tables if not expect_table else None
+
+
+def _table_name(qualified_name: str) -> str:
+    # Drop the schema (and catalog) qualifiers and any quotes.
+    quoted, unquoted = _NAME_PARTS.findall(qualified_name)[-1]
+    return quoted.replace('""', '"') if quoted != "" else unquoted
+
+
 class QueryRep:
     """
     A SQL query's "internal representation" within BRAD.
@@ -39,16 +289,34 @@ class QueryRep:
     so that its implementation details are not part of the interface of other
     BRAD classes (e.g., we want to avoid exposing the query's parsed representation).
 
-    Objects of this class are logically immutable.
+    Objects of this class are logically immutable. The facts used for routing
+    (e.g., whether the query modifies data or uses geospatial functions) are
+    computed together in one pass over the query text, the first time any of
+    them is needed.
     """
 
+    __slots__ = (
+        "_raw_sql_query",
+        "_upper_sql_query",
+        "_ast",
+        "_is_data_modification",
+        "_is_geospatial",
+        "_is_vector",
+        "_tables",
+        "_parsed",
+    )
+
     def __init__(self, sql_query: str):
         self._raw_sql_query = sql_query
 
         # Lazily computed.
+        self._upper_sql_query: Optional[str] = None
         self._ast: Optional[sqlglot.Expression] = None
         self._is_data_modification: Optional[bool] = None
+        self._is_geospatial: Optional[bool] = None
+        self._is_vector: Optional[bool] = None
         self._tables: Optional[List[str]] = None
+        self._parsed: Optional[ParsedQuery] = None
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, QueryRep):
@@ -58,55 +326,63 @@ class QueryRep:
     def __hash__(self) -> int:
         return hash(self._raw_sql_query)
 
+    def __getstate__(self) -> Tuple[str, Optional[Dict[str, Any]]]:
+        # The derived facts are cheap to recompute (and the AST is large), so
+        # we only serialize the query text (and any subclass attributes).
+        return (self._raw_sql_query, getattr(self, "__dict__", None))
+
+    def __setstate__(self, state: Any) -> None:
+        if isinstance(state, dict):
+            # Serialized before `__slots__` were used.
+            sql_query = state["_raw_sql_query"]
+            extra = {
+                key: value
+                for key, value in state.items()
+                if key not in QueryRep.__slots__
+            }
+        else:
+            sql_query, extra = state
+        QueryRep.__init__(self, sql_query)
+        if extra is not None:
+            self.__dict__.update(extra)
+
     @property
     def raw_query(self) -> str:
         return self._raw_sql_query
 
     def is_data_modification_query(self) -> bool:
         if self._is_data_modification is None:
-            self._is_data_modification = any(
-                map(self._raw_sql_query.upper().startswith, _DATA_MODIFICATION_PREFIXES)
+            # This check does not need the keyword scan in `_analyze()`.
+            self._is_data_modification = self._upper().startswith(
+                _DATA_MODIFICATION_PREFIXES_TUPLE
             )
         return self._is_data_modification
 
     def is_transaction_start(self) -> bool:
-        return self._raw_sql_query.upper() == "BEGIN"
+        return self._upper() == "BEGIN"
 
     def is_transaction_end(self) -> bool:
-        raw_sql = self._raw_sql_query.upper()
+        raw_sql = self._upper()
         return raw_sql == "COMMIT" or raw_sql == "ROLLBACK"
 
     def is_geospatial(self) -> bool:
-        query = self._raw_sql_query.upper()
-        for keyword in _GEOSPATIAL_KEYWORDS:
-            if keyword in query:
-                return True
-        return False
+        if self._is_geospatial is None:
+            self._analyze()
+        assert self._is_geospatial is not None
+        return self._is_geospatial
 
     def is_vector(self) -> bool:
-        query = self._raw_sql_query.upper()
-        for keyword in _VECTOR_KEYWORDS:
-            if keyword in query:
-                return True
-        return False
+        if self._is_vector is None:
+            self._analyze()
+        assert self._is_vector is not None
+        return self._is_vector
 
     def get_required_functionality(self) -> int:
-        req_functionality: List[str] = []
-        if self.is_geospatial():
-            req_functionality.append(Functionality.Geospatial)
-        if self.is_vector():
-            req_functionality.append(Functionality.Vector)
-
-        return Functionality.to_bitmap(req_functionality)
+        return self._parsed_query().functionality
 
     def tables(self) -> List[str]:
         if self._tables is None:
-            if self._ast is None:
-                self._parse_query()
-            assert self._ast is not None
-            self._tables = list(
-                map(lambda tbl: tbl.name, self._ast.find_all(exp.Table))
-            )
+            self._tables = list(self._parsed_query().tables)
         return self._tables
 
     def ast(self) -> sqlglot.Expression:
@@ -115,5 +391,64 @@ class QueryRep:
         assert self._ast is not None
         return self._ast
 
+    def _upper(self) -> str:
+        if self._upper_sql_query is None:
+            self._upper_sql_query = self._raw_sql_query.upper()
+        return self._upper_sql_query
+
+    def _analyze(self) -> None:
+        query = self._upper()
+        self.is_data_modification_query()
+        is_geospatial = False
+        is_vector = False
+        for match in _KEYWORD_MATCHER.finditer(query):
+            if match.lastgroup == "geospatial":
+                is_geospatial = True
+            else:
+                is_vector = True
+            if is_geospatial and is_vector:
+                break
+        self._is_geospatial = is_geospatial
+        self._is_vector = is_vector
+
+    def _parsed_query(self) -> ParsedQuery:
+        # The tables and required functionality are shared through the
+        # process-wide parse cache.
+        if self._parsed is None:
+            self._parsed = ParseCache.instance().get_or_compute(
+                self._raw_sql_query, self._compute_parsed_facts
+            )
+        return self._parsed
+
+    def _compute_parsed_facts(self, _sql_query: str) -> Tuple[List[str], int]:
+        tables = None
+        if self._ast is None:
+            tables = _extract_tables_simple(self._raw_sql_query)
+        if tables is None:
+            tables = list(map(lambda tbl: tbl.name, self.ast().find_all(exp.Table)))
+
+        req_functionality: List[str] = []
+        if self.is_geospatial():
+            req_functionality.append(Functionality.Geospatial)
+        if self.is_vector():
+            req_functionality.append(Functionality.Vector)
+
+        return (tables, Functionality.to_bitmap(req_functionality))
+
     def _parse_query(self) -> None:
         self._ast = sqlglot.parse_one(self._raw_sql_query)
+
+
+def load_parse_cache(path: pathlib.Path) -> None:
+    """
+    Warms up the process-wide parse cache using a snapshot saved by
+    `save_parse_cache()`.
+    """
+    ParseCache.instance().load(path, _ANALYSIS_VERSION)
+
+
+def save_parse_cache(path: pathlib.Path) -> None:
+    try:
+        ParseCache.instance().save(path, _ANALYSIS_VERSION)
+    except OSError:
+        logger.exception("Failed to save the parse cache to %s", path)
@@ -84,61 +84,70 @@ class RuleBased(AbstractRoutingPolicy):
         if self._catalog is None:
             self._catalog = dict()
         session_id, _ = await sessions.create_new_session()
-        session = sessions.get_session(session_id)
-        assert (
-            session is not None
-        ), "need to provide a valid aurora session to recollect_catalog"
-        # Since only Aurora handles txn, we only need connection to Aurora
-        connection = session.engines.get_connection(Engine.Aurora)
-        cursor = await connection.cursor()
+        try:
+            session = sessions.get_session(session_id)
+            assert (
+                session is not None
+            ), "need to provide a valid aurora session to recollect_catalog"
+            # Since only Aurora handles txn, we only need connection to Aurora
+            connection = await session.acquire_connection(
+                Engine.Aurora, for_writes=True
+            )
+            try:
+                cursor = await connection.cursor()
 
-        indexes_sql = (
-            "SELECT tablename, indexname, indexdef FROM pg_indexes WHERE schemaname = 'public' "
-            "ORDER BY tablename, indexname;"
-        )
-        await cursor.execute(indexes_sql)
-        all_indexes_raw = await cursor.fetchall()
-        all_indexes: MutableMapping[str, List[List[str]]] = dict()
-        for index in all_indexes_raw:
-            brad_table_name = index[0]
-            if brad_table_name not in all_indexes:
-                all_indexes[brad_table_name] = []
-            all_indexes[brad_table_name].append(list(index))
+                indexes_sql = (
+                    "SELECT tablename, indexname, indexdef FROM pg_indexes WHERE schemaname = 'public' "
+                    "ORDER BY tablename, indexname;"
+                )
+                await cursor.execute(indexes_sql)
+                all_indexes_raw = await cursor.fetchall()
+                all_indexes: MutableMapping[str, List[List[str]]] = dict()
+                for index in all_indexes_raw:
+                    brad_table_name = index[0]
+                    if brad_table_name not in all_indexes:
+                        all_indexes[brad_table_name] = []
+                    all_indexes[brad_table_name].append(list(index))
 
-        for table_name in blueprint.table_locations():
-            location = blueprint.table_locations()[table_name]
-            if Engine.Aurora in location:
-                # the following syntax only works for Aurora, we also assume all txn happens in Aurora
-                # so if a table is not on Aurora, it will have no change.
-                nrow_sql = f"SELECT COUNT(*) FROM {table_name};"
-                await cursor.execute(nrow_sql)
-                nrow = await cursor.fetchone()
-                assert nrow is not None
-                ncol_sql = f"""SELECT COUNT(*)
-                                  FROM INFORMATION_SCHEMA.COLUMNS
-                                  WHERE table_catalog = '{blueprint.schema_name()}'
-                                  AND table_name = '{table_name}';
-                           """
-                await cursor.execute(ncol_sql)
-                ncol = await cursor.fetchone()
-                assert ncol is not None
+                for table_name in blueprint.table_locations():
+                    location = blueprint.table_locations()[table_name]
+                    if Engine.Aurora in location:
+                        # the following syntax only works for Aurora, we also assume all txn happens in Aurora
+                        # so if a table is not on Aurora, it will have no change.
+                        nrow_sql = f"SELECT COUNT(*) FROM {table_name};"
+                        await cursor.execute(nrow_sql)
+                        nrow = await cursor.fetchone()
+                        assert nrow is not None
+                        ncol_sql = f"""SELECT COUNT(*)
+                                          FROM INFORMATION_SCHEMA.COLUMNS
+                                          WHERE table_catalog = '{blueprint.schema_name()}'
+                                          AND table_name = '{table_name}';
+                                   """
+                        await cursor.execute(ncol_sql)
+                        ncol = await cursor.fetchone()
+                        assert ncol is not None
 
-                brad_table_name = table_name + "_brad_source"
-                table_indexes = []
-                table_PKs = []
-                if brad_table_name in all_indexes:
-                    for index_info in all_indexes[brad_table_name]:
-                        column_name = index_info[-1].split("(")[-1].split(")")[0]
-                        table_indexes.append(column_name)
-                        if "_brad_source_pkey" in index_info[1]:
-                            table_PKs.append(column_name)
-                self._catalog[table_name] = {
-                    "nrow": nrow[0],
-                    "ncol": ncol[0],
-                    "indexes": table_indexes,
-                    "PKs": table_PKs,
-                }
-        await sessions.end_session(session_id)
+                        brad_table_name = table_name + "_brad_source"
+                        table_indexes = []
+                        table_PKs = []
+                        if brad_table_name in all_indexes:
+                            for index_info in all_indexes[brad_table_name]:
+                                column_name = (
+                                    index_info[-1].split("(")[-1].split(")")[0]
+                                )
+                                table_indexes.append(column_name)
+                                if "_brad_source_pkey" in index_info[1]:
+                                    table_PKs.append(column_name)
+                        self._catalog[table_name] = {
+                            "nrow": nrow[0],
+                            "ncol": ncol[0],
+                            "indexes": table_indexes,
+                            "PKs": table_PKs,
+                        }
+            finally:
+                session.release_connection(connection)
+        finally:
+            await sessions.end_session(session_id)
 
     def check_engine_state(
         self,
@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from brad.utils.time_periods import set_universal_now_override
+
+
+class VirtualClock:
+    """
+    A simulated clock. It only moves forward when it is explicitly advanced
+    (e.g., by the simulator's event loop or by `sleep()`).
+
+    Use `installed()` to make `universal_now()` return this clock's time. This
+    lets time-dependent components (e.g., the planner's triggers) run
+    unmodified in a simulation.
+    """
+
+    def __init__(self, start: datetime) -> None:
+        assert start.tzinfo is not None
+        self._start = start
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def start(self) -> datetime:
+        return self._start
+
+    def elapsed(self) -> timedelta:
+        return self._now - self._start
+
+    def elapsed_s(self) -> float:
+        """
+        The number of seconds since the clock's start. This can be used as a
+        monotonic clock (e.g., by the `ProvisioningWaiter`).
+        """
+        return self.elapsed().total_seconds()
+
+    def advance(self, delta: timedelta) -> None:
+        assert delta >= timedelta(0)
+        self._now += delta
+
+    def advance_to(self, timestamp: datetime) -> None:
+        assert timestamp >= self._now
+        self._now = timestamp
+
+    async def sleep(self, delay_s: float) -> None:
+        """
+        Advances the clock by `delay_s` seconds. This does not wait in real
+        time; it only yields to the running event loop.
+        """
+        self.advance(timedelta(seconds=delay_s))
+        await asyncio.sleep(0)
+
+    @contextmanager
+    def installed(self) -> Iterator["VirtualClock"]:
+        set_universal_now_override(self.now)
+        try:
+            yield self
+        finally:
+            set_universal_now_override(None)
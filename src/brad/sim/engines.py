@@ -0,0 +1,335 @@
+import numpy as np
+import numpy.typing as npt
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.config.engine import Engine
+from brad.config.planner import PlannerConfig
+from brad.data_stats.estimator import Estimator
+from brad.planner.metrics import Metrics
+from brad.planner.scoring.context import ScoringContext
+from brad.planner.scoring.performance.unified_aurora import AuroraProvisioningScore
+from brad.planner.scoring.performance.unified_redshift import RedshiftProvisioningScore
+from brad.planner.scoring.provisioning import (
+    aurora_num_cpus,
+    compute_athena_scan_cost_numpy,
+    compute_aurora_hourly_operational_cost,
+    compute_redshift_hourly_operational_cost,
+    redshift_num_cpus,
+)
+from brad.planner.workload import Workload
+from brad.routing.router import Router
+
+
+class EngineObservation:
+    """
+    The simulated behavior of the engines while running one workload on one
+    blueprint. CPU utilization values are percentages (like the monitored
+    metrics); latencies are in seconds.
+    """
+
+    def __init__(
+        self,
+        aurora_writer_cpu: float,
+        aurora_reader_cpus: List[float],
+        redshift_node_cpus: npt.NDArray,
+        query_latencies: npt.NDArray,
+        query_arrival_counts: npt.NDArray,
+        txn_lat_s_p50: float,
+        txn_lat_s_p90: float,
+        txn_per_s: float,
+        hourly_cost: float,
+    ) -> None:
+        self.aurora_writer_cpu = aurora_writer_cpu
+        self.aurora_reader_cpus = aurora_reader_cpus
+        self.redshift_node_cpus = redshift_node_cpus
+        self.query_latencies = query_latencies
+        self.query_arrival_counts = query_arrival_counts
+        self.query_lat_s_p50 = _weighted_quantile(
+            query_latencies, query_arrival_counts, 0.5
+        )
+        self.query_lat_s_p90 = _weighted_quantile(
+            query_latencies, query_arrival_counts, 0.9
+        )
+        self.txn_lat_s_p50 = txn_lat_s_p50
+        self.txn_lat_s_p90 = txn_lat_s_p90
+        self.txn_per_s = txn_per_s
+        self.hourly_cost = hourly_cost
+
+    def redshift_max_cpu(self) -> float:
+        if self.redshift_node_cpus.shape[0] == 0:
+            return 0.0
+        return self.redshift_node_cpus.max().item()
+
+    def to_metrics(self) -> Metrics:
+        if len(self.aurora_reader_cpus) > 0:
+            aurora_reader_cpu_avg = float(np.mean(self.aurora_reader_cpus))
+        else:
+            aurora_reader_cpu_avg = 0.0
+        return Metrics(
+            redshift_cpu_avg=self.redshift_max_cpu(),
+            aurora_writer_cpu_avg=self.aurora_writer_cpu,
+            aurora_reader_cpu_avg=aurora_reader_cpu_avg,
+            aurora_writer_buffer_hit_pct_avg=100.0,
+            aurora_reader_buffer_hit_pct_avg=100.0,
+            aurora_writer_load_minute_avg=0.0,
+            aurora_reader_load_minute_avg=0.0,
+            txn_completions_per_s=self.txn_per_s,
+            txn_lat_s_p50=self.txn_lat_s_p50,
+            txn_lat_s_p90=self.txn_lat_s_p90,
+            query_lat_s_p50=self.query_lat_s_p50,
+            query_lat_s_p90=self.query_lat_s_p90,
+            redshift_cpu_list=self.redshift_node_cpus.copy(),
+        )
+
+
+class SimulatedEngines:
+    """
+    Models how Aurora, Redshift, and Athena behave under a blueprint using the
+    blueprint planner's own models.
+
+    - Queries are routed using the blueprint's routing policy.
+    - Query run times are the workload's predicted latencies, scaled to the
+      engine's provisioning.
+    - CPU load is derived from the run times using the planner's run time to
+      CPU model, weighted by each query's concurrency (arrival rate times run
+      time). Transactional load uses the planner's transaction throughput to
+      CPU model.
+    - Query latencies include M/M/1 queuing delays at the resulting
+      utilization. Transaction latencies are scaled from the reference metrics
+      using the planner's transaction latency model.
+
+    The reference blueprint and metrics should come from a real deployment
+    (e.g., a recorded planning run); they calibrate the transaction latency
+    model.
+    """
+
+    def __init__(
+        self,
+        schema_name: str,
+        planner_config: PlannerConfig,
+        reference_blueprint: Blueprint,
+        reference_metrics: Metrics,
+        estimator: Optional[Estimator] = None,
+    ) -> None:
+        self._planner_config = planner_config
+        self._reference_blueprint = reference_blueprint
+        self._estimator = estimator
+        # The planner's models read their constants (and the reference
+        # metrics) through a scoring context.
+        self._ctx = ScoringContext(
+            schema_name,
+            reference_blueprint,
+            Workload.empty(),
+            Workload.empty(),
+            reference_metrics,
+            planner_config,
+        )
+
+        # Routing only depends on the blueprint and the workload, so it is
+        # reused across epochs.
+        self._routed_blueprint: Optional[Blueprint] = None
+        self._routed_workload: Optional[Workload] = None
+        self._query_locations: Dict[Engine, List[int]] = {}
+        self._workload_copy = Workload.empty()
+
+    def reference_metrics(self) -> Metrics:
+        return self._ctx.metrics
+
+    async def observe(
+        self, blueprint: Blueprint, workload: Workload
+    ) -> EngineObservation:
+        await self._route_if_needed(blueprint, workload)
+        workload = self._workload_copy
+        period_s = workload.period().total_seconds()
+        aurora_prov = blueprint.aurora_provisioning()
+        redshift_prov = blueprint.redshift_provisioning()
+
+        arrival_counts = workload.get_arrival_counts()
+        latencies = np.zeros(arrival_counts.shape[0])
+
+        # Aurora. Analytical queries run on the read replicas if there are any.
+        aurora_queries = self._query_locations[Engine.Aurora]
+        if len(workload.transactional_queries()) > 0:
+            txn_per_s = (
+                sum(q.arrival_count() for q in workload.transactional_queries())
+                / period_s
+            )
+        else:
+            # Recorded workloads may not include the transactions.
+            txn_per_s = self._ctx.metrics.txn_completions_per_s
+        txn_cpu_denorm = AuroraProvisioningScore.predict_txn_cpu_denorm(
+            txn_per_s, self._ctx
+        )
+        aurora_reader_cpus = []
+        if aurora_prov.num_nodes() > 0:
+            num_cpus = aurora_num_cpus(aurora_prov)
+            self._precompute_latencies(workload, Engine.Aurora, aurora_prov)
+            run_times = workload.precomputed_aurora_analytical_latencies[aurora_prov][
+                aurora_queries
+            ]
+            alpha, load_max = self._planner_config.aurora_rt_to_cpu_denorm()
+            ana_cpu_denorm = _cpu_denorm(
+                run_times,
+                workload.get_arrival_counts_batch(aurora_queries) / period_s,
+                alpha,
+                load_max,
+            )
+            num_readers = aurora_prov.num_nodes() - 1
+            if num_readers > 0:
+                writer_util = _clip_util(txn_cpu_denorm / num_cpus)
+                ana_util = _clip_util(ana_cpu_denorm / num_readers / num_cpus)
+                aurora_reader_cpus = [ana_util * 100.0] * num_readers
+            else:
+                writer_util = _clip_util((txn_cpu_denorm + ana_cpu_denorm) / num_cpus)
+                ana_util = writer_util
+            latencies[aurora_queries] = (
+                AuroraProvisioningScore.predict_query_latency_load_resources(
+                    aurora_queries, workload, aurora_prov, ana_util
+                )
+            )
+            txn_lats = AuroraProvisioningScore.predict_txn_latency(
+                self._ctx.metrics.aurora_writer_cpu_avg
+                / 100.0
+                * aurora_num_cpus(self._reference_blueprint.aurora_provisioning()),
+                writer_util * num_cpus,
+                self._reference_blueprint.aurora_provisioning(),
+                aurora_prov,
+                self._ctx,
+            )
+            txn_lat_s_p50, txn_lat_s_p90 = np.nan_to_num(txn_lats).tolist()
+        else:
+            latencies[aurora_queries] = np.inf
+            writer_util = 0.0
+            txn_lat_s_p50, txn_lat_s_p90 = 0.0, 0.0
+
+        # Redshift. The load is spread evenly across the nodes.
+        redshift_queries = self._query_locations[Engine.Redshift]
+        if redshift_prov.num_nodes() > 0:
+            self._precompute_latencies(workload, Engine.Redshift, redshift_prov)
+            run_times = workload.precomputed_redshift_analytical_latencies[
+                redshift_prov
+            ][redshift_queries]
+            alpha, load_max = self._planner_config.redshift_rt_to_cpu_denorm()
+            cpu_denorm = _cpu_denorm(
+                run_times,
+                workload.get_arrival_counts_batch(redshift_queries) / period_s,
+                alpha,
+                load_max,
+            )
+            node_util = _clip_util(
+                cpu_denorm
+                / redshift_prov.num_nodes()
+                / redshift_num_cpus(redshift_prov)
+            )
+            redshift_node_cpus = np.full(redshift_prov.num_nodes(), node_util * 100.0)
+            latencies[redshift_queries] = (
+                RedshiftProvisioningScore.predict_query_latency_load_resources(
+                    redshift_queries, workload, redshift_prov, node_util
+                )
+            )
+        else:
+            latencies[redshift_queries] = np.inf
+            redshift_node_cpus = np.empty(0)
+
+        # Athena is serverless; we use the predicted latencies as is.
+        athena_queries = self._query_locations[Engine.Athena]
+        latencies[athena_queries] = workload.get_predicted_analytical_latency_batch(
+            athena_queries, Engine.Athena
+        )
+        athena_period_cost = compute_athena_scan_cost_numpy(
+            workload.get_predicted_athena_bytes_accessed_batch(athena_queries),
+            workload.get_arrival_counts_batch(athena_queries),
+            self._planner_config,
+        )
+
+        hourly_cost = (
+            compute_aurora_hourly_operational_cost(aurora_prov, self._ctx)
+            + compute_redshift_hourly_operational_cost(redshift_prov)
+            + athena_period_cost * timedelta(hours=1).total_seconds() / period_s
+        )
+
+        return EngineObservation(
+            aurora_writer_cpu=writer_util * 100.0,
+            aurora_reader_cpus=aurora_reader_cpus,
+            redshift_node_cpus=redshift_node_cpus,
+            query_latencies=latencies,
+            query_arrival_counts=arrival_counts,
+            txn_lat_s_p50=txn_lat_s_p50,
+            txn_lat_s_p90=txn_lat_s_p90,
+            txn_per_s=txn_per_s,
+            hourly_cost=hourly_cost,
+        )
+
+    async def _route_if_needed(self, blueprint: Blueprint, workload: Workload) -> None:
+        if blueprint is self._routed_blueprint and workload is self._routed_workload:
+            return
+
+        router = Router.create_from_blueprint(blueprint)
+        await router.run_setup_for_standalone(self._estimator)
+        query_locations: Dict[Engine, List[int]] = {
+            Engine.Aurora: [],
+            Engine.Redshift: [],
+            Engine.Athena: [],
+        }
+        for query_idx, query in enumerate(workload.analytical_queries()):
+            engine = await router.engine_for(query)
+            query_locations[engine].append(query_idx)
+
+        self._routed_blueprint = blueprint
+        self._routed_workload = workload
+        self._query_locations = query_locations
+        # We cache provisioning-specific predictions on the workload, so we use
+        # our own copy.
+        self._workload_copy = workload.clone()
+
+    def _precompute_latencies(
+        self, workload: Workload, engine: Engine, prov: Provisioning
+    ) -> None:
+        if engine == Engine.Aurora:
+            if prov in workload.precomputed_aurora_analytical_latencies:
+                return
+            workload.precomputed_aurora_analytical_latencies.update(
+                AuroraProvisioningScore.predict_query_latency_resources_batch(
+                    workload.get_predicted_analytical_latency_all(Engine.Aurora),
+                    iter([prov]),
+                    self._ctx,
+                )
+            )
+        else:
+            if prov in workload.precomputed_redshift_analytical_latencies:
+                return
+            workload.precomputed_redshift_analytical_latencies.update(
+                RedshiftProvisioningScore.predict_query_latency_resources_batch(
+                    workload.get_predicted_analytical_latency_all(Engine.Redshift),
+                    iter([prov]),
+                    self._ctx,
+                )
+            )
+
+
+def _cpu_denorm(
+    run_times: npt.NDArray, arrivals_per_s: npt.NDArray, alpha: float, load_max: float
+) -> float:
+    # Each running query uses `alpha * run_time` CPUs (capped); on average
+    # `arrival_rate * run_time` instances of a query are running.
+    per_query_cpus = np.clip(run_times * alpha, a_min=0.0, a_max=load_max)
+    return np.dot(arrivals_per_s * run_times, per_query_cpus).item()
+
+
+def _clip_util(util: float) -> float:
+    return min(max(util, 0.0), 1.0)
+
+
+def _weighted_quantile(
+    values: npt.NDArray, weights: npt.NDArray, quantile: float
+) -> float:
+    total_weight = weights.sum()
+    if values.shape[0] == 0 or total_weight <= 0.0:
+        return 0.0
+    order = np.argsort(values, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    idx = int(np.searchsorted(cumulative, quantile * total_weight))
+    return values[order[min(idx, values.shape[0] - 1)]].item()
@@ -0,0 +1,176 @@
+import pandas as pd
+import numpy as np
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from brad.config.metrics import FrontEndMetric
+from brad.daemon.metrics_logger import MetricsLogger
+from brad.daemon.metrics_source import MetricsSourceWithForecasting
+from brad.daemon.monitor import MonitorSnapshot
+from brad.planner.metrics import Metrics, MetricsProvider
+from brad.sim.clock import VirtualClock
+from brad.sim.engines import EngineObservation
+
+# The metric IDs that the planner's triggers read (see the `Monitor`).
+AURORA_CPU_METRIC = "os.cpuUtilization.total.avg"
+REDSHIFT_CPU_METRIC = "CPUUtilization_Maximum"
+_FRONT_END_METRICS = [
+    FrontEndMetric.TxnEndPerSecond.value,
+    FrontEndMetric.QueryLatencySecondP50.value,
+    FrontEndMetric.QueryLatencySecondP90.value,
+    FrontEndMetric.TxnLatencySecondP50.value,
+    FrontEndMetric.TxnLatencySecondP90.value,
+]
+
+
+class SimulatedMetricsSource(MetricsSourceWithForecasting):
+    """
+    A metrics source whose values are recorded by the simulator (one row per
+    epoch, indexed by the epoch's start).
+    """
+
+    def __init__(
+        self,
+        metric_ids: List[str],
+        epoch_length: timedelta,
+        max_epochs: int,
+        forecasting_method: str = "constant",
+        forecasting_window_size: int = 5,
+    ) -> None:
+        self._metric_ids = metric_ids
+        self._timestamps: Deque[datetime] = deque(maxlen=max_epochs)
+        self._rows: Deque[List[float]] = deque(maxlen=max_epochs)
+        self._values = self._build_frame()
+        super().__init__(epoch_length, forecasting_method, forecasting_window_size)
+
+    def add_epoch(self, epoch_start: datetime, values: Dict[str, float]) -> None:
+        self._timestamps.append(epoch_start)
+        self._rows.append([values[metric_id] for metric_id in self._metric_ids])
+        self._values = self._build_frame()
+        self._forecaster.update_df_pointer(self._values)
+
+    def _build_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            list(self._rows),
+            columns=self._metric_ids,
+            index=pd.DatetimeIndex(list(self._timestamps), tz="UTC"),
+            dtype=float,
+        )
+
+    def _metrics_values(self) -> pd.DataFrame:
+        return self._values
+
+    def _metrics_logger(self) -> Optional[MetricsLogger]:
+        return None
+
+
+class SimulatedMonitor:
+    """
+    Plays the role of the daemon's `Monitor`: it records the engines' simulated
+    metrics each epoch and provides snapshots for the planner's triggers.
+    """
+
+    def __init__(
+        self,
+        epoch_length: timedelta,
+        max_epochs: int,
+        reference_metrics: Metrics,
+    ) -> None:
+        self._epoch_length = epoch_length
+        self._max_epochs = max_epochs
+        self._reference_metrics = reference_metrics
+
+        self._aurora_writer = self._make_source([AURORA_CPU_METRIC])
+        self._aurora_readers: List[SimulatedMetricsSource] = []
+        self._redshift = self._make_source([REDSHIFT_CPU_METRIC])
+        self._front_end = self._make_source(_FRONT_END_METRICS)
+
+        self._recent: Deque[Metrics] = deque(maxlen=max_epochs)
+        self._last_epoch_start: Optional[datetime] = None
+
+    def record(self, epoch_start: datetime, obs: EngineObservation) -> None:
+        # Reader metrics sources come and go with the read replicas (as in the
+        # `Monitor`).
+        num_readers = len(obs.aurora_reader_cpus)
+        del self._aurora_readers[num_readers:]
+        while len(self._aurora_readers) < num_readers:
+            self._aurora_readers.append(self._make_source([AURORA_CPU_METRIC]))
+
+        self._aurora_writer.add_epoch(
+            epoch_start, {AURORA_CPU_METRIC: obs.aurora_writer_cpu}
+        )
+        for source, reader_cpu in zip(self._aurora_readers, obs.aurora_reader_cpus):
+            source.add_epoch(epoch_start, {AURORA_CPU_METRIC: reader_cpu})
+        self._redshift.add_epoch(
+            epoch_start, {REDSHIFT_CPU_METRIC: obs.redshift_max_cpu()}
+        )
+        self._front_end.add_epoch(
+            epoch_start,
+            {
+                FrontEndMetric.TxnEndPerSecond.value: obs.txn_per_s,
+                FrontEndMetric.QueryLatencySecondP50.value: obs.query_lat_s_p50,
+                FrontEndMetric.QueryLatencySecondP90.value: obs.query_lat_s_p90,
+                FrontEndMetric.TxnLatencySecondP50.value: obs.txn_lat_s_p50,
+                FrontEndMetric.TxnLatencySecondP90.value: obs.txn_lat_s_p90,
+            },
+        )
+        self._recent.append(obs.to_metrics())
+        self._last_epoch_start = epoch_start
+
+    def snapshot(self, num_epochs: int) -> MonitorSnapshot:
+        return MonitorSnapshot(
+            self._aurora_writer.snapshot(num_epochs),
+            tuple(source.snapshot(num_epochs) for source in self._aurora_readers),
+            self._redshift.snapshot(num_epochs),
+            self._front_end.snapshot(num_epochs),
+        )
+
+    def recent_metrics(self, num_epochs: int) -> Tuple[Metrics, Optional[datetime]]:
+        """
+        Returns the average of the metrics over the last `num_epochs` epochs,
+        along with the start of the most recent epoch. The reference metrics
+        are returned if no epochs have been recorded.
+        """
+        if len(self._recent) == 0:
+            return self._reference_metrics, None
+
+        window = list(self._recent)[-num_epochs:]
+        averaged = {
+            field: float(np.mean([getattr(m, field) for m in window]))
+            for field in Metrics._fields
+            if field != "redshift_cpu_list"
+        }
+        # The number of Redshift nodes may vary across the window, so we use
+        # the most recent per-node values.
+        return (
+            Metrics(**averaged, redshift_cpu_list=window[-1].redshift_cpu_list.copy()),
+            self._last_epoch_start,
+        )
+
+    def _make_source(self, metric_ids: List[str]) -> SimulatedMetricsSource:
+        return SimulatedMetricsSource(metric_ids, self._epoch_length, self._max_epochs)
+
+
+class SimulatedMetricsProvider(MetricsProvider):
+    """
+    Provides the planner with the simulated metrics, averaged over the planning
+    window (like `WindowedMetricsFromMonitor`).
+    """
+
+    def __init__(
+        self,
+        monitor: SimulatedMonitor,
+        clock: VirtualClock,
+        planning_window: timedelta,
+        epoch_length: timedelta,
+    ) -> None:
+        self._monitor = monitor
+        self._clock = clock
+        self._num_epochs = max(int(planning_window / epoch_length), 1)
+
+    def get_metrics(self) -> Tuple[Metrics, datetime]:
+        metrics, timestamp = self._monitor.recent_metrics(self._num_epochs)
+        if timestamp is None:
+            timestamp = self._clock.now()
+        return metrics, timestamp
@@ -0,0 +1,78 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from brad.config.file import ConfigFile
+from brad.config.planner import PlannerConfig
+from brad.daemon.monitor import MonitorSnapshot
+from brad.planner.scoring.data_access.provider import NoopDataAccessProvider
+from brad.planner.triggers.provider import ConfigDefinedTriggers
+from brad.planner.triggers.trigger import Trigger
+from brad.planner.triggers.variable_costs import VariableCosts
+from brad.planner.workload import Workload
+from brad.planner.workload.provider import WorkloadProvider
+from brad.sim.clock import VirtualClock
+from brad.sim.monitor import SimulatedMonitor
+from brad.sim.trace import WorkloadTrace
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedWorkloadProvider(WorkloadProvider):
+    """
+    Returns the trace's workload at the end of the planning window. The trace
+    workloads are used as recorded (`desired_period` is ignored) because they
+    already include the planner's predictions.
+    """
+
+    def __init__(self, trace: WorkloadTrace, clock: VirtualClock) -> None:
+        self._trace = trace
+        self._clock = clock
+
+    async def get_workloads(
+        self,
+        window_end: datetime,
+        window_multiplier: int = 1,
+        desired_period: Optional[timedelta] = None,
+    ) -> Tuple[Workload, Workload]:
+        elapsed = max(window_end - self._clock.start(), timedelta(0))
+        workload = self._trace.workload_at(elapsed)
+        return workload.clone(), workload.clone()
+
+
+class SimulatedTriggerProvider(ConfigDefinedTriggers):
+    """
+    The triggers defined in the planner config, evaluated against the
+    simulated metrics.
+
+    The `VariableCosts` trigger is not used: it reads the workload from the
+    query logs (it does not go through the planner's providers).
+    """
+
+    def __init__(
+        self,
+        config: ConfigFile,
+        planner_config: PlannerConfig,
+        monitor: SimulatedMonitor,
+        startup_timestamp: datetime,
+    ) -> None:
+        super().__init__(
+            config,
+            planner_config,
+            None,
+            NoopDataAccessProvider(),
+            startup_timestamp,
+        )
+        self._sim_monitor = monitor
+
+    async def metrics_snapshot(self, num_epochs: int) -> MonitorSnapshot:
+        return self._sim_monitor.snapshot(num_epochs)
+
+    def get_triggers(self) -> List[Trigger]:
+        triggers = []
+        for trigger in super().get_triggers():
+            if isinstance(trigger, VariableCosts):
+                logger.info("Not simulating the %s trigger.", trigger.name())
+                continue
+            triggers.append(trigger)
+        return triggers
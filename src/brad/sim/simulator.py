@@ -0,0 +1,391 @@
+import enum
+import heapq
+import logging
+import time
+import pandas as pd
+import numpy as np
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from brad.blueprint import Blueprint
+from brad.config.file import ConfigFile
+from brad.config.planner import PlannerConfig
+from brad.daemon.blueprint_filter import is_minor_blueprint_change
+from brad.daemon.blueprint_watchdog import BlueprintWatchdog
+from brad.planner.abstract import BlueprintPlanner
+from brad.planner.compare.provider import BlueprintComparatorProvider
+from brad.planner.estimator import EstimatorProvider
+from brad.planner.factory import BlueprintPlannerFactory
+from brad.planner.providers import BlueprintProviders
+from brad.planner.scoring.data_access.provider import NoopDataAccessProvider
+from brad.planner.scoring.performance.analytics_latency import (
+    NoopAnalyticsLatencyScorer,
+)
+from brad.planner.scoring.score import Score
+from brad.planner.triggers.evaluator import TriggerEvaluator
+from brad.planner.triggers.trigger import Trigger
+from brad.sim.clock import VirtualClock
+from brad.sim.engines import SimulatedEngines
+from brad.sim.monitor import SimulatedMetricsProvider, SimulatedMonitor
+from brad.sim.providers import SimulatedTriggerProvider, SimulatedWorkloadProvider
+from brad.sim.trace import WorkloadTrace
+from brad.sim.transition import TransitionModel
+
+logger = logging.getLogger(__name__)
+
+# One row per simulated epoch.
+EpochRecord = namedtuple(
+    "EpochRecord",
+    [
+        "start",
+        "aurora_provisioning",
+        "redshift_provisioning",
+        "in_transition",
+        "aurora_writer_cpu",
+        "redshift_cpu",
+        "query_lat_s_p90",
+        "txn_lat_s_p90",
+        "hourly_cost",
+        "slo_violated",
+    ],
+)
+
+# `outcome` is one of "accepted", "skipped", "rejected", or "none" (the planner
+# did not select a blueprint). `latency_s` is the planner's wall-clock run time.
+ReplanRecord = namedtuple(
+    "ReplanRecord", ["timestamp", "trigger", "latency_s", "outcome"]
+)
+
+# `switch` is when the front ends start using the next blueprint; `end` is when
+# the transition (including clean up) completes.
+TransitionRecord = namedtuple(
+    "TransitionRecord", ["start", "switch", "end", "next_blueprint", "actions"]
+)
+
+# We keep at least this many epochs of metrics (for the triggers' lookbacks and
+# the forecasters).
+_MIN_RETAINED_EPOCHS = 12
+
+
+class _EventKind(enum.IntEnum):
+    # The values order events that occur at the same time. An epoch ends before
+    # a transition takes effect (the epoch ran on the previous blueprint), and
+    # triggers see the metrics of an epoch that just ended.
+    EpochEnd = 0
+    TransitionSwitch = 1
+    TransitionComplete = 2
+    TriggerCheck = 3
+
+
+class SimulationResult:
+    def __init__(
+        self,
+        epoch_length: timedelta,
+        epochs: List[EpochRecord],
+        replans: List[ReplanRecord],
+        transitions: List[TransitionRecord],
+    ) -> None:
+        self.epoch_length = epoch_length
+        self.epochs = epochs
+        self.replans = replans
+        self.transitions = transitions
+
+    def epochs_df(self) -> pd.DataFrame:
+        return pd.DataFrame.from_records(
+            self.epochs, columns=EpochRecord._fields, index="start"
+        )
+
+    def summary(self) -> Dict[str, float]:
+        epoch_hours = self.epoch_length / timedelta(hours=1)
+        num_violations = sum(1 for epoch in self.epochs if epoch.slo_violated)
+        replan_latencies = np.array([r.latency_s for r in self.replans])
+        transition_s = np.array(
+            [(t.end - t.start).total_seconds() for t in self.transitions]
+        )
+        return {
+            "simulated_hours": len(self.epochs) * epoch_hours,
+            "slo_violation_epochs": float(num_violations),
+            "slo_violation_frac": (
+                num_violations / len(self.epochs) if len(self.epochs) > 0 else 0.0
+            ),
+            "replans": float(len(self.replans)),
+            "replan_latency_s_p50": _quantile_or_zero(replan_latencies, 0.5),
+            "replan_latency_s_max": _quantile_or_zero(replan_latencies, 1.0),
+            "transitions": float(len(self.transitions)),
+            "transition_s_p50": _quantile_or_zero(transition_s, 0.5),
+            "transition_s_max": _quantile_or_zero(transition_s, 1.0),
+            "total_cost": sum(epoch.hourly_cost for epoch in self.epochs) * epoch_hours,
+        }
+
+
+class Simulator:
+    """
+    A deterministic discrete-event simulation of BRAD's planning loop. It runs
+    the real blueprint planner, triggers, routing policies, and provisioning
+    waiter against simulated engines, a virtual clock, and a recorded workload
+    trace. This lets us evaluate planner changes over days of (simulated) time
+    without deploying BRAD.
+
+    The daemon and the `TransitionOrchestrator` are modeled rather than run
+    because they issue calls to AWS and to the engines:
+    - Blueprints selected by the planner are accepted using the daemon's rules
+      (see `is_minor_blueprint_change()` and the `BlueprintWatchdog`).
+    - Transitions take the time estimated by the `TransitionModel`.
+
+    Replans take `replan_duration` of simulated time (their wall-clock run time
+    is recorded separately) so that results do not depend on the host.
+    """
+
+    def __init__(
+        self,
+        config: ConfigFile,
+        planner_config: PlannerConfig,
+        schema_name: str,
+        initial_blueprint: Blueprint,
+        initial_score: Optional[Score],
+        trace: WorkloadTrace,
+        engines: SimulatedEngines,
+        comparator_provider: BlueprintComparatorProvider,
+        start: datetime,
+        estimator_provider: Optional[EstimatorProvider] = None,
+        transition_model: Optional[TransitionModel] = None,
+        replan_duration: timedelta = timedelta(0),
+        query_p90_ceiling_s: float = 30.0,
+        txn_p90_ceiling_s: float = 0.030,
+    ) -> None:
+        self._config = config
+        self._planner_config = planner_config
+        self._schema_name = schema_name
+        self._trace = trace
+        self._engines = engines
+        self._comparator_provider = comparator_provider
+        self._estimator_provider = (
+            estimator_provider
+            if estimator_provider is not None
+            else EstimatorProvider()
+        )
+        self._transition_model = (
+            transition_model
+            if transition_model is not None
+            else TransitionModel(config)
+        )
+        self._replan_duration = replan_duration
+        self._query_p90_ceiling_s = query_p90_ceiling_s
+        self._txn_p90_ceiling_s = txn_p90_ceiling_s
+
+        self._clock = VirtualClock(start)
+        self._epoch_length = config.epoch_length
+        planning_epochs = max(
+            int(planner_config.planning_window() / self._epoch_length), 1
+        )
+        self._monitor = SimulatedMonitor(
+            self._epoch_length,
+            max(planning_epochs, _MIN_RETAINED_EPOCHS),
+            engines.reference_metrics(),
+        )
+        self._watchdog = BlueprintWatchdog(None)
+
+        # The blueprint the front ends are using, and the one the planner
+        # considers to be current (it is updated once a transition completes).
+        self._active_blueprint = initial_blueprint
+        self._current_blueprint = initial_blueprint
+        self._current_score = initial_score
+        self._pending: Optional[Tuple[Blueprint, Score]] = None
+
+        self._planner: Optional[BlueprintPlanner] = None
+        self._trigger_provider: Optional[SimulatedTriggerProvider] = None
+        self._check_period = timedelta(0)
+        self._events: List[Tuple[datetime, int, int]] = []
+        self._event_seq = 0
+
+        self._epochs: List[EpochRecord] = []
+        self._replans: List[ReplanRecord] = []
+        self._transitions: List[TransitionRecord] = []
+        self._last_outcome = "none"
+
+    async def run(self, duration: timedelta) -> SimulationResult:
+        end = self._clock.start() + duration
+        with self._clock.installed():
+            self._trigger_provider = SimulatedTriggerProvider(
+                self._config, self._planner_config, self._monitor, self._clock.now()
+            )
+            planner = self._create_planner(self._trigger_provider)
+            planner.register_new_blueprint_callback(self._handle_new_blueprint)
+            self._planner = planner
+            evaluator = TriggerEvaluator(planner.get_triggers())
+
+            self._schedule(
+                self._clock.start() + self._epoch_length, _EventKind.EpochEnd
+            )
+            if self._planner_config.triggers_enabled():
+                trigger_configs = self._planner_config.trigger_configs()
+                self._check_period = timedelta(
+                    seconds=trigger_configs["check_period_s"]
+                )
+                self._schedule(
+                    self._clock.start()
+                    + timedelta(seconds=trigger_configs["check_period_offset_s"])
+                    + self._check_period,
+                    _EventKind.TriggerCheck,
+                )
+
+            while len(self._events) > 0:
+                timestamp, kind_value, _ = heapq.heappop(self._events)
+                if timestamp > end:
+                    break
+                self._clock.advance_to(timestamp)
+                kind = _EventKind(kind_value)
+
+                if kind == _EventKind.EpochEnd:
+                    await self._run_epoch(timestamp - self._epoch_length)
+                    self._schedule(timestamp + self._epoch_length, _EventKind.EpochEnd)
+
+                elif kind == _EventKind.TriggerCheck:
+                    if self._pending is None:
+                        metrics = await self._trigger_provider.metrics_snapshot(
+                            evaluator.metrics_lookback_epochs()
+                        )
+                        fired = await evaluator.evaluate(metrics)
+                        if fired is not None:
+                            await self._run_replan(planner, fired)
+                    self._schedule(
+                        timestamp + self._check_period, _EventKind.TriggerCheck
+                    )
+
+                elif kind == _EventKind.TransitionSwitch:
+                    assert self._pending is not None
+                    self._active_blueprint = self._pending[0]
+
+                elif kind == _EventKind.TransitionComplete:
+                    assert self._pending is not None
+                    self._current_blueprint, self._current_score = self._pending
+                    self._pending = None
+                    planner.update_blueprint(
+                        self._current_blueprint, self._current_score
+                    )
+                    planner.set_disable_triggers(False)
+
+        return SimulationResult(
+            self._epoch_length, self._epochs, self._replans, self._transitions
+        )
+
+    def clock(self) -> VirtualClock:
+        return self._clock
+
+    def _create_planner(
+        self, trigger_provider: SimulatedTriggerProvider
+    ) -> BlueprintPlanner:
+        providers = BlueprintProviders(
+            workload_provider=SimulatedWorkloadProvider(self._trace, self._clock),
+            analytics_latency_scorer=NoopAnalyticsLatencyScorer(),
+            comparator_provider=self._comparator_provider,
+            metrics_provider=SimulatedMetricsProvider(
+                self._monitor,
+                self._clock,
+                self._planner_config.planning_window(),
+                self._epoch_length,
+            ),
+            data_access_provider=NoopDataAccessProvider(),
+            estimator_provider=self._estimator_provider,
+            trigger_provider=trigger_provider,
+        )
+        return BlueprintPlannerFactory.create(
+            config=self._config,
+            planner_config=self._planner_config,
+            schema_name=self._schema_name,
+            current_blueprint=self._current_blueprint,
+            current_blueprint_score=self._current_score,
+            providers=providers,
+        )
+
+    async def _run_epoch(self, epoch_start: datetime) -> None:
+        workload = self._trace.workload_at(epoch_start - self._clock.start())
+        obs = await self._engines.observe(self._active_blueprint, workload)
+        self._monitor.record(epoch_start, obs)
+        self._epochs.append(
+            EpochRecord(
+                start=epoch_start,
+                aurora_provisioning=str(self._active_blueprint.aurora_provisioning()),
+                redshift_provisioning=str(
+                    self._active_blueprint.redshift_provisioning()
+                ),
+                in_transition=self._pending is not None,
+                aurora_writer_cpu=obs.aurora_writer_cpu,
+                redshift_cpu=obs.redshift_max_cpu(),
+                query_lat_s_p90=obs.query_lat_s_p90,
+                txn_lat_s_p90=obs.txn_lat_s_p90,
+                hourly_cost=obs.hourly_cost,
+                slo_violated=(
+                    obs.query_lat_s_p90 > self._query_p90_ceiling_s
+                    or obs.txn_lat_s_p90 > self._txn_p90_ceiling_s
+                ),
+            )
+        )
+
+    async def _run_replan(self, planner: BlueprintPlanner, trigger: Trigger) -> None:
+        logger.info("Trigger %s fired at %s.", trigger.name(), self._clock.now())
+        self._last_outcome = "none"
+        replan_start = time.perf_counter()
+        await planner.run_replan(trigger=trigger)
+        self._replans.append(
+            ReplanRecord(
+                timestamp=self._clock.now(),
+                trigger=trigger.name(),
+                latency_s=time.perf_counter() - replan_start,
+                outcome=self._last_outcome,
+            )
+        )
+
+    async def _handle_new_blueprint(
+        self, blueprint: Blueprint, score: Score, _trigger: Optional[Trigger]
+    ) -> None:
+        # Mirrors `BradDaemon._handle_new_blueprint()`.
+        if self._pending is not None or is_minor_blueprint_change(
+            self._current_blueprint,
+            self._current_score,
+            blueprint,
+            score,
+            self._planner_config,
+        ):
+            self._last_outcome = "skipped"
+            return
+
+        if self._watchdog.reject_blueprint(blueprint):
+            self._last_outcome = "rejected"
+            return
+
+        self._last_outcome = "accepted"
+        self._pending = (blueprint, score)
+        # Triggers are disabled until the transition completes (as in the
+        # daemon).
+        if self._planner is not None:
+            self._planner.set_disable_triggers(True)
+
+        transition_start = self._clock.now() + self._replan_duration
+        times = await self._transition_model.run(
+            self._current_blueprint, blueprint, score, transition_start
+        )
+        switch = transition_start + times.pre_transition
+        end = switch + times.post_transition
+        self._transitions.append(
+            TransitionRecord(
+                start=transition_start,
+                switch=switch,
+                end=end,
+                next_blueprint=blueprint,
+                actions=times.actions,
+            )
+        )
+        self._schedule(switch, _EventKind.TransitionSwitch)
+        self._schedule(end, _EventKind.TransitionComplete)
+
+    def _schedule(self, timestamp: datetime, kind: _EventKind) -> None:
+        heapq.heappush(self._events, (timestamp, kind.value, self._event_seq))
+        self._event_seq += 1
+
+
+def _quantile_or_zero(values: np.ndarray, quantile: float) -> float:
+    if values.shape[0] == 0:
+        return 0.0
+    return float(np.quantile(values, quantile))
@@ -0,0 +1,52 @@
+import pathlib
+from datetime import timedelta
+from typing import List
+
+from brad.planner.workload import Workload
+
+
+class WorkloadTrace:
+    """
+    A sequence of recorded workloads to replay. Each workload is active for
+    its `period()`, one after another. The trace repeats from the beginning
+    once it runs out (this lets a short recording drive a long simulation).
+
+    The workloads must already include the predicted query latencies and data
+    access statistics (e.g., the workloads saved in a recorded planning run).
+    """
+
+    @classmethod
+    def from_directory(cls, path: str | pathlib.Path) -> "WorkloadTrace":
+        """
+        Loads pickled workloads (`*.pickle`), in file name order.
+        """
+        workloads = [
+            Workload.from_pickle(file_path)
+            for file_path in sorted(pathlib.Path(path).glob("*.pickle"))
+        ]
+        return cls(workloads)
+
+    def __init__(self, workloads: List[Workload]) -> None:
+        assert len(workloads) > 0
+        self._workloads = workloads
+        self._ends: List[timedelta] = []
+        total = timedelta(0)
+        for workload in workloads:
+            assert workload.period() > timedelta(0)
+            total += workload.period()
+            self._ends.append(total)
+        self._length = total
+
+    def length(self) -> timedelta:
+        return self._length
+
+    def workload_at(self, elapsed: timedelta) -> Workload:
+        """
+        Returns the workload that is active `elapsed` time after the trace
+        starts.
+        """
+        offset = elapsed % self._length
+        for workload, end in zip(self._workloads, self._ends):
+            if offset < end:
+                return workload
+        return self._workloads[-1]
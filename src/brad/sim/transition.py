@@ -0,0 +1,221 @@
+import logging
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from brad.blueprint import Blueprint
+from brad.blueprint.diff.blueprint import BlueprintDiff
+from brad.blueprint.provisioning import Provisioning
+from brad.config.file import ConfigFile
+from brad.planner.scoring.score import Score
+from brad.provisioning.redshift import RedshiftProvisioningManager
+from brad.provisioning.waiter import ProvisioningAction, ProvisioningWaiter
+from brad.sim.clock import VirtualClock
+
+logger = logging.getLogger(__name__)
+
+# How long a simulated transition takes. `pre_transition` is the time until the
+# front ends can switch to the next blueprint; `post_transition` is the time
+# spent cleaning up afterwards. `actions` lists the provisioning actions that
+# were waited on, along with how long each wait took (in seconds).
+TransitionTimes = namedtuple(
+    "TransitionTimes", ["pre_transition", "post_transition", "actions"]
+)
+
+
+class TransitionModel:
+    """
+    Simulates the `TransitionOrchestrator`. It runs through the same steps as
+    the orchestrator, but each provisioning action completes after a fixed
+    duration instead of calling AWS. Completion is detected by a
+    `ProvisioningWaiter` driven by a virtual clock, so the waiter's polling
+    delays (and its learned expected durations) are part of the result.
+
+    Aurora and Redshift are re-provisioned in parallel (as in the
+    orchestrator), so each is simulated on its own clock and the slower one
+    determines the transition's duration.
+    """
+
+    def __init__(
+        self,
+        config: ConfigFile,
+        action_durations_s: Optional[Dict[ProvisioningAction, float]] = None,
+    ) -> None:
+        self._config = config
+        if action_durations_s is None:
+            # A waiter without any history reports the default durations.
+            defaults = ProvisioningWaiter()
+            action_durations_s = {
+                action: defaults.expected_duration_s(action)
+                for action in ProvisioningAction
+            }
+        self._action_durations_s = action_durations_s
+
+        # Replaced whenever a transition runs.
+        self._branch_clock = VirtualClock(datetime.fromtimestamp(0, tz=timezone.utc))
+        self._waiter = ProvisioningWaiter(
+            clock=self._branch_elapsed_s, sleep=self._branch_sleep
+        )
+        self._actions: List[Tuple[ProvisioningAction, float]] = []
+
+        # Paused engines keep their provisioning; they resume with it.
+        self._paused_aurora: Optional[Provisioning] = None
+        self._paused_redshift: Optional[Provisioning] = None
+
+    async def run(
+        self,
+        curr_blueprint: Blueprint,
+        next_blueprint: Blueprint,
+        next_score: Optional[Score],
+        now: datetime,
+    ) -> TransitionTimes:
+        self._actions = []
+        diff = BlueprintDiff.of(curr_blueprint, next_blueprint)
+        if diff is None:
+            return TransitionTimes(timedelta(0), timedelta(0), [])
+
+        curr_aurora = curr_blueprint.aurora_provisioning()
+        next_aurora = next_blueprint.aurora_provisioning()
+        curr_redshift = curr_blueprint.redshift_provisioning()
+        next_redshift = next_blueprint.redshift_provisioning()
+
+        # 1. Re-provision Aurora and Redshift (in parallel).
+        self._branch_clock = VirtualClock(now)
+        if diff.aurora_diff() is not None:
+            await self._run_aurora_pre_transition(curr_aurora, next_aurora)
+        aurora_pre = self._branch_clock.elapsed()
+
+        self._branch_clock = VirtualClock(now)
+        if diff.redshift_diff() is not None:
+            await self._run_redshift_pre_transition(curr_redshift, next_redshift)
+        redshift_pre = self._branch_clock.elapsed()
+        pre_transition = max(aurora_pre, redshift_pre)
+
+        # 2. Table movement.
+        moves_tables = any(
+            len(table_diff.added_locations()) > 0 for table_diff in diff.table_diffs()
+        )
+        if (
+            not self._config.disable_table_movement
+            and moves_tables
+            and next_score is not None
+        ):
+            pre_transition += timedelta(seconds=next_score.table_movement_trans_time_s)
+
+        # 3. Clean up. Dropping tables is fast relative to the provisioning
+        # changes, so we only account for the latter.
+        self._branch_clock = VirtualClock(now + pre_transition)
+        if diff.aurora_diff() is not None:
+            await self._run_aurora_post_transition(curr_aurora, next_aurora)
+        if diff.redshift_diff() is not None and next_redshift.num_nodes() == 0:
+            self._paused_redshift = curr_redshift
+        post_transition = self._branch_clock.elapsed()
+
+        return TransitionTimes(pre_transition, post_transition, self._actions)
+
+    async def _run_aurora_pre_transition(
+        self, old: Provisioning, new: Provisioning
+    ) -> None:
+        if new.num_nodes() == 0:
+            # We pause the cluster in the post-transition step.
+            return
+
+        if old.num_nodes() == 0:
+            await self._wait(ProvisioningAction.AuroraStartCluster)
+            if self._paused_aurora is not None:
+                old = self._paused_aurora
+            else:
+                old = Provisioning(old.instance_type(), 1)
+            self._paused_aurora = None
+
+        # Create new replicas first (in parallel).
+        new_replica_count = max(new.num_nodes() - 1, 0)
+        old_replica_count = max(old.num_nodes() - 1, 0)
+        if new_replica_count > 0 and new_replica_count > old_replica_count:
+            await self._wait(ProvisioningAction.AuroraCreateReplica, 20.0)
+
+        if old.instance_type() != new.instance_type():
+            replicas_to_modify = min(new.num_nodes() - 1, old.num_nodes() - 1)
+            if replicas_to_modify == 1 and old.num_nodes() - 1 == 1:
+                # The single replica is replaced instead of modified.
+                await self._wait(ProvisioningAction.AuroraCreateReplica, 20.0)
+                await self._wait(ProvisioningAction.AuroraDeleteReplica)
+            else:
+                # Replicas are modified one-by-one.
+                for _ in range(max(replicas_to_modify, 0)):
+                    await self._wait(ProvisioningAction.AuroraChangeInstanceType, 60.0)
+
+            # The primary is replaced last: create a replica, fail over to
+            # it, and then delete the old primary.
+            await self._wait(ProvisioningAction.AuroraCreateReplica, 20.0)
+            await self._wait(ProvisioningAction.AuroraFailover)
+            await self._wait(ProvisioningAction.AuroraDeleteReplica)
+
+    async def _run_aurora_post_transition(
+        self, old: Provisioning, new: Provisioning
+    ) -> None:
+        if new.num_nodes() == 0:
+            # The cluster is paused (no need to wait).
+            self._paused_aurora = old
+            return
+
+        old_replica_count = max(old.num_nodes() - 1, 0)
+        new_replica_count = max(new.num_nodes() - 1, 0)
+        if old_replica_count > 0 and new_replica_count < old_replica_count:
+            for _ in range(old_replica_count - new_replica_count):
+                await self._wait(ProvisioningAction.AuroraDeleteReplica)
+
+    async def _run_redshift_pre_transition(
+        self, old: Provisioning, new: Provisioning
+    ) -> None:
+        if new.num_nodes() == 0:
+            # This is handled post-transition.
+            return
+
+        # The orchestrator always resumes the cluster; this is a no-op (apart
+        # from the wait's initial delay) if the cluster is running.
+        if old.num_nodes() == 0:
+            await self._wait(ProvisioningAction.RedshiftResume, 20.0)
+            if self._paused_redshift is not None:
+                old = self._paused_redshift
+            else:
+                old = new
+            self._paused_redshift = None
+        else:
+            await self._wait(ProvisioningAction.RedshiftResume, 20.0, duration_s=0.0)
+
+        if old == new:
+            return
+
+        if RedshiftProvisioningManager.must_use_classic_resize(old, new):
+            await self._wait(ProvisioningAction.RedshiftClassicResize, 20.0)
+        else:
+            await self._wait(ProvisioningAction.RedshiftElasticResize, 20.0)
+
+    async def _wait(
+        self,
+        action: ProvisioningAction,
+        initial_delay_s: float = 0.0,
+        duration_s: Optional[float] = None,
+    ) -> None:
+        if duration_s is None:
+            duration_s = self._action_durations_s[action]
+        start_s = self._branch_clock.elapsed_s()
+        done_s = start_s + duration_s
+
+        async def is_done() -> bool:
+            return self._branch_clock.elapsed_s() >= done_s
+
+        await self._waiter.wait_for(
+            action,
+            is_done,
+            "simulated {}".format(action.value),
+            initial_delay_s=initial_delay_s,
+        )
+        self._actions.append((action, self._branch_clock.elapsed_s() - start_s))
+
+    def _branch_elapsed_s(self) -> float:
+        return self._branch_clock.elapsed_s()
+
+    async def _branch_sleep(self, delay_s: float) -> None:
+        await self._branch_clock.sleep(delay_s)
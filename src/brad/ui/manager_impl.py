@@ -26,7 +26,7 @@ from brad.ui.models import (
     ClientState,
     SetClientState,
 )
-from brad.daemon.front_end_metrics import FrontEndMetric
+from brad.daemon.front_end_metrics import FrontEndMetric, STAGE_METRICS
 from brad.daemon.system_event_logger import SystemEventLogger, SystemEventRecord
 from brad.vdbe.manager import VdbeManager
 from brad.vdbe.models import VirtualEngine, CreateVirtualEngineArgs
@@ -89,6 +89,15 @@ def get_metrics(num_values: int = 3, use_generated: bool = False) -> MetricsData
     tlat = metrics[FrontEndMetric.TxnLatencySecondP90.value]
     tlat_tm = TimestampedMetrics(timestamps=list(tlat.index), values=list(tlat))
 
+    # Time spent in each stage of the front end's query path.
+    stage_latency_dict = {}
+    for stage_metrics in STAGE_METRICS.values():
+        for stage_metric in stage_metrics:
+            values = metrics[stage_metric.value]
+            stage_latency_dict[stage_metric.value] = TimestampedMetrics(
+                timestamps=list(values.index), values=list(values)
+            )
+
     vdbe_metrics = manager.monitor.vdbe_metrics()
     assert vdbe_metrics is not None
     vdbe_metrics_values = vdbe_metrics.read_k_most_recent(k=num_values)
@@ -128,6 +137,7 @@ def get_metrics(num_values: int = 3, use_generated: bool = False) -> MetricsData
         named_metrics={
             FrontEndMetric.QueryLatencySecondP90.value: qlat_tm,
             FrontEndMetric.TxnLatencySecondP90.value: tlat_tm,
+            **stage_latency_dict,
             **vdbe_latency_dict,
         }
     )
@@ -1,8 +1,13 @@
 import pytz
 import pandas as pd
-from typing import Iterator
+from typing import Callable, Iterator, Optional
 from datetime import datetime, timedelta
 
+# When set, `universal_now()` returns this function's result instead of the
+# wall clock time. This is used to run time-dependent components (e.g., the
+# planner's triggers) against a simulated clock (see `brad.sim`).
+_now_override: Optional[Callable[[], datetime]] = None
+
 
 def period_start(timestamp: datetime, period_length: timedelta) -> datetime:
     """
@@ -79,4 +84,15 @@ def universal_now() -> datetime:
     Returns a timestamp that represents the current date and time in a
     standardized timezone.
     """
+    if _now_override is not None:
+        return _now_override()
     return datetime.now(tz=pytz.utc)
+
+
+def set_universal_now_override(now_fn: Optional[Callable[[], datetime]]) -> None:
+    """
+    Makes `universal_now()` return `now_fn()`. Pass `None` to go back to using
+    the wall clock time.
+    """
+    global _now_override  # pylint: disable=global-statement
+    _now_override = now_fn
@@ -44,16 +44,21 @@ class LogFetcher:
                     continue
 
                 if include_contents:
-                    # Fetch the file from S3.
-                    response = self._s3.get_object(
-                        Bucket=self._config.s3_logs_bucket, Key=log_file_key
-                    )
-                    contents = response["Body"].read().decode("utf-8")
+                    contents: Optional[str] = self.fetch_contents(log_file_key)
                 else:
                     contents = None
 
                 yield LogFile(log_file_key, log_epoch_start, contents)
 
+    def fetch_contents(self, log_file_key: str) -> str:
+        """
+        Fetches a log file's contents from S3.
+        """
+        response = self._s3.get_object(
+            Bucket=self._config.s3_logs_bucket, Key=log_file_key
+        )
+        return response["Body"].read().decode("utf-8")
+
     def _s3_list_objects_full(self, prefix: str) -> Iterator[str]:
         continuation_token: Optional[str] = None
         while True:
@@ -0,0 +1,147 @@
+import asyncio
+from collections import Counter
+from typing import Dict
+
+from brad.asset_manager import AssetManager
+from brad.blueprint import Blueprint
+from brad.blueprint.diff.blueprint import BlueprintDiff
+from brad.blueprint.diff.delta import BlueprintDelta
+from brad.blueprint.manager import BlueprintManager, BlueprintVersioning
+from brad.blueprint.provisioning import Provisioning
+from brad.blueprint.state import TransitionState
+from brad.blueprint.user import UserProvidedBlueprint
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.planner.data import bootstrap_blueprint
+
+
+class _InMemoryAssets(AssetManager):
+    # pylint: disable-next=super-init-not-called
+    def __init__(self) -> None:
+        self.assets: Dict[str, bytes] = {}
+        self.loads: Counter = Counter()
+
+    def load_sync(self, key: str) -> bytes:
+        self.loads[key] += 1
+        try:
+            return self.assets[key]
+        except KeyError as ex:
+            raise ValueError(f"Key '{key}' does not exist.") from ex
+
+    def persist_sync(self, key: str, payload: bytes) -> None:
+        self.assets[key] = payload
+
+    def delete_sync(self, key: str) -> None:
+        del self.assets[key]
+
+
+def _initial_blueprint() -> Blueprint:
+    user = UserProvidedBlueprint.load_from_yaml_str("""
+      schema_name: test
+      tables:
+        - table_name: table1
+          columns:
+            - name: col1
+              data_type: BIGINT
+              primary_key: true
+        - table_name: table2
+          columns:
+            - name: col1
+              data_type: BIGINT
+              primary_key: true
+      provisioning:
+        aurora:
+          num_nodes: 1
+          instance_type: db.r6g.large
+        redshift:
+          num_nodes: 1
+          instance_type: dc2.large
+    """)
+    return bootstrap_blueprint(user)
+
+
+def _changed_blueprint(initial: Blueprint) -> Blueprint:
+    table_locations = dict(initial.table_locations())
+    table_locations["table2"] = [Engine.Redshift]
+    return Blueprint(
+        initial.schema_name(),
+        initial.tables(),
+        table_locations,
+        initial.aurora_provisioning(),
+        Provisioning(instance_type="dc2.large", num_nodes=4),
+        full_routing_policy=initial.get_routing_policy(),
+    )
+
+
+def _make_manager(tmp_path, assets: _InMemoryAssets) -> BlueprintManager:
+    config = ConfigFile(
+        {
+            "aws_access_key": "key",
+            "aws_access_key_secret": "secret",
+            "aurora": {"cluster_id": "brad"},
+            "redshift": {"cluster_id": "brad-redshift"},
+            "blueprint_cache_path": str(tmp_path / "blueprints"),
+        }
+    )
+    return BlueprintManager(config, assets, "test")
+
+
+def test_versioning_round_trip():
+    versioning = BlueprintVersioning(3, TransitionState.Transitioning, 4, "a", "b")
+    loaded = BlueprintVersioning.deserialize(versioning.serialize())
+    assert loaded.version_digest == "a"
+    assert loaded.next_version_digest == "b"
+
+    legacy = BlueprintVersioning.deserialize(b'[3, "stable", null]')
+    assert legacy.version == 3
+    assert legacy.version_digest is None
+
+
+def test_blueprints_are_shared_through_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    assets = _InMemoryAssets()
+    BlueprintManager.initialize_schema(assets, _initial_blueprint())
+
+    first = _make_manager(tmp_path, assets)
+    asyncio.run(first.load(skip_directory_refresh=True))
+    # pylint: disable-next=protected-access
+    blueprint_key = BlueprintManager._blueprint_key_for_version("test", version=0)
+    assert assets.loads[blueprint_key] == 1
+
+    # Another process on the same machine uses the cached copy.
+    second = _make_manager(tmp_path, assets)
+    asyncio.run(second.load(skip_directory_refresh=True))
+    assert assets.loads[blueprint_key] == 1
+    assert BlueprintDiff.of(second.get_blueprint(), first.get_blueprint()) is None
+
+
+def test_front_end_applies_transition_delta(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    assets = _InMemoryAssets()
+    initial = _initial_blueprint()
+    changed = _changed_blueprint(initial)
+    BlueprintManager.initialize_schema(assets, initial)
+
+    daemon = _make_manager(tmp_path, assets)
+    front_end = _make_manager(tmp_path, assets)
+    asyncio.run(daemon.load(skip_directory_refresh=True))
+    asyncio.run(front_end.load(skip_directory_refresh=True))
+
+    async def transition() -> None:
+        await daemon.start_transition(changed, None)
+        await daemon.update_transition_state(TransitionState.TransitionedPreCleanUp)
+
+    asyncio.run(transition())
+    tm = daemon.get_transition_metadata()
+    assert tm.next_blueprint is not None
+    delta = BlueprintDelta.of(tm.curr_blueprint, tm.next_blueprint)
+
+    num_loads = sum(assets.loads.values())
+    assert front_end.apply_delta(1, delta)
+    assert sum(assets.loads.values()) == num_loads
+    assert BlueprintDiff.of(front_end.get_blueprint(), changed) is None
+    assert front_end.get_active_blueprint_version() == 1
+
+    # The delta no longer applies to the front end's active blueprint.
+    assert not front_end.apply_delta(2, delta)
+    assert front_end.get_active_blueprint_version() == 1
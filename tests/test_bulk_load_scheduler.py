@@ -0,0 +1,262 @@
+import asyncio
+import pathlib
+from typing import List
+
+import pytest
+
+from brad.admin.bulk_load import _read_aurora_load_progress, _remaining_chunks
+from brad.admin.bulk_load_chunks import header_lines_for, split_into_chunks
+from brad.admin.bulk_load_scheduler import (
+    BulkLoadScheduler,
+    LoadChunk,
+    TableLoad,
+    load_workers_for,
+)
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.config.engine import Engine
+from brad.connection.connection import Connection
+from brad.connection.sqlite_connection import SqliteConnection
+from brad.routing.abstract_policy import FullRoutingPolicy
+from brad.routing.always_one import AlwaysOneRouter
+
+
+def _make_db(tmp_path: pathlib.Path) -> str:
+    db_path = str(tmp_path / "load.db")
+    conn = SqliteConnection.connect_sync(db_path, autocommit=True)
+    cursor = conn.cursor_sync()
+    cursor.execute_sync("CREATE TABLE t1 (id INTEGER, val TEXT)")
+    cursor.execute_sync("CREATE TABLE t2 (id INTEGER, val TEXT)")
+    cursor.execute_sync("CREATE TABLE progress (table_name TEXT)")
+    conn.close_sync()
+    return db_path
+
+
+# The "S3 objects" used in these tests. Each chunk holds its ids.
+_DATA = {
+    "t1/part-00000": [1, 2, 3],
+    "t1/part-00001": [4, 5],
+    "t2/part-00000": [10, 11, 12, 13, 14],
+}
+
+
+def _chunks(prefix: str) -> List[LoadChunk]:
+    return [
+        LoadChunk(path, len(ids))
+        for path, ids in _DATA.items()
+        if path.startswith(prefix)
+    ]
+
+
+def _make_loads(engine: Engine, order: List[str]) -> List[TableLoad]:
+    async def load_chunk(table_name: str, conn: Connection, chunk: LoadChunk) -> None:
+        order.append(chunk.s3_path)
+        cursor = await conn.cursor()
+        for row_id in _DATA[chunk.s3_path]:
+            await cursor.execute(
+                "INSERT INTO {} VALUES ({}, '{}')".format(
+                    table_name, row_id, chunk.s3_path
+                )
+            )
+
+    def make_load(table_name: str) -> TableLoad:
+        async def finish(conn: Connection) -> None:
+            order.append("finish:" + table_name)
+            cursor = await conn.cursor()
+            await cursor.execute(
+                "INSERT INTO progress VALUES ('{}')".format(table_name)
+            )
+
+        return TableLoad(
+            engine,
+            table_name,
+            _chunks(table_name + "/"),
+            lambda conn, chunk: load_chunk(table_name, conn, chunk),
+            finish,
+        )
+
+    return [make_load("t1"), make_load("t2")]
+
+
+def _make_scheduler(db_path: str, workers: int) -> BulkLoadScheduler:
+    async def connect(_engine: Engine) -> Connection:
+        return SqliteConnection.connect_sync(db_path, autocommit=True)
+
+    return BulkLoadScheduler(connect, {Engine.Aurora: workers})
+
+
+def _fetch(db_path: str, query: str):
+    conn = SqliteConnection.connect_sync(db_path, autocommit=True)
+    try:
+        cursor = conn.cursor_sync()
+        cursor.execute_sync(query)
+        return cursor.fetchall_sync()
+    finally:
+        conn.close_sync()
+
+
+def test_loads_all_chunks(tmp_path):
+    db_path = _make_db(tmp_path)
+    order: List[str] = []
+    scheduler = _make_scheduler(db_path, workers=2)
+    for load in _make_loads(Engine.Aurora, order):
+        scheduler.add(load)
+
+    stats = asyncio.run(scheduler.run())
+
+    rows = _fetch(db_path, "SELECT id FROM t1 ORDER BY id")
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+    rows = _fetch(db_path, "SELECT id FROM t2 ORDER BY id")
+    assert [row[0] for row in rows] == [10, 11, 12, 13, 14]
+    rows = _fetch(db_path, "SELECT table_name FROM progress ORDER BY table_name")
+    assert [row[0] for row in rows] == ["t1", "t2"]
+
+    aurora = stats[Engine.Aurora]
+    assert aurora.chunks_done == 3
+    assert aurora.tables_done == 2
+    assert aurora.bytes_done == aurora.total_bytes == 10
+
+
+def test_largest_chunks_first(tmp_path):
+    db_path = _make_db(tmp_path)
+    order: List[str] = []
+    scheduler = _make_scheduler(db_path, workers=1)
+    for load in _make_loads(Engine.Aurora, order):
+        scheduler.add(load)
+
+    asyncio.run(scheduler.run())
+
+    # Each table is finished right after its last chunk is loaded.
+    assert order == [
+        "t2/part-00000",
+        "finish:t2",
+        "t1/part-00000",
+        "t1/part-00001",
+        "finish:t1",
+    ]
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    max_in_flight = 0
+    connections = 0
+
+    async def connect(_engine: Engine) -> Connection:
+        nonlocal connections
+        connections += 1
+        return SqliteConnection.connect_sync(":memory:", autocommit=True)
+
+    async def load_chunk(_conn: Connection, _chunk: LoadChunk) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    scheduler = BulkLoadScheduler(connect, {Engine.Redshift: 3})
+    chunks = [LoadChunk("t/part-{}".format(i), 100) for i in range(10)]
+    scheduler.add(TableLoad(Engine.Redshift, "t", chunks, load_chunk))
+    stats = asyncio.run(scheduler.run())
+
+    assert max_in_flight == 3
+    assert connections == 3
+    assert stats[Engine.Redshift].chunks_done == 10
+
+
+def test_failure_is_raised(tmp_path):
+    db_path = _make_db(tmp_path)
+    finished = []
+
+    async def load_chunk(_conn: Connection, chunk: LoadChunk) -> None:
+        if chunk.s3_path.endswith("1"):
+            raise RuntimeError("Load failed.")
+
+    async def finish(_conn: Connection) -> None:
+        finished.append(True)
+
+    scheduler = _make_scheduler(db_path, workers=2)
+    scheduler.add(TableLoad(Engine.Aurora, "t1", _chunks("t1/"), load_chunk, finish))
+    with pytest.raises(RuntimeError):
+        asyncio.run(scheduler.run())
+    assert finished == []
+
+
+def test_resume_from_load_progress(tmp_path):
+    db_path = str(tmp_path / "progress.db")
+    conn = SqliteConnection.connect_sync(db_path, autocommit=True)
+    try:
+        # Creates the progress table.
+        assert asyncio.run(_read_aurora_load_progress(conn)) == {}
+        cursor = conn.cursor_sync()
+        cursor.execute_sync(
+            "INSERT INTO brad_bulk_load_progress VALUES ('t1', 't1/part-00000')"
+        )
+        progress = asyncio.run(_read_aurora_load_progress(conn))
+    finally:
+        conn.close_sync()
+
+    assert progress == {"t1": {"t1/part-00000"}}
+    assert _remaining_chunks("t1", _chunks("t1/"), progress["t1"]) == [
+        LoadChunk("t1/part-00001", 2)
+    ]
+    # The table was previously loaded using different chunks.
+    with pytest.raises(RuntimeError):
+        _remaining_chunks("t1", [LoadChunk("t1.csv", 5)], progress["t1"])
+
+
+def test_load_workers_for():
+    blueprint = Blueprint(
+        "test",
+        [],
+        {},
+        Provisioning("db.r6g.xlarge", 1),
+        Provisioning("dc2.large", 4),
+        FullRoutingPolicy([], AlwaysOneRouter(Engine.Aurora)),
+    )
+    assert load_workers_for(Engine.Aurora, blueprint) == 4
+    assert load_workers_for(Engine.Redshift, blueprint) == 4
+    assert load_workers_for(Engine.Athena, blueprint) > 0
+
+    paused = Blueprint(
+        "test",
+        [],
+        {},
+        Provisioning("db.r6g.xlarge", 1),
+        Provisioning("dc2.large", 0),
+        FullRoutingPolicy([], AlwaysOneRouter(Engine.Aurora)),
+    )
+    assert load_workers_for(Engine.Redshift, paused) == 1
+
+
+def test_split_into_chunks():
+    lines = [b"id|val\n"] + [
+        "{0}|value-{0}\n".format(i).encode("UTF-8") for i in range(100)
+    ]
+    data = b"".join(lines)
+    # Deliver the data in small, unaligned blocks.
+    blocks = [data[i : i + 7] for i in range(0, len(data), 7)]
+
+    chunks = list(split_into_chunks(blocks, chunk_bytes=100, header_lines=1))
+    assert len(chunks) > 1
+    body = b""
+    for chunk in chunks:
+        assert chunk.startswith(b"id|val\n")
+        assert chunk.endswith(b"\n")
+        # Chunks only exceed the target size by the header.
+        assert len(chunk) <= 100 + len(lines[0])
+        body += chunk[len(lines[0]) :]
+    assert body == b"".join(lines[1:])
+
+    # No header, and a line longer than the chunk size.
+    chunks = list(split_into_chunks([b"a" * 50 + b"\nb\nc"], chunk_bytes=10))
+    assert chunks == [b"a" * 50 + b"\n", b"b\nc"]
+
+
+def test_header_lines_for():
+    assert header_lines_for({}) == 0
+    assert header_lines_for({"header_lines": 2}) == 2
+    assert header_lines_for({"redshift_options": "DELIMITER '|' IGNOREHEADER 1"}) == 1
+    assert header_lines_for({"aurora_options": "FORMAT csv, HEADER true"}) == 1
+    assert header_lines_for({"aurora_options": "FORMAT csv, HEADER"}) == 1
+    assert header_lines_for({"aurora_options": "FORMAT csv, HEADER false"}) == 0
+    assert header_lines_for({"aurora_options": "FORMAT csv, DELIMITER '|'"}) == 0
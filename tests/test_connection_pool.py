@@ -0,0 +1,257 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from brad.blueprint.provisioning import Provisioning
+from brad.config.engine import Engine
+from brad.config.session import SessionId
+from brad.connection.connection import Connection
+from brad.connection.cursor import Cursor
+from brad.front_end.connection_pool import ConnectionPool, EngineConnectionPools
+from brad.front_end.session import Session
+from brad.routing.rule_based import RuleBased
+
+
+class _FakeConnection(Connection):
+    def __init__(self, conn_id: int) -> None:
+        super().__init__()
+        self.conn_id = conn_id
+        self.closed = False
+
+    async def cursor(self) -> Cursor:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def cursor_sync(self) -> Cursor:
+        raise NotImplementedError
+
+    def close_sync(self) -> None:
+        self.closed = True
+
+    def is_connection_lost_error(self, ex: Exception) -> bool:
+        return False
+
+
+class _ConnectionCounter:
+    def __init__(self) -> None:
+        self.created: List[_FakeConnection] = []
+
+    async def connect(self) -> Connection:
+        conn = _FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+
+class _FakePools:
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+
+    def pool_for(
+        self, _engine: Engine, _for_writes: bool, _replica_index=None
+    ) -> ConnectionPool:
+        return self.pool
+
+
+def test_pool_reuses_connections():
+    async def run():
+        counter = _ConnectionCounter()
+        pool = ConnectionPool("test", max_size=2, connect_fn=counter.connect)
+
+        c1 = await pool.acquire()
+        pool.release(c1)
+        c2 = await pool.acquire()
+        assert c1 is c2
+        assert len(counter.created) == 1
+
+        c3 = await pool.acquire()
+        assert c3 is not c2
+        assert pool.stats() == (2, 0, 0)
+
+        # The pool is exhausted, so the next acquire waits.
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert pool.stats()[2] == 1
+        pool.release(c3)
+        c4 = await asyncio.wait_for(waiter, timeout=1.0)
+        assert c4 is c3
+        assert len(counter.created) == 2
+
+    asyncio.run(run())
+
+
+def test_pool_discards_lost_connections():
+    async def run():
+        counter = _ConnectionCounter()
+        pool = ConnectionPool("test", max_size=1, connect_fn=counter.connect)
+
+        c1 = await pool.acquire()
+        c1.mark_connection_lost()
+        pool.release(c1)
+        await asyncio.sleep(0)
+        assert c1.closed  # type: ignore
+
+        c2 = await pool.acquire()
+        assert c2 is not c1
+        pool.release(c2)
+
+        # Connections from before a reset are not reused.
+        pool.reset()
+        await asyncio.sleep(0)
+        assert c2.closed  # type: ignore
+        c3 = await pool.acquire()
+        assert c3 is not c2
+        assert pool.stats() == (1, 0, 0)
+
+    asyncio.run(run())
+
+
+def test_session_pins_connection_during_transaction():
+    async def run():
+        counter = _ConnectionCounter()
+        pool = ConnectionPool("test", max_size=4, connect_fn=counter.connect)
+        session = Session(SessionId(0), None, None, pools=_FakePools(pool))  # type: ignore
+
+        # Outside a transaction, connections are returned after each statement.
+        c1 = await session.acquire_connection(Engine.Aurora, for_writes=False)
+        session.release_connection(c1)
+        assert pool.stats() == (1, 1, 0)
+
+        # BEGIN
+        session.set_in_transaction(True)
+        txn_conn = await session.acquire_connection(Engine.Aurora, for_writes=True)
+        session.release_connection(txn_conn)
+        assert pool.stats() == (1, 0, 0)
+        again = await session.acquire_connection(Engine.Aurora, for_writes=True)
+        assert again is txn_conn
+        session.release_connection(again)
+
+        # COMMIT
+        commit_conn = await session.acquire_connection(Engine.Aurora, for_writes=True)
+        assert commit_conn is txn_conn
+        session.set_in_transaction(False)
+        session.release_connection(commit_conn)
+        assert pool.stats() == (1, 1, 0)
+
+        # Closing a session in a transaction discards its pinned connection.
+        session.set_in_transaction(True)
+        pinned = await session.acquire_connection(Engine.Aurora, for_writes=True)
+        await session.close()
+        await asyncio.sleep(0)
+        assert pinned.closed  # type: ignore
+        assert pool.stats() == (0, 0, 0)
+
+    asyncio.run(run())
+
+
+class _FakeSessionManager:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.ended: List[SessionId] = []
+
+    async def create_new_session(self) -> Tuple[SessionId, Session]:
+        return self.session.identifier, self.session
+
+    def get_session(self, _session_id: SessionId) -> Session:
+        return self.session
+
+    async def end_session(self, session_id: SessionId) -> None:
+        self.ended.append(session_id)
+        await self.session.close()
+
+
+def test_recollect_catalog_releases_connection_on_failure():
+    async def run():
+        counter = _ConnectionCounter()
+        pool = ConnectionPool("test", max_size=1, connect_fn=counter.connect)
+        session = Session(SessionId(0), None, None, pools=_FakePools(pool))  # type: ignore
+        sessions = _FakeSessionManager(session)
+
+        # The fake connection's cursor raises, so the first catalog query fails.
+        with pytest.raises(NotImplementedError):
+            await RuleBased(catalog={}).recollect_catalog(
+                sessions, None  # type: ignore
+            )
+        assert pool.stats() == (1, 1, 0)
+        assert sessions.ended == [SessionId(0)]
+
+    asyncio.run(run())
+
+
+def test_session_pins_connection_with_session_state():
+    async def run():
+        counter = _ConnectionCounter()
+        pool = ConnectionPool("test", max_size=4, connect_fn=counter.connect)
+        session = Session(SessionId(0), None, None, pools=_FakePools(pool))  # type: ignore
+        other = Session(SessionId(1), None, None, pools=_FakePools(pool))  # type: ignore
+
+        # SET SESSION ...
+        session.pin_for_session(Engine.Aurora)
+        set_conn = await session.acquire_connection(Engine.Aurora, for_writes=False)
+        session.release_connection(set_conn)
+        assert pool.stats() == (1, 0, 0)
+
+        # Later statements in the session use the same connection, while other
+        # sessions do not see it.
+        again = await session.acquire_connection(Engine.Aurora, for_writes=False)
+        assert again is set_conn
+        session.release_connection(again)
+        other_conn = await other.acquire_connection(Engine.Aurora, for_writes=False)
+        assert other_conn is not set_conn
+        other.release_connection(other_conn)
+
+        # The connection is not returned to the pool when the session ends.
+        await session.close()
+        await asyncio.sleep(0)
+        assert set_conn.closed  # type: ignore
+        assert pool.stats() == (1, 1, 0)
+
+    asyncio.run(run())
+
+
+class _FakeConfig:
+    def connection_pool_sizes(self):
+        return {engine: 2 for engine in Engine}
+
+
+class _FakeBlueprint:
+    def aurora_provisioning(self) -> Provisioning:
+        return Provisioning("db.r6g.large", 2)
+
+    def redshift_provisioning(self) -> Provisioning:
+        return Provisioning("dc2.large", 1)
+
+
+class _FakeBlueprintManager:
+    def get_blueprint(self) -> _FakeBlueprint:
+        return _FakeBlueprint()
+
+
+def test_refresh_resets_aurora_and_redshift_pools():
+    async def run():
+        pools = EngineConnectionPools(
+            _FakeConfig(), _FakeBlueprintManager(), "test"  # type: ignore
+        )
+        pools.refresh()
+        to_check = [
+            pools.pool_for(Engine.Aurora, for_writes=True),
+            pools.pool_for(Engine.Aurora, for_writes=False, replica_index=0),
+            pools.pool_for(Engine.Redshift, for_writes=False),
+        ]
+        athena = pools.pool_for(Engine.Athena, for_writes=False)
+        counter = _ConnectionCounter()
+        for pool in [*to_check, athena]:
+            # pylint: disable-next=protected-access
+            pool._connect_fn = counter.connect
+            pool.release(await pool.acquire())
+
+        # E.g., after a transition that changes Aurora's instance type.
+        pools.refresh()
+        await asyncio.sleep(0)
+        assert [conn.closed for conn in counter.created] == [True, True, True, False]
+        await pools.close()
+
+    asyncio.run(run())
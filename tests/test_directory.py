@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+from brad.config.file import ConfigFile
+from brad.provisioning.directory import Directory
+from brad.provisioning.rds_status import RdsStatus
+
+
+class _FakeRds:
+    def __init__(self, member_ids: List[str], delay_s: float) -> None:
+        self.member_ids = member_ids
+        self.delay_s = delay_s
+        self.reader_endpoint_suffix = "reader"
+        self.max_concurrent = 0
+        self._num_running = 0
+        self._lock = threading.Lock()
+
+    def describe_db_clusters(self, DBClusterIdentifier: str) -> Dict[str, Any]:
+        return {
+            "DBClusters": [
+                {
+                    "DBClusterMembers": [
+                        {
+                            "DBInstanceIdentifier": instance_id,
+                            "IsClusterWriter": "-primary" in instance_id,
+                        }
+                        for instance_id in self.member_ids
+                    ],
+                    "Endpoint": f"{DBClusterIdentifier}.writer",
+                    "ReaderEndpoint": "{}.{}".format(
+                        DBClusterIdentifier, self.reader_endpoint_suffix
+                    ),
+                    "Port": 5432,
+                }
+            ]
+        }
+
+    def describe_db_instances(self, DBInstanceIdentifier: str) -> Dict[str, Any]:
+        with self._lock:
+            self._num_running += 1
+            self.max_concurrent = max(self.max_concurrent, self._num_running)
+        time.sleep(self.delay_s)
+        with self._lock:
+            self._num_running -= 1
+        return {
+            "DBInstances": [
+                {
+                    "DbiResourceId": "db-" + DBInstanceIdentifier,
+                    "Endpoint": {
+                        "Address": DBInstanceIdentifier + ".host",
+                        "Port": 5432,
+                    },
+                    "DBInstanceStatus": "available",
+                }
+            ]
+        }
+
+
+class _FakeRedshift:
+    def describe_clusters(self, ClusterIdentifier: str) -> Dict[str, Any]:
+        return {
+            "Clusters": [
+                {
+                    "Endpoint": {"Address": ClusterIdentifier + ".host", "Port": 5439},
+                    "NodeType": "dc2.large",
+                    "NumberOfNodes": 2,
+                    "ClusterAvailabilityStatus": "Available",
+                }
+            ]
+        }
+
+
+def _make_directory(config: ConfigFile, rds: _FakeRds) -> Directory:
+    directory = Directory(config)
+    # pylint: disable-next=protected-access
+    directory._rds = rds
+    # pylint: disable-next=protected-access
+    directory._redshift = _FakeRedshift()
+    return directory
+
+
+def _make_config(tmp_path, aurora_cluster_id: str = "brad") -> ConfigFile:
+    return ConfigFile(
+        {
+            "aws_access_key": "key",
+            "aws_access_key_secret": "secret",
+            "aurora": {"cluster_id": aurora_cluster_id},
+            "redshift": {"cluster_id": "brad-redshift"},
+            "directory_snapshot_path": str(tmp_path / "directory.pkl"),
+        }
+    )
+
+
+def test_refresh_describes_instances_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    config = _make_config(tmp_path)
+    rds = _FakeRds(
+        [
+            "brad-replica-1-3",
+            "brad-primary-0",
+            "brad-replica-0-3",
+            "brad-unmanaged",
+        ],
+        delay_s=0.1,
+    )
+    directory = _make_directory(config, rds)
+
+    asyncio.run(directory.refresh())
+
+    assert rds.max_concurrent == 3
+    assert directory.aurora_writer().instance_id() == "brad-primary-0"
+    assert [r.instance_id() for r in directory.aurora_readers()] == [
+        "brad-replica-0-3",
+        "brad-replica-1-3",
+    ]
+    assert directory.aurora_writer().status() == RdsStatus.Available
+    assert directory.aurora_reader_endpoint() == ("brad.reader", 5432)
+    assert directory.redshift_cluster().endpoint() == ("brad-redshift.host", 5439)
+
+
+def test_snapshot_is_saved_on_refresh_and_loaded(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    config = _make_config(tmp_path)
+    directory = _make_directory(config, _FakeRds(["brad-primary-0"], delay_s=0.0))
+    asyncio.run(directory.refresh())
+
+    loaded = Directory(config)
+    assert loaded.load_snapshot(tmp_path / "directory.pkl")
+    assert repr(loaded) == repr(directory)
+    assert loaded.aurora_writer_endpoint() == ("brad.writer", 5432)
+
+    # The snapshot only applies to the cluster it was saved for.
+    other = Directory(_make_config(tmp_path, aurora_cluster_id="other"))
+    assert not other.load_snapshot(tmp_path / "directory.pkl")
+    assert not loaded.load_snapshot(tmp_path / "missing.pkl")
+
+
+def test_connection_metadata_includes_cluster_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    rds = _FakeRds(["brad-primary-0", "brad-replica-0-2"], delay_s=0.0)
+    directory = _make_directory(_make_config(tmp_path), rds)
+    asyncio.run(directory.refresh())
+    metadata = directory.connection_metadata()
+    printed = repr(directory)
+
+    asyncio.run(directory.refresh())
+    assert directory.connection_metadata() == metadata
+
+    # The cluster endpoints are not part of the directory's `repr()`.
+    rds.reader_endpoint_suffix = "reader2"
+    asyncio.run(directory.refresh())
+    assert repr(directory) == printed
+    assert directory.connection_metadata() != metadata
+
+    rds.reader_endpoint_suffix = "reader"
+    asyncio.run(directory.refresh())
+    assert directory.connection_metadata() == metadata
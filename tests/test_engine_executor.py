@@ -0,0 +1,126 @@
+import asyncio
+import threading
+
+from brad.config.engine import Engine
+from brad.connection.executor import EngineExecutor, EngineExecutors
+
+
+def test_executor_bounds_concurrency():
+    async def run():
+        executor = EngineExecutor("test", max_workers=2)
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+        release = threading.Event()
+
+        def work(value: int) -> int:
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            release.wait(timeout=5.0)
+            with lock:
+                running -= 1
+            return value * 2
+
+        tasks = [asyncio.create_task(executor.run(work, i)) for i in range(6)]
+        # Wait until the pool is saturated.
+        while executor.in_flight() < 2:
+            await asyncio.sleep(0.01)
+        assert executor.queue_depth() == 4
+
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert results == [i * 2 for i in range(6)]
+        assert max_running == 2
+
+        metrics = executor.take_metrics()
+        assert metrics.completed == 6
+        assert metrics.queue_depth == 0
+        assert metrics.in_flight == 0
+        assert metrics.wait_time_sketch.count == 6
+        assert metrics.wait_time_s(0.99) > 0.0
+
+        # Metrics are reset after they are taken.
+        assert executor.take_metrics().completed == 0
+        executor.shutdown()
+
+    asyncio.run(run())
+
+
+def test_slow_engine_does_not_block_others():
+    async def run():
+        executors = EngineExecutors()
+        executors.configure({Engine.Athena: 1, Engine.Aurora: 1})
+        athena = executors.for_engine(Engine.Athena)
+        aurora = executors.for_engine(Engine.Aurora)
+        release = threading.Event()
+
+        slow = [asyncio.create_task(athena.run(release.wait, 5.0)) for _ in range(3)]
+        # The Aurora call runs even though all Athena threads are busy.
+        assert await asyncio.wait_for(aurora.run(lambda: 123), timeout=1.0) == 123
+        assert athena.queue_depth() >= 1
+
+        release.set()
+        await asyncio.gather(*slow)
+        executors.shutdown()
+
+    asyncio.run(run())
+
+
+def test_unconfigured_uses_default_executor():
+    async def run():
+        executors = EngineExecutors()
+        executor = executors.for_engine(Engine.Redshift)
+        assert executor.max_workers is None
+        assert await executor.run(sum, [1, 2, 3]) == 6
+        assert executor.take_metrics().completed == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_queued_call_leaves_queue():
+    async def run():
+        executor = EngineExecutor("test", max_workers=1)
+        release = threading.Event()
+        blocker = asyncio.create_task(executor.run(release.wait, 5.0))
+        while executor.in_flight() < 1:
+            await asyncio.sleep(0.01)
+
+        # This call is still waiting for a thread when it times out.
+        try:
+            await asyncio.wait_for(executor.run(lambda: 123), timeout=0.05)
+            assert False
+        except asyncio.TimeoutError:
+            pass
+        assert executor.queue_depth() == 0
+
+        release.set()
+        await blocker
+        assert executor.queue_depth() == 0
+        assert executor.take_metrics().completed == 1
+        executor.shutdown()
+
+    asyncio.run(run())
+
+
+def test_configure_drains_queued_calls():
+    async def run():
+        executors = EngineExecutors()
+        executors.configure({Engine.Athena: 1})
+        old = executors.for_engine(Engine.Athena)
+        release = threading.Event()
+        blocker = asyncio.create_task(old.run(release.wait, 5.0))
+        queued = asyncio.create_task(old.run(lambda: 123))
+        while old.queue_depth() < 1:
+            await asyncio.sleep(0.01)
+
+        # Replacing the pool does not cancel calls that are still queued.
+        executors.configure({Engine.Athena: 2})
+        release.set()
+        assert await blocker
+        assert await queued == 123
+        assert old.queue_depth() == 0
+        executors.shutdown()
+
+    asyncio.run(run())
@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing as mp
+import threading
+import pytest
+
+from brad.daemon.ipc_channel import IpcChannel, IpcChannelClosed
+from brad.daemon.messages import (
+    InternalCommandRequest,
+    InternalCommandResponse,
+    NewBlueprintAck,
+    ShutdownFrontEnd,
+)
+
+
+def test_send_recv_batched():
+    async def run():
+        left, right = IpcChannel.create_pair()
+        await left.open()
+        await right.open()
+
+        # These are sent in one batch (the writer task has not run yet).
+        for version in range(100):
+            await left.send(NewBlueprintAck(1, version))
+        for version in range(100):
+            msg = await right.recv()
+            assert isinstance(msg, NewBlueprintAck)
+            assert msg.fe_index == 1
+            assert msg.version == version
+
+        # Messages flow in both directions.
+        await right.send(InternalCommandRequest(1, "BRAD_SYNC"))
+        msg = await left.recv()
+        assert isinstance(msg, InternalCommandRequest)
+        assert msg.request == "BRAD_SYNC"
+
+        await left.close()
+        with pytest.raises(IpcChannelClosed):
+            await right.recv()
+        await right.close()
+
+    asyncio.run(run())
+
+
+def test_send_nowait_backpressure():
+    async def run():
+        left, right = IpcChannel.create_pair(max_pending_messages=2)
+        await left.open()
+        await right.open()
+
+        assert left.send_nowait(NewBlueprintAck(0, 1))
+        assert left.send_nowait(NewBlueprintAck(0, 2))
+        # The buffer is full until the writer task runs.
+        assert not left.send_nowait(NewBlueprintAck(0, 3))
+
+        assert (await right.recv()).version == 1  # type: ignore
+        assert (await right.recv()).version == 2  # type: ignore
+        assert left.send_nowait(NewBlueprintAck(0, 4))
+        assert (await right.recv()).version == 4  # type: ignore
+
+        await left.close()
+        await right.close()
+
+    asyncio.run(run())
+
+
+def test_unpicklable_message_does_not_stop_writer():
+    async def run():
+        left, right = IpcChannel.create_pair()
+        await left.open()
+        await right.open()
+
+        # Locks cannot be pickled, so this batch is dropped.
+        await left.send(NewBlueprintAck(0, threading.Lock()))  # type: ignore
+        # pylint: disable-next=protected-access
+        await asyncio.wait_for(left._outgoing.join(), timeout=5.0)  # type: ignore
+
+        await left.send(NewBlueprintAck(0, 1))
+        msg = await asyncio.wait_for(right.recv(), timeout=5.0)
+        assert msg.version == 1  # type: ignore
+
+        await left.close()
+        await right.close()
+
+    asyncio.run(run())
+
+
+def _echo_process(channel: IpcChannel) -> None:
+    async def run():
+        await channel.open()
+        while True:
+            msg = await channel.recv()
+            if isinstance(msg, ShutdownFrontEnd):
+                break
+            assert isinstance(msg, InternalCommandRequest)
+            await channel.send(InternalCommandResponse(msg.fe_index, [(msg.request,)]))
+        await channel.close()
+
+    asyncio.run(run())
+
+
+def test_across_processes():
+    async def run():
+        channel, child_channel = IpcChannel.create_pair()
+        await channel.open()
+        process = mp.Process(target=_echo_process, args=(child_channel,))
+        process.start()
+        child_channel.close_unopened()
+
+        for idx in range(10):
+            await channel.send(InternalCommandRequest(idx, f"cmd{idx}"))
+        for idx in range(10):
+            msg = await channel.recv()
+            assert isinstance(msg, InternalCommandResponse)
+            assert msg.fe_index == idx
+            assert msg.response == [(f"cmd{idx}",)]
+
+        await channel.send(ShutdownFrontEnd(0))
+        with pytest.raises(IpcChannelClosed):
+            await channel.recv()
+        await channel.close()
+        process.join()
+        assert process.exitcode == 0
+
+    asyncio.run(run())
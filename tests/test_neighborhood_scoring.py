@@ -0,0 +1,233 @@
+import importlib.resources as pkg_resources
+import pickle
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Iterator
+
+import pandas as pd
+import yaml
+
+import brad.planner as brad_planner
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.config.engine import Engine
+from brad.config.planner import PlannerConfig
+from brad.planner.enumeration.blueprint import EnumeratedBlueprint
+from brad.planner.neighborhood.candidate_scorer import CandidateScorer
+from brad.planner.neighborhood.full_neighborhood import FullNeighborhoodSearchPlanner
+from brad.planner.neighborhood.scaling_scorer import ALL_METRICS, ScalingScorer
+from brad.planner.neighborhood.score import Score, Scorer, ScoringContext
+from brad.planner.workload import Workload
+from brad.planner.workload.query import Query
+from brad.routing.abstract_policy import FullRoutingPolicy
+from brad.routing.always_one import AlwaysOneRouter
+
+
+class _NodeCountScorer(Scorer):
+    """
+    Scores candidates using their provisioning and table placement. The lower
+    bound only uses the provisioning.
+    """
+
+    def score(self, ctx: ScoringContext) -> Score:
+        bp = ctx.next_blueprint
+        num_replicas = sum(len(locs) for locs in bp.table_locations().values())
+        cost = self._provisioning_cost(bp) + num_replicas
+        return Score({"latency": 1.0}, cost, 0.0, {})
+
+    def lower_bound(self, ctx: ScoringContext, candidate: Blueprint) -> float:
+        return Score.combine(1.0, self._provisioning_cost(candidate))
+
+    def _provisioning_cost(self, bp: Any) -> float:
+        return float(
+            bp.aurora_provisioning().num_nodes()
+            + 2 * bp.redshift_provisioning().num_nodes()
+        )
+
+
+def _base_blueprint() -> Blueprint:
+    return Blueprint(
+        "test",
+        [],
+        {"table1": [Engine.Aurora], "table2": [Engine.Aurora]},
+        Provisioning("db.r6g.large", 1),
+        Provisioning("dc2.large", 1),
+        FullRoutingPolicy([], AlwaysOneRouter(Engine.Aurora)),
+    )
+
+
+def _candidates(base: Blueprint) -> Iterator[EnumeratedBlueprint]:
+    bp = EnumeratedBlueprint(base)
+    for aurora_nodes in range(1, 5):
+        for redshift_nodes in range(1, 5):
+            for locations in [
+                {"table1": [Engine.Aurora], "table2": [Engine.Aurora]},
+                {"table1": [Engine.Aurora, Engine.Redshift], "table2": [Engine.Aurora]},
+                {"table1": [Engine.Redshift], "table2": [Engine.Redshift]},
+            ]:
+                bp.set_table_locations(locations)
+                bp.set_aurora_provisioning(Provisioning("db.r6g.large", aurora_nodes))
+                bp.set_redshift_provisioning(Provisioning("dc2.large", redshift_nodes))
+                yield bp
+
+
+def _make_ctx(base: Blueprint) -> ScoringContext:
+    # The fake scorer does not use the workloads, engines, or metrics.
+    return ScoringContext(base, None, None, None, None, {})  # type: ignore
+
+
+def _make_workload() -> Workload:
+    queries = [
+        Query("SELECT * FROM table1 WHERE id < 100", arrival_count=10.0),
+        Query("SELECT * FROM table1, table2 WHERE table1.id = table2.id"),
+    ]
+    # Set the statistics that would otherwise be collected using the engines.
+    # pylint: disable=protected-access
+    for q in queries:
+        for engine in [Engine.Aurora, Engine.Redshift, Engine.Athena]:
+            q._data_accessed_mb[engine] = 100
+    workload = Workload(timedelta(hours=1), queries, [], {})
+    for table_name, size_mb in [("table1", 1000), ("table2", 500)]:
+        workload._table_sizes_mb[(table_name, Engine.Aurora)] = size_mb
+    # pylint: enable=protected-access
+    workload.set_dataset_size_from_table_sizes()
+    return workload
+
+
+def _make_scaling_ctx(base: Blueprint) -> ScoringContext:
+    workload = _make_workload()
+    metrics = pd.DataFrame({metric: [25.0] for metric in ALL_METRICS})
+    return ScoringContext(
+        base,
+        workload,
+        workload,
+        None,  # type: ignore
+        metrics,
+        {Engine.Aurora: 200, Engine.Redshift: 0, Engine.Athena: 0},
+    )
+
+
+def _make_scaling_scorer() -> ScalingScorer:
+    with pkg_resources.files(brad_planner).joinpath("constants.yml").open("r") as data:
+        raw = yaml.load(data, Loader=yaml.Loader)
+    return ScalingScorer(PlannerConfig(raw))
+
+
+def _make_planner(config: Dict[str, Any]) -> FullNeighborhoodSearchPlanner:
+    planner = FullNeighborhoodSearchPlanner(PlannerConfig(config))
+    scorer = _NodeCountScorer()
+    # pylint: disable=protected-access
+    planner._scorer = scorer  # type: ignore
+    planner._candidate_scorer = CandidateScorer(
+        scorer, PlannerConfig(config).neighborhood_scoring_workers()
+    )
+    planner._num_top = 5
+    # pylint: enable=protected-access
+    return planner
+
+
+def test_combine_is_monotone_in_cost():
+    for perf in [0.0, 0.5, 2.0]:
+        prev = Score.combine(perf, 1e-3)
+        for cost in [0.01, 0.1, 1.0, 10.0, 100.0]:
+            curr = Score.combine(perf, cost)
+            assert curr >= prev
+            prev = curr
+
+
+def test_lower_bound_does_not_exceed_score():
+    base = _base_blueprint()
+    ctx = _make_ctx(base)
+    scorer = _NodeCountScorer()
+    for bp in _candidates(base):
+        candidate = bp.to_blueprint()
+        ctx.reset(candidate)
+        assert scorer.lower_bound(ctx, candidate) <= scorer.score(ctx).single_value()
+
+
+def test_scaling_scorer_lower_bound_does_not_exceed_score():
+    base = _base_blueprint()
+    ctx = _make_scaling_ctx(base)
+    scorer = _make_scaling_scorer()
+    scorer.prepare(ctx)
+    for bp in _candidates(base):
+        candidate = bp.to_blueprint()
+        ctx.reset(candidate)
+        score = scorer.score(ctx)
+        assert score.monetary_cost() > 0.0
+        assert scorer.lower_bound(ctx, candidate) <= score.single_value()
+
+
+def test_scoring_context_is_pickled_without_engines():
+    base = _base_blueprint()
+    ctx = _make_scaling_ctx(base)
+    # Stands in for the engine connections, which cannot be pickled.
+    ctx.engines = threading.Lock()  # type: ignore
+    copy = pickle.loads(pickle.dumps(ctx))
+    assert copy.engines is None
+    assert ctx.engines is not None
+    assert copy.current_total_accessed_mb == ctx.current_total_accessed_mb
+
+
+def _run_planner(planner: FullNeighborhoodSearchPlanner, prune: bool) -> Blueprint:
+    base = _base_blueprint()
+    ctx = _make_ctx(base)
+    planner.on_start_enumeration(ctx)
+    for bp in _candidates(base):
+        if prune and planner.should_prune(bp, ctx):
+            continue
+        planner.on_enumerated_blueprint(bp, ctx)
+    return planner.on_enumeration_complete(ctx)
+
+
+def test_pruning_keeps_best_candidate():
+    unpruned = _run_planner(_make_planner({}), prune=False)
+
+    planner = _make_planner({})
+    pruned = _run_planner(planner, prune=True)
+    assert planner._num_pruned > 0  # pylint: disable=protected-access
+
+    assert pruned.aurora_provisioning() == unpruned.aurora_provisioning()
+    assert pruned.redshift_provisioning() == unpruned.redshift_provisioning()
+    assert pruned.table_locations() == unpruned.table_locations()
+    assert pruned.aurora_provisioning().num_nodes() == 1
+    assert pruned.redshift_provisioning().num_nodes() == 1
+
+
+def test_parallel_scoring_matches_serial():
+    base = _base_blueprint()
+    candidates = [bp.to_blueprint() for bp in _candidates(base)]
+
+    serial = CandidateScorer(_NodeCountScorer(), num_workers=1)
+    serial.start(_make_ctx(base))
+    expected = [score.single_value() for score in serial.score(candidates)]
+    serial.stop()
+
+    parallel = CandidateScorer(_NodeCountScorer(), num_workers=2)
+    parallel.start(_make_ctx(base))
+    try:
+        actual = [score.single_value() for score in parallel.score(candidates)]
+    finally:
+        parallel.stop()
+    assert actual == expected
+
+
+def test_parallel_scaling_scorer_matches_serial():
+    base = _base_blueprint()
+    candidates = [bp.to_blueprint() for bp in _candidates(base)]
+
+    serial = CandidateScorer(_make_scaling_scorer(), num_workers=1)
+    serial.start(_make_scaling_ctx(base))
+    expected = [score.single_value() for score in serial.score(candidates)]
+    serial.stop()
+
+    ctx = _make_scaling_ctx(base)
+    # The engine connections are not sent to the workers.
+    ctx.engines = threading.Lock()  # type: ignore
+    parallel = CandidateScorer(_make_scaling_scorer(), num_workers=2)
+    parallel.start(ctx)
+    try:
+        actual = [score.single_value() for score in parallel.score(candidates)]
+    finally:
+        parallel.stop()
+    assert actual == expected
@@ -0,0 +1,77 @@
+from brad.forecasting.linear_forecaster import LinearForecaster
+from brad.forecasting.online_linear_forecaster import OnlineLinearForecaster
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+
+def test_num_points():
+    dataframe = pd.DataFrame(
+        {"a": [i for i in range(10)], "b": [i for i in range(10, 20)]},
+        index=pd.date_range("2022-01-01", "2022-01-10", freq="D", normalize=True),
+    )
+
+    f = OnlineLinearForecaster(dataframe, timedelta(days=1))
+
+    assert f.num_points("a", -3) == []
+    assert f.num_points("a", 0) == []
+    assert np.allclose(f.num_points("a", 3), [i for i in range(10, 13)])
+    assert np.allclose(f.num_points("b", 4), [i for i in range(20, 24)])
+
+
+def test_until():
+    dataframe = pd.DataFrame(
+        {"a": [i for i in range(10)], "b": [i for i in range(10, 20)]},
+        index=pd.date_range("2022-01-01", "2022-01-10", freq="D", normalize=True),
+    )
+
+    f = OnlineLinearForecaster(dataframe, timedelta(days=1))
+
+    assert f.until("a", datetime(year=2022, month=1, day=10)) == []
+    assert np.allclose(
+        f.until("a", datetime(year=2022, month=1, day=14)), [i for i in range(10, 14)]
+    )
+
+
+def test_incremental_matches_batch():
+    rand = np.random.default_rng(seed=42)
+    dataframe = pd.DataFrame(
+        {"a": rand.random(50), "b": rand.random(50) * 100},
+        index=pd.date_range("2022-01-01", periods=50, freq="h"),
+    )
+
+    online = OnlineLinearForecaster(dataframe.head(1), timedelta(hours=1))
+    for end in range(2, 51):
+        df = dataframe.head(end)
+        online.update_df_pointer(df)
+        batch = LinearForecaster(df, timedelta(hours=1))
+        expected = batch.num_points_all(4)
+        assert np.allclose(online.num_points_all(4).to_numpy(), expected.to_numpy())
+        assert np.allclose(online.num_points("b", 4), batch.num_points("b", 4))
+
+
+def test_non_finite_values_are_dropped():
+    rand = np.random.default_rng(seed=42)
+    a = rand.random(50)
+    b = rand.random(50) * 100
+    a[[3, 4, 20, 21, 22]] = np.nan
+    b[[10, 30]] = -np.inf
+    dataframe = pd.DataFrame(
+        {"a": a, "b": b}, index=pd.date_range("2022-01-01", periods=50, freq="h")
+    )
+
+    online = OnlineLinearForecaster(dataframe.head(1), timedelta(hours=1))
+    for end in range(2, 51):
+        df = dataframe.head(end)
+        online.update_df_pointer(df)
+        forecast = online.num_points_all(2)
+        for column in ["a", "b"]:
+            # Fit the line using only the window's finite points.
+            window = df[column].tail(5).to_numpy()
+            xs = np.arange(len(window), dtype=np.float64)
+            finite = np.isfinite(window)
+            if finite.sum() < 2:
+                continue
+            slope, intercept = np.polyfit(xs[finite], window[finite], 1)
+            next_xs = np.arange(len(window), len(window) + 2)
+            assert np.allclose(forecast[column], slope * next_xs + intercept)
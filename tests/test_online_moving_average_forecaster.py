@@ -0,0 +1,69 @@
+from brad.forecasting.moving_average_forecaster import MovingAverageForecaster
+from brad.forecasting.online_moving_average_forecaster import (
+    OnlineMovingAverageForecaster,
+)
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+
+def test_num_points():
+    dataframe = pd.DataFrame(
+        {"a": [i for i in range(10)], "b": [i for i in range(10, 20)]},
+        index=pd.date_range("2022-01-01", "2022-01-10", freq="D", normalize=True),
+    )
+
+    f = OnlineMovingAverageForecaster(dataframe, timedelta(days=1))
+
+    assert f.num_points("a", -3) == []
+    assert f.num_points("a", 0) == []
+    assert f.num_points("a", 3) == [7 for _ in range(3)]
+    assert f.num_points("b", 4) == [17 for _ in range(4)]
+
+
+def test_until():
+    dataframe = pd.DataFrame(
+        {"a": [i for i in range(10)], "b": [i for i in range(10, 20)]},
+        index=pd.date_range("2022-01-01", "2022-01-10", freq="D", normalize=True),
+    )
+
+    f = OnlineMovingAverageForecaster(dataframe, timedelta(days=1))
+
+    assert f.until("a", datetime(year=2022, month=1, day=10)) == []
+    assert f.until("a", datetime(year=2022, month=1, day=14)) == [7 for _ in range(4)]
+
+
+def test_incremental_matches_batch():
+    rand = np.random.default_rng(seed=42)
+    dataframe = pd.DataFrame(
+        {"a": rand.random(50), "b": rand.random(50)},
+        index=pd.date_range("2022-01-01", periods=50, freq="h"),
+    )
+
+    online = OnlineMovingAverageForecaster(dataframe.head(3), timedelta(hours=1))
+    for end in range(4, 51):
+        df = dataframe.head(end)
+        online.update_df_pointer(df)
+        batch = MovingAverageForecaster(df, timedelta(hours=1))
+        assert np.allclose(
+            online.num_points_all(3).to_numpy(), batch.num_points_all(3).to_numpy()
+        )
+
+
+def test_non_finite_values_are_dropped():
+    rand = np.random.default_rng(seed=42)
+    a = rand.random(50)
+    b = rand.random(50)
+    a[[3, 4, 20]] = np.nan
+    b[[10, 30]] = np.inf
+    dataframe = pd.DataFrame(
+        {"a": a, "b": b}, index=pd.date_range("2022-01-01", periods=50, freq="h")
+    )
+
+    online = OnlineMovingAverageForecaster(dataframe.head(1), timedelta(hours=1))
+    for end in range(2, 51):
+        df = dataframe.head(end)
+        online.update_df_pointer(df)
+        window = df.tail(5).replace(np.inf, np.nan)
+        assert np.allclose(online.num_points("a", 1), [window["a"].mean()])
+        assert np.allclose(online.num_points("b", 1), [window["b"].mean()])
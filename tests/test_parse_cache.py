@@ -0,0 +1,81 @@
+import pathlib
+
+from brad.parse_cache import ParseCache, normalize_sql
+from brad.query_rep import QueryRep, load_parse_cache, save_parse_cache
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def compute(self, _sql_query: str):
+        self.calls += 1
+        return (["abc"], 0)
+
+
+def test_cache_hits_and_eviction():
+    cache = ParseCache(max_entries=2)
+    counter = _Counter()
+
+    parsed = cache.get_or_compute("SELECT * FROM abc", counter.compute)
+    assert parsed.tables == ("abc",)
+    # Whitespace and trailing semicolons do not matter.
+    cache.get_or_compute("SELECT *\n  FROM abc;", counter.compute)
+    assert counter.calls == 1
+    assert cache.stats() == (1, 1)
+
+    cache.get_or_compute("SELECT 1 FROM abc", counter.compute)
+    # Makes "SELECT * FROM abc" the most recently used entry.
+    cache.get_or_compute("SELECT * FROM abc", counter.compute)
+    cache.get_or_compute("SELECT 2 FROM abc", counter.compute)
+    assert len(cache) == 2
+    assert counter.calls == 3
+
+    cache.get_or_compute("SELECT * FROM abc", counter.compute)
+    assert counter.calls == 3
+    cache.get_or_compute("SELECT 1 FROM abc", counter.compute)
+    assert counter.calls == 4
+
+
+def test_snapshot_round_trip(tmp_path: pathlib.Path):
+    path = tmp_path / "parse_cache.json"
+    counter = _Counter()
+
+    cache = ParseCache(max_entries=10)
+    cache.get_or_compute("SELECT * FROM abc", counter.compute)
+    cache.save(path, version="v1")
+
+    # Another process merges its entries into the snapshot.
+    other = ParseCache(max_entries=10)
+    other.get_or_compute("SELECT 1 FROM abc", counter.compute)
+    other.save(path, version="v1")
+    assert counter.calls == 2
+
+    restored = ParseCache(max_entries=10)
+    assert restored.load(path, version="v1") == 2
+    restored.get_or_compute("SELECT * FROM abc", counter.compute)
+    restored.get_or_compute("SELECT 1 FROM abc", counter.compute)
+    assert counter.calls == 2
+
+    # Snapshots from a different version of the analysis are ignored.
+    assert ParseCache(max_entries=10).load(path, version="v2") == 0
+    assert ParseCache(max_entries=10).load(tmp_path / "missing.json", "v1") == 0
+
+
+def test_query_rep_uses_cache(tmp_path: pathlib.Path):
+    sql = "SELECT * FROM parse_cache_test_a, parse_cache_test_b"
+    assert QueryRep(sql).tables() == ["parse_cache_test_a", "parse_cache_test_b"]
+
+    path = tmp_path / "parse_cache.json"
+    save_parse_cache(path)
+    ParseCache.instance().clear()
+    load_parse_cache(path)
+
+    hits_before, misses_before = ParseCache.instance().stats()
+    rep = QueryRep(sql + ";")
+    assert rep.tables() == ["parse_cache_test_a", "parse_cache_test_b"]
+    assert rep.get_required_functionality() == 0
+    hits_after, misses_after = ParseCache.instance().stats()
+    assert hits_after == hits_before + 1
+    assert misses_after == misses_before
+    assert normalize_sql(sql + " ;") == sql
@@ -1,4 +1,9 @@
+import json
+
 from brad.data_stats.plan_parsing import (
+    explain_json_from_rows,
+    parse_explain_json,
+    parse_explain_text,
     parse_explain_verbose,
     extract_base_cardinalities,
 )
@@ -178,3 +183,110 @@ def test_complex_extract_base_cardinality():
         expected_tables[clean_name] += 1
     for tbl, value in expected_tables.items():
         assert value == 1, tbl
+
+
+def get_json_plan():
+    # EXPLAIN (VERBOSE, FORMAT JSON) output for a bitmap scan join (abridged).
+    plan = [
+        {
+            "Plan": {
+                "Node Type": "Nested Loop",
+                "Parallel Aware": False,
+                "Startup Cost": 531.32,
+                "Total Cost": 41470.37,
+                "Plan Rows": 9694,
+                "Plan Width": 4,
+                "Plans": [
+                    {
+                        "Node Type": "Bitmap Heap Scan",
+                        "Parent Relationship": "Outer",
+                        "Parallel Aware": True,
+                        "Relation Name": "aka_name_brad_source",
+                        "Schema": "public",
+                        "Startup Cost": 530.89,
+                        "Total Cost": 15285.07,
+                        "Plan Rows": 9694,
+                        "Plan Width": 12,
+                        "Recheck Cond": "((aka_name_brad_source.person_id >= 1276226) AND (aka_name_brad_source.person_id <= 1377150))",
+                        "Plans": [
+                            {
+                                "Node Type": "Bitmap Index Scan",
+                                "Parent Relationship": "Outer",
+                                "Parallel Aware": False,
+                                "Index Name": "aka_name_person_id_index",
+                                "Startup Cost": 0.0,
+                                "Total Cost": 525.07,
+                                "Plan Rows": 23265,
+                                "Plan Width": 0,
+                            }
+                        ],
+                    },
+                    {
+                        "Node Type": "Index Only Scan",
+                        "Parent Relationship": "Inner",
+                        "Parallel Aware": False,
+                        "Index Name": "name_brad_source_pkey",
+                        "Relation Name": "name_brad_source",
+                        "Schema": "public",
+                        "Startup Cost": 0.43,
+                        "Total Cost": 2.7,
+                        "Plan Rows": 1,
+                        "Plan Width": 4,
+                        "Index Cond": "(name_brad_source.id = aka_name_brad_source.person_id)",
+                        "Filter": "((name_brad_source.name)::text !~~ '%a.b%'::text)",
+                    },
+                ],
+            }
+        }
+    ]
+    return json.dumps(plan)
+
+
+def test_parse_explain_json():
+    table = parse_explain_json(get_json_plan())
+    assert table.num_operators() == 4
+    assert list(table.parents) == [-1, 0, 1, 0]
+    assert table.children(0) == [1, 3]
+    assert table.op_names[1] == "Parallel Bitmap Heap Scan"
+    assert table.est_costs[3] == 2.7
+    assert table.filter_columns_of(1) == ["aka_name_brad_source.person_id"]
+    assert table.filter_columns_of(3) == [
+        "name_brad_source.name",
+        "name_brad_source.id",
+        "aka_name_brad_source.person_id",
+    ]
+
+    cards = table.base_cardinalities()
+    assert sorted((c.table_name, c.cardinality) for c in cards) == [
+        ("aka_name_brad_source", 9694),
+        ("name_brad_source", 1),
+    ]
+
+
+def test_explain_json_from_rows():
+    text = get_json_plan()
+    # ODBC drivers return the JSON text, possibly split across rows.
+    split = [text[:100], text[100:]]
+    # psycopg decodes the `json` column.
+    decoded = [json.loads(text)]
+
+    for values in [[text], split, decoded]:
+        table = parse_explain_json(explain_json_from_rows(values))
+        assert table.num_operators() == 4
+        assert sorted(c.table_name for c in table.base_cardinalities()) == [
+            "aka_name_brad_source",
+            "name_brad_source",
+        ]
+
+
+def test_text_operator_table_matches_parse_explain_verbose():
+    for rows in [get_rows(), get_complex_rows(), get_redshift_rows()]:
+        expected = extract_base_cardinalities(parse_explain_verbose(list(rows)))
+        table = parse_explain_text(rows)
+        assert sorted(table.base_cardinalities()) == sorted(expected)
+
+    table = parse_explain_text(get_rows())
+    assert table.num_operators() == 5
+    assert list(table.parents) == [-1, 0, 1, 2, 3]
+    assert table.workers_planned[1] == 2
+    assert table.filter_columns_of(4) == ["inventory.i_stock"]
@@ -0,0 +1,84 @@
+import asyncio
+
+from brad.provisioning.waiter import ProvisioningAction, ProvisioningWaiter
+
+
+class _SimulatedProvider:
+    """
+    A provisioning action that completes at a fixed (simulated) time.
+    """
+
+    def __init__(self, completes_at_s: float) -> None:
+        self.now_s = 0.0
+        self.completes_at_s = completes_at_s
+        self.num_checks = 0
+
+    def clock(self) -> float:
+        return self.now_s
+
+    async def sleep(self, delay_s: float) -> None:
+        self.now_s += delay_s
+
+    async def is_done(self) -> bool:
+        self.num_checks += 1
+        return self.now_s >= self.completes_at_s
+
+
+def _make_waiter(provider: _SimulatedProvider) -> ProvisioningWaiter:
+    return ProvisioningWaiter(
+        min_interval_s=5.0,
+        max_interval_s=60.0,
+        clock=provider.clock,
+        sleep=provider.sleep,
+    )
+
+
+def test_polls_tightly_near_the_expected_completion_time():
+    provider = _SimulatedProvider(completes_at_s=430.0)
+    waiter = _make_waiter(provider)
+    assert asyncio.run(
+        waiter.wait_for(
+            ProvisioningAction.AuroraCreateReplica,
+            provider.is_done,
+            "replica",
+            initial_delay_s=20.0,
+        )
+    )
+    # The default expected duration is 480 s. Fixed 20 s polling would take 22
+    # checks and could observe the completion up to 20 s late.
+    assert provider.now_s - provider.completes_at_s <= 5.0
+    assert provider.num_checks <= 10
+
+
+def test_expected_duration_follows_observed_durations():
+    waiter = ProvisioningWaiter()
+    action = ProvisioningAction.RedshiftElasticResize
+    assert waiter.expected_duration_s(action) == 600.0
+
+    for completes_at_s in [100.0, 130.0, 160.0]:
+        provider = _SimulatedProvider(completes_at_s)
+        # pylint: disable-next=protected-access
+        waiter._clock, waiter._sleep = provider.clock, provider.sleep
+        assert asyncio.run(waiter.wait_for(action, provider.is_done, "resize"))
+    assert 130.0 <= waiter.expected_duration_s(action) <= 135.0
+
+    # Later waits check tightly around the new expected duration.
+    provider = _SimulatedProvider(completes_at_s=140.0)
+    # pylint: disable-next=protected-access
+    waiter._clock, waiter._sleep = provider.clock, provider.sleep
+    assert asyncio.run(waiter.wait_for(action, provider.is_done, "resize"))
+    assert provider.now_s - provider.completes_at_s <= 5.0
+
+
+def test_gives_up_after_max_wait():
+    provider = _SimulatedProvider(completes_at_s=10_000.0)
+    waiter = _make_waiter(provider)
+    assert not asyncio.run(
+        waiter.wait_for(
+            ProvisioningAction.RedshiftClassicResize,
+            provider.is_done,
+            "resize",
+            max_wait_s=1200.0,
+        )
+    )
+    assert provider.now_s == 1200.0
@@ -1,4 +1,15 @@
-from brad.query_rep import QueryRep
+import pickle
+import sqlglot
+import sqlglot.expressions as exp
+
+from brad.query_rep import QueryRep, _extract_tables_simple
+from brad.routing.functionality_catalog import Functionality
+
+
+class _DecoratedQueryRep(QueryRep):
+    def __init__(self, sql_query: str, arrival_count: float) -> None:
+        super().__init__(sql_query)
+        self.arrival_count = arrival_count
 
 
 def test_is_data_modification():
@@ -59,3 +70,73 @@ def test_extract_tables():
     assert len(tables) == 2
     assert "abc" in tables
     assert "test" in tables
+
+
+def test_simple_table_extraction_matches_parser():
+    queries = [
+        'SELECT MAX("title"."id") FROM "info_type" LEFT OUTER JOIN "movie_info_idx" '
+        'ON "info_type"."id" = "movie_info_idx"."info_type_id" LEFT OUTER JOIN "title" '
+        'ON "movie_info_idx"."movie_id" = "title"."id" WHERE "title"."kind_id" <= 2005',
+        "SELECT extract(year from o_entry_d) AS y, COUNT(*) FROM orders o, public.customer "
+        "WHERE o_c_id = c_id GROUP BY y ORDER BY y LIMIT 10",
+        "SELECT * FROM a CROSS JOIN b INNER JOIN c ON (a.x = c.x) WHERE a.name = 'FROM d'",
+        "INSERT INTO ticket_orders (showing_id, quantity) VALUES (1, 2), (3, 4)",
+        "UPDATE showings SET seats_left = seats_left - 2 WHERE id = 1234",
+        "DELETE FROM new_order WHERE no_o_id = 2101",
+    ]
+    for query in queries:
+        # pylint: disable-next=protected-access
+        simple = _extract_tables_simple(query)
+        assert simple is not None
+        assert simple == [
+            tbl.name for tbl in sqlglot.parse_one(query).find_all(exp.Table)
+        ]
+
+    # Forms that need a full parse.
+    complex_queries = [
+        "SELECT * FROM (SELECT * FROM abc) t",
+        "SELECT a FROM abc UNION SELECT b FROM def",
+        "WITH test AS (SELECT * FROM abc) SELECT * FROM test",
+        "SELECT * FROM abc WHERE id IN (SELECT id FROM def)",
+        "SELECT * FROM generate_series(1, 10)",
+        "INSERT INTO abc SELECT * FROM def",
+        "UPDATE abc SET x = def.x FROM def WHERE abc.id = def.id",
+        "SELECT * FROM abc -- comment",
+    ]
+    for query in complex_queries:
+        assert _extract_tables_simple(query) is None
+
+    rep = QueryRep("UPDATE abc SET x = def.x FROM def WHERE abc.id = def.id")
+    assert rep.tables() == ["abc", "def"]
+
+
+def test_required_functionality():
+    rep = QueryRep("SELECT id FROM theatres WHERE st_dwithin(location, 'abc', 10)")
+    assert rep.is_geospatial()
+    assert not rep.is_vector()
+
+    rep = QueryRep("SELECT id FROM embeddings ORDER BY embedding <=> '[1, 2]' LIMIT 5")
+    assert not rep.is_geospatial()
+    assert rep.is_vector()
+    assert rep.get_required_functionality() == Functionality.to_bitmap(
+        [Functionality.Vector]
+    )
+
+    rep = QueryRep("SELECT id FROM theatres")
+    assert not rep.is_geospatial()
+    assert not rep.is_vector()
+    assert rep.get_required_functionality() == 0
+
+
+def test_pickle_round_trip():
+    rep = QueryRep("SELECT * FROM abc")
+    assert rep.tables() == ["abc"]
+    restored = pickle.loads(pickle.dumps(rep))
+    assert restored == rep
+    assert restored.tables() == ["abc"]
+
+    # Subclasses (e.g., the planner's `Query`) keep their attributes.
+    query = _DecoratedQueryRep("SELECT * FROM abc", arrival_count=3.0)
+    restored_query = pickle.loads(pickle.dumps(query))
+    assert restored_query == query
+    assert restored_query.arrival_count == 3.0
@@ -0,0 +1,36 @@
+from ddsketch import DDSketch
+
+from brad.daemon.messages import MetricsReport
+from brad.front_end.query_stages import QueryStage, StageLatencies
+
+
+def test_take_resets_sketches():
+    latencies = StageLatencies()
+    latencies.record(QueryStage.Parse, 0.001)
+    latencies.record(QueryStage.Parse, 0.003)
+    latencies.record(QueryStage.Execute, 0.010)
+
+    taken = dict(latencies.take())
+    assert set(taken.keys()) == set(QueryStage)
+    assert taken[QueryStage.Parse].count == 2
+    assert taken[QueryStage.Execute].count == 1
+    assert taken[QueryStage.Serialize].count == 0
+
+    assert all(sketch.count == 0 for _, sketch in latencies.sketches())
+
+
+def test_metrics_report_round_trip():
+    latencies = StageLatencies()
+    latencies.record(QueryStage.Route, 0.002)
+    latencies.record(QueryStage.Route, 0.004)
+    report = MetricsReport.from_data(
+        0, 1.0, DDSketch(), DDSketch(), stage_latency_sketches=latencies.take()
+    )
+    sketches = dict(report.stage_latency_sketches())
+    assert set(sketches.keys()) == set(QueryStage)
+    assert sketches[QueryStage.Route].count == 2
+    assert sketches[QueryStage.Parse].count == 0
+
+    # Reports from older front ends do not include the stage sketches.
+    report = MetricsReport.from_data(0, 1.0, DDSketch(), DDSketch())
+    assert report.stage_latency_sketches() == []
@@ -0,0 +1,90 @@
+from brad.front_end.replica_balancer import ReplicaLoadBalancer
+
+
+def test_prefers_least_outstanding():
+    balancer = ReplicaLoadBalancer(seed=42)
+    balancer.set_replicas(["r0", "r1", "r2"], slow_start=False)
+
+    balancer.on_start(0)
+    balancer.on_start(0)
+    balancer.on_start(1)
+    assert balancer.choose() == 2
+
+    balancer.on_start(2)
+    balancer.on_start(2)
+    assert balancer.choose() == 1
+
+
+def test_prefers_lower_latency():
+    balancer = ReplicaLoadBalancer(seed=42)
+    balancer.set_replicas(["r0", "r1"], slow_start=False)
+
+    for _ in range(5):
+        balancer.on_start(0)
+        balancer.on_complete(0, 0.5)
+        balancer.on_start(1)
+        balancer.on_complete(1, 0.05)
+
+    assert balancer.choose() == 1
+
+    # A slow replica is still used once the fast one is loaded enough.
+    for _ in range(12):
+        balancer.on_start(1)
+    assert balancer.choose() == 0
+
+    # Failed queries do not affect the latency average.
+    metrics = balancer.take_metrics()
+    balancer.on_start(0)
+    balancer.on_complete(0, None)
+    assert balancer.take_metrics()[0].ewma_latency_s == metrics[0].ewma_latency_s
+    assert metrics[0].completed == 5
+    assert metrics[1].outstanding == 12
+
+
+def test_slow_start_new_replica():
+    balancer = ReplicaLoadBalancer(slow_start_s=60.0, min_weight=0.1, seed=42)
+    balancer.set_replicas(["r0"], slow_start=False)
+    balancer.set_replicas(["r0", "r1"])
+
+    metrics = balancer.take_metrics()
+    assert metrics[0].weight == 1.0
+    assert metrics[1].weight < 0.2
+
+    # Both replicas are idle with no latency samples, but the new replica is
+    # still ramping up.
+    assert balancer.choose() == 0
+    for _ in range(10):
+        balancer.on_start(0)
+    assert balancer.choose() == 1
+
+
+def test_removed_replica_is_ignored():
+    balancer = ReplicaLoadBalancer(seed=42)
+    balancer.set_replicas(["r0", "r1"], slow_start=False)
+    balancer.on_start(1)
+    balancer.set_replicas(["r0"])
+    # Completing a query on a removed replica is a no-op.
+    balancer.on_complete(1, 0.1)
+    assert balancer.choose() == 0
+    assert len(balancer.take_metrics()) == 1
+
+
+def test_slow_start_replaced_replica():
+    balancer = ReplicaLoadBalancer(slow_start_s=60.0, min_weight=0.1, seed=42)
+    balancer.set_replicas(["r0", "r1"], slow_start=False)
+    balancer.on_start(1)
+    balancer.on_complete(1, 0.5)
+
+    # The same replicas keep their state.
+    balancer.set_replicas(["r0", "r1"])
+    metrics = balancer.take_metrics()
+    assert [m.weight for m in metrics] == [1.0, 1.0]
+    assert metrics[1].ewma_latency_s == 0.5
+
+    # Replica 1 is replaced by a new instance (e.g., after an instance type
+    # change), so it is slow started even though the count did not change.
+    balancer.set_replicas(["r0", "r1-new"])
+    metrics = balancer.take_metrics()
+    assert metrics[0].weight == 1.0
+    assert metrics[1].weight < 0.2
+    assert metrics[1].ewma_latency_s is None
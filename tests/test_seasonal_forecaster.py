@@ -0,0 +1,56 @@
+from brad.forecasting.seasonal_forecaster import SeasonalForecaster
+import pandas as pd
+import numpy as np
+from datetime import timedelta
+
+
+def test_daily_profile():
+    # Two days of hourly data where the value is the hour of the day.
+    index = pd.date_range("2022-01-01", periods=48, freq="h")
+    dataframe = pd.DataFrame({"a": [ts.hour for ts in index]}, index=index)
+
+    f = SeasonalForecaster(dataframe, timedelta(hours=1), smoothing=0.5)
+
+    assert f.num_points("a", 0) == []
+    assert f.num_points("a", 3) == [0.0, 1.0, 2.0]
+    assert f.num_points("a", 25)[-1] == 0.0
+
+
+def test_unobserved_slots_fall_back_to_last_value():
+    index = pd.date_range("2022-01-01", periods=3, freq="h")
+    dataframe = pd.DataFrame({"a": [1.0, 2.0, 3.0]}, index=index)
+
+    f = SeasonalForecaster(dataframe, timedelta(hours=1))
+    assert f.num_points("a", 2) == [3.0, 3.0]
+    # The 24th upcoming point wraps around to 00:00, which was observed.
+    assert f.num_points("a", 22)[-1] == 1.0
+
+
+def test_smoothing():
+    index = pd.date_range("2022-01-01", periods=1, freq="h")
+    f = SeasonalForecaster(
+        pd.DataFrame({"a": [10.0]}, index=index), timedelta(hours=12), smoothing=0.5
+    )
+    f.update_df_pointer(
+        pd.DataFrame(
+            {"a": [10.0, 0.0, 20.0]},
+            index=pd.DatetimeIndex(
+                ["2022-01-01 00:00", "2022-01-01 12:00", "2022-01-02 00:00"]
+            ),
+        )
+    )
+    forecast = f.num_points_all(2)
+    assert np.allclose(forecast["a"].to_numpy(), [0.0, 15.0])
+
+
+def test_non_finite_values_are_dropped():
+    index = pd.date_range("2022-01-01", periods=4, freq="12h")
+    dataframe = pd.DataFrame(
+        {"a": [10.0, 5.0, np.nan, np.inf], "b": [1.0, 2.0, 3.0, 4.0]}, index=index
+    )
+
+    f = SeasonalForecaster(dataframe, timedelta(hours=12), smoothing=0.5)
+    forecast = f.num_points_all(2)
+    # Column "a" keeps its profile from the first day.
+    assert np.allclose(forecast["a"].to_numpy(), [10.0, 5.0])
+    assert np.allclose(forecast["b"].to_numpy(), [2.0, 3.0])
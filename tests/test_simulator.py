@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from importlib import resources as pkg_resources
+from typing import List, Tuple
+
+import numpy as np
+import yaml
+
+import brad.planner as brad_planner
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.blueprint.user import UserProvidedBlueprint
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.config.planner import PlannerConfig
+from brad.planner.compare.provider import PerformanceCeilingComparatorProvider
+from brad.planner.data import bootstrap_blueprint
+from brad.planner.metrics import Metrics
+from brad.planner.workload import Workload
+from brad.planner.workload.query import Query
+from brad.provisioning.waiter import ProvisioningAction
+from brad.query_rep import QueryRep
+from brad.routing.abstract_policy import AbstractRoutingPolicy, FullRoutingPolicy
+from brad.routing.context import RoutingContext
+from brad.sim.clock import VirtualClock
+from brad.sim.engines import SimulatedEngines
+from brad.sim.simulator import SimulationResult, Simulator
+from brad.sim.trace import WorkloadTrace
+from brad.sim.transition import TransitionModel
+from brad.utils.time_periods import universal_now
+
+_SCHEMA = "imdb_extended_100g"
+_TABLES = ["cast_info", "keyword", "movie_keyword", "name"]
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FixedRanking(AbstractRoutingPolicy):
+    def name(self) -> str:
+        return "FixedRanking"
+
+    def engine_for_sync(self, _query: QueryRep, _ctx: RoutingContext) -> List[Engine]:
+        return [Engine.Aurora, Engine.Redshift, Engine.Athena]
+
+
+def _make_blueprint() -> Blueprint:
+    columns = "".join(f"""
+        - table_name: {table}
+          columns:
+            - name: id
+              data_type: BIGINT
+              primary_key: true""" for table in _TABLES)
+    user = UserProvidedBlueprint.load_from_yaml_str(f"""
+      schema_name: {_SCHEMA}
+      tables:{columns}
+      provisioning:
+        aurora:
+          num_nodes: 1
+          instance_type: db.r6g.large
+        redshift:
+          num_nodes: 0
+          instance_type: dc2.large
+    """)
+    initial = bootstrap_blueprint(user)
+    return Blueprint(
+        initial.schema_name(),
+        initial.tables(),
+        {table: [Engine.Aurora, Engine.Athena] for table in _TABLES},
+        initial.aurora_provisioning(),
+        initial.redshift_provisioning(),
+        FullRoutingPolicy([], _FixedRanking()),
+    )
+
+
+def _make_workload(arrivals_per_query: float) -> Workload:
+    queries = [
+        Query(f"SELECT COUNT(*) FROM {table}", arrival_count=arrivals_per_query)
+        for table in _TABLES
+    ]
+    txns = [Query("UPDATE name SET id = id WHERE id = 1", arrival_count=36000)]
+    workload = Workload(
+        timedelta(hours=1), queries, txns, {table: 1_000_000 for table in _TABLES}
+    )
+    # Columns: Aurora, Redshift, Athena.
+    workload.set_predicted_analytical_latencies(
+        np.tile(np.array([[5.0, 2.0, 8.0]]), (len(queries), 1)), {}
+    )
+    workload.set_predicted_data_access_statistics(
+        aurora_pages=np.full(len(queries), 1000),
+        athena_bytes=np.full(len(queries), 10_000_000),
+    )
+    return workload
+
+
+def _make_configs() -> Tuple[ConfigFile, PlannerConfig]:
+    config = ConfigFile(
+        {
+            "epoch_length": {"weeks": 0, "days": 0, "hours": 0, "minutes": 5},
+            "disable_table_movement": False,
+        }
+    )
+    with pkg_resources.files(brad_planner).joinpath("constants.yml").open("r") as data:
+        raw = yaml.load(data, Loader=yaml.Loader)
+    raw.update(
+        {
+            "strategy": "table_based_beam",
+            "planning_window": {"weeks": 0, "days": 0, "hours": 1, "minutes": 0},
+            "reinterpret_second_as": 1,
+            "query_dist_change_frac": 0.1,
+            "beam_size": 10,
+            "max_provisioning_multiplier": 1.5,
+            "triggers": {
+                "enabled": True,
+                "check_period_s": 300,
+                "check_period_offset_s": 0,
+                "observe_new_blueprint_mins": 10,
+                "elapsed_time": {"disabled": True, "multiplier": 60},
+                "redshift_cpu": {"disabled": True, "lo": 15, "hi": 85},
+                "aurora_cpu": {"lo": 15, "hi": 85, "sustained_epochs": 3},
+                "variable_costs": {"disabled": True, "threshold": 1.0},
+                "query_latency_ceiling": {"disabled": True},
+                "txn_latency_ceiling": {"disabled": True},
+                "recent_change": {"disabled": True},
+            },
+        }
+    )
+    return config, PlannerConfig(raw)
+
+
+def _run_simulation() -> SimulationResult:
+    config, planner_config = _make_configs()
+    blueprint = _make_blueprint()
+    reference_metrics = Metrics(
+        aurora_writer_cpu_avg=30.0,
+        aurora_writer_buffer_hit_pct_avg=100.0,
+        txn_completions_per_s=10.0,
+        txn_lat_s_p50=0.005,
+        txn_lat_s_p90=0.010,
+    )
+    simulator = Simulator(
+        config,
+        planner_config,
+        _SCHEMA,
+        blueprint,
+        None,
+        # The load increases after the first hour.
+        WorkloadTrace([_make_workload(20.0), _make_workload(200.0)]),
+        SimulatedEngines(_SCHEMA, planner_config, blueprint, reference_metrics),
+        PerformanceCeilingComparatorProvider(30.0, 0.030),
+        _START,
+        replan_duration=timedelta(minutes=1),
+    )
+    return asyncio.run(simulator.run(timedelta(hours=2)))
+
+
+def test_virtual_clock_overrides_universal_now():
+    clock = VirtualClock(_START)
+    with clock.installed():
+        assert universal_now() == _START
+        asyncio.run(clock.sleep(90.0))
+        assert universal_now() == _START + timedelta(seconds=90)
+        assert clock.elapsed_s() == 90.0
+    assert universal_now() != clock.now()
+
+
+def test_workload_trace_repeats():
+    first = _make_workload(1.0)
+    second = _make_workload(2.0)
+    trace = WorkloadTrace([first, second])
+    assert trace.length() == timedelta(hours=2)
+    assert trace.workload_at(timedelta(minutes=30)) is first
+    assert trace.workload_at(timedelta(hours=1)) is second
+    assert trace.workload_at(timedelta(hours=2, minutes=5)) is first
+
+
+def test_transition_model_redshift_resize():
+    config, _ = _make_configs()
+    durations = {action: 100.0 for action in ProvisioningAction}
+    model = TransitionModel(config, durations)
+    blueprint = _make_blueprint()
+    resized = Blueprint(
+        blueprint.schema_name(),
+        blueprint.tables(),
+        blueprint.table_locations(),
+        blueprint.aurora_provisioning(),
+        Provisioning("dc2.large", 2),
+        blueprint.get_routing_policy(),
+    )
+
+    times = asyncio.run(model.run(blueprint, resized, None, _START))
+    actions = [action for action, _ in times.actions]
+    assert actions == [ProvisioningAction.RedshiftResume]
+    # The resume completes after 100 s; the waiter may observe it a bit later.
+    assert timedelta(seconds=100) <= times.pre_transition <= timedelta(seconds=130)
+    assert times.post_transition == timedelta(0)
+
+    # Pausing Redshift happens after the switch (no waiting).
+    times = asyncio.run(model.run(resized, blueprint, None, _START))
+    assert times.pre_transition == timedelta(0)
+    assert times.actions == []
+
+
+def test_simulation_is_deterministic():
+    result = _run_simulation()
+    epochs = result.epochs_df()
+    assert len(epochs) == 24
+    assert epochs.index[0] == _START
+
+    # The load increase after the first hour should cause a replan.
+    assert len(result.replans) > 0
+    assert all(replan.timestamp >= _START for replan in result.replans)
+    for transition in result.transitions:
+        assert transition.start <= transition.switch <= transition.end
+    summary = result.summary()
+    assert summary["simulated_hours"] == 2.0
+    assert summary["total_cost"] > 0.0
+
+    again = _run_simulation()
+    assert again.epochs == result.epochs
+    assert [(r.timestamp, r.trigger, r.outcome) for r in again.replans] == [
+        (r.timestamp, r.trigger, r.outcome) for r in result.replans
+    ]
+    assert [(t.start, t.switch, t.end) for t in again.transitions] == [
+        (t.start, t.switch, t.end) for t in result.transitions
+    ]
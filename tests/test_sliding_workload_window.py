@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pytz
+
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.planner.scoring.data_access.provider import DataAccessProvider
+from brad.planner.workload import Workload
+from brad.planner.workload.sliding_window import SlidingWorkloadWindow
+from brad.workload_logging.log_fetcher import LogFetcher, LogFile
+
+
+class _FakeLogFetcher(LogFetcher):
+    # pylint: disable-next=super-init-not-called
+    def __init__(self) -> None:
+        self.logs: Dict[str, LogFile] = {}
+        self.num_content_fetches = 0
+
+    def add(self, key: str, epoch_start: datetime, entries: List[str]) -> None:
+        self.logs[key] = LogFile(key, epoch_start, "\n".join(entries))
+
+    def fetch_logs(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        include_contents: bool = True,
+    ) -> Iterator[LogFile]:
+        for log in self.logs.values():
+            if window_start <= log.epoch_start < window_end:
+                yield log if include_contents else log._replace(contents=None)
+
+    def fetch_contents(self, log_file_key: str) -> str:
+        self.num_content_fetches += 1
+        return self.logs[log_file_key].contents
+
+
+class _CountingProvider(DataAccessProvider):
+    def __init__(self) -> None:
+        self.num_predicted = 0
+
+    def apply_access_statistics(self, workload: Workload) -> None:
+        queries = workload.analytical_queries()
+        self.num_predicted += len(queries)
+        workload.set_predicted_data_access_statistics(
+            aurora_pages=np.array([len(q.raw_query) for q in queries]),
+            athena_bytes=np.array([1000 * len(q.raw_query) for q in queries]),
+        )
+
+
+def _entry(query: str, engine: str) -> str:
+    return f"2024-01-01 00:00:00 INFO Query: {query} Engine: {engine} Duration (s): 1.5"
+
+
+def _epoch(minute: int) -> datetime:
+    return datetime(2024, 1, 1, 0, minute, tzinfo=pytz.utc)
+
+
+def test_window_ingests_new_epochs_and_evicts_old_ones():
+    config = ConfigFile(
+        {"epoch_length": {"weeks": 0, "days": 0, "hours": 0, "minutes": 1}}
+    )
+    fetcher = _FakeLogFetcher()
+    provider = _CountingProvider()
+    window = SlidingWorkloadWindow(config, fetcher)
+
+    fetcher.add(
+        "analytical_fe0_e0",
+        _epoch(0),
+        [_entry("SELECT 1", "aurora"), _entry("SELECT 1", "athena")],
+    )
+    fetcher.add("transactional_fe0_e0_p10.log", _epoch(0), ["BEGIN"])
+    fetcher.add("analytical_fe0_e1", _epoch(1), [_entry("SELECT 22", "athena")])
+    assert window.refresh(_epoch(0), _epoch(2)) == 3
+    window.apply_access_statistics(provider)
+    assert provider.num_predicted == 2
+    assert window.period() == timedelta(minutes=2)
+    assert window.arrival_count_multiplier(timedelta(hours=1)) == 30.0
+
+    queries = {wq.query: wq for wq in window.queries()}
+    assert queries["SELECT 1"].count == 2
+    # The first execution logged in the most recent epoch wins.
+    assert queries["SELECT 1"].engine == Engine.Aurora
+    assert queries["SELECT 22"].aurora_pages == 9.0
+
+    # A second front end's log for the latest epoch and a new epoch arrive.
+    # Only the new files are downloaded.
+    fetcher.add("analytical_fe1_e1", _epoch(1), [_entry("SELECT 1", "redshift")])
+    fetcher.add("analytical_fe0_e2", _epoch(2), [_entry("SELECT 333", "aurora")])
+    assert window.refresh(_epoch(1), _epoch(3)) == 2
+    assert fetcher.num_content_fetches == 4
+    window.apply_access_statistics(provider)
+    assert provider.num_predicted == 3
+
+    queries = {wq.query: wq for wq in window.queries()}
+    assert queries["SELECT 1"].count == 1
+    assert queries["SELECT 1"].engine == Engine.Redshift
+    assert queries["SELECT 22"].count == 1
+    assert window.period() == timedelta(minutes=2)
+
+    # Queries leave the window along with their last epoch.
+    assert window.refresh(_epoch(2), _epoch(3)) == 0
+    assert [wq.query for wq in window.queries()] == ["SELECT 333"]
@@ -0,0 +1,149 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from brad.connection.connection import Connection, ConnectionFailed
+from brad.config.file import ConfigFile
+from brad.connection.cursor import Cursor
+from brad.front_end.engine_connections import EngineConnections
+from brad.front_end.session import SessionManager
+from brad.front_end.standby_connections import StandbyConnections
+
+
+class _FakeConnection(Connection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+    async def cursor(self) -> Cursor:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def cursor_sync(self) -> Cursor:
+        raise NotImplementedError
+
+    def close_sync(self) -> None:
+        self.closed = True
+
+    def is_connection_lost_error(self, ex: Exception) -> bool:
+        return False
+
+
+class _FakeEngineConnections:
+    def __init__(self, conn_id: int) -> None:
+        self.conn_id = conn_id
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _Connector:
+    def __init__(self) -> None:
+        self.created: List[_FakeEngineConnections] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def connect(self):
+        await self.release.wait()
+        conns = _FakeEngineConnections(len(self.created))
+        self.created.append(conns)
+        return (conns, None)
+
+
+async def _wait_until(predicate) -> None:
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0)
+    assert predicate()
+
+
+def test_standby_replenishes():
+    async def run():
+        connector = _Connector()
+        standby = StandbyConnections(2, connector.connect)  # type: ignore
+
+        # Nothing is established until the pool is first used.
+        assert standby.take() is None
+        await _wait_until(lambda: standby.num_ready() == 2)
+
+        conns, estimator = standby.take()  # type: ignore
+        assert estimator is None
+        assert conns.conn_id == 0
+        await _wait_until(lambda: standby.num_ready() == 2)
+        assert len(connector.created) == 3
+
+        await standby.close()
+        assert all(conns.closed for conns in connector.created[1:])
+        assert not connector.created[0].closed
+
+    asyncio.run(run())
+
+
+def test_standby_invalidate_discards_stale_connections():
+    async def run():
+        connector = _Connector()
+        standby = StandbyConnections(1, connector.connect)  # type: ignore
+        standby.replenish()
+        await _wait_until(lambda: standby.num_ready() == 1)
+        first = connector.created[0]
+
+        # Connections that are in progress during an invalidation are closed.
+        connector.release.clear()
+        standby.invalidate()
+        await _wait_until(lambda: first.closed)
+        connector.release.set()
+        await _wait_until(lambda: standby.num_ready() == 1)
+        await _wait_until(lambda: len(connector.created) == 2)
+
+        conns, _ = standby.take()  # type: ignore
+        assert not conns.closed
+        await standby.close()
+
+    asyncio.run(run())
+
+
+def test_session_manager_warms_up_standby_connections():
+    async def run():
+        config = ConfigFile({"standby_session_connections": 2})
+        manager = SessionManager(config, None, "test")  # type: ignore
+        connector = _Connector()
+        # pylint: disable-next=protected-access
+        manager._standby = StandbyConnections(2, connector.connect)  # type: ignore
+
+        # The standby connections are established before the first session.
+        manager.start_standby_connections()
+        # pylint: disable-next=protected-access
+        await _wait_until(lambda: manager._standby.num_ready() == 2)  # type: ignore
+        assert len(connector.created) == 2
+        await manager.end_all_sessions()
+        assert all(conns.closed for conns in connector.created)
+
+    asyncio.run(run())
+
+
+def test_connect_all_closes_on_failure():
+    async def run():
+        established = [_FakeConnection(), _FakeConnection()]
+
+        async def succeed(idx: int) -> Connection:
+            await asyncio.sleep(0)
+            return established[idx]
+
+        async def fail() -> Connection:
+            raise ConnectionFailed()
+
+        # pylint: disable-next=protected-access
+        conns = await EngineConnections._connect_all([succeed(0), succeed(1)])
+        assert conns == established
+
+        with pytest.raises(ConnectionFailed):
+            # pylint: disable-next=protected-access
+            await EngineConnections._connect_all([succeed(0), fail(), succeed(1)])
+        assert all(conn.closed for conn in established)
+
+    asyncio.run(run())
@@ -0,0 +1,212 @@
+import asyncio
+from datetime import timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from brad.blueprint import Blueprint
+from brad.blueprint.provisioning import Provisioning
+from brad.blueprint.user import UserProvidedBlueprint
+from brad.config.engine import Engine, EngineBitmapValues
+from brad.config.planner import PlannerConfig
+from brad.planner.beam.table_based_candidate import BlueprintCandidate
+from brad.planner.data import bootstrap_blueprint
+from brad.planner.metrics import Metrics
+from brad.planner.scoring.context import ScoringContext
+from brad.planner.scoring.provisioning import (
+    compute_athena_scanned_bytes,
+    compute_athena_scanned_bytes_batch,
+)
+from brad.planner.workload import Workload
+from brad.planner.workload.query import Query
+from brad.query_rep import QueryRep
+from brad.routing.abstract_policy import AbstractRoutingPolicy, FullRoutingPolicy
+from brad.routing.context import RoutingContext
+from brad.routing.router import Router
+from brad.front_end.session import Session
+
+_TABLES = ["cast_info", "keyword", "movie_keyword", "name"]
+
+
+class _FixedRanking(AbstractRoutingPolicy):
+    def name(self) -> str:
+        return "FixedRanking"
+
+    def engine_for_sync(self, _query: QueryRep, _ctx: RoutingContext) -> List[Engine]:
+        return [Engine.Redshift, Engine.Athena, Engine.Aurora]
+
+
+class _CountingRouter(Router):
+    def __init__(self) -> None:
+        super().__init__(
+            FullRoutingPolicy([], _FixedRanking()),
+            {},
+            use_future_blueprint_policies=False,
+        )
+        self.num_routed = 0
+
+    async def engine_for(
+        self, query: QueryRep, session: Optional[Session] = None
+    ) -> Engine:
+        self.num_routed += 1
+        return await super().engine_for(query, session)
+
+
+def _make_ctx() -> ScoringContext:
+    columns = "".join(f"""
+        - table_name: {table}
+          columns:
+            - name: id
+              data_type: BIGINT
+              primary_key: true""" for table in _TABLES)
+    user = UserProvidedBlueprint.load_from_yaml_str(f"""
+      schema_name: imdb
+      tables:{columns}
+      provisioning:
+        aurora:
+          num_nodes: 1
+          instance_type: db.r6g.large
+        redshift:
+          num_nodes: 1
+          instance_type: dc2.large
+    """)
+    initial = bootstrap_blueprint(user)
+    blueprint = Blueprint(
+        initial.schema_name(),
+        initial.tables(),
+        {table: [Engine.Aurora] for table in _TABLES},
+        initial.aurora_provisioning(),
+        Provisioning("dc2.large", 1),
+        initial.get_routing_policy(),
+    )
+
+    # Queries over different subsets of the tables.
+    queries: List[Query] = []
+    for i, table in enumerate(_TABLES):
+        queries.append(Query(f"SELECT COUNT(*) FROM {table}", arrival_count=i + 1))
+    for left, right in zip(_TABLES, _TABLES[1:]):
+        queries.append(
+            Query(
+                f"SELECT COUNT(*) FROM {left}, {right} WHERE {left}.id = {right}.id",
+                arrival_count=2.0,
+            )
+        )
+    workload = Workload(
+        timedelta(hours=1), queries, [], {table: 1000 for table in _TABLES}
+    )
+    workload.set_predicted_data_access_statistics(
+        aurora_pages=np.arange(len(queries)) * 10 + 5,
+        athena_bytes=np.arange(len(queries)) * 10_000_000,
+    )
+
+    metrics = Metrics(
+        redshift_cpu_avg=0.0,
+        aurora_writer_cpu_avg=0.0,
+        aurora_reader_cpu_avg=0.0,
+        aurora_writer_buffer_hit_pct_avg=100.0,
+        aurora_reader_buffer_hit_pct_avg=100.0,
+        aurora_writer_load_minute_avg=0.0,
+        aurora_reader_load_minute_avg=0.0,
+        txn_completions_per_s=0.0,
+        txn_lat_s_p50=0.0,
+        txn_lat_s_p90=0.0,
+        query_lat_s_p50=0.0,
+        query_lat_s_p90=0.0,
+    )
+    return ScoringContext(
+        "imdb",
+        blueprint,
+        workload,
+        workload,
+        metrics,
+        PlannerConfig.load_only_constants(),
+    )
+
+
+async def _plan(ctx: ScoringContext, router: _CountingRouter) -> BlueprintCandidate:
+    # Mimics the table-based planner: each "cluster" adds a placement for
+    # some tables, followed by the queries that only reference those tables.
+    steps = [
+        (EngineBitmapValues[Engine.Aurora], ["cast_info"], [0]),
+        (EngineBitmapValues[Engine.Athena], ["keyword"], [1]),
+        (EngineBitmapValues[Engine.Redshift], ["cast_info", "keyword"], [4]),
+        (EngineBitmapValues[Engine.Athena], ["movie_keyword"], [2]),
+        (EngineBitmapValues[Engine.Redshift], ["keyword", "movie_keyword"], [5]),
+        (EngineBitmapValues[Engine.Aurora], ["name"], [3]),
+        (EngineBitmapValues[Engine.Athena], ["movie_keyword", "name"], [6]),
+    ]
+    candidate = BlueprintCandidate.based_on(ctx.current_blueprint, lambda _a, _b: True)
+    for placement_bitmap, tables, queries in steps:
+        changed = candidate.add_placement(placement_bitmap, tables, ctx)
+        router.update_placement(candidate.table_placements)
+        await candidate.add_query_cluster(router, queries, changed, ctx)
+    return candidate
+
+
+def test_incremental_rerouting_matches_full_rerouting():
+    ctx = _make_ctx()
+    full_router = _CountingRouter()
+    full = asyncio.run(_plan(ctx, full_router))
+
+    ctx.compute_next_queries_by_table()
+    incremental_router = _CountingRouter()
+    incremental = asyncio.run(_plan(ctx, incremental_router))
+
+    assert incremental.query_engines == full.query_engines
+    for engine in [Engine.Aurora, Engine.Redshift, Engine.Athena]:
+        assert sorted(incremental.query_locations[engine]) == sorted(
+            full.query_locations[engine]
+        )
+    assert incremental.aurora_accessed_pages == full.aurora_accessed_pages
+    assert incremental.athena_scanned_bytes == full.athena_scanned_bytes
+    assert incremental.workload_scan_cost == full.workload_scan_cost
+    assert incremental_router.num_routed < full_router.num_routed
+
+
+def test_scan_stats_follow_routing():
+    ctx = _make_ctx()
+    ctx.compute_next_queries_by_table()
+    candidate = asyncio.run(_plan(ctx, _CountingRouter()))
+
+    workload = ctx.next_workload
+    aurora = candidate.query_locations[Engine.Aurora]
+    athena = candidate.query_locations[Engine.Athena]
+    expected_pages = (
+        workload.get_predicted_aurora_pages_accessed_batch(aurora).sum()
+        * workload.get_arrival_counts_batch(aurora).sum()
+    )
+    assert candidate.aurora_accessed_pages == max(int(expected_pages), 1)
+    assert candidate.athena_scanned_bytes == compute_athena_scanned_bytes(
+        [workload.analytical_queries()[qidx] for qidx in athena],
+        workload.get_predicted_athena_bytes_accessed_batch(athena),
+        ctx.planner_config,
+    )
+    assert set(candidate.query_engines) == set(
+        range(len(workload.analytical_queries()))
+    )
+
+
+def test_compute_athena_scanned_bytes():
+    planner_config = PlannerConfig.load_only_constants()
+    min_bytes = planner_config.athena_min_mb_per_query() * 1000 * 1000
+    queries = [Query("SELECT 1", arrival_count=2.0), Query("SELECT 2")]
+    accessed_bytes = [1000, 3 * min_bytes]
+
+    # Queries that scan less than the minimum are charged the minimum.
+    expected = 2 * min_bytes + 3 * min_bytes
+    assert compute_athena_scanned_bytes(queries, accessed_bytes, planner_config) == (
+        expected
+    )
+    assert (
+        compute_athena_scanned_bytes(
+            iter(queries), iter(accessed_bytes), planner_config
+        )
+        == expected
+    )
+    assert (
+        compute_athena_scanned_bytes_batch(
+            np.array(accessed_bytes), np.array([2.0, 1.0]), planner_config
+        )
+        == expected
+    )
+    assert compute_athena_scanned_bytes([], [], planner_config) == 1
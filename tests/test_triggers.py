@@ -1,5 +1,15 @@
+import asyncio
+from datetime import timedelta
+from typing import List
+
 import pandas as pd
+
+from brad.daemon.metrics_source import MetricsSourceWithForecasting
+from brad.daemon.monitor import MonitorSnapshot
+from brad.planner.triggers.aurora_cpu_utilization import AuroraCpuUtilization
+from brad.planner.triggers.evaluator import TriggerEvaluator
 from brad.planner.triggers.metrics_thresholds import MetricsThresholds
+from brad.planner.triggers.trigger import Trigger
 
 
 def test_metrics_thresholds():
@@ -14,3 +24,130 @@ def test_metrics_thresholds():
     high_not_sustained = pd.Series([81, 75, 82])
     assert mtt.exceeds_thresholds(high, "")
     assert not mtt.exceeds_thresholds(high_not_sustained, "")
+
+
+class _FakeSource(MetricsSourceWithForecasting):
+    def __init__(
+        self, values: pd.DataFrame, forecasting_method: str = "constant"
+    ) -> None:
+        self._values = values
+        super().__init__(timedelta(minutes=1), forecasting_method, 3)
+
+    async def fetch_latest(self) -> None:
+        self._forecaster.update_df_pointer(self._values)
+
+    def append(self, values: pd.DataFrame) -> None:
+        self._values = pd.concat([self._values, values])
+
+    def _metrics_values(self) -> pd.DataFrame:
+        return self._values
+
+    def _metrics_logger(self) -> None:
+        return None
+
+
+class _FakeTrigger(Trigger):
+    def __init__(
+        self, name: str, fires: bool, delay_s: float, events: List[str]
+    ) -> None:
+        super().__init__(timedelta(minutes=1), timedelta(minutes=0))
+        self._name = name
+        self._fires = fires
+        self._delay_s = delay_s
+        # Shared across triggers to record the order of the checks.
+        self._events = events
+        self.seen_cpu: List[float] = []
+
+    async def should_replan(self, metrics: MonitorSnapshot) -> bool:
+        self._events.append("start:" + self._name)
+        self.seen_cpu.append(
+            metrics.redshift_metrics().read_k_most_recent(1)["cpu"].iloc[-1]
+        )
+        await asyncio.sleep(self._delay_s)
+        self._events.append("end:" + self._name)
+        return self._fires
+
+    def name(self) -> str:
+        return self._name
+
+
+def test_metrics_snapshot_is_unaffected_by_later_fetches():
+    index = pd.date_range("2024-01-01", periods=3, freq="1min", tz="UTC")
+    values = pd.DataFrame({"cpu": [10.0, 20.0, 30.0]}, index=index)
+    source = _FakeSource(values)
+    snapshot = source.snapshot(3)
+
+    values.loc[index[-1], "cpu"] = 90.0
+    assert snapshot.read_k_most_recent(1)["cpu"].iloc[-1] == 30.0
+    assert snapshot.real_time_delay() == source.real_time_delay()
+
+
+def test_metrics_snapshot_is_bounded_and_copies_forecaster():
+    index = pd.date_range("2024-01-01", periods=100, freq="1min", tz="UTC")
+    source = _FakeSource(
+        pd.DataFrame({"cpu": [float(i) for i in range(100)]}, index=index),
+        forecasting_method="online_linear",
+    )
+    snapshot = source.snapshot(5)
+    assert len(snapshot.read_k_most_recent(100)) == 5
+    # The forecaster window (3) is kept even if fewer epochs are requested.
+    assert len(source.snapshot(1).read_k_most_recent(100)) == 3
+
+    upcoming = snapshot.read_k_upcoming(2)
+    assert upcoming.equals(source.read_k_upcoming(2))
+    assert list(upcoming["cpu"]) == [100.0, 101.0]
+
+    # Later fetches do not affect the snapshot's forecasts.
+    more = pd.date_range(index[-1], periods=4, freq="1min", tz="UTC")[1:]
+    source.append(pd.DataFrame({"cpu": [0.0] * 3}, index=more))
+    asyncio.run(source.fetch_latest())
+    assert not source.read_k_upcoming(2).equals(upcoming)
+    assert snapshot.read_k_upcoming(2).equals(upcoming)
+
+
+def test_trigger_evaluator_runs_triggers_concurrently():
+    index = pd.date_range("2024-01-01", periods=3, freq="1min", tz="UTC")
+    source = _FakeSource(pd.DataFrame({"cpu": [10.0, 20.0, 30.0]}, index=index))
+    metrics = MonitorSnapshot(None, tuple(), source.snapshot(1), None)
+
+    events: List[str] = []
+    slow_fires = _FakeTrigger("slow_fires", fires=True, delay_s=0.2, events=events)
+    fast_fires = _FakeTrigger("fast_fires", fires=True, delay_s=0.0, events=events)
+    quiet = _FakeTrigger("quiet", fires=False, delay_s=0.2, events=events)
+    evaluator = TriggerEvaluator([quiet, slow_fires, fast_fires])
+
+    fired = asyncio.run(evaluator.evaluate(metrics))
+
+    # The first trigger in the configured order wins, even though another
+    # trigger finished first.
+    assert fired is slow_fires
+    # The checks overlap: every trigger starts before the slow ones finish.
+    assert events.index("end:fast_fires") < events.index("end:slow_fires")
+    last_start = max(
+        events.index("start:" + t.name()) for t in [quiet, slow_fires, fast_fires]
+    )
+    assert last_start < min(events.index("end:quiet"), events.index("end:slow_fires"))
+    for trigger in [quiet, slow_fires, fast_fires]:
+        assert trigger.seen_cpu == [30.0]
+    latencies = evaluator.last_latencies()
+    assert set(latencies.keys()) == {"slow_fires", "fast_fires", "quiet"}
+    assert latencies["quiet"] > latencies["fast_fires"]
+
+    assert asyncio.run(TriggerEvaluator([quiet]).evaluate(metrics)) is None
+
+
+def test_trigger_evaluator_metrics_lookback():
+    events: List[str] = []
+    quiet = _FakeTrigger("quiet", fires=False, delay_s=0.0, events=events)
+    assert TriggerEvaluator([]).metrics_lookback_epochs() == 0
+    assert TriggerEvaluator([quiet]).metrics_lookback_epochs() == 0
+
+    sustained = AuroraCpuUtilization(
+        lo=10,
+        hi=90,
+        epoch_length=timedelta(minutes=1),
+        observe_bp_delay=timedelta(minutes=0),
+        sustained_epochs=6,
+    )
+    evaluator = TriggerEvaluator([quiet, sustained])
+    assert evaluator.metrics_lookback_epochs() == 6
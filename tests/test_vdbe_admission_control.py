@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+
+from brad.config.engine import Engine
+from brad.front_end.errors import QueryError
+from brad.front_end.vdbe.admission_control import VdbeAdmissionController
+from brad.vdbe.models import QueryInterface, VirtualEngine
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _vdbe(vdbe_id: int, slo_ms: int, engine: Engine = Engine.Redshift):
+    return VirtualEngine(
+        internal_id=vdbe_id,
+        name=f"vdbe{vdbe_id}",
+        max_staleness_ms=0,
+        p90_latency_slo_ms=slo_ms,
+        interface=QueryInterface.Common,
+        tables=[],
+        mapped_to=engine,
+    )
+
+
+def test_weighted_fair_admission():
+    async def run():
+        ac = VdbeAdmissionController(max_concurrency=1, max_queued=100)
+        # VDBE 2 has a 2x tighter SLO, so it gets twice the share.
+        ac.update_vdbes([_vdbe(1, slo_ms=1000), _vdbe(2, slo_ms=500)])
+
+        running = await ac.admit(1)
+        order = []
+
+        async def query(vdbe_id: int) -> None:
+            ticket = await ac.admit(vdbe_id)
+            order.append(vdbe_id)
+            ac.release(ticket, 0.1)
+
+        # A burst on VDBE 1 does not starve VDBE 2.
+        tasks = [asyncio.create_task(query(1)) for _ in range(6)]
+        tasks.extend(asyncio.create_task(query(2)) for _ in range(6))
+        await asyncio.sleep(0)
+        ac.release(running, 0.1)
+        await asyncio.gather(*tasks)
+
+        assert order[:9].count(2) == 6
+        assert order[9:] == [1, 1, 1]
+        queue_times = dict(ac.take_queue_time_sketches())
+        assert queue_times[1].count == 7
+        assert queue_times[2].count == 6
+        assert ac.take_queue_time_sketches() == []
+
+    asyncio.run(run())
+
+
+def test_aimd_limit_follows_slo():
+    async def run():
+        clock = _FakeClock()
+        ac = VdbeAdmissionController(
+            max_concurrency=10, max_queued=100, adjust_period_s=1.0, clock=clock
+        )
+        ac.update_vdbes(
+            [_vdbe(1, slo_ms=100), _vdbe(2, slo_ms=100, engine=Engine.Athena)]
+        )
+        assert ac.concurrency_limit(Engine.Redshift) == 10
+
+        # Latencies above the SLO decrease the limit multiplicatively.
+        ticket = await ac.admit(1)
+        clock.now += 1.0
+        ac.release(ticket, 0.5)
+        assert ac.concurrency_limit(Engine.Redshift) == 7
+        # Other engines are not affected.
+        assert ac.concurrency_limit(Engine.Athena) == 10
+
+        for _ in range(10):
+            ticket = await ac.admit(1)
+            clock.now += 1.0
+            ac.release(ticket, 0.5)
+        assert ac.concurrency_limit(Engine.Redshift) == 1
+
+        # Meeting the SLO under contention increases the limit additively.
+        first = await ac.admit(1)
+        waiting = asyncio.create_task(ac.admit(1))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        clock.now += 1.0
+        ac.release(first, 0.01)
+        assert ac.concurrency_limit(Engine.Redshift) == 2
+        ac.release(await waiting, 0.01)
+
+        # Without contention, the limit stays the same.
+        ticket = await ac.admit(1)
+        clock.now += 1.0
+        ac.release(ticket, 0.01)
+        assert ac.concurrency_limit(Engine.Redshift) == 2
+
+    asyncio.run(run())
+
+
+def test_rejects_when_queue_is_full():
+    async def run():
+        ac = VdbeAdmissionController(max_concurrency=1, max_queued=1)
+        ac.update_vdbes([_vdbe(1, slo_ms=100)])
+        running = await ac.admit(1)
+        waiting = asyncio.create_task(ac.admit(1))
+        await asyncio.sleep(0)
+
+        # pylint: disable-next=protected-access
+        finish_tag = ac._vdbes[1].last_finish_tag
+        with pytest.raises(QueryError) as ex:
+            await ac.admit(1)
+        assert ex.value.is_transient()
+        # Rejected queries do not count against the VDBE's share.
+        # pylint: disable-next=protected-access
+        assert ac._vdbes[1].last_finish_tag == finish_tag
+
+        # Cancelled waiters do not hold on to a slot.
+        waiting.cancel()
+        await asyncio.sleep(0)
+        ac.release(running, None)
+        ac.release(await ac.admit(1), None)
+
+        with pytest.raises(QueryError):
+            await ac.admit(3)
+
+    asyncio.run(run())
@@ -0,0 +1,87 @@
+from brad.front_end.vdbe.result_cache import VdbeResultCache
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_serves_results_within_staleness_bound():
+    clock = _FakeClock()
+    cache = VdbeResultCache(max_entries=10, clock=clock)
+
+    cache.put(1, "SELECT * FROM abc", ["abc"], [(1,), (2,)], None, cache.now())
+    # Surrounding whitespace and trailing semicolons do not matter.
+    assert cache.get(1, "  SELECT * FROM abc ;\n", 500, need_schema=False) == (
+        [(1,), (2,)],
+        None,
+    )
+    # Results are cached per VDBE.
+    assert cache.get(2, "SELECT * FROM abc", 500, need_schema=False) is None
+    # A VDBE without a staleness allowance never uses cached results.
+    assert cache.get(1, "SELECT * FROM abc", 0, need_schema=False) is None
+    # The cached result did not include a schema.
+    assert cache.get(1, "SELECT * FROM abc", 500, need_schema=True) is None
+
+    clock.now += 0.4
+    assert cache.get(1, "SELECT * FROM abc", 500, need_schema=False) is not None
+    clock.now += 0.2
+    assert cache.get(1, "SELECT * FROM abc", 500, need_schema=False) is None
+    assert len(cache) == 0
+    assert cache.stats() == (2, 3)
+
+
+def test_string_literals_are_not_normalized():
+    cache = VdbeResultCache(max_entries=10, clock=_FakeClock())
+    cache.put(
+        1, "SELECT id FROM abc WHERE name = 'a b'", ["abc"], [(1,)], None, cache.now()
+    )
+    assert (
+        cache.get(1, "SELECT id FROM abc WHERE name = 'a  b'", 500, need_schema=False)
+        is None
+    )
+    cache.put(
+        1, "SELECT id FROM abc WHERE name = 'a  b'", ["abc"], [(2,)], None, cache.now()
+    )
+    assert cache.get(
+        1, "SELECT id FROM abc WHERE name = 'a b'", 500, need_schema=False
+    ) == ([(1,)], None)
+    assert cache.get(
+        1, "SELECT id FROM abc WHERE name = 'a  b'", 500, need_schema=False
+    ) == ([(2,)], None)
+
+
+def test_invalidate_tables():
+    cache = VdbeResultCache(max_entries=10, clock=_FakeClock())
+    cache.put(1, "SELECT * FROM abc", ["abc"], [(1,)], None, cache.now())
+    cache.put(1, "SELECT * FROM abc, xyz", ["abc", "xyz"], [(2,)], None, cache.now())
+    cache.put(2, "SELECT * FROM xyz", ["xyz"], [(3,)], None, cache.now())
+
+    assert cache.invalidate_tables(["abc", "unrelated"]) == 2
+    assert cache.get(1, "SELECT * FROM abc", 1000, need_schema=False) is None
+    assert cache.get(1, "SELECT * FROM abc, xyz", 1000, need_schema=False) is None
+    assert cache.get(2, "SELECT * FROM xyz", 1000, need_schema=False) == (
+        [(3,)],
+        None,
+    )
+    assert cache.invalidate_tables(["xyz"]) == 1
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    cache = VdbeResultCache(max_entries=2, clock=_FakeClock())
+    cache.put(1, "SELECT 1 FROM abc", ["abc"], [(1,)], None, cache.now())
+    cache.put(1, "SELECT 2 FROM abc", ["abc"], [(2,)], None, cache.now())
+    assert cache.get(1, "SELECT 1 FROM abc", 1000, need_schema=False) is not None
+    cache.put(1, "SELECT 3 FROM abc", ["abc"], [(3,)], None, cache.now())
+
+    assert len(cache) == 2
+    assert cache.get(1, "SELECT 2 FROM abc", 1000, need_schema=False) is None
+    assert cache.get(1, "SELECT 1 FROM abc", 1000, need_schema=False) is not None
+    # The evicted entry is no longer tracked for invalidation.
+    assert cache.invalidate_tables(["abc"]) == 2
+
+    assert not VdbeResultCache(max_entries=0).enabled()
@@ -0,0 +1,58 @@
+from brad.config.engine import Engine
+from brad.front_end.vdbe.table_validator import VdbeTableValidator
+from brad.query_rep import QueryRep
+from brad.vdbe.models import QueryInterface, VirtualEngine, VirtualTable
+
+
+def _vdbe(vdbe_id: int, tables):
+    return VirtualEngine(
+        internal_id=vdbe_id,
+        name=f"vdbe{vdbe_id}",
+        max_staleness_ms=0,
+        p90_latency_slo_ms=100,
+        interface=QueryInterface.Common,
+        tables=[VirtualTable(name=name, writable=False) for name in tables],
+        mapped_to=Engine.Aurora,
+    )
+
+
+class _CountingQueryRep(QueryRep):
+    num_analyzed = 0
+
+    def tables(self):
+        _CountingQueryRep.num_analyzed += 1
+        return super().tables()
+
+
+def test_validation_is_cached_per_vdbe():
+    _CountingQueryRep.num_analyzed = 0
+    validator = VdbeTableValidator([_vdbe(1, ["movies"]), _vdbe(2, ["theatres"])])
+    sql = "SELECT * FROM movies WHERE id = 1"
+
+    assert validator.check(1, _CountingQueryRep(sql)) == (("movies",), None)
+    assert validator.check(1, _CountingQueryRep(sql)) == (("movies",), None)
+    assert _CountingQueryRep.num_analyzed == 1
+
+    assert validator.check(2, _CountingQueryRep(sql)) == (("movies",), "movies")
+    assert validator.check(2, _CountingQueryRep(sql)) == (("movies",), "movies")
+    assert _CountingQueryRep.num_analyzed == 2
+
+    join = "SELECT * FROM theatres t, movies m WHERE t.id = m.id"
+    assert validator.check(2, QueryRep(join)) == (("theatres", "movies"), "movies")
+    # Unknown VDBEs have no tables.
+    assert validator.check(3, QueryRep(sql)) == (("movies",), "movies")
+
+    # The cached results are discarded when the VDBEs change.
+    validator.reset([_vdbe(1, []), _vdbe(2, ["theatres", "movies"])])
+    assert validator.check(1, _CountingQueryRep(sql)) == (("movies",), "movies")
+    assert validator.check(2, QueryRep(join)) == (("theatres", "movies"), None)
+    assert _CountingQueryRep.num_analyzed == 3
+
+
+def test_evicts_oldest_entries():
+    validator = VdbeTableValidator([_vdbe(1, ["movies"])], max_entries_per_vdbe=2)
+    for movie_id in range(3):
+        validator.check(1, QueryRep(f"SELECT * FROM movies WHERE id = {movie_id}"))
+    before = _CountingQueryRep.num_analyzed
+    validator.check(1, _CountingQueryRep("SELECT * FROM movies WHERE id = 0"))
+    assert _CountingQueryRep.num_analyzed == before + 1
@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import grpc
+import yaml
+
+import brad.proto_gen.brad_pb2 as b
+import brad.proto_gen.brad_pb2_grpc as brad_grpc
+from brad.asset_manager import AssetManager
+from brad.blueprint.manager import BlueprintManager
+from brad.config.file import ConfigFile
+from brad.connection.factory import ConnectionFactory
+from brad.daemon.ipc_channel import IpcChannel
+from brad.daemon.populate_stub import create_tables_in_stub, load_tables_in_stub
+from brad.front_end.front_end import BradFrontEnd
+from brad.front_end.query_stages import QueryStage
+from brad.provisioning.directory import Directory
+
+# pylint: disable=no-member
+# See https://github.com/protocolbuffers/protobuf/issues/10372
+
+_REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# Each "unit of work" is a list of queries that a client runs back to back.
+Work = List[str]
+
+
+def make_point_query(prng: random.Random) -> Work:
+    # The read-only lookups issued by the IMDB_extended transactional clients.
+    # The stub tables have 100 rows each.
+    theatre_id = prng.randint(0, 99)
+    return [
+        prng.choice(
+            [
+                f"SELECT id, name, location_x, location_y FROM theatres WHERE id = {theatre_id}",
+                f"SELECT id, seats_left FROM showings WHERE theatre_id = {theatre_id} "
+                "ORDER BY date_time ASC",
+                f"SELECT id, quantity FROM ticket_orders WHERE showing_id = {theatre_id}",
+            ]
+        )
+    ]
+
+
+def make_purchase(prng: random.Random) -> Work:
+    # The IMDB_extended ticket purchase, without the explicit transaction. The
+    # stub engines are SQLite databases that run on the front end's event loop,
+    # so a session holding SQLite's write lock would block the other sessions.
+    showing_id = prng.randint(0, 99)
+    return [
+        f"SELECT id, seats_left FROM showings WHERE id = {showing_id}",
+        "INSERT INTO ticket_orders (id, showing_id, quantity, contact_name, "
+        f"location_x, location_y) VALUES ({prng.randint(1000, 10**9)}, "
+        f"{showing_id}, 1, 'bench', 0.0, 0.0)",
+        f"UPDATE showings SET seats_left = seats_left - 1 WHERE id = {showing_id}",
+    ]
+
+
+def load_analytical_queries(
+    bank: pathlib.Path, stub_db: pathlib.Path, max_queries: int, max_run_time_s: float
+) -> List[str]:
+    """
+    Returns queries from the bank that SQLite can run quickly on the stub data
+    (the banks were written for Redshift and Athena).
+    """
+    with open(bank, "r", encoding="UTF-8") as file:
+        candidates = [line.strip() for line in file if len(line.strip()) > 0]
+    candidates = [q[:-1] if q.endswith(";") else q for q in candidates]
+
+    conn = sqlite3.connect(str(stub_db))
+    deadline = 0.0
+
+    def abort_if_slow() -> int:
+        return 1 if time.perf_counter() > deadline else 0
+
+    conn.set_progress_handler(abort_if_slow, 10_000)
+    usable = []
+    for query in candidates:
+        deadline = time.perf_counter() + max_run_time_s
+        try:
+            conn.execute(query).fetchall()
+            usable.append(query)
+        except sqlite3.Error:
+            continue
+        if len(usable) >= max_queries:
+            break
+    conn.close()
+    return usable
+
+
+def make_workload(
+    prng: random.Random,
+    num_units: int,
+    analytics: List[str],
+    analytics_frac: float,
+    purchase_frac: float,
+) -> List[Work]:
+    workload = []
+    for _ in range(num_units):
+        dice = prng.random()
+        if dice < analytics_frac and len(analytics) > 0:
+            workload.append([prng.choice(analytics)])
+        elif dice < analytics_frac + purchase_frac:
+            workload.append(make_purchase(prng))
+        else:
+            workload.append(make_point_query(prng))
+    return workload
+
+
+def make_config(args, stub_db: pathlib.Path, logs_path: pathlib.Path) -> ConfigFile:
+    with open(args.physical_config, "r", encoding="UTF-8") as file:
+        raw = yaml.load(file, Loader=yaml.Loader)
+    with open(args.system_config, "r", encoding="UTF-8") as file:
+        raw.update(yaml.load(file, Loader=yaml.Loader))
+    raw["stub_mode_path"] = str(pathlib.Path(args.stub_path).resolve())
+    raw["stub_db_path"] = str(stub_db)
+    raw["front_end_interface"] = "127.0.0.1"
+    raw["front_end_port"] = args.port
+    raw["local_logs_path"] = str(logs_path)
+    # We read the stage latencies directly (the front end resets them when it
+    # reports its metrics).
+    raw["front_end_metrics_reporting_period_seconds"] = 24 * 60 * 60
+    if args.routing_policy is not None:
+        raw["routing_policy"] = args.routing_policy
+    # Keep the front end's logs out of the benchmark output.
+    for key in ["front_end_log_path", "daemon_log_file", "metrics_log_path"]:
+        raw.pop(key, None)
+    return ConfigFile(raw)
+
+
+async def run_client(
+    stub: brad_grpc.BradStub, workload: List[Work], latencies_s: List[float]
+) -> int:
+    session = await stub.StartSession(b.StartSessionRequest())
+    session_id = b.SessionId(id_value=session.id.id_value)
+    num_errors = 0
+    for work in workload:
+        for query in work:
+            start = time.perf_counter()
+            try:
+                response = await stub.RunQueryJson(
+                    b.RunQueryRequest(id=session_id, query=query)
+                )
+            except grpc.aio.AioRpcError:
+                # Unexpected front end exceptions terminate the RPC.
+                num_errors += 1
+                continue
+            latencies_s.append(time.perf_counter() - start)
+            if response.WhichOneof("result") != "results":
+                num_errors += 1
+            else:
+                json.loads(response.results.results_json)
+    await stub.EndSession(b.EndSessionRequest(id=session_id))
+    return num_errors
+
+
+async def run_at_concurrency(
+    stub: brad_grpc.BradStub,
+    front_end: BradFrontEnd,
+    workloads: List[List[Work]],
+    num_warmup: int,
+) -> Tuple[Dict[str, float], Dict[QueryStage, Tuple[int, float, float, float]]]:
+    # Warm up (connections, caches), then discard the stage timings.
+    await asyncio.gather(
+        *[run_client(stub, workload[:num_warmup], []) for workload in workloads]
+    )
+    front_end.stage_latencies().take()
+
+    latencies_s: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *[
+            run_client(stub, workload[num_warmup:], latencies_s)
+            for workload in workloads
+        ]
+    )
+    elapsed_s = time.perf_counter() - start
+
+    latencies_s.sort()
+    summary = {
+        "num_queries": float(len(latencies_s)),
+        "num_errors": float(sum(errors)),
+        "throughput_qps": len(latencies_s) / elapsed_s,
+        "p50_ms": latencies_s[len(latencies_s) // 2] * 1e3,
+        "p99_ms": latencies_s[min(len(latencies_s) - 1, int(len(latencies_s) * 0.99))]
+        * 1e3,
+    }
+    stages = {}
+    for stage, sketch in front_end.stage_latencies().take():
+        p50_s = sketch.get_quantile_value(0.5)
+        p99_s = sketch.get_quantile_value(0.99)
+        if sketch.count == 0 or p50_s is None or p99_s is None:
+            stages[stage] = (0, 0.0, 0.0, 0.0)
+            continue
+        stages[stage] = (
+            int(sketch.count),
+            sketch.sum / sketch.count * 1e6,
+            p50_s * 1e6,
+            p99_s * 1e6,
+        )
+    return summary, stages
+
+
+async def main_impl(args) -> None:
+    # The AWS clients are created (but never used) in stub mode.
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stub_db = pathlib.Path(tmp_dir) / "stub.sqlite"
+        config = make_config(args, stub_db, pathlib.Path(tmp_dir) / "logs")
+
+        blueprint_mgr = BlueprintManager(config, AssetManager(config), args.schema_name)
+        await blueprint_mgr.load()
+        stub_conn = ConnectionFactory.connect_to_stub(config)
+        create_tables_in_stub(config, stub_conn, blueprint_mgr.get_blueprint())
+        load_tables_in_stub(config, stub_conn, blueprint_mgr.get_blueprint())
+        stub_conn.close_sync()
+
+        analytics = load_analytical_queries(
+            pathlib.Path(args.analytics_bank),
+            stub_db,
+            args.max_analytical_queries,
+            args.max_analytical_run_time_s,
+        )
+        print(f"# Using {len(analytics)} analytical queries from the bank.")
+
+        fe_channel, daemon_channel = IpcChannel.create_pair()
+        await daemon_channel.open()
+        front_end = BradFrontEnd(
+            0,
+            config,
+            args.schema_name,
+            args.system_config,
+            False,
+            Directory(config),
+            fe_channel,
+        )
+        server_task = asyncio.create_task(front_end.serve_forever())
+
+        channel = grpc.aio.insecure_channel(f"127.0.0.1:{args.port}")
+        try:
+            await asyncio.wait_for(channel.channel_ready(), timeout=60.0)
+            stub = brad_grpc.BradStub(channel)
+
+            prng = random.Random(args.seed)
+            print(
+                "concurrency,num_queries,num_errors,throughput_qps,p50_ms,p99_ms,"
+                + ",".join(
+                    f"{stage.value}_mean_us,{stage.value}_p50_us,{stage.value}_p99_us"
+                    for stage in QueryStage
+                )
+            )
+            for concurrency in args.concurrency:
+                workloads = [
+                    make_workload(
+                        prng,
+                        args.warmup_units + args.units_per_client,
+                        analytics,
+                        args.analytics_frac,
+                        args.purchase_frac,
+                    )
+                    for _ in range(concurrency)
+                ]
+                summary, stages = await run_at_concurrency(
+                    stub, front_end, workloads, args.warmup_units
+                )
+                print(
+                    "{},{:.0f},{:.0f},{:.1f},{:.3f},{:.3f},".format(
+                        concurrency,
+                        summary["num_queries"],
+                        summary["num_errors"],
+                        summary["throughput_qps"],
+                        summary["p50_ms"],
+                        summary["p99_ms"],
+                    )
+                    + ",".join(
+                        "{:.1f},{:.1f},{:.1f}".format(*stages[stage][1:])
+                        for stage in QueryStage
+                    )
+                )
+        finally:
+            await channel.close()
+            server_task.cancel()
+            try:
+                await server_task
+            except asyncio.CancelledError:
+                pass
+            await daemon_channel.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measures the BRAD front end's request pipeline overhead "
+        "using the SQLite stub engines (no cloud resources needed)."
+    )
+    parser.add_argument(
+        "--stub-path", type=str, default=str(_REPO_ROOT / "config/stubs/imdb_extended")
+    )
+    parser.add_argument("--schema-name", type=str, default="imdb_extended")
+    parser.add_argument(
+        "--system-config",
+        type=str,
+        default=str(_REPO_ROOT / "config/system_config.yml"),
+    )
+    parser.add_argument(
+        "--physical-config",
+        type=str,
+        default=str(_REPO_ROOT / "config/physical_config_sample.yml"),
+    )
+    parser.add_argument(
+        "--routing-policy",
+        type=str,
+        help="Overrides the blueprint's routing policy (e.g., always_aurora).",
+    )
+    parser.add_argument("--port", type=int, default=16583)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--units-per-client",
+        type=int,
+        default=200,
+        help="Each unit is a point query, an analytical query, or a ticket purchase.",
+    )
+    parser.add_argument("--warmup-units", type=int, default=20)
+    parser.add_argument("--analytics-frac", type=float, default=0.1)
+    parser.add_argument("--purchase-frac", type=float, default=0.1)
+    parser.add_argument(
+        "--analytics-bank",
+        type=str,
+        default=str(_REPO_ROOT / "workloads/IMDB_100GB/regular_test/queries.sql"),
+    )
+    parser.add_argument("--max-analytical-queries", type=int, default=100)
+    parser.add_argument("--max-analytical-run-time-s", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main_impl(args))
+
+
+if __name__ == "__main__":
+    main()
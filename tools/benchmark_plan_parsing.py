@@ -0,0 +1,181 @@
+import argparse
+import json
+import pathlib
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from brad.data_stats.plan_parsing import (
+    extract_base_cardinalities,
+    parse_explain_json,
+    parse_explain_text,
+    parse_explain_verbose,
+)
+
+# A recorded plan: the text EXPLAIN VERBOSE rows and the EXPLAIN (VERBOSE,
+# FORMAT JSON) output for the same query.
+RecordedPlan = Tuple[List[str], str]
+
+
+def load_recorded_plans(plans_dir: pathlib.Path) -> List[RecordedPlan]:
+    """
+    Loads pairs of recorded plans: `<name>.txt` holds the EXPLAIN VERBOSE output
+    (one row per line) and `<name>.json` holds the EXPLAIN (VERBOSE, FORMAT
+    JSON) output.
+    """
+    plans = []
+    for text_path in sorted(plans_dir.glob("*.txt")):
+        json_path = text_path.with_suffix(".json")
+        if not json_path.exists():
+            continue
+        with open(text_path, "r", encoding="UTF-8") as file:
+            text_rows = [line.rstrip("\n") for line in file if len(line.strip()) > 0]
+        with open(json_path, "r", encoding="UTF-8") as file:
+            json_plan = file.read()
+        plans.append((text_rows, json_plan))
+    return plans
+
+
+def _scan(table: str, rows: int, depth: int) -> Tuple[List[str], Dict[str, Any]]:
+    indent = " " * (6 * depth)
+    text = [
+        f"{indent}->  Parallel Seq Scan on public.{table}  "
+        f"(cost=0.00..{rows / 10:.2f} rows={rows} width=16)",
+        f"{indent}      Output: {table}.id, {table}.value",
+        f"{indent}      Filter: ({table}.value > 10)",
+    ]
+    node = {
+        "Node Type": "Seq Scan",
+        "Parallel Aware": True,
+        "Relation Name": table,
+        "Schema": "public",
+        "Startup Cost": 0.0,
+        "Total Cost": rows / 10,
+        "Plan Rows": rows,
+        "Plan Width": 16,
+        "Output": [f"{table}.id", f"{table}.value"],
+        "Filter": f"({table}.value > 10)",
+    }
+    return text, node
+
+
+def synthetic_plan(num_tables: int) -> RecordedPlan:
+    """
+    A left-deep hash join over `num_tables` tables, rendered in both formats.
+    """
+    text, node = _scan("table0", 1000, num_tables - 1)
+    for i in range(1, num_tables):
+        depth = num_tables - i
+        indent = " " * (6 * depth)
+        outer_indent = " " * (6 * (depth - 1))
+        scan_text, scan_node = _scan(f"table{i}", 1000 * (i + 1), depth + 1)
+        join_text = [
+            f"{outer_indent}->  Hash Join  (cost=10.00..{i * 500.0:.2f} rows=1000 width=16)",
+            f"{outer_indent}      Output: table0.id",
+            f"{outer_indent}      Hash Cond: (table0.id = table{i}.id)",
+        ]
+        hash_text = [
+            f"{indent}->  Hash  (cost=5.00..5.00 rows=1000 width=16)",
+            f"{indent}      Output: table{i}.id",
+        ]
+        text = join_text + text + hash_text + scan_text
+        node = {
+            "Node Type": "Hash Join",
+            "Parallel Aware": False,
+            "Startup Cost": 10.0,
+            "Total Cost": i * 500.0,
+            "Plan Rows": 1000,
+            "Plan Width": 16,
+            "Hash Cond": f"(table0.id = table{i}.id)",
+            "Plans": [
+                node,
+                {
+                    "Node Type": "Hash",
+                    "Parallel Aware": False,
+                    "Startup Cost": 5.0,
+                    "Total Cost": 5.0,
+                    "Plan Rows": 1000,
+                    "Plan Width": 16,
+                    "Plans": [scan_node],
+                },
+            ],
+        }
+    # The root operator is printed without an arrow.
+    text[0] = text[0].replace("->  ", "", 1)
+    return text, json.dumps([{"Plan": node}])
+
+
+def baseline(plan: RecordedPlan) -> None:
+    # `parse_explain_verbose()` modifies its input.
+    extract_base_cardinalities(parse_explain_verbose(list(plan[0])))
+
+
+def operator_table_text(plan: RecordedPlan) -> None:
+    parse_explain_text(plan[0]).base_cardinalities()
+
+
+def operator_table_json(plan: RecordedPlan) -> None:
+    parse_explain_json(plan[1]).base_cardinalities()
+
+
+def time_per_plan(
+    fn: Callable[[RecordedPlan], None], plans: List[RecordedPlan], repetitions: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for plan in plans:
+            fn(plan)
+    return (time.perf_counter() - start) / (repetitions * len(plans))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark for parsing PostgreSQL query plans."
+    )
+    parser.add_argument(
+        "--plans-dir",
+        type=str,
+        help="A directory of recorded plans (<name>.txt and <name>.json pairs). "
+        "If not set, synthetic join plans are used.",
+    )
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.plans_dir is not None:
+        workloads = [("recorded", load_recorded_plans(pathlib.Path(args.plans_dir)))]
+    else:
+        workloads = [
+            (f"synthetic_{num_tables}_tables", [synthetic_plan(num_tables)] * 10)
+            for num_tables in [1, 4, 8, 16]
+        ]
+
+    print("plans,num_plans,mismatches,baseline_us,text_us,json_us,json_speedup")
+    for name, plans in workloads:
+        if len(plans) == 0:
+            print("# No recorded plans found.")
+            continue
+        mismatches = 0
+        for text_rows, json_plan in plans:
+            expected = sorted(
+                extract_base_cardinalities(parse_explain_verbose(list(text_rows)))
+            )
+            if sorted(parse_explain_json(json_plan).base_cardinalities()) != expected:
+                mismatches += 1
+
+        baseline_s = time_per_plan(baseline, plans, args.repetitions)
+        text_s = time_per_plan(operator_table_text, plans, args.repetitions)
+        json_s = time_per_plan(operator_table_json, plans, args.repetitions)
+        print(
+            "{},{},{},{:.1f},{:.1f},{:.1f},{:.1f}".format(
+                name,
+                len(plans),
+                mismatches,
+                baseline_s * 1e6,
+                text_s * 1e6,
+                json_s * 1e6,
+                baseline_s / json_s,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import pathlib
+import time
+from typing import Callable, List
+
+import sqlglot
+import sqlglot.expressions as exp
+
+from brad.parse_cache import ParseCache
+from brad.query_rep import (
+    QueryRep,
+    _DATA_MODIFICATION_PREFIXES,
+    _GEOSPATIAL_KEYWORDS,
+    _VECTOR_KEYWORDS,
+    _extract_tables_simple,
+)
+
+_REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+_DEFAULT_QUERY_BANKS = [
+    # The IMDB_extended workloads draw their analytical queries from these banks.
+    "workloads/IMDB_100GB/regular_test/queries.sql",
+    "workloads/IMDB_100GB/adhoc_test/queries.sql",
+    "workloads/IMDB_100GB/regular_rebalanced_5k/queries.sql",
+    "workloads/chbenchmark/queries.sql",
+]
+
+# Representative transactional statements (IMDB_extended and CH-benCHmark).
+_TRANSACTIONS = [
+    "BEGIN",
+    "SELECT id, name, location_x, location_y FROM theatres WHERE id = 123",
+    "SELECT id, capacity, seats_left FROM showings WHERE theatre_id = 12 AND "
+    "movie_id = 3456 AND date_time > '2023-07-10 12:00:00' ORDER BY date_time ASC",
+    "INSERT INTO ticket_orders (showing_id, quantity, contact_name, contact_email) "
+    "VALUES (1234, 2, 'abc', 'abc@example.com')",
+    "UPDATE showings SET seats_left = seats_left - 2 WHERE id = 1234",
+    "COMMIT",
+    "SELECT c_discount, c_last, c_credit, w_tax FROM customer, warehouse "
+    "WHERE w_id = 1 AND c_w_id = w_id AND c_d_id = 3 AND c_id = 1200",
+    "UPDATE district SET d_next_o_id = 3001 WHERE d_id = 3 AND d_w_id = 1",
+    "DELETE FROM new_order WHERE no_d_id = 3 AND no_w_id = 1 AND no_o_id = 2101",
+    "ROLLBACK",
+]
+
+
+def baseline_facts(sql: str) -> None:
+    # The analysis that `QueryRep` used to run (one uppercase pass per fact, a
+    # scan per keyword, and a full parse for the table list).
+    any(map(sql.upper().startswith, _DATA_MODIFICATION_PREFIXES))
+    upper = sql.upper()
+    any(keyword in upper for keyword in _GEOSPATIAL_KEYWORDS)
+    upper = sql.upper()
+    any(keyword in upper for keyword in _VECTOR_KEYWORDS)
+    list(map(lambda tbl: tbl.name, sqlglot.parse_one(sql).find_all(exp.Table)))
+
+
+def query_rep_facts(sql: str) -> None:
+    rep = QueryRep(sql)
+    rep.is_data_modification_query()
+    rep.get_required_functionality()
+    rep.tables()
+
+
+def time_per_query(
+    fn: Callable[[str], None],
+    queries: List[str],
+    repetitions: int,
+    clear_parse_cache: bool,
+) -> float:
+    elapsed = 0.0
+    for _ in range(repetitions):
+        if clear_parse_cache:
+            ParseCache.instance().clear()
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        elapsed += time.perf_counter() - start
+    return elapsed / (repetitions * len(queries))
+
+
+def load_queries(path: pathlib.Path, max_queries: int) -> List[str]:
+    with open(path, "r", encoding="UTF-8") as file:
+        queries = [line.strip() for line in file if len(line.strip()) > 0]
+    # Strip trailing semicolons to match what clients send to BRAD.
+    queries = [q[:-1] if q.endswith(";") else q for q in queries]
+    return queries[:max_queries]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark for `QueryRep`'s query analysis."
+    )
+    parser.add_argument(
+        "--query-bank",
+        type=str,
+        action="append",
+        help="Query bank files (one query per line). Can be repeated.",
+    )
+    parser.add_argument("--max-queries", type=int, default=500)
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.query_bank is not None:
+        banks = [pathlib.Path(bank) for bank in args.query_bank]
+    else:
+        banks = [_REPO_ROOT / bank for bank in _DEFAULT_QUERY_BANKS]
+    workloads = [
+        (bank.parent.name, load_queries(bank, args.max_queries)) for bank in banks
+    ]
+    workloads.append(("transactions", _TRANSACTIONS))
+
+    print(
+        "bank,num_queries,simple_table_extraction_frac,mismatches,"
+        "baseline_us,query_rep_us,speedup,query_rep_cached_us,cached_speedup"
+    )
+    for name, queries in workloads:
+        # Check that the simple table extractor agrees with sqlglot.
+        num_simple = 0
+        mismatches = 0
+        for query in queries:
+            simple = _extract_tables_simple(query)
+            if simple is None:
+                continue
+            num_simple += 1
+            parsed = list(
+                map(lambda tbl: tbl.name, sqlglot.parse_one(query).find_all(exp.Table))
+            )
+            if simple != parsed:
+                mismatches += 1
+                print("# Mismatch:", query, simple, parsed)
+
+        baseline_s = time_per_query(
+            baseline_facts, queries, args.repetitions, clear_parse_cache=False
+        )
+        # Cold: every query is analyzed. Cached: the queries were seen before
+        # (e.g., loaded from a parse cache snapshot).
+        query_rep_s = time_per_query(
+            query_rep_facts, queries, args.repetitions, clear_parse_cache=True
+        )
+        for query in queries:
+            query_rep_facts(query)
+        cached_s = time_per_query(
+            query_rep_facts, queries, args.repetitions, clear_parse_cache=False
+        )
+        print(
+            "{},{},{:.3f},{},{:.1f},{:.1f},{:.1f},{:.1f},{:.1f}".format(
+                name,
+                len(queries),
+                num_simple / len(queries),
+                mismatches,
+                baseline_s * 1e6,
+                query_rep_s * 1e6,
+                baseline_s / query_rep_s,
+                cached_s * 1e6,
+                baseline_s / cached_s,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
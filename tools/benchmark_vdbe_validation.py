@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import random
+import sqlite3
+import time
+from typing import Callable, List
+
+from brad.asset_manager import AssetManager
+from brad.blueprint.manager import BlueprintManager
+from brad.config.engine import Engine
+from brad.config.file import ConfigFile
+from brad.front_end.engine_connections import EngineConnections
+from brad.front_end.vdbe.table_validator import VdbeTableValidator
+from brad.parse_cache import ParseCache
+from brad.query_rep import QueryRep
+from brad.vdbe.models import QueryInterface, VirtualEngine, VirtualTable
+
+# Short point queries issued by the IMDB_extended transactional clients.
+_POINT_QUERY_TEMPLATES = [
+    "SELECT id, name, location_x, location_y FROM theatres WHERE id = {}",
+    "SELECT id, title, production_year FROM title WHERE id = {}",
+    "SELECT id, capacity, seats_left FROM showings WHERE id = {}",
+    "SELECT id, showing_id, quantity FROM ticket_orders WHERE id = {}",
+]
+_TABLES = ["theatres", "showings", "ticket_orders", "title"]
+
+
+def make_queries(num_distinct: int, num_queries: int, seed: int) -> List[str]:
+    prng = random.Random(seed)
+    distinct = [
+        template.format(prng.randint(1, 1_000_000))
+        for template in _POINT_QUERY_TEMPLATES
+        for _ in range(max(1, num_distinct // len(_POINT_QUERY_TEMPLATES)))
+    ]
+    return [prng.choice(distinct) for _ in range(num_queries)]
+
+
+def make_vdbe() -> VirtualEngine:
+    return VirtualEngine(
+        internal_id=1,
+        name="benchmark",
+        max_staleness_ms=0,
+        p90_latency_slo_ms=30,
+        interface=QueryInterface.Common,
+        tables=[VirtualTable(name=name, writable=True) for name in _TABLES],
+        mapped_to=Engine.Aurora,
+    )
+
+
+def previous_validation(vdbe: VirtualEngine) -> Callable[[str], None]:
+    # What `BradVdbeFrontEnd._run_query_impl` did before the validator.
+    def validate(sql: str) -> None:
+        for table_name in QueryRep(sql).tables():
+            if table_name not in vdbe.table_names_set:
+                raise RuntimeError(table_name)
+
+    return validate
+
+
+def cached_validation(vdbe: VirtualEngine) -> Callable[[str], None]:
+    validator = VdbeTableValidator([vdbe])
+
+    def validate(sql: str) -> None:
+        _, disallowed = validator.check(vdbe.internal_id, QueryRep(sql))
+        if disallowed is not None:
+            raise RuntimeError(disallowed)
+
+    return validate
+
+
+def time_per_query(
+    fn: Callable[[str], None], queries: List[str], clear_parse_cache: bool
+) -> float:
+    if clear_parse_cache:
+        ParseCache.instance().clear()
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def sqlite_point_query_latency(queries: List[str]) -> float:
+    # A lower bound on engine latency (no network round trip).
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE theatres (id INTEGER PRIMARY KEY, name TEXT, "
+        "location_x REAL, location_y REAL)"
+    )
+    conn.executemany(
+        "INSERT INTO theatres VALUES (?, ?, ?, ?)",
+        ((i, f"theatre{i}", 0.0, 0.0) for i in range(100_000)),
+    )
+    prng = random.Random(len(queries))
+    start = time.perf_counter()
+    for _ in queries:
+        conn.execute(
+            "SELECT id, name, location_x, location_y FROM theatres WHERE id = ?",
+            (prng.randint(0, 99_999),),
+        ).fetchall()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed / len(queries)
+
+
+async def aurora_point_query_latency(
+    config_file: str, schema_name: str, queries: List[str]
+) -> float:
+    config = ConfigFile.load(config_file)
+    blueprint_mgr = BlueprintManager(config, AssetManager(config), schema_name)
+    await blueprint_mgr.load()
+    cxns = await EngineConnections.connect(
+        config,
+        blueprint_mgr.get_directory(),
+        schema_name,
+        autocommit=True,
+        specific_engines={Engine.Aurora},
+    )
+    cursor = cxns.get_connection(Engine.Aurora).cursor_sync()
+    start = time.perf_counter()
+    for query in queries:
+        await cursor.execute(query)
+        await cursor.fetchall()
+    elapsed = time.perf_counter() - start
+    await cxns.close()
+    return elapsed / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares VDBE table-access validation overhead to the "
+        "latency of short Aurora point queries."
+    )
+    parser.add_argument("--num-distinct", type=int, default=1000)
+    parser.add_argument("--num-queries", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--config-file",
+        type=str,
+        help="If set, point query latency is measured on Aurora.",
+    )
+    parser.add_argument("--schema-name", type=str, default="imdb_extended_100g")
+    parser.add_argument("--num-engine-queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    queries = make_queries(args.num_distinct, args.num_queries, args.seed)
+    vdbe = make_vdbe()
+
+    # Cold: the queries have never been seen. Warm: repeated queries.
+    previous_cold_s = time_per_query(
+        previous_validation(vdbe), queries, clear_parse_cache=True
+    )
+    previous_warm_s = time_per_query(
+        previous_validation(vdbe), queries, clear_parse_cache=False
+    )
+    validator_fn = cached_validation(vdbe)
+    validator_cold_s = time_per_query(validator_fn, queries, clear_parse_cache=True)
+    validator_warm_s = time_per_query(validator_fn, queries, clear_parse_cache=False)
+
+    engine_queries = queries[: args.num_engine_queries]
+    if args.config_file is not None:
+        engine_s = asyncio.run(
+            aurora_point_query_latency(
+                args.config_file, args.schema_name, engine_queries
+            )
+        )
+        engine_name = "aurora"
+    else:
+        engine_s = sqlite_point_query_latency(engine_queries)
+        engine_name = "sqlite_in_memory"
+
+    print("variant,validation_us,engine,engine_us,overhead_frac")
+    for name, validation_s in [
+        ("previous_cold", previous_cold_s),
+        ("previous_warm", previous_warm_s),
+        ("validator_cold", validator_cold_s),
+        ("validator_warm", validator_warm_s),
+    ]:
+        print(
+            "{},{:.2f},{},{:.2f},{:.4f}".format(
+                name,
+                validation_s * 1e6,
+                engine_name,
+                engine_s * 1e6,
+                validation_s / (validation_s + engine_s),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()